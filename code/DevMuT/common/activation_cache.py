@@ -0,0 +1,265 @@
+from collections import OrderedDict
+from copy import deepcopy
+from mindspore import nn, context
+
+
+class _Cursor:
+    def __init__(self):
+        self.batch = 0
+
+
+class _Slot:
+    # plain holder, so Cell.__setattr__ leaves the per-batch lists alone
+    def __init__(self, values):
+        self.values = values
+
+
+class RecordCell(nn.Cell):
+    """
+    Runs the wrapped layer and keeps its output for the current batch.
+    """
+
+    def __init__(self, layer, calls, cursor):
+        super(RecordCell, self).__init__(auto_prefix=False)
+        self.layer = layer
+        self.calls = _Slot(calls)
+        self.cursor = cursor
+
+    def construct(self, *inputs):
+        output = self.layer(*inputs)
+        self.calls.values[self.cursor.batch].append(output)
+        return output
+
+
+class CachedCell(nn.Cell):
+    """
+    Stands in for a layer whose inputs and weights are unchanged: returns the output recorded for the current
+    batch and ignores its inputs.
+    """
+
+    def __init__(self, outputs, counts, cursor):
+        super(CachedCell, self).__init__(auto_prefix=False)
+        self.outputs = _Slot(outputs)
+        self.counts = _Slot(counts)
+        self.cursor = cursor
+
+    def construct(self, *inputs):
+        self.counts.values[self.cursor.batch] += 1
+        return self.outputs.values[self.cursor.batch]
+
+
+class ActivationEntry:
+    def __init__(self, data_id, num_batches, outputs, multi, orders, nbytes):
+        self.data_id = data_id
+        self.num_batches = num_batches
+        self.outputs = outputs
+        self.multi = multi
+        self.orders = orders
+        self.nbytes = nbytes
+
+
+def _nbytes(output):
+    if isinstance(output, (list, tuple)):
+        return sum(_nbytes(val) for val in output)
+    return getattr(output, "nbytes", 0)
+
+
+def _as_list(val):
+    if isinstance(val, (list, tuple)):
+        return list(val)
+    return [val]
+
+
+def changed_layers(record):
+    """
+    Layer names a mutation record (see common/mutation_journal.py) touched, or None when it can not be told.
+    """
+    if record is None or record["skip"] or record["args"] is None:
+        return None
+    args = record["args"]
+    if record["operator"] == "LD":
+        names = [args["del_layer_name"]]
+    elif record["operator"] == "LS":
+        names = [args["mut_layer_name1"], args["mut_layer_name2"]]
+    elif record["operator"] == "PM":
+        names = [args["mutate_layer_name"]]
+    else:
+        names = [args.get("mut_layer_name")]
+    if any(not name for name in names):
+        return None
+    return names
+
+
+def leaf_layers(model):
+    """
+    Top-most leaf ops (Basic_OPS and add_Cascade_OPs) of a prepared model, or None without topology information.
+    """
+    if getattr(model, "Basic_OPS", None) is None or not isinstance(getattr(model, "orders", None), dict):
+        return None
+    names = sorted(set(model.Basic_OPS) | set(getattr(model, "add_Cascade_OPs", [])))
+    leaves = []
+    for name in names:
+        if any(name.startswith(val + ".") for val in names):
+            continue
+        if not isinstance(model.get_layers(name), nn.Cell):
+            continue
+        leaves.append(name)
+    return leaves
+
+
+class ActivationCache:
+    """
+    Per-layer outputs of the seed and recent parents on the mutation-score batches, keyed by model (0 for the
+    seed, otherwise the generation) -> layer name -> batch index.
+
+    Scoring a mutant only re-executes the layers the mutation touched and everything downstream of them in
+    `orders`; every other leaf op is swapped for a CachedCell that returns the parent's output. The caller only
+    passes `changed` when the model is exactly the parent plus that mutation (see common/model_states.py), so
+    the untouched layers still carry the parent's weights; a rebuilt seed or a replayed mutant is run in full.
+    Models are run in inference mode, so Dropout and BatchNorm outputs do not depend on the call. Requires PyNative mode, in
+    GRAPH_MODE every call is a plain forward pass. The seed entry is never evicted, the other entries are
+    dropped in LRU order beyond `capacity` or `max_bytes`.
+    """
+
+    def __init__(self, capacity=2, max_bytes=1024 ** 3):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.full_runs = 0
+        self.incremental_runs = 0
+        self.layers_run = 0
+        self.layers_skipped = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def enabled(self):
+        return self.capacity > 0 and not context.get_context("mode") == context.GRAPH_MODE
+
+    def put(self, key, entry):
+        if key in self.entries:
+            self.total_bytes -= self.entries.pop(key).nbytes
+        if entry.nbytes > self.max_bytes:
+            return
+        self.entries[key] = entry
+        self.total_bytes += entry.nbytes
+        while len(self.entries) > self.capacity + 1 or self.total_bytes > self.max_bytes:
+            evict = [val for val in self.entries.keys() if not val == 0]
+            if len(evict) == 0:
+                break
+            self.total_bytes -= self.entries.pop(evict[0]).nbytes
+
+    def get(self, key, data_id, num_batches):
+        entry = self.entries.get(key)
+        if entry is None or not entry.data_id == data_id or not entry.num_batches == num_batches:
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    @staticmethod
+    def dirty_layers(model, parent, changed, leaves):
+        successors = {}
+        for orders in [parent.orders, model.orders]:
+            for name, (_, next_ops) in orders.items():
+                successors.setdefault(name, set()).update(
+                    val for val in _as_list(next_ops) if isinstance(val, str) and "OUTPUT" not in val)
+
+        stack = []
+        for name in list(successors.keys()) + leaves:
+            if any(name == val or name.startswith(val + ".") or val.startswith(name + ".") for val in changed):
+                stack.append(name)
+        visited = set()
+        while len(stack) > 0:
+            name = stack.pop()
+            if name in visited:
+                continue
+            visited.add(name)
+            stack.extend(successors.get(name, []))
+
+        dirty = set()
+        for name in leaves:
+            if name not in parent.outputs or name in parent.multi:
+                dirty.add(name)
+            elif any(val == name or val.startswith(name + ".") or name.startswith(val + ".") for val in visited):
+                dirty.add(name)
+        return dirty
+
+    def run(self, model, batches, leaves, parent, dirty):
+        cursor = _Cursor()
+        records, counts, originals = {}, {}, []
+        try:
+            for name in leaves:
+                layer = model.get_layers(name)
+                originals.append((name, layer))
+                if name in dirty:
+                    records[name] = [[] for _ in batches]
+                    model.set_layers(name, RecordCell(layer, records[name], cursor))
+                else:
+                    counts[name] = [0] * len(batches)
+                    model.set_layers(name, CachedCell(parent.outputs[name], counts[name], cursor))
+            outputs = []
+            for idx, inputs in enumerate(batches):
+                cursor.batch = idx
+                outputs.append(model(*inputs))
+        finally:
+            for name, layer in reversed(originals):
+                model.set_layers(name, layer)
+        return outputs, records, counts
+
+    def forward(self, model, batches, parent_key=None, changed=None, new_key=None, data_id=None):
+        """
+        Outputs of `model` on each input tuple in `batches`. With a cached `parent_key` and the `changed` layer
+        names of the mutation that produced `model` from it, only the affected layers are executed. The
+        per-layer outputs are stored under `new_key` for the mutants derived from this one.
+        """
+        training = model.training
+        model.set_train(False)
+        try:
+            return self.forward_eval(model, batches, parent_key, changed, new_key, data_id)
+        finally:
+            model.set_train(training)
+
+    def forward_eval(self, model, batches, parent_key, changed, new_key, data_id):
+        leaves = leaf_layers(model) if self.enabled() else None
+        if leaves is None:
+            return [model(*inputs) for inputs in batches]
+
+        parent = None
+        if parent_key is not None and changed is not None:
+            parent = self.get(parent_key, data_id, len(batches))
+        dirty = set(leaves) if parent is None else self.dirty_layers(model, parent, changed, leaves)
+        outputs, records, counts = self.run(model, batches, leaves, parent, dirty)
+        if any(max(val) > 1 for val in counts.values()):
+            # a cached layer was reached more than once per batch, so its position in orders can not be trusted
+            dirty = set(leaves)
+            outputs, records, counts = self.run(model, batches, leaves, parent, dirty)
+
+        if len(dirty) == len(leaves):
+            self.full_runs += 1
+        else:
+            self.incremental_runs += 1
+        self.layers_run += len(dirty)
+        self.layers_skipped += len(leaves) - len(dirty)
+
+        if new_key is None:
+            return outputs
+        layer_outputs, multi, nbytes = {}, set(), 0
+        for name in leaves:
+            if name in counts:
+                layer_outputs[name] = parent.outputs[name]
+            elif all(len(val) == 1 for val in records[name]):
+                layer_outputs[name] = [val[0] for val in records[name]]
+                nbytes += sum(_nbytes(val) for val in layer_outputs[name])
+            elif any(len(val) > 1 for val in records[name]):
+                multi.add(name)
+        self.put(new_key, ActivationEntry(data_id, len(batches), layer_outputs, multi, deepcopy(model.orders),
+                                          nbytes))
+        return outputs
+
+    def summary(self):
+        total = self.layers_run + self.layers_skipped
+        return "activation cache: {} entries, {:.1f}MB, full forwards:{}, incremental forwards:{}, " \
+               "layers skipped:{}/{} ({:.1f}%)".format(len(self.entries), self.total_bytes / 1024 / 1024,
+                                                       self.full_runs, self.incremental_runs, self.layers_skipped,
+                                                       total, 100.0 * self.layers_skipped / max(total, 1))
@@ -0,0 +1,138 @@
+import numpy as np
+
+# layer classes (by name, subclasses included) Layer_helpUtils.is_layer_in_weight_change_white_list accepts
+weight_change_types = {"Dense", "Conv1d", "Conv2d", "Conv3d", "Conv2dTranspose", "Conv3dTranspose",
+                       "MaxPool1d", "MaxPool2d", "MaxPool3d", "AvgPool1d", "AvgPool2d", "AvgPool3d",
+                       "LeakyReLU", "ELU", "Threshold", "Softmax", "ReLU"}
+
+# layers each operator can work on; operators not listed take any layer
+operator_categories = {"WS": "conv_dense", "NS": "weight_change", "LA": "insertable", "RA": "insertable",
+                       "CM": "insertable"}
+# operators that rewrite the candidate lists (Basic_OPS, add_Cascade_OPs), after which the index is synced
+structural_operators = {"LD", "LA", "RA", "CM", "LC", "PM", "SM", "DM"}
+
+
+def param_count(layer):
+    params = layer.get_parameters() if hasattr(layer, "get_parameters") else layer.parameters()
+    return sum(int(np.prod(param.shape)) for param in params)
+
+
+def layer_categories(layer):
+    """
+    Categories of one layer: "weighted" (has parameters), "conv_dense" (weighted conv/dense, the WS targets),
+    "weight_change" (weighted and in the weight-change white list, the NS targets) and "insertable" (not a
+    Sequential ending in a replace cell, which LA/RA/CM can not insert into).
+    """
+    type_name = layer.__class__.__name__
+    categories = set()
+    if param_count(layer) > 0:
+        categories.add("weighted")
+        if "conv" in type_name.lower() or "dense" in type_name.lower():
+            categories.add("conv_dense")
+        if any(cls.__name__ in weight_change_types for cls in type(layer).__mro__):
+            categories.add("weight_change")
+    if "Sequential" in type_name:
+        if len(layer) > 0 and "replace" not in layer[len(layer) - 1].__class__.__name__.lower():
+            categories.add("insertable")
+    else:
+        categories.add("insertable")
+    return categories
+
+
+class EligibilityIndex:
+    """
+    Layers of a model per category, built once by model_prepare and kept current by set_layers.
+
+    Each category is a list of layer names plus a name -> position map, so a layer is added or removed in O(1)
+    (swap with the last entry) and an operator draws its layer with one random index instead of permuting the
+    candidates and counting their parameters until a suitable one turns up. The mutation candidates
+    (add_Cascade_OPs + Basic_OPS) are a category of their own, "candidate", and every layer category also has a
+    "candidate:<category>" intersection, which `sync` keeps current after the operators that rewrite the
+    candidate lists.
+    """
+
+    def __init__(self, model, layer_names):
+        self.members = {}
+        self.positions = {}
+        self.categories = {}
+        self.base_categories = {}
+        self.candidates = set()
+        for layer_name in layer_names:
+            layer = model.get_layers(layer_name)
+            if layer is not None and layer is not False:
+                self.update(layer_name, layer)
+        self.sync(model)
+
+    def add(self, category, layer_name):
+        positions = self.positions.setdefault(category, {})
+        if layer_name not in positions:
+            members = self.members.setdefault(category, [])
+            positions[layer_name] = len(members)
+            members.append(layer_name)
+
+    def remove(self, category, layer_name):
+        positions = self.positions.get(category, {})
+        if layer_name not in positions:
+            return
+        members = self.members[category]
+        idx = positions.pop(layer_name)
+        last = members.pop()
+        if not last == layer_name:
+            members[idx] = last
+            positions[last] = idx
+
+    def assign(self, layer_name):
+        old_categories = self.categories.get(layer_name, set())
+        new_categories = set(self.base_categories.get(layer_name, set()))
+        if layer_name in self.candidates:
+            new_categories.update(["candidate"] + ["candidate:" + val for val in new_categories])
+        for category in old_categories - new_categories:
+            self.remove(category, layer_name)
+        for category in new_categories - old_categories:
+            self.add(category, layer_name)
+        self.categories[layer_name] = new_categories
+
+    def update(self, layer_name, layer):
+        self.base_categories[layer_name] = layer_categories(layer)
+        self.assign(layer_name)
+
+    def sync(self, model):
+        """
+        Make the "candidate" category the model's current add_Cascade_OPs + Basic_OPS.
+        """
+        candidates = set(getattr(model, "add_Cascade_OPs", [])) | set(getattr(model, "Basic_OPS", []))
+        changed = candidates ^ self.candidates
+        self.candidates = candidates
+        for layer_name in changed:
+            self.assign(layer_name)
+
+    def draw(self, operator):
+        """
+        Uniform random pick among the mutation candidates `operator` can work on, or None.
+        """
+        members = self.members.get("candidate:" + operator_categories[operator], [])
+        if len(members) == 0:
+            return None
+        return members[np.random.randint(len(members))]
+
+    def filter(self, operator, candidates):
+        """
+        The layers of `candidates` that `operator` can work on, or all of them if there are none.
+        """
+        category = operator_categories.get(operator)
+        if category is None:
+            return list(candidates)
+        positions = self.positions.get(category, {})
+        eligible = [val for val in candidates if val in positions]
+        return eligible if len(eligible) > 0 else list(candidates)
+
+
+def get_eligibility(model):
+    """
+    The model's index, built on first use for models that did not go through model_prepare.
+    """
+    eligibility = getattr(model, "eligibility", None)
+    if eligibility is None:
+        eligibility = EligibilityIndex(model, model.layer_names.keys())
+        model.eligibility = eligibility
+    return eligibility
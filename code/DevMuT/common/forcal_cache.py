@@ -0,0 +1,57 @@
+import os
+import json
+import hashlib
+import numpy as np
+import mindspore
+import mindspore.dataset as ds
+
+
+def forcal_key(model_name, dataset_name, dataset_path, data_forcal_size, dtypes):
+    info = {"model_name": model_name, "dataset_name": dataset_name,
+            "dataset_path": os.path.abspath(dataset_path), "data_forcal_size": int(data_forcal_size),
+            "dtypes": list(dtypes), "seed": ds.config.get_seed()}
+    key = hashlib.sha1(json.dumps(info, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return "{}-{}-{}".format(model_name, dataset_name, key), info
+
+
+def save_forcal_data(path, data, info):
+    if not os.path.exists(path):
+        os.makedirs(path, exist_ok=True)
+    tensors = data if isinstance(data, list) else [data]
+    files = []
+    for idx, tensor in enumerate(tensors):
+        name = "input_{}.npy".format(idx)
+        # write then rename, so a concurrent reader (e.g. another campaign worker) never sees a partial file
+        tmp_path = os.path.join(path, name + ".{}.tmp".format(os.getpid()))
+        with open(tmp_path, "wb") as f:
+            np.save(f, tensor.asnumpy())
+        os.replace(tmp_path, os.path.join(path, name))
+        files.append(name)
+
+    meta = {"info": info, "files": files, "is_list": isinstance(data, list)}
+    tmp_path = os.path.join(path, "meta.json.{}.tmp".format(os.getpid()))
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(path, "meta.json"))
+
+
+def load_forcal_data(cache_dir, key, info, build_fn):
+    """
+    Forcal inputs stored under cache_dir/key as one .npy per model input, built with `build_fn()` (which returns
+    what get_filter_data returns) on a miss. The arrays are memory-mapped and wrapped into Tensors with their
+    original dtypes, so every stage and every run with the same key sees bit-identical inputs.
+    Returns (inputs, hit).
+    """
+    path = os.path.join(cache_dir, key)
+    meta_path = os.path.join(path, "meta.json")
+    hit = os.path.exists(meta_path)
+    if not hit:
+        save_forcal_data(path, build_fn(), info)
+
+    with open(meta_path, "r") as f:
+        meta = json.load(f)
+    tensors = [mindspore.Tensor(np.asarray(np.load(os.path.join(path, name), mmap_mode="r")))
+               for name in meta["files"]]
+    if meta["is_list"]:
+        return tensors, hit
+    return tensors[0], hit
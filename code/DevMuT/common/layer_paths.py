@@ -0,0 +1,55 @@
+def parse_layer_path(layer_name):
+    """
+    Steps from the model to the layer named `layer_name` (a cells_and_names / named_modules name): attribute
+    names, and ints for positions inside SequentialCell/Sequential/ModuleList containers.
+    """
+    return tuple(int(element) if element.isdigit() else element for element in layer_name.split("."))
+
+
+def _step(parent, element):
+    if isinstance(element, int):
+        return parent[element]
+    return getattr(parent, element)
+
+
+class LayerPathMixin:
+    """
+    get_layers/set_layers for the zoo models, shared by MindSpore Cells and PyTorch Modules.
+
+    The layers that can be replaced are the ones of the seed model (the keys of origin_layer_names, or
+    layer_names for models without it). Their paths are parsed once, so set_layers walks straight to the parent
+    container and assigns the slot; `layer_names`, `origin_layer_names` and the operator-eligibility index
+    (common/eligibility.py) are updated with the new layer.
+    """
+
+    def layer_paths(self):
+        paths = self.__dict__.get("_layer_paths")
+        if paths is None:
+            names = list(getattr(self, "origin_layer_names", {}).keys())
+            names += [name for name in self.layer_names.keys() if name not in names]
+            paths = {name: parse_layer_path(name) for name in names}
+            self.__dict__["_layer_paths"] = paths
+        return paths
+
+    def get_layers(self, layer_name):
+        if layer_name not in self.layer_names.keys():
+            return False
+        return self.layer_names[layer_name]
+
+    def set_layers(self, layer_name, new_layer):
+        path = self.layer_paths().get(layer_name)
+        if path is None:
+            return
+        parent = self
+        for element in path[:-1]:
+            parent = _step(parent, element)
+        if isinstance(path[-1], int):
+            parent[path[-1]] = new_layer
+        else:
+            setattr(parent, path[-1], new_layer)
+        self.layer_names[layer_name] = new_layer
+        if hasattr(self, "origin_layer_names"):
+            self.origin_layer_names[layer_name] = new_layer
+        eligibility = getattr(self, "eligibility", None)
+        if eligibility is not None:
+            eligibility.update(layer_name, new_layer)
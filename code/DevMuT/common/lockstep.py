@@ -0,0 +1,106 @@
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from common.mutation_journal import get_journal, replayable
+from common.mutation_torch.mutation_main_followlog import apply_record_torch, analyze_log_torch_followtrace
+
+
+class LockstepTwins:
+    """
+    PyTorch twins of the stage-1 MindSpore mutants.
+
+    Right after a MindSpore mutation is written to the mutation log, its journal record is applied to the twin of
+    the mutated parent, so the PyTorch side follows stage 1 generation by generation and the MindSpore/PyTorch
+    mutation results are compared at once (the check stage 2 used to replay every trace for). Twins of recent
+    mutants are kept by generation together with their trace; a twin that is not cached is rebuilt from its
+    nearest cached ancestor, or from the seed, by replaying the missing suffix of the trace.
+    """
+
+    def __init__(self, log_path, input_size, train_configs, capacity=8, mutate_logger=None):
+        self.log_path = log_path
+        self.input_size = input_size
+        self.train_configs = train_configs
+        self.capacity = capacity
+        self.mutate_logger = mutate_logger
+        self.seed = None
+        self.twins = OrderedDict()
+        self.inconsistency_traces = {}
+        self.generations = set()
+        self.applied = 0
+        self.replayed = 0
+        self.cost_time = 0.0
+
+    def set_seed(self, model):
+        self.seed = model
+
+    def covers(self, trace_list):
+        return all(generation in self.generations for traces in trace_list for generation in traces)
+
+    def put(self, generation, traces, model):
+        if self.capacity <= 0:
+            return
+        self.twins[generation] = (list(traces), model)
+        self.twins.move_to_end(generation)
+        while len(self.twins) > self.capacity:
+            self.twins.popitem(last=False)
+
+    def restore(self, traces):
+        """
+        PyTorch model of the mutant with the sorted execution trace `traces`.
+        """
+        traces = [val for val in traces if not val == "seed"]
+        idx, model = -1, None
+        for idx in range(len(traces) - 1, -1, -1):
+            entry = self.twins.get(traces[idx])
+            if entry is not None and entry[0] == list(traces[:idx + 1]):
+                self.twins.move_to_end(traces[idx])
+                model = deepcopy(entry[1])
+                break
+        if model is None:
+            idx, model = -1, deepcopy(self.seed)
+
+        suffix = list(traces[idx + 1:])
+        if len(suffix) == 0:
+            return model
+        self.replayed += len(suffix)
+        return analyze_log_torch_followtrace(suffix, model, self.log_path, self.input_size, self.train_configs)
+
+    def step(self, generation, parent_traces):
+        """
+        Apply the mutation of `generation` (made on the mutant with trace `parent_traces`) to the PyTorch twin.
+        Returns (MindSpore result, PyTorch result), or None when the generation has nothing to apply.
+        """
+        start_time = time.time()
+        self.generations.add(generation)
+        record = get_journal(self.log_path).get(generation)
+        if not replayable(record):
+            return None
+
+        model = self.restore(parent_traces)
+        ms_mut_result = record["success"]
+        pt_mut_result = apply_record_torch(model, record, self.input_size, self.train_configs)
+        self.applied += 1
+        if pt_mut_result is not None:
+            if ms_mut_result != pt_mut_result:
+                self.inconsistency_traces[str(generation)] = 'MindSpore: ' + str(ms_mut_result) + ', PyTorch: ' + \
+                                                             str(pt_mut_result)
+                if self.mutate_logger is not None:
+                    self.mutate_logger.error(f"For {generation} generation mutation model, the results of MindSpore "
+                                             f"and PyTorch are inconsistent, MindSpore: {ms_mut_result}, PyTorch: "
+                                             f"{pt_mut_result}")
+            elif ms_mut_result:
+                self.put(generation, list(parent_traces) + [generation], model)
+        self.cost_time += time.time() - start_time
+        return ms_mut_result, pt_mut_result
+
+    def export(self):
+        return {"inconsistency_traces": dict(self.inconsistency_traces), "generations": sorted(self.generations)}
+
+    def merge(self, exported):
+        self.inconsistency_traces.update(exported["inconsistency_traces"])
+        self.generations.update(exported["generations"])
+
+    def summary(self):
+        return "lockstep twins: {} generations, {} applied, {} inconsistent, {} cached, replayed:{}, " \
+               "time:{:.1f}s".format(len(self.generations), self.applied, len(self.inconsistency_traces),
+                                     len(self.twins), self.replayed, self.cost_time)
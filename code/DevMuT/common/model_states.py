@@ -0,0 +1,42 @@
+import weakref
+
+
+class ModelStates:
+    """
+    Which cached state (0 for the seed, otherwise a generation) each live model object is in.
+
+    The activation cache and the structural index only reuse a parent's per-layer outputs and digests for the
+    layers a mutation left alone, which is only sound when the model object is exactly that parent plus the one
+    mutation being scored. `mutated` records every in-place mutation as (previous state, generation), so a
+    second mutation, a replay or an untracked rebuild leaves the object without a usable parent and it is
+    processed in full.
+    """
+
+    def __init__(self):
+        # id(model) -> (weak reference to the model, state)
+        self.states = {}
+
+    def get(self, model):
+        entry = self.states.get(id(model))
+        if entry is None or entry[0]() is not model:
+            return None
+        return entry[1]
+
+    def set(self, model, state):
+        key = id(model)
+        self.states[key] = (weakref.ref(model, lambda ref: self.states.pop(key, None)), state)
+
+    def forget(self, model):
+        self.states.pop(id(model), None)
+
+    def mutated(self, model, generation):
+        """
+        Record that `model` is mutated in place as `generation`; call it before the operator runs.
+        """
+        self.set(model, (self.get(model), generation))
+
+    def derived(self, model, parent_key, generation):
+        """
+        Whether `model` is exactly the state `parent_key` plus the mutation of `generation`.
+        """
+        return parent_key is not None and self.get(model) == (parent_key, generation)
@@ -1,4 +1,6 @@
 import os
+import shutil
+import tempfile
 import numpy as np
 import json
 from copy import deepcopy
@@ -6,6 +8,10 @@ import torch
 import mindspore as ms
 import troubleshooter as ts
 import scipy.io as scio
+from common.profiler import profiled
+from common.topology import LayerTree, within, find_Cascade_OP, find_Child_leaf_OP
+from common.eligibility import EligibilityIndex
+from common.mutation_ms.OP_shape_utils import record_baseline
 
 if os.environ['CONTEXT_DEVICE_TARGET'] == 'GPU':
     device = os.environ['CUDA_VISIBLE_DEVICES'].split(",")[0]
@@ -14,22 +20,7 @@ else:
     device = "cpu"
 
 
-def find_Cascade_OP(layer_names):
-    Cascade_ops = []
-    for i in range(len(layer_names)):
-        if "_del" in layer_names[i] or "empty" in layer_names[i]:
-            continue
-        c1 = layer_names[i].split(".")
-        for j in range(i + 1, len(layer_names)):
-            if "_del" in layer_names[j] or "empty" in layer_names[i]:
-                continue
-            c2 = layer_names[j].split(".")
-            if layer_names[i] in layer_names[j] and len(c1) == len(c2) - 1:
-                Cascade_ops.append(layer_names[i])
-                break
-    return Cascade_ops
-
-
+@profiled(cat="build")
 def model_prepare(model, input_size):
     layer_names = deepcopy(list(model.layer_names.keys()))
     Cascade_OPs = find_Cascade_OP(layer_names)
@@ -93,8 +84,10 @@ def model_prepare(model, input_size):
     Cascade_OPs_inshapes, Cascade_OPs_outshapes = {}, {}
     remove_Cascade = []
 
+    layer_tree = LayerTree(model.layer_names.keys())
     for Cascade_OP in Cascade_OPs:
-        yezi_ops = find_Child_leaf_OP(model.layer_names, Cascade_OP, model.Basic_OPS, model.add_Cascade_OPs)
+        yezi_ops = find_Child_leaf_OP(model.layer_names, Cascade_OP, model.Basic_OPS, model.add_Cascade_OPs,
+                                      tree=layer_tree)
 
         bsize = model.in_shapes[list(model.in_shapes.keys())[0]][0]
         first_childs, final_childs, last_ops, next_ops, in_shape, out_shape = find_Cascade_OP_shape(model, bsize,
@@ -169,6 +162,8 @@ def model_prepare(model, input_size):
             model.out_shapes[shape_key][0] = int(model.out_shapes[shape_key][0] * bsize_mul)
 
     check_orderinfo_selfcorrect(model)
+    model.eligibility = EligibilityIndex(model, model.layer_names.keys())
+    record_baseline(model)
     return model
 
 
@@ -209,7 +204,7 @@ def find_Cascade_OP_shape(model, b_size, del_layer_name, yezi_ops):
         if isinstance(qianqu_info, list):
             for qianqu_info_single in qianqu_info:
                 flag_lastop = True
-                if not (del_layer_name in qianqu_info_single):
+                if not within(qianqu_info_single, del_layer_name):
                     flag_firstchild = False
                     flag_lastop = False
                     break
@@ -218,7 +213,7 @@ def find_Cascade_OP_shape(model, b_size, del_layer_name, yezi_ops):
                 last_ops.append(qianqu_info_single)
 
         else:
-            if del_layer_name not in qianqu_info:
+            if not within(qianqu_info, del_layer_name):
                 flag_firstchild = False
                 last_ops.append(qianqu_info)
 
@@ -237,7 +232,7 @@ def find_Cascade_OP_shape(model, b_size, del_layer_name, yezi_ops):
         if isinstance(houji_info, list):
             for houji_info_single in houji_info:
                 flag_nextop = True
-                if not (del_layer_name in houji_info_single):
+                if not within(houji_info_single, del_layer_name):
                     flag_finalchild = False
                     flag_nextop = False
 
@@ -245,7 +240,7 @@ def find_Cascade_OP_shape(model, b_size, del_layer_name, yezi_ops):
                 next_ops.append(houji_info_single)
 
         else:
-            if not (del_layer_name in houji_info):
+            if not within(houji_info, del_layer_name):
                 flag_finalchild = False
                 next_ops.append(houji_info)
 
@@ -271,21 +266,6 @@ def find_Cascade_OP_shape(model, b_size, del_layer_name, yezi_ops):
     return first_childs, final_childs, last_ops, next_ops, input_shapes, out_shapes
 
 
-def find_Child_leaf_OP(layer_names, del_layer_name, Basic_op_names, add_Cascade_OP_names):
-    yezi_ops = []
-    for layer_name in layer_names:
-        if "_del" in layer_name or "empty" in layer_name:
-            continue
-
-        flag = (del_layer_name + "." in layer_name) and not (del_layer_name == layer_name) and \
-               (layer_name in Basic_op_names or layer_name in add_Cascade_OP_names)
-
-        if flag:
-            yezi_ops.append(layer_name)
-
-    return yezi_ops
-
-
 def get_vgg16():
     from network.cv.vgg16.src.vgg import vgg16
     from network.cv.vgg16.vgg16_torch import vgg
@@ -342,7 +322,57 @@ def get_resnet50():
 
 
 
-def get_model(model_name, input_size=1, only_ms=False, scaned=True):
+# pytorch -> mindspore parameter name maps, built once per architecture
+weight_maps = {}
+
+
+def get_weight_map(model_name, model_pt, state_dict):
+    key = (model_name, tuple(state_dict.keys()))
+    if key not in weight_maps:
+        weight_maps[key] = ts.migrator.get_weight_map(pt_net=model_pt, print_map=False)
+    return weight_maps[key]
+
+
+@profiled(cat="weights")
+def transfer_weights_pt2ms(model_name, model_pt, model_ms, ckpt_path=None):
+    """
+    Copy the PyTorch weights into the MindSpore model through host NumPy buffers instead of a
+    map/pth/ckpt round-trip on disk. The checkpoint is only written when `ckpt_path` is given.
+    """
+    state_dict = model_pt.state_dict()
+    weight_map = get_weight_map(model_name, model_pt, state_dict)
+    if not all(isinstance(val, str) for val in weight_map.values()):
+        # entries with value transforms are left to troubleshooter's converter; its intermediate files go to a
+        # private directory, so concurrent transfers never overwrite each other's
+        save_dir = tempfile.mkdtemp(prefix="pt2ms_")
+        try:
+            map_path = os.path.join(save_dir, "torch_net_map.json")
+            pt_path = os.path.join(save_dir, "torch_net.path")
+            ms_path = ckpt_path if ckpt_path else os.path.join(save_dir, "convert_ms.ckpt")
+            with open(map_path, "w") as f:
+                json.dump(weight_map, f)
+            torch.save(state_dict, pt_path)
+            ts.migrator.convert_weight(weight_map_path=map_path, pt_file_path=pt_path, ms_file_save_path=ms_path,
+                                       print_conv_info=False, print_save_path=False)
+            ms.load_param_into_net(model_ms, ms.load_checkpoint(ms_path))
+        finally:
+            shutil.rmtree(save_dir, ignore_errors=True)
+        return
+
+    param_dict = {}
+    for pt_name, ms_name in weight_map.items():
+        if pt_name not in state_dict:
+            continue
+        # numpy() is a view of CPU tensors; the MindSpore tensor takes the single copy, so the two nets never alias
+        val = state_dict[pt_name].detach().cpu().numpy()
+        param_dict[ms_name] = ms.Parameter(ms.Tensor(val), name=ms_name)
+    ms.load_param_into_net(model_ms, param_dict)
+    if ckpt_path is not None:
+        ms.save_checkpoint(model_ms, ckpt_path)
+
+
+@profiled(cat="build")
+def get_model(model_name, input_size=1, only_ms=False, scaned=True, ckpt_path=None):
     models_dict = {
         'vgg16': get_vgg16,
         'resnet50': get_resnet50,
@@ -374,15 +404,6 @@ def get_model(model_name, input_size=1, only_ms=False, scaned=True):
     else:
         model_pt.to('cpu')
 
-    ts.migrator.get_weight_map(pt_net=model_pt,
-                               weight_map_save_path='./torch_net_map.json',
-                               print_map=False)
-    torch.save(model_pt.state_dict(), './torch_net.path')
-    ts.migrator.convert_weight(weight_map_path='./torch_net_map.json',
-                               pt_file_path='./torch_net.path',
-                               ms_file_save_path='./convert_ms.ckpt',
-                               print_conv_info=False, print_save_path=False)
-    param_dict = ms.load_checkpoint('./convert_ms.ckpt')
-    ms.load_param_into_net(model_ms, param_dict)
+    transfer_weights_pt2ms(model_name, model_pt, model_ms, ckpt_path=ckpt_path)
 
     return model_ms, model_pt
@@ -0,0 +1,174 @@
+from collections import OrderedDict
+from copy import deepcopy
+import mindspore
+import numpy as np
+from common.mutation_ms.model_mutation_operators_followlog import analyze_log_mindspore_followtrace
+
+
+class MutantEntry:
+    def __init__(self, generation, lineage, input_size, template, params):
+        self.generation = generation
+        self.lineage = lineage
+        self.input_size = input_size
+        self.template = template
+        self.params = params
+        # the template keeps its own copy of the parameters next to the host snapshot, both count
+        self.nbytes = sum(val.nbytes for val in params.values()) + \
+            sum(param.nbytes for _, param in template.parameters_and_names())
+
+
+class MutantCache:
+    """
+    Generation-keyed store of MindSpore mutants.
+
+    Every entry keeps a structural copy of the mutant (cells, orders, shapes, op lists) together with a host
+    snapshot of its parameters, so later in-place weight mutations on the live model never leak into the cache.
+    Entries are evicted in LRU order once either `capacity` or `max_bytes` (parameter bytes of the snapshot and
+    of the template) is exceeded.
+    """
+
+    def __init__(self, capacity=8, max_bytes=2 * 1024 ** 3):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.replayed = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, generation):
+        return generation in self.entries
+
+    def put(self, generation, lineage, model, input_size):
+        if self.capacity <= 0:
+            return
+        if generation in self.entries:
+            self.pop(generation)
+
+        params = {name: param.asnumpy().copy() for name, param in model.parameters_and_names()}
+        entry = MutantEntry(generation, list(lineage), tuple(input_size), deepcopy(model), params)
+        if entry.nbytes > self.max_bytes:
+            return
+
+        self.entries[generation] = entry
+        self.total_bytes += entry.nbytes
+        while len(self.entries) > self.capacity or self.total_bytes > self.max_bytes:
+            self.pop(next(iter(self.entries)))
+
+    def pop(self, generation):
+        entry = self.entries.pop(generation)
+        self.total_bytes -= entry.nbytes
+        return entry
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def get(self, generation):
+        if generation not in self.entries:
+            return None
+        self.entries.move_to_end(generation)
+        return self.materialize(self.entries[generation])
+
+    @staticmethod
+    def materialize(entry):
+        model = deepcopy(entry.template)
+        for name, param in model.parameters_and_names():
+            if name in entry.params:
+                param.set_data(mindspore.Tensor(entry.params[name], param.dtype))
+        return model
+
+    def nearest_ancestor(self, traces, input_size):
+        """
+        Return (index, entry) of the deepest cached generation in `traces` whose lineage is exactly the trace
+        prefix ending at it, or (-1, None) when nothing usable is cached.
+        """
+        input_size = tuple(input_size)
+        for idx in range(len(traces) - 1, -1, -1):
+            entry = self.entries.get(traces[idx])
+            if entry is None or entry.input_size != input_size:
+                continue
+            if entry.lineage == list(traces[:idx + 1]):
+                self.entries.move_to_end(traces[idx])
+                return idx, entry
+        return -1, None
+
+    def restore(self, traces, seed_fn, log_path, input_size, train_configs, states=None):
+        """
+        Rebuild the mutant described by the sorted execution trace `traces`.
+
+        Starts from the nearest cached ancestor and only replays the missing suffix of the trace against the
+        mutation log; falls back to `seed_fn()` plus a full replay on a miss. A model rebuilt without any replay
+        is an exact copy of the cached state, which is recorded in `states` (common/model_states.py).
+        """
+        traces = [val for val in traces if not val == "seed"]
+        idx, entry = self.nearest_ancestor(traces, input_size)
+        if entry is None:
+            self.misses += 1
+            model = seed_fn()
+        else:
+            self.hits += 1
+            model = self.materialize(entry)
+
+        suffix = deepcopy(traces[idx + 1:])
+        if len(suffix) == 0:
+            if states is not None:
+                states.set(model, 0 if entry is None else entry.generation)
+            return model
+        self.replayed += len(suffix)
+        return analyze_log_mindspore_followtrace(suffix, model, log_path, input_size, train_configs)
+
+    def summary(self):
+        return "mutant cache: {} entries, {:.1f}MB, hits:{}, misses:{}, replayed generations:{}".format(
+            len(self.entries), self.total_bytes / 1024 / 1024, self.hits, self.misses, self.replayed)
+
+
+class SeedPrototypes:
+    """
+    Prepared seed models by (model name, input size).
+
+    The first request builds the model (construction plus model_prepare's cascade-op scan) and keeps a
+    structural copy with a host snapshot of its parameters; later requests get a clone of that prototype instead
+    of a rebuild, so every seed of the run also carries the weights the seed outputs were computed with.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.entries = {}
+        self.builds = 0
+        self.clones = 0
+
+    def get(self, model_name, input_size, build_fn):
+        if not self.enabled:
+            self.builds += 1
+            return build_fn()
+        key = (model_name, tuple(input_size))
+        entry = self.entries.get(key)
+        if entry is None:
+            model = build_fn()
+            self.builds += 1
+            params = {name: np.ascontiguousarray(param.asnumpy()) for name, param in model.parameters_and_names()}
+            self.entries[key] = MutantEntry(0, [], tuple(input_size), deepcopy(model), params)
+            return model
+        self.clones += 1
+        return MutantCache.materialize(entry)
+
+    def summary(self):
+        return "seed prototypes: {} prepared, builds:{}, clones:{}".format(len(self.entries), self.builds,
+                                                                           self.clones)
+
+
+def get_lineage(help_info, mutant_name, seed_name):
+    """
+    Walk a child->father map (as kept by the MCMC and ddqn strategies) and return the sorted generation trace.
+    """
+    execution_traces = []
+    father_name = mutant_name
+    while not father_name == seed_name:
+        execution_traces.append(int(father_name.split("_")[-1]))
+        father_name = help_info[father_name]
+    execution_traces.sort()
+    return execution_traces
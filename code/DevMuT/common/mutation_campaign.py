@@ -0,0 +1,131 @@
+import os
+import time
+import random
+import multiprocessing
+from copy import deepcopy
+import numpy as np
+import mindspore
+import torch
+from common.mutation_journal import get_journal
+
+
+def split_generations(mutation_iterations, num_workers):
+    """
+    Disjoint [first, last] generation ranges, one per worker, covering 1..mutation_iterations.
+    """
+    num_workers = max(1, min(num_workers, mutation_iterations))
+    ranges = []
+    first_generation = 1
+    for worker_id in range(num_workers):
+        iterations = mutation_iterations // num_workers + (1 if worker_id < mutation_iterations % num_workers else 0)
+        ranges.append((first_generation, first_generation + iterations - 1))
+        first_generation += iterations
+    return ranges
+
+
+def run_worker(args, worker_id, first_generation, last_generation, seed):
+    """
+    Stage-1 mutation chain of one campaign worker, in its own process, with its own RNG seed, seed model and
+    mutation log / journal shard under <campaign log>/worker_<id>.
+    """
+    from mutation_test import NetworkGeneralization
+
+    random.seed(seed)
+    np.random.seed(seed)
+    mindspore.set_seed(seed)
+    torch.manual_seed(seed)
+
+    iterations = last_generation - first_generation + 1
+    args = deepcopy(args)
+    args.mutation_iterations = iterations
+    args.first_generation = first_generation
+    if args.selected_model_num:
+        args.selected_model_num = min(args.selected_model_num, iterations)
+    if not os.path.exists(args.mutation_log):
+        os.makedirs(args.mutation_log)
+
+    mutate = NetworkGeneralization(args=args)
+    start_time = time.time()
+    mutate.mindspore_mutation()
+    mutate.write_profile()
+    return {"worker_id": worker_id, "seed": seed, "first_generation": first_generation,
+            "last_generation": last_generation, "mut_log_path": mutate.mut_log_path,
+            "scores": list(mutate.first_scores), "traces": mutate.total_trace_record,
+            "pass_count": mutate.mindspore_pass_rate,
+            "lockstep": None if mutate.lockstep is None else mutate.lockstep.export(),
+            "time": time.time() - start_time}
+
+
+def merge_shards(mutate, results):
+    """
+    Append the records of the worker journal shards to the campaign journal (so one journal indexes every
+    generation), then rebuild the campaign-wide scores, traces and stage-1 selection on `mutate`.
+    """
+    results = sorted(results, key=lambda val: val["first_generation"])
+    journal = get_journal(mutate.mut_log_path)
+    for result in results:
+        shard = get_journal(result["mut_log_path"])
+        for record in shard.select(list(shard.index.keys())):
+            journal.append(record)
+
+    mutation_scores, mut_trace = [], {}
+    for result in results:
+        mutation_scores.extend(result["scores"])
+        mut_trace.update(result["traces"])
+    mutate.first_scores = mutation_scores
+    mutate.total_trace_record = mut_trace
+    mutate.mindspore_pass_rate = sum(result["pass_count"] for result in results)
+    for result in results:
+        if mutate.lockstep is not None and result["lockstep"] is not None:
+            # the twins stay in the workers, their mutation-time checks replace the stage-2 replay check
+            mutate.lockstep.merge(result["lockstep"])
+
+    f = open(mutate.mut_log_path, 'a+')
+    f.write("mutation trace: {}\n".format(mut_trace))
+    f.close()
+
+    first_select_generations = np.argsort(np.array(mutation_scores))[
+                               (len(mutation_scores) - mutate.selected_model_num):]
+    first_select_generations = list(map(str, first_select_generations + 1))
+    mutate.first_generation_tracedict = {gen: trace for gen, trace in mut_trace.items()
+                                         if gen in first_select_generations}
+    return mutate.first_generation_tracedict
+
+
+def run_campaign(mutate, args, num_workers):
+    """
+    Run stage 1 as `num_workers` independent mutation chains in a process pool and merge them into `mutate`,
+    which then continues with stage 2 (diff_calculate) as for a single chain.
+    """
+    ranges = split_generations(mutate.mutation_iterations, num_workers)
+    base_seed = int(getattr(args, 'campaign_seed', 0))
+    jobs = []
+    for worker_id, (first_generation, last_generation) in enumerate(ranges):
+        worker_args = deepcopy(args)
+        worker_args.mutation_log = mutate.log_path + "/worker_" + str(worker_id)
+        jobs.append((worker_args, worker_id, first_generation, last_generation, base_seed + worker_id))
+
+    start_time = time.time()
+    # spawn instead of fork: every worker needs a fresh MindSpore/PyTorch runtime
+    with multiprocessing.get_context("spawn").Pool(len(jobs)) as pool:
+        results = pool.starmap(run_worker, jobs)
+    cost_time = time.time() - start_time
+    merge_shards(mutate, results)
+
+    journal = get_journal(mutate.mut_log_path)
+    lines = []
+    for result in sorted(results, key=lambda val: val["worker_id"]):
+        lines.append("worker {}: seed:{}, generations:{}-{}, mutation success:{}, time:{:.1f}s".format(
+            result["worker_id"], result["seed"], result["first_generation"], result["last_generation"],
+            result["pass_count"], result["time"]))
+    lines.append("campaign: {} workers, {} generations, mutation success:{}, time:{:.1f}s "
+                 "(sum of worker time {:.1f}s)".format(len(results), len(journal), journal.success_count, cost_time,
+                                                       sum(result["time"] for result in results)))
+    lines.append("**** stage1 select generations: {} ****".format(sorted(
+        int(val) for val in mutate.first_generation_tracedict.keys())))
+    f = open(mutate.true_log_path, 'a+')
+    f.write("\n".join(lines) + "\n")
+    f.close()
+    for line in lines:
+        mutate.run_log.info(line)
+    return mutate.first_generation_tracedict
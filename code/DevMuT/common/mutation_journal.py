@@ -0,0 +1,423 @@
+import os
+import json
+import logging
+
+# mut_result messages that mean the operator never touched the model, so the generation is not replayed at all
+SKIP_RESULTS = {
+    "LD": ["not enough layers to delete!", "set layers failure", "No suitable ops for"],
+    "LS": ["suitable"],
+    "WS": ["suitable"], "NS": ["suitable"], "GF": ["suitable"], "NAI": ["suitable"], "NEB": ["suitable"],
+    "LA": ["No suitable ops for", "Create illegal layer", "set layers failure"],
+    "RA": ["No suitable ops for", "Create illegal layer", "set layers failure"],
+    "CM": ["No suitable ops for", "Create illegal layer", "set layers failure"],
+    "LC": ["No suitable ops for", "Create illegal layer", "set layers failure"],
+    "PM": ["Parameter Miss", "PM Create illegal layer", "set layers failure"],
+    "SM": ["Create illegal layer", "set layers failure", "No suitable ops for"],
+    "DM": ["Create illegal layer", "set layers failure", "No suitable ops for"],
+}
+DTYPE_NAMES = ["float16", "float32", "int32", "int16"]
+
+# arguments each operator records (with their defaults) and the ones a replayable record can not do without
+ARG_DEFAULTS = {
+    "LD": {"del_layer_name": None, "mutate_layer_indice": -1},
+    "LS": {"mut_layer_name1": None, "mut_layer_name2": None},
+    "PM": {"mutate_layer_name": None, "mutate_layer_indice": -1, "mutate_param_selname": None, "mut_value": None},
+    "SM": {"mut_layer_isBasic": None, "mut_layer_name": None, "mut_state": None, "input_shape_mut": None,
+           "output_shape_mut": None, "mutate_layer_indice": -1},
+    "DM": {"mut_layer_isBasic": None, "mut_layer_name": None, "newdtype": None, "mutate_layer_indice": -1},
+}
+for _operator in ["WS", "NS", "GF", "NAI", "NEB"]:
+    ARG_DEFAULTS[_operator] = {"mut_layer_name": "", "mutation_ratio": 0.4, "mutate_layer_indice": -1}
+for _operator in ["LA", "RA", "CM", "LC"]:
+    ARG_DEFAULTS[_operator] = {"mut_layer_isBasic": None, "mut_layer_name": None, "add_layer_type": None,
+                               "add_layer_info": None, "activation_name": None, "mutate_layer_indice": -1}
+REQUIRED_ARGS = {
+    "LD": ["del_layer_name"],
+    "LS": ["mut_layer_name1", "mut_layer_name2"],
+    "PM": ["mutate_layer_name", "mutate_param_selname", "mut_value"],
+    "SM": ["mut_layer_isBasic", "mut_layer_name", "mut_state"],
+    "DM": ["mut_layer_isBasic", "mut_layer_name", "newdtype"],
+    "LA": ["mut_layer_isBasic", "mut_layer_name", "add_layer_type", "add_layer_info"],
+    "RA": ["mut_layer_isBasic", "mut_layer_name", "add_layer_type", "add_layer_info"],
+    "LC": ["mut_layer_isBasic", "mut_layer_name", "add_layer_type", "add_layer_info"],
+    "CM": ["mut_layer_isBasic", "mut_layer_name", "add_layer_info"],
+}
+for _operator in ["WS", "NS", "GF", "NAI", "NEB"]:
+    REQUIRED_ARGS[_operator] = ["mut_layer_name"]
+
+
+class JournalRecordError(Exception):
+    pass
+
+
+def _plain(val):
+    # JSON-safe copy of an argument value: tuples become lists, NumPy scalars Python numbers
+    if isinstance(val, (list, tuple)):
+        return [_plain(item) for item in val]
+    if isinstance(val, str) or val is None:
+        return None if val is None else str(val)
+    if hasattr(val, "item"):
+        return val.item()
+    return val
+
+
+def dtype_name(dtype):
+    # name of a MindSpore/Torch dtype as the followlog replay rebuilds it, e.g. "float16"
+    dtype_str = str(dtype).lower()
+    for name in DTYPE_NAMES:
+        if name in dtype_str:
+            return name
+    return None
+
+
+def make_record(generation, operator, mut_result, args, log=None):
+    """
+    Journal record of one mutation from the operator's result and its recorded arguments. Arguments are only kept
+    for records that can be replayed; one missing a required argument keeps the reason in "error", and replaying
+    it raises JournalRecordError.
+    """
+    result = str(mut_result).strip()
+    if result.startswith("mut_result:"):
+        result = result[len("mut_result:"):]
+    record = {"generation": int(generation),
+              "operator": operator,
+              "result": result,
+              "success": mut_result is True or result == "True",
+              "skip": any(msg in result for msg in SKIP_RESULTS.get(operator, [])),
+              "args": None}
+    if log is not None:
+        record["log"] = list(log)
+    if not record["skip"]:
+        missing = [key for key in REQUIRED_ARGS.get(operator, []) if args.get(key) is None or args.get(key) == ""]
+        if len(missing) > 0:
+            record["error"] = "missing arguments: " + ",".join(missing)
+            logging.getLogger().error("The {} record of generation {} can not be replayed, {}".format(
+                operator, record["generation"], record["error"]))
+        else:
+            record["args"] = dict(args)
+    return record
+
+
+def render_text(record):
+    """
+    mutation.txt block of a record: the operator's log lines, closed by its result and generation lines.
+    """
+    text = "".join(record.get("log", ["Adopt {} mut_strategy!\n".format(record["operator"])]))
+    if "mut_result:" not in text:
+        text += "mut_result:{}\n".format(record["result"])
+    if "{} generation!".format(record["generation"]) not in text:
+        text += "{} generation!\n\n".format(record["generation"])
+    return text
+
+
+class MutationRecorder:
+    """
+    What a mutation operator writes instead of opening mutation.txt: `write` keeps its human-readable log lines,
+    `record` its structured arguments. MutationJournal.commit turns both into the generation's record once the
+    operator returned.
+    """
+
+    def __init__(self, generation, operator):
+        self.generation = generation
+        self.operator = operator
+        self.args = dict(ARG_DEFAULTS.get(operator, {}))
+        self.lines = []
+
+    def write(self, text):
+        self.lines.append(text)
+
+    def record(self, **args):
+        for key, val in args.items():
+            self.args[key] = _plain(val)
+
+    def close(self):
+        # the record is committed by the caller of the operator, whichever way the operator returned
+        pass
+
+
+def _parse_shape(line):
+    shape_str = line[line.index("[") + 1:line.index("]")].replace(" ", "")
+    return [int(val) for val in shape_str.split(",")]
+
+
+def _parse_value(m_value):
+    if "(" in m_value and ")" in m_value:
+        return [int(val) for val in m_value[1:-1].split(",") if val.strip()]
+    elif m_value in ("True", "False"):
+        return m_value == "True"
+    elif "." in m_value or "e" in m_value:
+        return float(m_value)
+    return int(m_value)
+
+
+def _parse_args(operator, lines):
+    if operator == "LD":
+        return {"del_layer_name": lines[1].split(":")[-1], "mutate_layer_indice": int(lines[2].split(":")[-1])}
+
+    elif operator == "LS":
+        return {"mut_layer_name1": lines[1].split(":")[-1], "mut_layer_name2": lines[2].split(":")[-1]}
+
+    elif operator in ["WS", "NS", "GF", "NAI", "NEB"]:
+        args = {"mut_layer_name": "", "mutation_ratio": 0.4, "mutate_layer_indice": -1}
+        for line in lines:
+            if "mutation_ratio" in line:
+                args["mutation_ratio"] = float(line.split(":")[1])
+            elif "mutlayers_indice" in line:
+                args["mutate_layer_indice"] = int(line.split(":")[-1])
+            elif "select layer" in line:
+                args["mut_layer_name"] = line.split(":")[-1]
+        return args
+
+    elif operator in ["LA", "RA", "CM", "LC"]:
+        args = {"mut_layer_isBasic": None, "mut_layer_name": None, "add_layer_type": None, "add_layer_info": None,
+                "activation_name": None, "mutate_layer_indice": -1}
+        for j, line in enumerate(lines):
+            if "select layer: " in line:
+                args["mut_layer_name"] = line[len("select layer: "):line.index(" layer_type:")]
+            elif "add Basic layer" in line:
+                args["add_layer_type"] = line[len("add Basic layer : "):]
+            elif "mut Basic type:" in line:
+                args["mut_layer_isBasic"] = line[len("mut Basic type: "):] == "True"
+            elif "mutlayers_indice" in line:
+                args["mutate_layer_indice"] = int(line.split(":")[-1])
+            elif "select insert layer: " in line:
+                args["add_layer_info"] = line[len("select insert layer: "):line.index("<")]
+                if args["add_layer_info"] == "dwpw_group":
+                    k = j
+                    while "dwpw_activation" not in lines[k]:
+                        k += 1
+                    args["activation_name"] = lines[k].split(": ")[1][:-2]
+        return args
+
+    elif operator == "PM":
+        args = {"mutate_layer_name": lines[2][11:lines[2].index(" layer_type")],
+                "mutate_layer_indice": -1,
+                "mutate_param_selname": lines[2][lines[2].index("selected param:") + len("selected param:"):
+                                                 lines[2].index(" input_shape:")],
+                "mut_value": None}
+        for line in lines:
+            if "Edit value:" in line:
+                args["mut_value"] = _parse_value(line[len("Edit value: "):line.index(" new_inshape")])
+            elif "mutlayers_indice:" in line:
+                args["mutate_layer_indice"] = int(line[line.index(":") + 1:])
+        if args["mut_value"] is None:
+            raise ValueError("PM record without edit value")
+        return args
+
+    elif operator == "SM":
+        args = {"mut_layer_isBasic": None, "mut_layer_name": None, "mut_state": None, "input_shape_mut": None,
+                "output_shape_mut": None, "mutate_layer_indice": -1}
+        for j, line in enumerate(lines):
+            if "select layer: " in line:
+                args["mut_layer_name"] = line[len("select layer: "):line.index(" layer_type:")]
+            elif "mutlayers_indice" in line:
+                args["mutate_layer_indice"] = int(line.split(":")[-1])
+            elif "mut Basic type:" in line:
+                args["mut_layer_isBasic"] = line[len("mut Basic type: "):] == "True"
+            elif "mutate state:" in line:
+                mutate_state = line[len("mutate state: "):]
+                if mutate_state == "all":
+                    args["input_shape_mut"] = _parse_shape(lines[j + 1])
+                    args["output_shape_mut"] = _parse_shape(lines[j + 2])
+                    args["mut_state"] = 2
+                elif mutate_state == "before":
+                    args["input_shape_mut"] = _parse_shape(lines[j + 1])
+                    args["mut_state"] = 0
+                elif mutate_state == "after":
+                    args["output_shape_mut"] = _parse_shape(lines[j + 1])
+                    args["mut_state"] = 1
+        return args
+
+    elif operator == "DM":
+        args = {"mut_layer_isBasic": None, "mut_layer_name": None, "newdtype": None, "mutate_layer_indice": -1}
+        for line in lines:
+            if "select layer: " in line:
+                args["mut_layer_name"] = line[len("select layer: "):line.index(" layer_type:")]
+            elif "mutlayers_indice" in line:
+                args["mutate_layer_indice"] = int(line.split(":")[-1])
+            elif "mut Basic type:" in line:
+                args["mut_layer_isBasic"] = line[len("mut Basic type: "):] == "True"
+            elif "in_dtype:" in line:
+                args["newdtype"] = dtype_name(line.split(":")[1])
+        return args
+
+    raise ValueError("unknown mutation operator {}".format(operator))
+
+
+def parse_mutation_block(lines):
+    """
+    Turn one generation block of a mutation.txt written before the journal existed ("Adopt X mut_strategy!" ...
+    "mut_result:..." / "N generation!") into a journal record. Operator arguments are only parsed for records that
+    can be replayed; a record whose arguments can not be parsed keeps the error in "error", and replaying it
+    raises JournalRecordError.
+    """
+    lines = [line.rstrip("\n") for line in lines]
+    operator = lines[0].split(" ")[1]
+    j = 0
+    while "mut_result" not in lines[j]:
+        j += 1
+    result_line = lines[j]
+    record = {"generation": int(lines[j + 1].split(" ")[0]),
+              "operator": operator,
+              "result": result_line[result_line.index("mut_result:") + len("mut_result:"):],
+              "success": result_line.split(":")[1] == "True",
+              "skip": any(msg in result_line for msg in SKIP_RESULTS.get(operator, [])),
+              "args": None}
+    if not record["skip"]:
+        try:
+            record["args"] = _parse_args(operator, lines[:j])
+        except (ValueError, IndexError) as e:
+            record["error"] = "{}: {}".format(e.__class__.__name__, str(e))
+            logging.getLogger().error("Can not parse the {} record of generation {}: {}".format(
+                operator, record["generation"], record["error"]))
+    return record
+
+
+def replayable(record):
+    """
+    Whether `record` has a mutation to apply. Raises JournalRecordError for a record without usable operator
+    arguments, so a replay never silently drops a mutation the original model went through.
+    """
+    if record is None or record["skip"]:
+        return False
+    if record.get("error") is not None:
+        raise JournalRecordError("generation {} ({}): {}".format(record["generation"], record["operator"],
+                                                                record["error"]))
+    return True
+
+
+class MutationJournal:
+    """
+    Append-only JSON Lines journal (mutation.jsonl) with one record per mutation generation, the source of truth
+    for replay.
+
+    Operators write to the MutationRecorder of their generation (`recorder`) instead of mutation.txt; `commit`
+    turns it into a record once the operator returned. mutation.txt is only a human-readable view rendered from
+    the records (`text_view`). A mutation.txt from before the journal existed is imported once by parsing its
+    blocks. A generation -> byte offset index lets replay seek straight to the records of an execution trace.
+    """
+
+    def __init__(self, text_path, text_view=True):
+        self.text_path = text_path
+        self.journal_path = os.path.join(os.path.dirname(text_path), "mutation.jsonl")
+        self.text_view = text_view
+        self.index = {}
+        self.journal_size = 0
+        self.op_counts = {}
+        self.success_count = 0
+        self.pending = None
+        self.sync()
+        if not os.path.exists(self.journal_path) and os.path.exists(self.text_path):
+            self.import_text()
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, generation):
+        return generation in self.index
+
+    def add_index(self, record, offset):
+        if record["generation"] not in self.index:
+            self.index[record["generation"]] = offset
+        counts = self.op_counts.setdefault(record["operator"], [0, 0])
+        counts[0] += 1
+        if record["success"]:
+            counts[1] += 1
+            self.success_count += 1
+
+    def sync(self):
+        """
+        Index the records appended to mutation.jsonl since the previous call (by another journal on the same file).
+        """
+        if not os.path.exists(self.journal_path) or os.path.getsize(self.journal_path) <= self.journal_size:
+            return 0
+        with open(self.journal_path, "rb") as f:
+            f.seek(self.journal_size)
+            lines = f.read().splitlines(keepends=True)
+        count = 0
+        for line in lines:
+            if not line.endswith(b"\n"):
+                break
+            self.add_index(json.loads(line), self.journal_size)
+            self.journal_size += len(line)
+            count += 1
+        return count
+
+    def append(self, record, text=True):
+        self.sync()
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with open(self.journal_path, "ab") as f:
+            f.write(line)
+        self.add_index(record, self.journal_size)
+        self.journal_size += len(line)
+        if text and self.text_view:
+            with open(self.text_path, "a") as f:
+                f.write(render_text(record))
+
+    def recorder(self, generation, operator):
+        self.pending = MutationRecorder(generation, operator)
+        return self.pending
+
+    def commit(self, mut_result):
+        """
+        Append the record of the pending recorder with the operator's result; returns it, or None.
+        """
+        recorder, self.pending = self.pending, None
+        if recorder is None:
+            return None
+        record = make_record(recorder.generation, recorder.operator, mut_result, recorder.args, recorder.lines)
+        self.append(record)
+        return record
+
+    def import_text(self):
+        with open(self.text_path, "rb") as f:
+            lines = f.read().splitlines(keepends=True)
+        k = 0
+        while k < len(lines):
+            if not (b"Adopt" in lines[k] and b"mut_strategy" in lines[k]):
+                k += 1
+                continue
+            j = k
+            while j < len(lines) and b"mut_result" not in lines[j]:
+                j += 1
+            if j + 1 >= len(lines) or not lines[j + 1].endswith(b"\n"):
+                break
+            if b"generation" in lines[j + 1]:
+                self.append(parse_mutation_block([line.decode("utf-8", "replace") for line in lines[k:j + 2]]),
+                            text=False)
+            k = j + 2
+
+    def get(self, generation):
+        if generation not in self.index:
+            return None
+        with open(self.journal_path, "rb") as f:
+            f.seek(self.index[generation])
+            return json.loads(f.readline())
+
+    def select(self, traces):
+        """
+        Records of the generations in `traces` in the order they were mutated; unknown generations are ignored.
+        """
+        offsets = sorted(self.index[val] for val in set(traces) if val in self.index)
+        records = []
+        if len(offsets) == 0:
+            return records
+        with open(self.journal_path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                records.append(json.loads(f.readline()))
+        return records
+
+
+journals = {}
+
+
+def get_journal(text_path):
+    """
+    Shared, up-to-date journal for a mutation.txt path.
+    """
+    key = os.path.abspath(text_path)
+    if key not in journals:
+        journals[key] = MutationJournal(text_path)
+    journals[key].sync()
+    return journals[key]
@@ -442,19 +442,23 @@ class BasicOPUtils:
         self.extension_ops['embedding'] = BasicOPUtils.available_embedding
 
     @staticmethod
-    def available_activations():
+    def activation_types():
         activations = {}
-        activations['relu'] = nn.ReLU()
-        activations['relu6'] = nn.ReLU6()
-        activations['tanh'] = nn.Tanh()
-        activations['sigmoid'] = nn.Sigmoid()
-        activations['leakyrelu'] = nn.LeakyReLU()
-        activations['elu'] = nn.ELU()
-        activations['gelu'] = nn.GELU()
-        activations['mish'] = nn.Mish()
-        activations['softmax'] = nn.Softmax()
+        activations['relu'] = nn.ReLU
+        activations['relu6'] = nn.ReLU6
+        activations['tanh'] = nn.Tanh
+        activations['sigmoid'] = nn.Sigmoid
+        activations['leakyrelu'] = nn.LeakyReLU
+        activations['elu'] = nn.ELU
+        activations['gelu'] = nn.GELU
+        activations['mish'] = nn.Mish
+        activations['softmax'] = nn.Softmax
         return activations
 
+    @staticmethod
+    def available_activations():
+        return {name: op_type() for name, op_type in BasicOPUtils.activation_types().items()}
+
     @staticmethod
     def copy_convs(**kwargs):
         in_channel, out_channel, kernel_size, stride, group, bias, name = kwargs['param1'], kwargs['param2'], kwargs['param3'], kwargs['param4'], kwargs['param5'], kwargs['param6'], kwargs['param7']
@@ -503,6 +507,20 @@ class BasicOPUtils:
             convs = np.random.permutation(convs)
             return convs
 
+    @staticmethod
+    def available_conv(in_channel, out_channel, kernel_size, stride, name, transpose=False):
+        """
+        The one conv (or transposed conv) of available_convs, for lazy candidates.
+        """
+        name = name.lower()
+        if "1d" in name:
+            op_type = nn.Conv1dTranspose if transpose else nn.Conv1d
+        elif "2d" in name:
+            op_type = nn.Conv2dTranspose if transpose else nn.Conv2d
+        else:
+            op_type = nn.Conv3dTranspose if transpose else nn.Conv3d
+        return op_type(in_channel, out_channel, kernel_size=kernel_size, stride=stride)
+
     @staticmethod
     def available_embedding(**kwargs):
         vocab_size, embedding_size, name = kwargs['param1'], kwargs['param2'], kwargs['param3']
@@ -593,6 +611,17 @@ class BasicOPUtils:
             pools = np.random.permutation(pools)
             return pools
 
+    @staticmethod
+    def available_pool_op(output_size, stride, name, max_pool=False):
+        """
+        The one pool of available_pool, for lazy candidates.
+        """
+        if "1d" in name.lower():
+            op_type = nn.MaxPool1d if max_pool else nn.AvgPool1d
+        else:
+            op_type = nn.MaxPool2d if max_pool else nn.AvgPool2d
+        return op_type(output_size, stride)
+
     @staticmethod
     def available_flatten():
         return nn.Flatten()
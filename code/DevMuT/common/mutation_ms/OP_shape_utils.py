@@ -0,0 +1,261 @@
+import math
+
+# layers whose output shape equals their input shape
+identity_ops = ["relu", "relu6", "tanh", "sigmoid", "leakyrelu", "elu", "gelu", "mish", "softmax", "logsoftmax",
+                "threshold", "dropout", "emptycell", "hswish", "hsigmoid", "softplus", "softsign"]
+conv_ops = ["conv1d", "conv2d", "conv3d", "conv1dtranspose", "conv2dtranspose", "conv3dtranspose"]
+
+legality_stats = {"static_pass": 0, "static_reject": 0, "forward": 0, "disagree": 0}
+
+
+class IllegalShape(Exception):
+    pass
+
+
+def _to_list(val, nd):
+    if isinstance(val, int):
+        return [val] * nd
+    val = list(val)
+    return val[-nd:]
+
+
+def _pads(padding, nd):
+    if isinstance(padding, int):
+        return [(padding, padding)] * nd
+    padding = list(padding)
+    if len(padding) == nd:
+        return [(val, val) for val in padding]
+    if len(padding) == 2 * nd:
+        return [(padding[2 * i], padding[2 * i + 1]) for i in range(nd)]
+    return None
+
+
+def _conv_outshape(layer, in_shape, nd, transpose):
+    if not len(in_shape) == nd + 2:
+        raise IllegalShape("{} expects {}D input, got {}".format(layer.__class__.__name__, nd + 2, in_shape))
+    if not in_shape[1] == layer.in_channels:
+        raise IllegalShape("{} expects {} channels, got {}".format(layer.__class__.__name__, layer.in_channels,
+                                                                   in_shape[1]))
+    if not str(getattr(layer, "data_format", "NCHW")).upper().startswith("NC"):
+        return None
+    kernel = _to_list(layer.kernel_size, nd)
+    stride = _to_list(layer.stride, nd)
+    dilation = _to_list(getattr(layer, "dilation", 1), nd)
+    pad_mode = str(getattr(layer, "pad_mode", "same")).lower()
+    pads = _pads(getattr(layer, "padding", 0), nd)
+    if pads is None:
+        return None
+
+    out_shape = [in_shape[0], layer.out_channels]
+    for i in range(nd):
+        size, k, s, d = in_shape[2 + i], kernel[i], stride[i], dilation[i]
+        if transpose:
+            if pad_mode == "same":
+                out = size * s
+            elif pad_mode == "valid":
+                out = (size - 1) * s + d * (k - 1) + 1
+            elif pad_mode == "pad":
+                out = (size - 1) * s - sum(pads[i]) + d * (k - 1) + 1
+            else:
+                return None
+        else:
+            if pad_mode == "same":
+                out = math.ceil(size / s)
+            elif pad_mode == "valid":
+                out = (size - d * (k - 1) - 1) // s + 1
+            elif pad_mode == "pad":
+                out = (size + sum(pads[i]) - d * (k - 1) - 1) // s + 1
+            else:
+                return None
+        if out <= 0:
+            raise IllegalShape("{} produces empty output from {}".format(layer.__class__.__name__, in_shape))
+        out_shape.append(out)
+    return out_shape
+
+
+def _pool_outshape(layer, in_shape, nd):
+    if not len(in_shape) == nd + 2:
+        return None
+    pad_mode = str(getattr(layer, "pad_mode", "valid")).lower()
+    if pad_mode not in ["same", "valid"]:
+        return None
+    kernel = _to_list(layer.kernel_size, nd)
+    stride = _to_list(layer.stride, nd)
+    out_shape = list(in_shape[:2])
+    for i in range(nd):
+        size = in_shape[2 + i]
+        out = math.ceil(size / stride[i]) if pad_mode == "same" else (size - kernel[i]) // stride[i] + 1
+        if out <= 0:
+            raise IllegalShape("{} produces empty output from {}".format(layer.__class__.__name__, in_shape))
+        out_shape.append(out)
+    return out_shape
+
+
+def _fold(layers, in_shape):
+    shape = in_shape
+    for layer in layers:
+        if layer is None:
+            return None
+        shape = infer_outshape(layer, shape)
+        if shape is None:
+            return None
+    return shape
+
+
+def infer_outshape(layer, in_shape):
+    """
+    Output shape of `layer` for an NC* input of shape `in_shape` (batch at dim 0), from the layer's attributes.
+    Returns None when there is no rule for the layer and raises IllegalShape when the input cannot be accepted.
+    """
+    layer_type = str(layer.__class__.__name__).lower()
+    in_shape = list(in_shape)
+
+    if layer_type in identity_ops:
+        return in_shape
+
+    elif layer_type == "replace_ms":
+        return list(layer.output_shape)
+
+    elif layer_type == "sequentialcell":
+        return _fold([layer[i] for i in range(len(layer))], in_shape)
+
+    elif layer_type in conv_ops:
+        return _conv_outshape(layer, in_shape, int(layer_type[4]), "transpose" in layer_type)
+
+    elif layer_type in ["batchnorm1d", "batchnorm2d", "batchnorm3d"]:
+        ranks = {"1d": [2, 3], "2d": [4], "3d": [5]}[layer_type[-2:]]
+        if len(in_shape) not in ranks or not in_shape[1] == layer.num_features:
+            raise IllegalShape("{} with {} features can not take {}".format(layer.__class__.__name__,
+                                                                            layer.num_features, in_shape))
+        return in_shape
+
+    elif layer_type == "dense":
+        if len(in_shape) < 2 or not in_shape[-1] == layer.in_channels:
+            raise IllegalShape("Dense expects {} input features, got {}".format(layer.in_channels, in_shape))
+        return in_shape[:-1] + [layer.out_channels]
+
+    elif layer_type == "flatten":
+        pro = 1
+        for val in in_shape[1:]:
+            pro *= val
+        return [in_shape[0], pro]
+
+    elif layer_type in ["maxpool1d", "avgpool1d", "maxpool2d", "avgpool2d"]:
+        return _pool_outshape(layer, in_shape, int(layer_type[-2]))
+
+    elif layer_type in ["adaptiveavgpool2d", "adaptivemaxpool2d"]:
+        if len(in_shape) not in [3, 4]:
+            raise IllegalShape("{} can not take {}".format(layer.__class__.__name__, in_shape))
+        output_size = _to_list(layer.output_size, 2)
+        return in_shape[:-2] + [in_shape[-2 + i] if output_size[i] is None else output_size[i] for i in range(2)]
+
+    elif layer_type in ["embedding", "embeddinglookup"]:
+        return in_shape + [layer.embedding_size]
+
+    elif layer_type == "convbnrelu":
+        return _fold([layer.conbnrelu_conv, layer.conbnrelu_bn, layer.conbnrelu_relu], in_shape)
+
+    elif layer_type == "downsample":
+        return _fold([layer.downsample_conv, layer.downsample_bn], in_shape)
+
+    elif layer_type == "dwpw_basic":
+        return _fold([layer.dwpw_conv, layer.dwpw_bn, getattr(layer, "dwpw_activation", None)], in_shape)
+
+    elif layer_type == "dwpw_group":
+        return _fold([layer.depthwise, layer.pointwise], in_shape)
+
+    elif layer_type == "pwdwpw_residualblock":
+        out_shape = _fold([layer.PDP_ResidualBlock_1, layer.PDP_ResidualBlock_2, layer.PDP_ResidualBlock_3],
+                          in_shape)
+        if out_shape is not None and not out_shape[1:] == in_shape[1:]:
+            raise IllegalShape("residual add of {} and {}".format(out_shape, in_shape))
+        return out_shape
+
+    elif layer_type == "cm_branchcell":
+        if infer_outshape(layer.branch1CM, in_shape) is None or infer_outshape(layer.branch2CM, in_shape) is None:
+            return None
+        return list(layer.out_shape)
+
+    return None
+
+
+def edge_shapes(model):
+    """
+    (producer, consumer) -> (producer out_shape, consumer in_shape) for every edge of `orders` whose ends both
+    have recorded shapes.
+    """
+    edges = {}
+    for layer_name, (_, next_ops) in model.orders.items():
+        if layer_name not in model.out_shapes:
+            continue
+        for next_op in next_ops if isinstance(next_ops, list) else [next_ops]:
+            if next_op in model.in_shapes:
+                edges[(layer_name, next_op)] = (tuple(model.out_shapes[layer_name]), tuple(model.in_shapes[next_op]))
+    return edges
+
+
+def param_dtypes(model):
+    params = model.get_parameters() if hasattr(model, "get_parameters") else model.parameters()
+    return sorted(set(str(param.dtype) for param in params))
+
+
+def record_baseline(model):
+    """
+    Remember the seed's edges and parameter dtypes. An edge whose shapes differ at its two ends goes through
+    functional glue (reshape, concat, add) the op rules do not model; static_legality only trusts such an edge
+    while its shapes are the ones recorded here.
+    """
+    model.edge_baseline = edge_shapes(model)
+    model.dtype_baseline = param_dtypes(model)
+
+
+def static_legality(model):
+    """
+    Check every leaf op (Basic_OPS and add_Cascade_OPs) against the in/out shapes recorded for its position, then
+    every edge of `orders` between two recorded ops: a producer's output must be its consumer's input, or, for
+    edges through functional glue (fan-in, reshape), both ends must still have the seed's shapes. Parameter dtypes
+    must also be the seed's. Only then is the forward pass known to be consistent; returns (True, ""),
+    (False, reason) or (None, names of the ops, edges or checks the rules do not cover).
+    """
+    unknown = []
+    for layer_name in list(model.Basic_OPS) + list(model.add_Cascade_OPs):
+        if layer_name not in model.in_shapes or layer_name not in model.out_shapes:
+            continue
+        in_shape, out_shape = model.in_shapes[layer_name], model.out_shapes[layer_name]
+        if not all(isinstance(val, int) for val in list(in_shape) + list(out_shape)):
+            unknown.append(layer_name)
+            continue
+        try:
+            new_outshape = infer_outshape(model.get_layers(layer_name), in_shape)
+        except IllegalShape as e:
+            return False, "{}: {}".format(layer_name, str(e))
+        except AttributeError:
+            new_outshape = None
+        if new_outshape is None:
+            unknown.append(layer_name)
+        elif not (len(new_outshape) == len(out_shape) and list(new_outshape[1:]) == list(out_shape[1:])):
+            return False, "{}: output {} does not match {}".format(layer_name, new_outshape, list(out_shape))
+
+    edge_baseline = getattr(model, "edge_baseline", None)
+    if edge_baseline is None:
+        unknown.append("edges")
+    else:
+        for edge, shapes in edge_shapes(model).items():
+            out_shape, in_shape = shapes
+            if len(out_shape) == len(in_shape) and out_shape[1:] == in_shape[1:]:
+                continue
+            if not edge_baseline.get(edge) == shapes:
+                unknown.append("->".join(edge))
+
+    if not param_dtypes(model) == getattr(model, "dtype_baseline", None):
+        unknown.append("dtypes")
+
+    if len(unknown) > 0:
+        return None, ",".join(unknown)
+    return True, ""
+
+
+def legality_summary():
+    return "legality check: static pass:{}, static reject:{}, forward:{}, static/forward disagree:{}".format(
+        legality_stats["static_pass"], legality_stats["static_reject"], legality_stats["forward"],
+        legality_stats["disagree"])
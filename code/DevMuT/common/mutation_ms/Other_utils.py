@@ -1,8 +1,13 @@
+import random
+from functools import partial
 from copy import deepcopy
 import mindspore
 from mindspore.rewrite import SymbolTree
 from common.mutation_ms.Layer_utils import *
 from common.mutation_ms.OP_parameter_mutate_utils import get_new_basicop, get_new_cascadeop
+from common.mutation_ms.OP_shape_utils import static_legality, legality_stats
+from common.profiler import profiled
+from common.topology import within, find_Cascade_OP, find_Child_leaf_OP
 
 
 def scan_same_inout(model, layer1_name, scan_layers):
@@ -39,22 +44,6 @@ def update_params(old_op, new_op):
     return new_op
 
 
-def find_Cascade_OP(layer_names):
-    Cascade_ops = []
-    for i in range(len(layer_names)):
-        if "_del" in layer_names[i] or "empty" in layer_names[i]:
-            continue
-        c1 = layer_names[i].split(".")
-        for j in range(i + 1, len(layer_names)):
-            if "_del" in layer_names[j] or "empty" in layer_names[i]:
-                continue
-            c2 = layer_names[j].split(".")
-            if layer_names[i] in layer_names[j] and len(c1) == len(c2) - 1:
-                Cascade_ops.append(layer_names[i])
-                break
-    return Cascade_ops
-
-
 def check_orderinfo_selfcorrect(model):
     orders = model.orders
     layer_names = list(orders.keys())
@@ -90,14 +79,14 @@ def find_Cascade_OP_shape(model, input_size, del_layer_name, yezi_ops):
         if isinstance(qianqu_info, list):
             for qianqu_info_single in qianqu_info:
                 flag1 = True
-                if not (del_layer_name in qianqu_info_single):
+                if not within(qianqu_info_single, del_layer_name):
                     flag = False
                     flag1 = False
 
                 if not flag1:
                     last_ops.append(qianqu_info_single)
         else:
-            if del_layer_name not in qianqu_info:
+            if not within(qianqu_info, del_layer_name):
                 flag = False
                 last_ops.append(qianqu_info)
 
@@ -111,13 +100,13 @@ def find_Cascade_OP_shape(model, input_size, del_layer_name, yezi_ops):
         if isinstance(houji_info, list):
             for houji_info_single in houji_info:
                 flag2 = True
-                if not (del_layer_name in houji_info_single):
+                if not within(houji_info_single, del_layer_name):
                     flag = False
                     flag2 = False
                 if not flag2:
                     next_ops.append(houji_info_single)
         else:
-            if not (del_layer_name in houji_info):
+            if not within(houji_info, del_layer_name):
                 flag = False
                 next_ops.append(houji_info)
 
@@ -137,20 +126,33 @@ def find_Cascade_OP_shape(model, input_size, del_layer_name, yezi_ops):
     return last_ops, next_ops, input_shapes, out_shapes
 
 
-def find_Child_leaf_OP(layer_names, del_layer_name, Basic_op_names, add_Cascade_OP_names):
-    yezi_ops = []
-    for layer_name in layer_names:
-        if "_del" in layer_name or "empty" in layer_name:
-            continue
-
-        flag = (del_layer_name in layer_name) and not (del_layer_name == layer_name) and \
-               (layer_name in Basic_op_names or layer_name in add_Cascade_OP_names)
-        if flag:
-            yezi_ops.append(layer_name)
-    return yezi_ops
+@profiled(cat="legality")
+def judge_legenacy(model, input_size, mutate_logger=None, train_configs=None):
+    # "static": shape rules decide once they cover every op, edge and dtype, forward pass otherwise; "confirm":
+    # static check plus the forward pass, logging disagreements; "forward": forward pass only
+    check_mode = train_configs.get("legality_check", "static")
+    if not check_mode == "forward":
+        static_result, static_info = static_legality(model)
+        if static_result is False and not check_mode == "confirm":
+            legality_stats["static_reject"] += 1
+            if mutate_logger is not None:
+                mutate_logger.info("Static shape check failed: " + static_info)
+            return False
+        if static_result is True and not check_mode == "confirm":
+            legality_stats["static_pass"] += 1
+            return True
+
+    legality_stats["forward"] += 1
+    forward_result = forward_legality(model, input_size, mutate_logger, train_configs)
+    if check_mode == "confirm" and static_result is not None and not static_result == forward_result:
+        legality_stats["disagree"] += 1
+        if mutate_logger is not None:
+            mutate_logger.warning("Static shape check ({}) disagrees with forward pass ({}) {}".format(
+                static_result, forward_result, static_info))
+    return forward_result
 
 
-def judge_legenacy(model, input_size, mutate_logger=None, train_configs=None):
+def forward_legality(model, input_size, mutate_logger=None, train_configs=None):
     batch_size = input_size[0]
     input_sizes = train_configs["input_size"]
     test_inputs = []
@@ -336,6 +338,112 @@ def del_Cascade_op_info(qianqu_houji_list, del_layer_name):
     return qianqu_houji_list
 
 
+class LazyOp:
+    """
+    A candidate insert layer that is only built when selected: the catalogue name plus the factory call.
+    """
+    __slots__ = ("name", "factory")
+
+    def __init__(self, name, factory, *args, **kwargs):
+        self.name = name
+        self.factory = partial(factory, *args, **kwargs)
+
+    def materialize(self):
+        return self.factory()
+
+    def __repr__(self):
+        return "LazyOp({})".format(self.name)
+
+
+def _insert_channels(in_shape, out_shape, mut_type):
+    if mut_type == "CM" or mut_type == "RA":
+        return deepcopy(in_shape), in_shape[1], out_shape[1]
+    return deepcopy(out_shape), out_shape[1], out_shape[1]
+
+
+def basicop_catalogue(in_shape, out_shape, mut_type):
+    """
+    Lazy counterpart of get_alternative_Basicops: the same candidates (both conv and both pool variants are
+    separate entries), none of them built yet.
+    """
+    insert_layer_inshape, insert_inchannels, insert_outchannels = _insert_channels(in_shape, out_shape, mut_type)
+    kernel_size, stride = 1, 1
+    dimension = "3D" if len(insert_layer_inshape) == 5 else "2D"
+
+    candidates = [LazyOp(name, op_type) for name, op_type in BasicOPUtils.activation_types().items()]
+    candidates.append(LazyOp("conv", BasicOPUtils.available_conv, insert_inchannels, insert_outchannels,
+                             kernel_size, stride, dimension))
+    candidates.append(LazyOp("convtranspose", BasicOPUtils.available_conv, insert_inchannels, insert_outchannels,
+                             kernel_size, stride, dimension, transpose=True))
+    if dimension == "2D":
+        candidates.append(LazyOp("avgpool", BasicOPUtils.available_pool_op, kernel_size, stride, dimension))
+        candidates.append(LazyOp("maxpool", BasicOPUtils.available_pool_op, kernel_size, stride, dimension,
+                                 max_pool=True))
+    candidates.append(LazyOp("batchnorm", BasicOPUtils.available_BN, param1=insert_inchannels, param2=dimension))
+    if dimension == "2D":
+        candidates.append(LazyOp("dense", lambda: BasicOPUtils.available_Dense(
+            param1=insert_inchannels, param2=insert_outchannels, param3=random.choice([True, False]))))
+    candidates.append(LazyOp("dropout", BasicOPUtils.available_Dropout, param1=0.5))
+    return candidates
+
+
+def cascadeop_catalogue(in_shape, out_shape, mut_type):
+    """
+    Lazy counterpart of get_alternative_Cascadeops, with the same key dispatch and shape conditions as
+    get_new_cascadeop.
+    """
+    _, insert_inchannels, insert_outchannels = _insert_channels(in_shape, out_shape, mut_type)
+    kernel_size, stride = 1, 1
+    activation = np.random.permutation(list(BasicOPUtils.activation_types().keys()))[0]
+
+    extension_ops = CascadeOPUtils().extension_ops
+    candidates = []
+    candidate = None
+    for mutate_layer_type in extension_ops.keys():
+        op_type = mutate_layer_type.lower()
+        if "convbnrelu" in op_type:
+            candidate = LazyOp("convbnrelu", extension_ops['convbnrelu'], insert_inchannels, insert_outchannels,
+                               kernel_size, stride)
+        elif "downsample" in op_type:
+            candidate = LazyOp("downsample", extension_ops['downsample'], insert_inchannels, insert_outchannels,
+                               kernel_size, stride)
+        elif "dwpw_group" in op_type and (
+                insert_inchannels % insert_outchannels == 0 and insert_inchannels <= insert_outchannels):
+            candidate = LazyOp("dwpw_group", extension_ops['dwpw_group'], insert_inchannels, insert_outchannels,
+                               kernel_size, stride, activation)
+        elif "se" in op_type:
+            candidate = LazyOp("se", extension_ops['se'])
+        elif "denselayer" in op_type:
+            candidate = LazyOp("denselayer", extension_ops['denselayer'], insert_inchannels, insert_outchannels)
+        elif "residualblock" in op_type and insert_outchannels // 4 > 0:
+            candidate = LazyOp("residualblock", extension_ops['residualblock'], insert_inchannels,
+                               insert_outchannels, kernel_size, stride, activation)
+        elif "pwdwpw_residualblock" in op_type and insert_outchannels // 4 > 0:
+            candidate = LazyOp("pwdwpw_residualblock", extension_ops['pwdwpw_residualblock'], insert_inchannels,
+                               insert_outchannels, kernel_size, stride, activation)
+        elif "inception" in op_type:
+            candidate = LazyOp("inception", extension_ops['inception'])
+        candidates.append(candidate)
+    return candidates
+
+
+def choose_alternative(candidates, exclude=()):
+    """
+    Pick one candidate uniformly, passing over the names in `exclude` unless nothing else is left.
+    """
+    allowed = [val for val in candidates if getattr(val, "name", None) not in exclude]
+    if len(allowed) == 0:
+        allowed = candidates
+    return allowed[np.random.randint(len(allowed))]
+
+
+def select_alternative_op(candidates):
+    """
+    Pick one candidate uniformly and build only that one.
+    """
+    return choose_alternative(candidates).materialize()
+
+
 def get_alternative_Basicops(in_shape, out_shape, mut_type):
     if mut_type == "CM" or mut_type == "RA":
         insert_layer_inshape = deepcopy(in_shape)
@@ -1,10 +1,28 @@
 import random
 from common.mutation_ms.model_mutation_operators import PM_mut, RA_mut, LD_mut, LA_mut, LC_mut, CM_mut, WS_mut, \
     NS_mut, GF_mut, NAI_mut, NEB_mut, LS_mut, SM_mut, DM_mut
+from common.mutation_journal import get_journal
+from common.eligibility import get_eligibility, structural_operators
 
 
 def generate_model_by_model_mutation(model, operator, input_size, mut_file_path, generations, mutate_logger,
                                      train_configs):
+    # the operator fills the journal recorder of this generation, its record is committed with the result
+    journal = get_journal(mut_file_path)
+    try:
+        mut_result = _apply_mutation(model, operator, input_size, mut_file_path, generations, mutate_logger,
+                                     train_configs)
+    except Exception as e:
+        journal.commit("{}: {}".format(e.__class__.__name__, str(e)))
+        raise
+    finally:
+        if operator in structural_operators:
+            get_eligibility(model).sync(model)
+    journal.commit(mut_result)
+    return mut_result
+
+
+def _apply_mutation(model, operator, input_size, mut_file_path, generations, mutate_logger, train_configs):
     layer_names = list(model.layer_names.keys())
     # Parameter mutation
     if operator == 'PM':
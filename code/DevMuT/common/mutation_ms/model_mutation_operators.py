@@ -4,10 +4,14 @@ import mindspore as ms
 import mindspore.nn as nn
 from common.mutation_ms.Layer_utils import *
 from common.mutation_ms.OP_parameter_mutate_utils import *
-from common.mutation_ms.OP_weight_utils import _shuffle_conv2d, _shuffle_conv3d, weighted_layer_indices, \
-    assert_indices, _shuffle_dense, generate_permutation
+from common.mutation_ms.OP_weight_utils import _shuffle_conv2d, _shuffle_conv3d, assert_indices, _shuffle_dense, \
+    generate_permutation
 from common.mutation_ms.Other_utils import *
+from common.mutation_ms.negative_cache import get_negative_cache
+from common.mutation_journal import get_journal, dtype_name
+from common.eligibility import get_eligibility
 import numpy as np
+from common.profiler import profiled
 
 basicop_copy_whitelist = ['AvgPool1d', 'MaxPool1d', 'AvgPool2d', 'MaxPool2d', 'BatchNorm1d', 'BatchNorm2d',
                           'BatchNorm3d', 'Conv2d', 'Conv2dTranspose', 'Conv1d', 'Conv1dTranspose', 'Conv3d',
@@ -18,8 +22,17 @@ basicop_copy_whitelist = ['AvgPool1d', 'MaxPool1d', 'AvgPool2d', 'MaxPool2d', 'B
 cascadeop_copy_whitelist = ['convbnrelu', 'downsample', 'dwpw_group', 'ResidualBlock']
 ms_dtypes = [mindspore.float32, mindspore.int32, mindspore.float16]
 
+
+def inserted_layer_args(insert_layer):
+    # journal arguments the followlog replay rebuilds an inserted layer from
+    add_layer_info = insert_layer.__class__.__name__
+    activation_name = insert_layer.activation if add_layer_info == "dwpw_group" else None
+    return {"add_layer_info": add_layer_info, "activation_name": activation_name}
+
+
+@profiled(cat="mutation")
 def PM_mut(model, input_size, mut_file_path="", generations=-1, mutate_logger="", train_configs=""):
-    f = open(mut_file_path, "a+")
+    f = get_journal(mut_file_path).recorder(generations, "PM")
     f.write("Adopt PM mut_strategy!\n")
     mutate_logger.info("Adopt PM mut_strategy!")
 
@@ -29,7 +42,7 @@ def PM_mut(model, input_size, mut_file_path="", generations=-1, mutate_logger=""
 
     candidate_ops = []
     add_Cascade_OPs_indices = {}
-    add_Cascade_OPs = deepcopy(model.add_Cascade_OPs)
+    add_Cascade_OPs = list(model.add_Cascade_OPs)
     for op in add_Cascade_OPs:
         op_layer = model.get_layers(op)
         if str(op_layer.__class__.__name__) in basicop_copy_whitelist:
@@ -50,7 +63,7 @@ def PM_mut(model, input_size, mut_file_path="", generations=-1, mutate_logger=""
                 candidate_ops.append(op)
                 add_Cascade_OPs_indices[op] = suitable_indices[0]
 
-    Basic_OPS = deepcopy(model.Basic_OPS)
+    Basic_OPS = list(model.Basic_OPS)
     for op in Basic_OPS:
         op_layer = model.get_layers(op)
         if hasattr(op_layer, mutate_param_selname):
@@ -73,9 +86,11 @@ def PM_mut(model, input_size, mut_file_path="", generations=-1, mutate_logger=""
     if "Sequential" in mutate_layer.__class__.__name__:
         mutate_layer_indice = add_Cascade_OPs_indices[mutate_layer_name]
         mutate_layer = mutate_layer[mutate_layer_indice]
+        f.record(mutate_layer_indice=mutate_layer_indice)
         f.write("candidate_in_mutlayers_indice:" + str(mutate_layer_indice) + "\n")
         mutate_logger.info("candidate_in_mutlayers_indice:" + str(mutate_layer_indice))
     else:
+        f.record(mutate_layer_indice=-1)
         f.write("candidate_in_mutlayers_indice:-1\n")
         mutate_logger.info("candidate_in_mutlayers_indice:-1")
 
@@ -85,6 +100,7 @@ def PM_mut(model, input_size, mut_file_path="", generations=-1, mutate_logger=""
 
     mutate_layer_type = mutate_layer.__class__.__name__
 
+    f.record(mutate_layer_name=mutate_layer_name, mutate_param_selname=mutate_param_selname)
     f.write("select op: " + str(mutate_layer_name) + " layer_type: " + str(
         mutate_layer_type) + " selected param:" + mutate_param_selname + " input_shape:" + str(
         mutate_layer_input_shape) + " output_shape:" + str(mutate_layer_output_shape) + "\n")
@@ -184,6 +200,7 @@ def PM_mut(model, input_size, mut_file_path="", generations=-1, mutate_logger=""
         mutate_logger.info("{} generation!\n".format(generations))
         return "PM Create illegal layer!"
 
+    f.record(mut_value=new_value)
     f.write("Edit value: " + str(new_value) + " new_inshape: " + str(test_input_data.shape) + " new_outshape: " + str(
         new_op_outshape) + "\n")
     mutate_logger.info(
@@ -235,14 +252,15 @@ def PM_mut(model, input_size, mut_file_path="", generations=-1, mutate_logger=""
     return mut_result
 
 
+@profiled(cat="mutation")
 def LD_mut(model, layer_names, input_size, del_layer_type="", mut_file_path="", generations=-1, mutate_logger="",
            train_configs=""):
-    f = open(mut_file_path, 'a+')
+    f = get_journal(mut_file_path).recorder(generations, "LD")
     f.write("Adopt LD mut_strategy!\n")
     mutate_logger.info("Adopt LD mut_strategy!")
 
-    Cascade_OPs = deepcopy(model.get_Cascade_OPs())
-    Basic_OPS = deepcopy(model.get_Basic_OPS())
+    Cascade_OPs = list(model.get_Cascade_OPs())
+    Basic_OPS = list(model.get_Basic_OPS())
     if len(layer_names) < 2:
         f.write("mut_result:" + "not enough layers to delete!" + "\n")
         f.write("{} generation!\n\n".format(generations))
@@ -251,9 +269,10 @@ def LD_mut(model, layer_names, input_size, del_layer_type="", mut_file_path="",
         return "not enough layers to delete!"
 
     if del_layer_type == "Basic_op":
-        yezi_ops = deepcopy(Basic_OPS + model.add_Cascade_OPs)
+        yezi_ops = Basic_OPS + model.add_Cascade_OPs
         del_layer_loction = random.randint(0, len(yezi_ops) - 1)
         del_layer_name = yezi_ops[del_layer_loction]
+        f.record(del_layer_name=del_layer_name)
         f.write("delete layer_name:" + del_layer_name + "\n")
         mutate_logger.info("delete layer_name:" + del_layer_name)
         if model.get_outshape(del_layer_name) is False:
@@ -285,6 +304,7 @@ def LD_mut(model, layer_names, input_size, del_layer_type="", mut_file_path="",
             idx = mutate_layer_indice
 
             mutate_logger.info("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
+            f.record(mutate_layer_indice=mutate_layer_indice)
             f.write("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
 
             while not "replace" in str(del_layer[idx].__class__.__name__).lower() and idx >= 0:
@@ -318,6 +338,7 @@ def LD_mut(model, layer_names, input_size, del_layer_type="", mut_file_path="",
 
         else:
             mutate_logger.info("candidate_in_mutlayers_indice:-1")
+            f.record(mutate_layer_indice=-1)
             f.write("candidate_in_mutlayers_indice:-1\n")
             if in_shape == out_shape:
                 replace_cell = EmptyCell()
@@ -411,6 +432,7 @@ def LD_mut(model, layer_names, input_size, del_layer_type="", mut_file_path="",
         if len(next_ops) == 1:
             next_ops = next_ops[0]
 
+        f.record(del_layer_name=del_layer_name)
         f.write("delete layer_name:" + del_layer_name + "\n")
         mutate_logger.info("delete layer_name:" + del_layer_name)
 
@@ -432,6 +454,7 @@ def LD_mut(model, layer_names, input_size, del_layer_type="", mut_file_path="",
             idx = mutate_layer_indice
 
             mutate_logger.info("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
+            f.record(mutate_layer_indice=mutate_layer_indice)
             f.write("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
 
             while not "replace" in str(del_layer[idx].__class__.__name__).lower() and idx >= 0:
@@ -464,6 +487,7 @@ def LD_mut(model, layer_names, input_size, del_layer_type="", mut_file_path="",
 
         else:
             mutate_logger.info("candidate_in_mutlayers_indice:-1")
+            f.record(mutate_layer_indice=-1)
             f.write("candidate_in_mutlayers_indice:-1\n")
             if in_shape == out_shape:
                 replace_cell = EmptyCell()
@@ -508,13 +532,16 @@ def LD_mut(model, layer_names, input_size, del_layer_type="", mut_file_path="",
     return test_result
 
 
+@profiled(cat="mutation")
 def LA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, generations, mut_layer_isBasic="",
            mutate_logger="", train_configs=""):
-    f = open(mut_file_path, 'a+')
+    f = get_journal(mut_file_path).recorder(generations, "LA")
+    negative_cache = get_negative_cache(mut_file_path)
     f.write("Adopt LA mut_strategy!\n")
     mutate_logger.info("Adopt LA mut_strategy!")
-    Cascade_OPs = deepcopy(model.get_Cascade_OPs())
-    Basic_OPS = deepcopy(model.get_Basic_OPS())
+    Cascade_OPs = list(model.get_Cascade_OPs())
+    Basic_OPS = list(model.get_Basic_OPS())
+    eligibility = get_eligibility(model)
 
     if add_layer_type == "":
         add_layer_type = random.choice(["Basic_op", "Cascade_op"])
@@ -530,13 +557,14 @@ def LA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
             mut_layer_isBasic = False
 
     if mut_layer_isBasic:
-        mut_layer_name = np.random.permutation(Basic_OPS + model.add_Cascade_OPs)[0]
+        mut_layer_name = negative_cache.pick_layer(model, "LA",
+                                                   eligibility.filter("LA", Basic_OPS + model.add_Cascade_OPs))
         in_shape = model.get_inshape(mut_layer_name)
         out_shape = model.get_outshape(mut_layer_name)
         topology_info = model.get_order(mut_layer_name)
         last_ops, next_ops = topology_info[0], topology_info[1]
     else:
-        mut_layer_name = np.random.permutation(Cascade_OPs)[0]
+        mut_layer_name = negative_cache.pick_layer(model, "LA", eligibility.filter("LA", Cascade_OPs))
         yezi_ops = find_Child_leaf_OP(layer_names, mut_layer_name, Basic_OPS, model.add_Cascade_OPs)
         last_ops, next_ops, _, _ = find_Cascade_OP_shape(model, input_size, mut_layer_name, yezi_ops)
         in_shape_list, out_shape_list = list(model.Cascade_OPs_inshapes[mut_layer_name]), list(
@@ -547,6 +575,7 @@ def LA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
     insert_layer_outshape = deepcopy(out_shape)
     op_in_shape, op_out_shape = deepcopy(out_shape), deepcopy(out_shape)
     mut_layer = model.get_layers(mut_layer_name)
+    negative_site = negative_cache.site(model, "LA", mut_layer_name)
 
     mutate_layer_indice = -1
     if "Sequential" in str(mut_layer.__class__.__name__):
@@ -555,6 +584,7 @@ def LA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
             if not "replace" in str(mut_layer[mutate_layer_indice].__class__.__name__).lower():
                 mutate_layer_indices.append(i)
         if len(mutate_layer_indices) == 0:
+            negative_cache.add(negative_site)
             f.write("mut_result:No suitable ops for LA mutation!\n")
             f.write("{} generation!\n\n".format(generations))
             mutate_logger.info("mut_result:No suitable ops for LA mutation!")
@@ -580,6 +610,7 @@ def LA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
             raise RuntimeError("mutation_ratio or index are wrong")
 
         mutate_logger.info("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
+        f.record(mutate_layer_indice=mutate_layer_indice)
         f.write("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
 
         insert_layer_outshape = deepcopy(out_shape)  # mut_layer[mutate_layer_indice](temp_data).shape
@@ -588,11 +619,15 @@ def LA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
 
     else:
         mutate_logger.info("candidate_in_mutlayers_indice:-1")
+        f.record(mutate_layer_indice=-1)
         f.write("candidate_in_mutlayers_indice:-1\n")
 
+    f.record(mut_layer_name=mut_layer_name)
     f.write("select layer: " + mut_layer_name + " layer_type: " + str(mut_layer.__class__) + " " + "in_shape: " + str(
         in_shape) + " out_shape: " + str(out_shape) + "\n")
+    f.record(mut_layer_isBasic=mut_layer_isBasic)
     f.write("mut Basic type: " + str(mut_layer_isBasic) + "\n")
+    f.record(add_layer_type=add_layer_type)
     f.write("add Basic layer : " + str(add_layer_type) + "\n")
     mutate_logger.info(
         "select layer: " + mut_layer_name + " layer_type: " + str(mut_layer.__class__) + " " + "in_shape: " + str(
@@ -602,15 +637,17 @@ def LA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
 
     alternative_insert_layers = []
     if add_layer_type == "Basic_op":
-        alternative_insert_layers = get_alternative_Basicops(op_in_shape, op_out_shape, "LA")
+        alternative_insert_layers = basicop_catalogue(op_in_shape, op_out_shape, "LA")
     elif add_layer_type == "Cascade_op":
-        alternative_insert_layers = get_alternative_Cascadeops(op_in_shape, op_out_shape, "LA")
+        alternative_insert_layers = cascadeop_catalogue(op_in_shape, op_out_shape, "LA")
 
-    alternative_insert_layers = np.random.permutation(alternative_insert_layers)
-    insert_layer = alternative_insert_layers[0]
+    insert_candidate = choose_alternative(alternative_insert_layers,
+                                          negative_cache.excluded(negative_site, alternative_insert_layers))
+    insert_layer = insert_candidate.materialize()
 
     lubrication_op = get_lubrication_op(insert_layer_inshape, insert_layer, input_size)
 
+    f.record(**inserted_layer_args(insert_layer))
     f.write("select insert layer: " + str(insert_layer) + "\n")
     mutate_logger.info("select insert layer: " + str(insert_layer))
 
@@ -664,6 +701,7 @@ def LA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
             break
 
     if not tcflag:
+        negative_cache.add(negative_site, insert_candidate.name)
         f.write("Illegal LA mutate!\n")
         f.write(error_info + "\n")
         f.write("mut_result:{}\n".format("LA Create illegal layer!"))
@@ -678,9 +716,12 @@ def LA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
 
     set_result = set_layer(model, insert_layer, mut_layer_name, f, "LA", generations, mutate_logger)
     if set_result is not True:
+        negative_cache.add(negative_site)
         return set_result
 
     test_result = judge_legenacy(model, input_size, mutate_logger, train_configs)
+    if test_result is False:
+        negative_cache.add(negative_site, insert_candidate.name)
 
     # update information
     if mutate_layer_indice == -1:
@@ -748,14 +789,17 @@ def LA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
     return test_result
 
 
+@profiled(cat="mutation")
 def RA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, generations, mut_layer_isBasic="",
            mutate_logger="", train_configs=""):
-    f = open(mut_file_path, 'a+')
+    f = get_journal(mut_file_path).recorder(generations, "RA")
+    negative_cache = get_negative_cache(mut_file_path)
     f.write("Adopt RA mut_strategy!\n")
     mutate_logger.info("Adopt RA mut_strategy!")
 
-    Cascade_OPs = deepcopy(model.get_Cascade_OPs())
-    Basic_OPS = deepcopy(model.get_Basic_OPS())
+    Cascade_OPs = list(model.get_Cascade_OPs())
+    Basic_OPS = list(model.get_Basic_OPS())
+    eligibility = get_eligibility(model)
     if add_layer_type == "":
         add_layer_type = random.choice(["Basic_op", "Cascade_op"])
 
@@ -771,12 +815,12 @@ def RA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
             mut_layer_isBasic = False
 
     if mut_layer_isBasic:
-        canditidate_select_ops = Basic_OPS + deepcopy(model.add_Cascade_OPs)
-        mut_layer_name = np.random.permutation(canditidate_select_ops)[0]
+        canditidate_select_ops = Basic_OPS + list(model.add_Cascade_OPs)
+        mut_layer_name = negative_cache.pick_layer(model, "RA", eligibility.filter("RA", canditidate_select_ops))
         in_shape = model.get_inshape(mut_layer_name)
         out_shape = model.get_outshape(mut_layer_name)
     else:
-        mut_layer_name = np.random.permutation(Cascade_OPs)[0]
+        mut_layer_name = negative_cache.pick_layer(model, "RA", eligibility.filter("RA", Cascade_OPs))
         yezi_ops = find_Child_leaf_OP(layer_names, mut_layer_name, Basic_OPS, model.add_Cascade_OPs)
 
         last_ops, next_ops, _, _ = find_Cascade_OP_shape(model, input_size, mut_layer_name, yezi_ops)
@@ -793,6 +837,7 @@ def RA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
     insert_layer_outshape = deepcopy(out_shape)
     op_in_shape, op_out_shape = deepcopy(in_shape), deepcopy(out_shape)
     mut_layer = model.get_layers(mut_layer_name)
+    negative_site = negative_cache.site(model, "RA", mut_layer_name)
 
     mutate_layer_indice = -1
     if "Sequential" in str(mut_layer.__class__.__name__):
@@ -801,6 +846,7 @@ def RA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
             if not "replace" in str(mut_layer[mutate_layer_indice].__class__.__name__).lower():
                 mutate_layer_indices.append(i)
         if len(mutate_layer_indices) == 0:
+            negative_cache.add(negative_site)
             f.write("mut_result:No suitable ops for RA mutation!\n")
             f.write("{} generation!\n\n".format(generations))
             mutate_logger.info("mut_result:No suitable ops for RA mutation!")
@@ -815,6 +861,7 @@ def RA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
 
         idx = mutate_layer_indice
         mutate_logger.info("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
+        f.record(mutate_layer_indice=mutate_layer_indice)
         f.write("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
 
         while not "replace" in str(mut_layer[idx].__class__.__name__).lower() and idx >= 0:
@@ -847,11 +894,15 @@ def RA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
 
     else:
         mutate_logger.info("candidate_in_mutlayers_indice:-1")
+        f.record(mutate_layer_indice=-1)
         f.write("candidate_in_mutlayers_indice:-1\n")
 
+    f.record(mut_layer_name=mut_layer_name)
     f.write("select layer: " + mut_layer_name + " layer_type: " + str(mut_layer.__class__) + " " + "in_shape: " + str(
         in_shape) + " out_shape: " + str(out_shape) + "\n")
+    f.record(mut_layer_isBasic=mut_layer_isBasic)
     f.write("mut Basic type: " + str(mut_layer_isBasic) + "\n")
+    f.record(add_layer_type=add_layer_type)
     f.write("add Basic layer : " + str(add_layer_type) + "\n")
     mutate_logger.info(
         "select layer: " + mut_layer_name + " layer_type: " + str(mut_layer.__class__) + " " + "in_shape: " + str(
@@ -860,15 +911,17 @@ def RA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
     mutate_logger.info("add Basic layer : " + str(add_layer_type))
 
     if add_layer_type == "Basic_op":
-        alternative_insert_layers = get_alternative_Basicops(op_in_shape, op_out_shape, "RA")
+        alternative_insert_layers = basicop_catalogue(op_in_shape, op_out_shape, "RA")
     elif add_layer_type == "Cascade_op":
-        alternative_insert_layers = get_alternative_Cascadeops(op_in_shape, op_out_shape, "RA")
+        alternative_insert_layers = cascadeop_catalogue(op_in_shape, op_out_shape, "RA")
 
-    alternative_insert_layers = np.random.permutation(alternative_insert_layers)
-    insert_layer = alternative_insert_layers[0]
+    insert_candidate = choose_alternative(alternative_insert_layers,
+                                          negative_cache.excluded(negative_site, alternative_insert_layers))
+    insert_layer = insert_candidate.materialize()
 
     lubrication_op = get_lubrication_op(insert_layer_inshape, insert_layer, input_size)
 
+    f.record(**inserted_layer_args(insert_layer))
     f.write("select insert layer: " + str(insert_layer) + "\n")
     mutate_logger.info("select insert layer: " + str(insert_layer))
 
@@ -896,6 +949,7 @@ def RA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
                 break
 
         if not tcflag:
+            negative_cache.add(negative_site, insert_candidate.name)
             f.write("Illegal RA mutate!\n")
             f.write(error_info + "\n")
             f.write("mut_result:{}\n".format("RA Create illegal layer!"))
@@ -962,6 +1016,7 @@ def RA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
             break
 
     if not tcflag:
+        negative_cache.add(negative_site, insert_candidate.name)
         f.write("Illegal RA mutate!\n")
         f.write(error_info + "\n")
         f.write("mut_result:{}\n".format("RA Create illegal layer!"))
@@ -975,9 +1030,12 @@ def RA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
 
     set_result = set_layer(model, final_insert_layer, mut_layer_name, f, "RA", generations, mutate_logger)
     if set_result is not True:
+        negative_cache.add(negative_site)
         return set_result
 
     test_result = judge_legenacy(model, input_size, mutate_logger, train_configs)
+    if test_result is False:
+        negative_cache.add(negative_site, insert_candidate.name)
 
     # update information
     if mutate_layer_indice == 1:
@@ -1063,14 +1121,17 @@ def RA_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
     return test_result
 
 
+@profiled(cat="mutation")
 def CM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer_isBasic="", mutate_logger="",
            train_configs=""):
-    f = open(mut_file_path, 'a+')
+    f = get_journal(mut_file_path).recorder(generations, "CM")
+    negative_cache = get_negative_cache(mut_file_path)
     f.write("Adopt CM mut_strategy!\n")
     mutate_logger.info("Adopt CM mut_strategy!")
 
-    Cascade_OPs = deepcopy(model.get_Cascade_OPs())
-    Basic_OPS = deepcopy(model.get_Basic_OPS())
+    Cascade_OPs = list(model.get_Cascade_OPs())
+    Basic_OPS = list(model.get_Basic_OPS())
+    eligibility = get_eligibility(model)
 
     if mut_layer_isBasic == "":
         mut_layer_isBasic = np.random.permutation([True, False])[0]
@@ -1084,11 +1145,12 @@ def CM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
             mut_layer_isBasic = False
 
     if mut_layer_isBasic:
-        mut_layer_name = np.random.permutation(Basic_OPS + model.add_Cascade_OPs)[0]
+        mut_layer_name = negative_cache.pick_layer(model, "CM",
+                                                   eligibility.filter("CM", Basic_OPS + model.add_Cascade_OPs))
         in_shape = model.get_inshape(mut_layer_name)
         out_shape = model.get_outshape(mut_layer_name)
     else:
-        mut_layer_name = np.random.permutation(Cascade_OPs)[0]
+        mut_layer_name = negative_cache.pick_layer(model, "CM", eligibility.filter("CM", Cascade_OPs))
         yezi_ops = find_Child_leaf_OP(layer_names, mut_layer_name, Basic_OPS, model.add_Cascade_OPs)
 
         last_ops, next_ops, _, _ = find_Cascade_OP_shape(model, input_size, mut_layer_name, yezi_ops)
@@ -1101,6 +1163,7 @@ def CM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
             next_ops = next_ops[0]
 
     mut_layer = model.get_layers(mut_layer_name)
+    negative_site = negative_cache.site(model, "CM", mut_layer_name)
     op_in_shape, op_out_shape = deepcopy(in_shape), deepcopy(out_shape)
 
     mutate_layer_indice = -1
@@ -1111,6 +1174,7 @@ def CM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
                 mutate_layer_indices.append(i)
 
         if len(mutate_layer_indices) == 0:
+            negative_cache.add(negative_site)
             f.write("mut_result:No suitable ops for CM mutation!\n")
             f.write("{} generation!\n\n".format(generations))
             mutate_logger.info("mut_result:No suitable ops for CM mutation!")
@@ -1147,14 +1211,18 @@ def CM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
         insert_layer_outshape = deepcopy(out_shape)  # mut_layer[mutate_layer_indice](temp_data).shape
         op_in_shape, op_out_shape = deepcopy(insert_layer_inshape), deepcopy(insert_layer_outshape)
         mutate_logger.info("candidate_in_mutlayers_indice:{}".format(mutate_layer_indice))
+        f.record(mutate_layer_indice=mutate_layer_indice)
         f.write("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
 
     else:
         mutate_logger.info("candidate_in_mutlayers_indice:-1")
+        f.record(mutate_layer_indice=-1)
         f.write("candidate_in_mutlayers_indice:-1\n")
 
+    f.record(mut_layer_name=mut_layer_name)
     f.write("select layer: " + mut_layer_name + " layer_type: " + str(mut_layer.__class__) + " " + "in_shape: " + str(
         in_shape) + " out_shape: " + str(out_shape) + "\n")
+    f.record(mut_layer_isBasic=mut_layer_isBasic)
     f.write("mut Basic type: " + str(mut_layer_isBasic) + "\n")
 
     mutate_logger.info(
@@ -1162,11 +1230,12 @@ def CM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
             in_shape) + " out_shape: " + str(out_shape))
     mutate_logger.info("mut Basic type: " + str(mut_layer_isBasic))
 
-    alternative_insert_layers = get_alternative_Cascadeops(op_in_shape, op_out_shape, "CM") + get_alternative_Basicops(
+    alternative_insert_layers = cascadeop_catalogue(op_in_shape, op_out_shape, "CM") + basicop_catalogue(
         op_in_shape, op_out_shape, "CM")
 
-    idxs = np.random.permutation([i for i in range(len(alternative_insert_layers))])
-    insert_layer_candidate = alternative_insert_layers[idxs[0]]
+    insert_candidate = choose_alternative(alternative_insert_layers,
+                                          negative_cache.excluded(negative_site, alternative_insert_layers))
+    insert_layer_candidate = insert_candidate.materialize()
 
     lubrication_op = get_lubrication_op(in_shape, insert_layer_candidate, input_size)
 
@@ -1187,6 +1256,7 @@ def CM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
                 break
 
         if not tcflag:
+            negative_cache.add(negative_site, insert_candidate.name)
             f.write("Illegal CM mutate!\n")
             f.write(error_info + "\n")
             f.write("mut_result:{}\n".format("CM Create illegal layer!"))
@@ -1202,6 +1272,7 @@ def CM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
     else:
         insert_layer = insert_layer_candidate
 
+    f.record(**inserted_layer_args(insert_layer_candidate))
     f.write("select insert layer: " + str(insert_layer_candidate) + "\n")
     mutate_logger.info("select insert layer: " + str(insert_layer_candidate))
 
@@ -1224,6 +1295,7 @@ def CM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
             break
 
     if not tcflag:
+        negative_cache.add(negative_site, insert_candidate.name)
         f.write("Illegal CM mutate!\n")
         f.write(error_info + "\n")
         f.write("mut_result:{}\n".format("CM Create illegal layer!"))
@@ -1242,6 +1314,7 @@ def CM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
         set_result = set_layer(model, mut_layer, mut_layer_name, f, "CM", generations, mutate_logger)
 
     if set_result is not True:
+        negative_cache.add(negative_site)
         return set_result
 
     # update information
@@ -1296,6 +1369,8 @@ def CM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
     model.set_Cascade_OPS(Cascade_OPs)
 
     test_result = judge_legenacy(model, input_size, mutate_logger, train_configs)
+    if test_result is False:
+        negative_cache.add(negative_site, insert_candidate.name)
 
     f.write("mut_result:{}\n".format(str(test_result)))
     f.write("{} generation!\n\n".format(generations))
@@ -1305,66 +1380,41 @@ def CM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
     return test_result
 
 
+@profiled(cat="mutation")
 def WS_mut(model, layer_names, input_size, mut_file_path, generations, mutate_logger="", mutation_ratio=0.4,
            train_configs=""):
-    f = open(mut_file_path, 'a+')
+    f = get_journal(mut_file_path).recorder(generations, "WS")
+    negative_cache = get_negative_cache(mut_file_path)
     f.write("Adopt WS mut_strategy!\n")
     mutate_logger.info("Adopt WS mut_strategy!")
 
-    candidate_layer_names = model.add_Cascade_OPs + model.Basic_OPS
-    mutated_layer_indices = weighted_layer_indices(model, candidate_layer_names)
-    depth_layer = len(candidate_layer_names)
-    mutated_layer_indices = np.arange(depth_layer) if mutated_layer_indices is None else mutated_layer_indices
+    eligibility = get_eligibility(model)
 
-    mutate_layer_indice = -1
     execution_flag = False
     if 0 < mutation_ratio <= 1.0:
-        assert_indices(mutated_layer_indices, depth_layer)
-        layer_name = ""
-        search_times = 0
-        while search_times <= depth_layer:
-            mutated_layer_indices = np.random.permutation(mutated_layer_indices)
-            sel_mut_layer_name_idx = mutated_layer_indices[0]
-
-            mut_layer_name = candidate_layer_names[sel_mut_layer_name_idx]
-            layer = model.get_layers(mut_layer_name)
-
-            layer_name = type(layer).__name__
-            search_times += 1
-            if ("conv" in layer_name.lower() or "dense" in layer_name.lower()):
+        # one draw among the weighted conv/dense candidates, redrawn (a few times) over known failures
+        mut_layer_name = None
+        for _ in range(4):
+            mut_layer_name = eligibility.draw("WS")
+            if mut_layer_name is None:
                 break
+            negative_site = negative_cache.site(model, "WS", mut_layer_name)
+            if not negative_cache.known(negative_site):
+                break
+            negative_cache.avoided += 1
 
-            if "sequential" in str(layer.__class__.__name__):
-                mutate_layer_indices = []
-                for i in range(len(layer)):
-                    layeri_type = str(layer[i].__class__.__name__).lower()
-                    if ("conv" in layeri_type or "dense" in layeri_type):
-                        mutate_layer_indices.append(i)
-
-                if len(mutate_layer_indices) == 0:
-                    f.write("mut_result:No suitable ops for WS mutation!\n")
-                    f.write("{} generation!\n\n".format(generations))
-                    mutate_logger.info("mut_result:No suitable ops for WS mutation!")
-                    mutate_logger.info("{} generation!".format(generations))
-                    return "mut_result:No suitable ops for WS mutation!"
-
-                mutate_layer_indice = int(np.random.permutation(mutate_layer_indices)[0])
-
-        if layer == None:
+        if mut_layer_name is None:
             f.write("mut_result:No suitable ops for WS mutation!\n")
             f.write("{} generation!\n\n".format(generations))
             mutate_logger.info("mut_result:No suitable ops for WS mutation!")
             mutate_logger.info("{} generation!".format(generations))
             return "mut_result:No suitable ops for WS mutation!"
+        layer = model.get_layers(mut_layer_name)
+        layer_name = type(layer).__name__
 
-        if not mutate_layer_indice == -1:
-            layer = layer[mutate_layer_indice]
-            mutate_logger.info("candidate_in_mutlayers_indice:{}".format(mutate_layer_indice))
-            f.write("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
-
-        else:
-            mutate_logger.info("candidate_in_mutlayers_indice:-1")
-            f.write("candidate_in_mutlayers_indice:-1\n")
+        mutate_logger.info("candidate_in_mutlayers_indice:-1")
+        f.record(mutate_layer_indice=-1)
+        f.write("candidate_in_mutlayers_indice:-1\n")
 
         weights = []
         params_generator = layer.get_parameters()
@@ -1380,10 +1430,11 @@ def WS_mut(model, layer_names, input_size, mut_file_path, generations, mutate_lo
                 new_weights = _shuffle_conv3d(weights, mutation_ratio)
 
             for params_dict_key in params_dict_keys:
-                f.write(f"select layer:{candidate_layer_names[sel_mut_layer_name_idx]}\n")
+                f.record(mut_layer_name=mut_layer_name)
+                f.write(f"select layer:{mut_layer_name}\n")
                 f.write(f"layer type:{str(type(layer).__name__)}\n")
                 mutate_logger.info(
-                    f"select layer:{candidate_layer_names[sel_mut_layer_name_idx]} " + " layer_type:" + str(
+                    f"select layer:{mut_layer_name} " + " layer_type:" + str(
                         type(layer).__name__))
                 execution_flag = True
                 param = layer.parameters_dict()[params_dict_key]
@@ -1393,10 +1444,11 @@ def WS_mut(model, layer_names, input_size, mut_file_path, generations, mutate_lo
         elif layer_name.lower() == "dense" and len(weights) != 0:
             new_weights = _shuffle_dense(weights, mutation_ratio)
             for params_dict_key in params_dict_keys:
-                f.write(f"select layer:{candidate_layer_names[sel_mut_layer_name_idx]}\n")
+                f.record(mut_layer_name=mut_layer_name)
+                f.write(f"select layer:{mut_layer_name}\n")
                 f.write(f"layer type:{str(type(layer).__name__)}\n")
                 mutate_logger.info(
-                    f"select layer:{candidate_layer_names[sel_mut_layer_name_idx]} " + " layer_type:" + str(
+                    f"select layer:{mut_layer_name} " + " layer_type:" + str(
                         type(layer).__name__))
                 execution_flag = True
                 param = layer.parameters_dict()[params_dict_key]
@@ -1409,6 +1461,7 @@ def WS_mut(model, layer_names, input_size, mut_file_path, generations, mutate_lo
         raise RuntimeError("mutation_ratio or index are wrong")
 
     if execution_flag is False:
+        negative_cache.add(negative_site)
         f.write("mut_result:No suitable layer for WS!\n")
         f.write("{} generation!\n".format(generations))
         mutate_logger.info("mut_result:No suitable layer for WS!")
@@ -1416,16 +1469,13 @@ def WS_mut(model, layer_names, input_size, mut_file_path, generations, mutate_lo
         f.close()
         return "No suitable layer for WS!"
 
-    if not mutate_layer_indice == -1:
-        ori_layer = model.get_layers(mut_layer_name)
-        ori_layer[mutate_layer_indice] = layer
-        set_result = set_layer(model, ori_layer, mut_layer_name, f, "WS", generations, mutate_logger)
-    else:
-        set_result = set_layer(model, layer, mut_layer_name, f, "WS", generations, mutate_logger)
+    set_result = set_layer(model, layer, mut_layer_name, f, "WS", generations, mutate_logger)
 
     if set_result is not True:
+        negative_cache.add(negative_site)
         return set_result
 
+    f.record(mutation_ratio=mutation_ratio)
     f.write(f"mutation_ratio:{mutation_ratio}\n")
     test_result = judge_legenacy(model, input_size, mutate_logger, train_configs)
     f.write("mut_result:{}\n".format(str(test_result)))
@@ -1436,132 +1486,133 @@ def WS_mut(model, layer_names, input_size, mut_file_path, generations, mutate_lo
     return test_result
 
 
+@profiled(cat="mutation")
 def NS_mut(model, layer_names, input_size, mut_file_path, generations, mutate_logger="", mutation_ratio=0.4,
            train_configs=""):
-    f = open(mut_file_path, 'a+')
+    f = get_journal(mut_file_path).recorder(generations, "NS")
     f.write("Adopt NS mut_strategy!\n")
     mutate_logger.info("Adopt NS mut_strategy!")
 
-    candidate_layer_names = model.add_Cascade_OPs + model.Basic_OPS
-    mutated_layer_indices = weighted_layer_indices(model, candidate_layer_names)
-    mutated_layer_indices = np.arange(
-        len(candidate_layer_names)) if mutated_layer_indices is None else mutated_layer_indices
-    depth_layer = len(candidate_layer_names)
-    assert_indices(mutated_layer_indices, depth_layer)
+    # one draw among the weighted candidates in the weight-change white list
+    selected_layer_name = get_eligibility(model).draw("NS")
     layer_utils = Layer_helpUtils()
 
-    mutated_layer_indices = np.random.permutation(mutated_layer_indices)
-
-    execution_flag = False
-
-    mutate_layer_indice = -1
-    for layer_name_index in mutated_layer_indices:
-        layer_name = candidate_layer_names[layer_name_index]
-        layer = model.get_layers(layer_name)
-        mut_layer_name = deepcopy(layer_name)
-
-        if "sequential" in str(layer.__class__.__name__):
-            mutate_layer_indices = []
-            for i in range(len(layer)):
-                if layer_utils.is_layer_in_weight_change_white_list(layer[i]):
-                    mutate_layer_indices.append(i)
-
-            if len(mutate_layer_indices) == 0:
-                continue
-
-            mutate_layer_indice = int(np.random.permutation(mutate_layer_indices)[0])
-            layer = layer[mutate_layer_indice]
-            mutate_logger.info("candidate_in_mutlayers_indice:{}".format(mutate_layer_indice))
-            f.write("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
+    def no_suitable_layer():
+        f.write("mut_result:No suitable layer for NS!\n")
+        f.write("{} generation!\n\n".format(generations))
+        mutate_logger.info("mut_result:No suitable layer for NS!")
+        mutate_logger.info("{} generation!\n".format(generations))
+        f.close()
+        return "No suitable layer for NS!"
 
-        else:
-            if not layer_utils.is_layer_in_weight_change_white_list(layer):
-                continue
-            mutate_logger.info("candidate_in_mutlayers_indice:-1")
-            f.write("candidate_in_mutlayers_indice:-1\n")
+    if selected_layer_name is None:
+        return no_suitable_layer()
 
-        weights = []
-        params_generator = layer.get_parameters()
-        params_dict_keys = []
-        for param in params_generator:
-            params_dict_keys.append(param.name)
-            weights.append(param.init_data().asnumpy())
+    layer_name = selected_layer_name
+    layer = model.get_layers(layer_name)
+    mut_layer_name = deepcopy(layer_name)
 
-        if len(weights) > 0:
-            if len(weights) == 2:
+    mutate_layer_indice = -1
+    if "sequential" in str(layer.__class__.__name__):
+        mutate_layer_indices = []
+        for i in range(len(layer)):
+            if layer_utils.is_layer_in_weight_change_white_list(layer[i]):
+                mutate_layer_indices.append(i)
 
-                f.write(f"select layer:{layer_name}\n")
-                f.write(f"layer type:{str(type(layer).__name__)}\n")
-                mutate_logger.info(f"select layer:{layer_name} " + " layer_type:" + str(type(layer).__name__))
-                weights_w, weights_b = weights
-
-                if weights_w.shape[0] >= 2:
-                    permutation = np.random.permutation(weights_w.shape[0])[:2]
-                    weights_w[permutation[0]], weights_w[permutation[1]] = weights_w[permutation[1]].copy(), weights_w[
-                        permutation[0]].copy()
-                    weights_b[permutation[0]], weights_b[permutation[1]] = weights_b[permutation[1]].copy(), weights_b[
-                        permutation[0]].copy()
-
-                    layer.weight.set_data(ms.Tensor(weights_w, ms.float32))
-                    layer.bias.set_data(ms.Tensor(weights_b, ms.float32))
-                    execution_flag = True
-                else:
-                    f.write(f"layer type:{str(type(layer).__name__)}\n")
-                    mutate_logger.info(f"select layer:{layer_name} " + " layer_type:" + str(type(layer).__name__))
+        if len(mutate_layer_indices) == 0:
+            return no_suitable_layer()
 
-            elif len(weights) == 1:
-                f.write(f"select layer:{layer_name}\n")
-                f.write(f"layer type:{str(type(layer).__name__)}\n")
-                mutate_logger.info(f"select layer:{layer_name} " + " layer_type:" + str(type(layer).__name__))
-                weights_w = weights[0]
+        mutate_layer_indice = int(np.random.permutation(mutate_layer_indices)[0])
+        layer = layer[mutate_layer_indice]
+        mutate_logger.info("candidate_in_mutlayers_indice:{}".format(mutate_layer_indice))
+        f.record(mutate_layer_indice=mutate_layer_indice)
+        f.write("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
 
-                if weights_w.shape[0] >= 2:
-                    permutation = np.random.permutation(weights_w.shape[0])[:2]
-                    weights_w[permutation[0]], weights_w[permutation[1]] = weights_w[permutation[1]].copy(), weights_w[
-                        permutation[0]].copy()
+    else:
+        if not layer_utils.is_layer_in_weight_change_white_list(layer):
+            return no_suitable_layer()
+        mutate_logger.info("candidate_in_mutlayers_indice:-1")
+        f.record(mutate_layer_indice=-1)
+        f.write("candidate_in_mutlayers_indice:-1\n")
 
-                    layer.weight.set_data(ms.Tensor(weights_w, ms.float32))
-                    execution_flag = True
-                else:
-                    f.write(f"layer type:{str(type(layer).__name__)}\n")
-                    mutate_logger.info(f"select layer:{layer_name} " + " layer_type:" + str(type(layer).__name__))
+    weights = []
+    params_generator = layer.get_parameters()
+    params_dict_keys = []
+    for param in params_generator:
+        params_dict_keys.append(param.name)
+        weights.append(param.init_data().asnumpy())
 
-            break
+    execution_flag = False
+    if len(weights) == 2:
+
+        f.record(mut_layer_name=layer_name)
+        f.write(f"select layer:{layer_name}\n")
+        f.write(f"layer type:{str(type(layer).__name__)}\n")
+        mutate_logger.info(f"select layer:{layer_name} " + " layer_type:" + str(type(layer).__name__))
+        weights_w, weights_b = weights
+
+        if weights_w.shape[0] >= 2:
+            permutation = np.random.permutation(weights_w.shape[0])[:2]
+            weights_w[permutation[0]], weights_w[permutation[1]] = weights_w[permutation[1]].copy(), weights_w[
+                permutation[0]].copy()
+            weights_b[permutation[0]], weights_b[permutation[1]] = weights_b[permutation[1]].copy(), weights_b[
+                permutation[0]].copy()
+
+            layer.weight.set_data(ms.Tensor(weights_w, ms.float32))
+            layer.bias.set_data(ms.Tensor(weights_b, ms.float32))
+            execution_flag = True
+        else:
+            f.write(f"layer type:{str(type(layer).__name__)}\n")
+            mutate_logger.info(f"select layer:{layer_name} " + " layer_type:" + str(type(layer).__name__))
+
+    elif len(weights) == 1:
+        f.record(mut_layer_name=layer_name)
+        f.write(f"select layer:{layer_name}\n")
+        f.write(f"layer type:{str(type(layer).__name__)}\n")
+        mutate_logger.info(f"select layer:{layer_name} " + " layer_type:" + str(type(layer).__name__))
+        weights_w = weights[0]
+
+        if weights_w.shape[0] >= 2:
+            permutation = np.random.permutation(weights_w.shape[0])[:2]
+            weights_w[permutation[0]], weights_w[permutation[1]] = weights_w[permutation[1]].copy(), weights_w[
+                permutation[0]].copy()
+
+            layer.weight.set_data(ms.Tensor(weights_w, ms.float32))
+            execution_flag = True
+        else:
+            f.write(f"layer type:{str(type(layer).__name__)}\n")
+            mutate_logger.info(f"select layer:{layer_name} " + " layer_type:" + str(type(layer).__name__))
 
     if execution_flag is False:
-        f.write("mut_result:No suitable layer for NS!\n")
-        f.write("{} generation!\n\n".format(generations))
-        mutate_logger.info("mut_result:No suitable layer for NS!")
-        mutate_logger.info("{} generation!\n".format(generations))
-        f.close()
-        return "No suitable layer for NS!"
-    else:
+        return no_suitable_layer()
 
-        if not mutate_layer_indice == -1:
-            ori_layer = model.get_layers(mut_layer_name)
-            ori_layer[mutate_layer_indice] = layer
-            set_result = set_layer_nolog(model, ori_layer, mut_layer_name, "NS")
-        else:
-            set_result = set_layer_nolog(model, layer, mut_layer_name, "NS")
+    if not mutate_layer_indice == -1:
+        ori_layer = model.get_layers(mut_layer_name)
+        ori_layer[mutate_layer_indice] = layer
+        set_result = set_layer_nolog(model, ori_layer, mut_layer_name, "NS")
+    else:
+        set_result = set_layer_nolog(model, layer, mut_layer_name, "NS")
 
-        if set_result is not True:
-            return set_result
+    if set_result is not True:
+        return set_result
 
-        f.write(f"mutation_ratio:{mutation_ratio}\n")
-        test_result = judge_legenacy(model, input_size, mutate_logger, train_configs)
-        f.write("mut_result:{}\n".format(str(test_result)))
-        f.write("{} generation!\n\n".format(generations))
-        mutate_logger.info("mut_result:{}".format(str(test_result)))
-        mutate_logger.info("{} generation!\n".format(generations))
-        f.close()
-        return test_result
+    f.record(mutation_ratio=mutation_ratio)
+    f.write(f"mutation_ratio:{mutation_ratio}\n")
+    test_result = judge_legenacy(model, input_size, mutate_logger, train_configs)
+    f.write("mut_result:{}\n".format(str(test_result)))
+    f.write("{} generation!\n\n".format(generations))
+    mutate_logger.info("mut_result:{}".format(str(test_result)))
+    mutate_logger.info("{} generation!\n".format(generations))
+    f.close()
+    return test_result
 
 
+@profiled(cat="mutation")
 def GF_mut(model, layer_names, input_size, mut_file_path, generations, mutate_logger="", mutation_ratio=0.4,
            train_configs=""):
     distribution = 'normal'
     STD = 0.1
-    f = open(mut_file_path, 'a+')
+    f = get_journal(mut_file_path).recorder(generations, "GF")
     f.write("Adopt GF mut_strategy!\n")
     mutate_logger.info("Adopt GF mut_strategy!")
     valid_distributions = ['normal', 'uniform']
@@ -1590,10 +1641,12 @@ def GF_mut(model, layer_names, input_size, mut_file_path, generations, mutate_lo
         mutate_layer_indice = int(np.random.permutation(mutate_layer_indices)[0])
         layer = layer[mutate_layer_indice]
         mutate_logger.info("candidate_in_mutlayers_indice:{}".format(mutate_layer_indice))
+        f.record(mutate_layer_indice=mutate_layer_indice)
         f.write("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
 
     else:
         mutate_logger.info("candidate_in_mutlayers_indice:-1")
+        f.record(mutate_layer_indice=-1)
         f.write("candidate_in_mutlayers_indice:-1\n")
 
     weights = []
@@ -1603,6 +1656,7 @@ def GF_mut(model, layer_names, input_size, mut_file_path, generations, mutate_lo
         params_dict_keys.append(param.name)
         weights.append(param.init_data().asnumpy())
 
+    f.record(mut_layer_name=layer_name)
     f.write(f"select layer:{layer_name}\n")
     f.write(f"layer type:{str(type(layer).__name__)}\n")
     mutate_logger.info(f"select layer:{layer_name} " + " layer_type:" + str(type(layer).__name__))
@@ -1633,6 +1687,7 @@ def GF_mut(model, layer_names, input_size, mut_file_path, generations, mutate_lo
     if set_result is not True:
         return set_result
 
+    f.record(mutation_ratio=mutation_ratio)
     f.write(f"mutation_ratio:{mutation_ratio}\n")
     test_result = judge_legenacy(model, input_size, mutate_logger, train_configs)
     f.write("mut_result:{}\n".format(str(test_result)))
@@ -1643,9 +1698,10 @@ def GF_mut(model, layer_names, input_size, mut_file_path, generations, mutate_lo
     return test_result
 
 
+@profiled(cat="mutation")
 def NEB_mut(model, layer_names, input_size, mut_file_path, generations, mutate_logger="", mutation_ratio=0.4,
             train_configs=""):
-    f = open(mut_file_path, 'a+')
+    f = get_journal(mut_file_path).recorder(generations, "NEB")
     f.write("Adopt NEB mut_strategy!\n")
     mutate_logger.info("Adopt NEB mut_strategy!")
     candidate_layer_names = model.add_Cascade_OPs + model.Basic_OPS
@@ -1675,12 +1731,14 @@ def NEB_mut(model, layer_names, input_size, mut_file_path, generations, mutate_l
                 mutate_layer_indice = int(np.random.permutation(mutate_layer_indices)[0])
                 layer = layer[mutate_layer_indice]
                 mutate_logger.info("candidate_in_mutlayers_indice:{}".format(mutate_layer_indice))
+                f.record(mutate_layer_indice=mutate_layer_indice)
                 f.write("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
 
             else:
                 if not layer_utils.is_layer_in_weight_change_white_list(layer):
                     continue
                 mutate_logger.info("candidate_in_mutlayers_indice:-1")
+                f.record(mutate_layer_indice=-1)
                 f.write("candidate_in_mutlayers_indice:-1\n")
 
             weights = []
@@ -1699,6 +1757,7 @@ def NEB_mut(model, layer_names, input_size, mut_file_path, generations, mutate_l
                     weights_b[permutation] = 0
                     new_weights = [weights_w, weights_b]
 
+                    f.record(mut_layer_name=layer_name)
                     f.write(f"select layer:{layer_name}\n")
                     f.write(f"layer type:{str(type(layer).__name__)}\n")
                     mutate_logger.info(f"select layer:{layer_name} " + " layer_type:" + str(type(layer).__name__))
@@ -1710,6 +1769,7 @@ def NEB_mut(model, layer_names, input_size, mut_file_path, generations, mutate_l
 
                 elif len(weights) == 1:
                     execution_flag = True
+                    f.record(mut_layer_name=layer_name)
                     f.write(f"select layer:{layer_name}\n")
                     f.write(f"layer type:{str(type(layer).__name__)}\n")
                     mutate_logger.info(f"select layer:{layer_name} " + " layer_type:" + str(type(layer).__name__))
@@ -1729,6 +1789,7 @@ def NEB_mut(model, layer_names, input_size, mut_file_path, generations, mutate_l
 
     if not execution_flag:
         mutate_logger.info("mut_result:Do not find suitable layer for NEB mutation!")
+        f.record(mutation_ratio=mutation_ratio)
         f.write(f"mutation_ratio:{mutation_ratio}\n")
         f.write(f"mut_result:Do not find suitable layer for NEB mutation!\n")
         f.write("{} generation!\n\n".format(generations))
@@ -1747,6 +1808,7 @@ def NEB_mut(model, layer_names, input_size, mut_file_path, generations, mutate_l
         if set_result is not True:
             return set_result
 
+    f.record(mutation_ratio=mutation_ratio)
     f.write(f"mutation_ratio:{mutation_ratio}\n")
     test_result = judge_legenacy(model, input_size, mutate_logger, train_configs)
     f.write("mut_result:{}\n".format(str(test_result)))
@@ -1757,9 +1819,10 @@ def NEB_mut(model, layer_names, input_size, mut_file_path, generations, mutate_l
     return test_result
 
 
+@profiled(cat="mutation")
 def NAI_mut(model, layer_names, input_size, mut_file_path, generations, mutate_logger="", mutation_ratio=0.4,
             train_configs=""):
-    f = open(mut_file_path, 'a+')
+    f = get_journal(mut_file_path).recorder(generations, "NAI")
     f.write("Adopt NAI mut_strategy!\n")
     mutate_logger.info("Adopt NAI mut_strategy!")
 
@@ -1789,12 +1852,14 @@ def NAI_mut(model, layer_names, input_size, mut_file_path, generations, mutate_l
                 mutate_layer_indice = int(np.random.permutation(mutate_layer_indices)[0])
                 layer = layer[mutate_layer_indice]
                 mutate_logger.info("candidate_in_mutlayers_indice:{}".format(mutate_layer_indice))
+                f.record(mutate_layer_indice=mutate_layer_indice)
                 f.write("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
 
             else:
                 if not layer_utils.is_layer_in_weight_change_white_list(layer):
                     continue
                 mutate_logger.info("candidate_in_mutlayers_indice:-1")
+                f.record(mutate_layer_indice=-1)
                 f.write("candidate_in_mutlayers_indice:-1\n")
 
             weights = []
@@ -1812,6 +1877,7 @@ def NAI_mut(model, layer_names, input_size, mut_file_path, generations, mutate_l
                     weights_w[permutation] *= -1
                     weights_b[permutation] *= -1
                     new_weights = [weights_w, weights_b]
+                    f.record(mut_layer_name=layer_name)
                     f.write(f"select layer:{layer_name}\n")
                     f.write(f"layer type:{str(type(layer).__name__)}\n")
                     mutate_logger.info(f"select layer:{layer_name} " + " layer_type:" + str(type(layer).__name__))
@@ -1822,6 +1888,7 @@ def NAI_mut(model, layer_names, input_size, mut_file_path, generations, mutate_l
 
                 elif len(weights) == 1:
                     execution_flag = True
+                    f.record(mut_layer_name=layer_name)
                     f.write(f"select layer:{layer_name}\n")
                     f.write(f"layer type:{str(type(layer).__name__)}\n")
                     mutate_logger.info(f"select layer:{layer_name} " + " layer_type:" + str(type(layer).__name__))
@@ -1840,6 +1907,7 @@ def NAI_mut(model, layer_names, input_size, mut_file_path, generations, mutate_l
 
     if not execution_flag:
         mutate_logger.info("mut_result:Do not find suitable layer for NAI mutation!")
+        f.record(mutation_ratio=mutation_ratio)
         f.write(f"mutation_ratio:{mutation_ratio}\n")
         f.write("mut_result:Do not find suitable layer for NAI mutation!\n")
         f.write("{} generation!\n\n".format(generations))
@@ -1859,6 +1927,7 @@ def NAI_mut(model, layer_names, input_size, mut_file_path, generations, mutate_l
         if set_result is not True:
             return set_result
 
+    f.record(mutation_ratio=mutation_ratio)
     f.write(f"mutation_ratio:{mutation_ratio}\n")
     test_result = judge_legenacy(model, input_size, mutate_logger, train_configs)
     f.write("mut_result:{}\n".format(str(test_result)))
@@ -1869,9 +1938,10 @@ def NAI_mut(model, layer_names, input_size, mut_file_path, generations, mutate_l
     return test_result
 
 
+@profiled(cat="mutation")
 def LS_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer_isBasic="", mutate_logger="",
            train_configs=""):
-    f = open(mut_file_path, 'a+')
+    f = get_journal(mut_file_path).recorder(generations, "LS")
     f.write("Adopt LS mut_strategy!\n")
     mutate_logger.info("Adopt LS mut_strategy!")
 
@@ -1897,6 +1967,7 @@ def LS_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
 
     mutate_logger.info("switch layer1:" + switch_layer1_name)
     mutate_logger.info("switch layer2:" + switch_layer2_name)
+    f.record(mut_layer_name1=switch_layer1_name, mut_layer_name2=switch_layer2_name)
     f.write("switch layer1:" + switch_layer1_name + "\n")
     f.write("switch layer2:" + switch_layer2_name + "\n")
 
@@ -1918,13 +1989,14 @@ def LS_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
     return test_result
 
 
+@profiled(cat="mutation")
 def LC_mut(model, layer_names, input_size, add_layer_type, mut_file_path, generations, mut_layer_isBasic="",
            mutate_logger="", train_configs=""):
-    f = open(mut_file_path, 'a+')
+    f = get_journal(mut_file_path).recorder(generations, "LC")
     f.write("Adopt LC mut_strategy!\n")
     mutate_logger.info("Adopt LC mut_strategy!")
-    Cascade_OPs = deepcopy(model.get_Cascade_OPs())
-    Basic_OPS = deepcopy(model.get_Basic_OPS())
+    Cascade_OPs = list(model.get_Cascade_OPs())
+    Basic_OPS = list(model.get_Basic_OPS())
 
     if mut_layer_isBasic == "":
 
@@ -1983,9 +2055,12 @@ def LC_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
         return "LC Create illegal layer!"
 
 
+    f.record(mut_layer_name=mut_layer_name)
     f.write("select layer: " + mut_layer_name + " layer_type: " + str(mut_layer.__class__) + " " + "in_shape: " + str(
         in_shape) + " out_shape: " + str(out_shape) + "\n")
+    f.record(mut_layer_isBasic=mut_layer_isBasic)
     f.write("mut Basic type: " + str(mut_layer_isBasic) + "\n")
+    f.record(add_layer_type=add_layer_type)
     f.write("add Basic layer : " + str(add_layer_type) + "\n")
     mutate_logger.info(
         "select layer: " + mut_layer_name + " layer_type: " + str(mut_layer.__class__) + " " + "in_shape: " + str(
@@ -2003,6 +2078,7 @@ def LC_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
         mutate_logger.info("Unknown operator copied!")
         raise RuntimeError("Unknown operator copied!")
 
+    f.record(**inserted_layer_args(insert_layer))
     f.write("select insert layer: " + str(insert_layer) + "\n")
     mutate_logger.info("select insert layer: " + str(insert_layer))
 
@@ -2113,13 +2189,14 @@ def LC_mut(model, layer_names, input_size, add_layer_type, mut_file_path, genera
     return test_result
 
 
+@profiled(cat="mutation")
 def SM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer_isBasic="", mutate_logger="",
            train_configs=""):
-    f = open(mut_file_path, 'a+')
+    f = get_journal(mut_file_path).recorder(generations, "SM")
     f.write("Adopt SM mut_strategy!\n")
     mutate_logger.info("Adopt SM mut_strategy!")
-    Cascade_OPs = deepcopy(model.get_Cascade_OPs())
-    Basic_OPS = deepcopy(model.get_Basic_OPS())
+    Cascade_OPs = list(model.get_Cascade_OPs())
+    Basic_OPS = list(model.get_Basic_OPS())
 
     if mut_layer_isBasic == "":
         mut_layer_isBasic = np.random.permutation([True, False])[0]
@@ -2149,8 +2226,10 @@ def SM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
     mut_layer = model.get_layers(mut_layer_name)
     op_in_shape, op_out_shape = deepcopy(in_shape), deepcopy(out_shape)
 
+    f.record(mut_layer_name=mut_layer_name)
     f.write("select layer: " + mut_layer_name + " layer_type: " + str(mut_layer.__class__) + " " + "in_shape: " + str(
         in_shape) + " out_shape: " + str(out_shape) + "\n")
+    f.record(mut_layer_isBasic=mut_layer_isBasic)
     f.write("mut Basic type: " + str(mut_layer_isBasic) + "\n")
 
     mutate_logger.info(
@@ -2201,10 +2280,12 @@ def SM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
         insert_layer_outshape = deepcopy(out_shape)  # mut_layer[mutate_layer_indice](temp_data).shape
         op_in_shape, op_out_shape = deepcopy(insert_layer_inshape), deepcopy(insert_layer_outshape)
         mutate_logger.info("candidate_in_mutlayers_indice:{}".format(mutate_layer_indice))
+        f.record(mutate_layer_indice=mutate_layer_indice)
         f.write("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
 
     else:
         mutate_logger.info("candidate_in_mutlayers_indice:-1")
+        f.record(mutate_layer_indice=-1)
         f.write("candidate_in_mutlayers_indice:-1\n")
 
     input_shape_dimension_mut, output_shape_dimension_mut = np.random.randint(2, 6), np.random.randint(2, 6)
@@ -2231,6 +2312,7 @@ def SM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
             mut_layer_slice.append(input_replace_cell2)
             mut_layer_slice.append(mut_layer[mutate_layer_indice])
             insert_layer = mut_layer_slice
+            f.record(mut_state=0, input_shape_mut=input_shape_mut)
             f.write("mutate state: before\n")
             f.write("mutate input_shape: " + str(input_shape_mut) + "\n")
             mutate_logger.info("mutate input_shape: " + str(input_shape_mut))
@@ -2240,6 +2322,7 @@ def SM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
             mut_layer_slice.append(output_replace_cell1)
             mut_layer_slice.append(output_replace_cell2)
             insert_layer = mut_layer_slice
+            f.record(mut_state=1, output_shape_mut=output_shape_mut)
             f.write("mutate state: after\n")
             f.write("mutate output_shape: " + str(output_shape_mut) + "\n")
             mutate_logger.info("mutate output_shape: " + str(output_shape_mut))
@@ -2252,6 +2335,7 @@ def SM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
             mut_layer_slice.append(output_replace_cell1)
             mut_layer_slice.append(output_replace_cell2)
             insert_layer = mut_layer_slice
+            f.record(mut_state=2, input_shape_mut=input_shape_mut, output_shape_mut=output_shape_mut)
             f.write("mutate state: all\n")
             f.write("mutate input_shape: " + str(input_shape_mut) + "\n")
             f.write("mutate output_shape: " + str(output_shape_mut) + "\n")
@@ -2261,12 +2345,14 @@ def SM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
     else:
         if mut_state == 0:
             insert_layer = nn.SequentialCell([input_replace_cell1, input_replace_cell2, mut_layer])
+            f.record(mut_state=0, input_shape_mut=input_shape_mut)
             f.write("mutate state: before\n")
             f.write("mutate input_shape: " + str(input_shape_mut) + "\n")
             mutate_logger.info("mutate input_shape: " + str(input_shape_mut))
 
         elif mut_state == 1:
             insert_layer = nn.SequentialCell([mut_layer, output_replace_cell1, output_replace_cell2])
+            f.record(mut_state=1, output_shape_mut=output_shape_mut)
             f.write("mutate state: after\n")
             f.write("mutate output_shape: " + str(output_shape_mut) + "\n")
             mutate_logger.info("mutate output_shape: " + str(output_shape_mut))
@@ -2274,6 +2360,7 @@ def SM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
         elif mut_state == 2:
             insert_layer = nn.SequentialCell(
                 [input_replace_cell1, input_replace_cell2, mut_layer, output_replace_cell1, output_replace_cell2])
+            f.record(mut_state=2, input_shape_mut=input_shape_mut, output_shape_mut=output_shape_mut)
             f.write("mutate state: all\n")
             f.write("mutate input_shape: " + str(input_shape_mut) + "\n")
             f.write("mutate output_shape: " + str(output_shape_mut) + "\n")
@@ -2364,13 +2451,14 @@ def SM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
     return test_result
 
 
+@profiled(cat="mutation")
 def DM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer_isBasic="", mutate_logger="",
            train_configs=""):
-    f = open(mut_file_path, 'a+')
+    f = get_journal(mut_file_path).recorder(generations, "DM")
     f.write("Adopt DM mut_strategy!\n")
     mutate_logger.info("Adopt DM mut_strategy!")
-    Cascade_OPs = deepcopy(model.get_Cascade_OPs())
-    Basic_OPS = deepcopy(model.get_Basic_OPS())
+    Cascade_OPs = list(model.get_Cascade_OPs())
+    Basic_OPS = list(model.get_Basic_OPS())
 
     if mut_layer_isBasic == "":
         mut_layer_isBasic = np.random.permutation([True, False])[0]
@@ -2399,8 +2487,10 @@ def DM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
 
     mut_layer = model.get_layers(mut_layer_name)
 
+    f.record(mut_layer_name=mut_layer_name)
     f.write("select layer: " + mut_layer_name + " layer_type: " + str(mut_layer.__class__) + " " + "in_shape: " + str(
         in_shape) + " out_shape: " + str(out_shape) + "\n")
+    f.record(mut_layer_isBasic=mut_layer_isBasic)
     f.write("mut Basic type: " + str(mut_layer_isBasic) + "\n")
 
     mutate_logger.info(
@@ -2448,6 +2538,7 @@ def DM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
             raise RuntimeError("can not achieve the correct dtype")
 
         mutate_logger.info("candidate_in_mutlayers_indice:{}".format(mutate_layer_indice))
+        f.record(mutate_layer_indice=mutate_layer_indice)
         f.write("candidate_in_mutlayers_indice:{}\n".format(mutate_layer_indice))
 
     else:
@@ -2465,6 +2556,7 @@ def DM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
             raise RuntimeError("can not achieve the correct dtype")
 
         mutate_logger.info("candidate_in_mutlayers_indice:-1")
+        f.record(mutate_layer_indice=-1)
         f.write("candidate_in_mutlayers_indice:-1\n")
 
     if "float" in str(dtype.__class__.__name__).lower():
@@ -2474,6 +2566,7 @@ def DM_mut(model, layer_names, input_size, mut_file_path, generations, mut_layer
         newdtype = np.random.permutation([mindspore.int16, mindspore.int32])[0]
 
     mutate_logger.info("in_dtype:{}".format(str(newdtype)))
+    f.record(newdtype=dtype_name(newdtype))
     f.write("in_dtype:{}\n".format(str(newdtype)))
 
 
@@ -4,6 +4,9 @@ import mindspore.nn as nn
 from common.mutation_ms.OP_parameter_mutate_utils import *
 from common.mutation_ms.OP_weight_utils import _shuffle_conv2d, _shuffle_conv3d, _shuffle_dense, generate_permutation
 from common.mutation_ms.Other_utils import *
+from common.mutation_journal import get_journal, replayable
+from common.eligibility import get_eligibility, structural_operators
+from common.profiler import profiled
 
 ms_dtypes = [mindspore.float32, mindspore.int32, mindspore.float16]
 
@@ -1540,355 +1543,68 @@ def DM_mut_followlog(model, input_size, mut_layer_isBasic, mut_layer_name, newdt
     return test_result
 
 
+def apply_record_mindspore(model, record, input_size, train_configs=None):
+    args = record["args"]
+    mut_type = record["operator"]
+    if mut_type == "LD":
+        return LD_mut_followlog(model, input_size, del_layer_name=args["del_layer_name"],
+                                mutate_layer_indice=args["mutate_layer_indice"], train_configs=train_configs)
+    elif mut_type == "LS":
+        return LS_mut_followlog(model, input_size, args["mut_layer_name1"], args["mut_layer_name2"],
+                                train_configs=train_configs)
+    elif mut_type in ["WS", "NS", "GF", "NAI", "NEB"]:
+        mut_funcs = {"WS": WS_mut_followlog, "NS": NS_mut_followlog, "GF": GF_mut_followlog,
+                     "NAI": NAI_mut_followlog, "NEB": NEB_mut_followlog}
+        return mut_funcs[mut_type](model, input_size, args["mut_layer_name"], args["mutation_ratio"],
+                                   args["mutate_layer_indice"], train_configs=train_configs)
+    elif mut_type == "LA":
+        return LA_mut_followlog(model, input_size, args["mut_layer_isBasic"], args["mut_layer_name"],
+                                args["add_layer_type"], args["add_layer_info"], args["activation_name"],
+                                args["mutate_layer_indice"], train_configs=train_configs)
+    elif mut_type == "RA":
+        return RA_mut_followlog(model, input_size, args["mut_layer_isBasic"], args["mut_layer_name"],
+                                args["add_layer_type"], args["add_layer_info"], args["activation_name"],
+                                args["mutate_layer_indice"], train_configs=train_configs)
+    elif mut_type == "CM":
+        return CM_mut_followlog(model, input_size, args["mut_layer_isBasic"], args["mut_layer_name"],
+                                args["add_layer_info"], args["activation_name"], args["mutate_layer_indice"],
+                                train_configs=train_configs)
+    elif mut_type == "LC":
+        return LC_mut_followlog(model, input_size, args["mut_layer_isBasic"], args["mut_layer_name"],
+                                args["add_layer_type"], args["add_layer_info"], args["activation_name"],
+                                train_configs=train_configs)
+    elif mut_type == "PM":
+        mut_value = args["mut_value"]
+        if isinstance(mut_value, list):
+            mut_value = tuple(mut_value)
+        return PM_mut_followlog(model, input_size, args["mutate_layer_name"], args["mutate_layer_indice"],
+                                args["mutate_param_selname"], mut_value, train_configs=train_configs)
+    elif mut_type == "SM":
+        input_shape_mut = None if args["input_shape_mut"] is None else tuple(args["input_shape_mut"])
+        output_shape_mut = None if args["output_shape_mut"] is None else tuple(args["output_shape_mut"])
+        return SM_mut_followlog(model, input_size, args["mut_layer_isBasic"], args["mut_layer_name"],
+                                args["mut_state"], input_shape_mut, output_shape_mut,
+                                mutate_layer_indice=args["mutate_layer_indice"], train_configs=train_configs)
+    elif mut_type == "DM":
+        return DM_mut_followlog(model, input_size, args["mut_layer_isBasic"], args["mut_layer_name"],
+                                getattr(ms, args["newdtype"]), args["mutate_layer_indice"],
+                                train_configs=train_configs)
+
+
+@profiled(cat="replay")
 def analyze_log_mindspore_followtrace(traces, model, log_path, input_size, train_configs=None):
-    f = open(log_path)
-    log = f.readlines()
-    i = -1
-
-    while i < len(log):
-        i += 1
-
-        if len(traces) == 0:
-            return model
-        if i >= len(log):
-            break
-        line = log[i]
-        if "\n" == line:
-            continue
-        elif "generation" in line:
+    """
+    Replay the generations in `traces` on `model` from the mutation journal; replayed generations are removed
+    from `traces`.
+    """
+    journal = get_journal(log_path)
+    sync = False
+    for record in journal.select(traces):
+        traces.remove(record["generation"])
+        if not record["success"] or not replayable(record):
             continue
-
-        if "LD mut_strategy" in line:
-            mut_type_name = "LD"
-            j = i
-            while "mut_result" not in log[j]:
-                j += 1
-            assert "generation" in log[j + 1]
-            if "generation" in log[j + 1]:
-                generation = int(log[j + 1][:-1].split(" ")[0])
-
-                if generation not in traces:
-                    continue
-                else:
-                    generation_idx = traces.index(generation)
-                    del traces[generation_idx]
-
-            if "not enough layers to delete!" in log[j] or "set layers failure" in log[j] \
-                    or "No suitable ops for" in log[j]:
-                continue
-
-            ms_mut_result = log[j].split(":")[1][:-1] == "True"
-            if ms_mut_result is False:
-                i = j
-                continue
-
-            l_name = log[i + 1].split(":")[-1]
-            mutate_layer_indice = int(log[i + 2][:-1].split(":")[-1])
-            LD_mut_followlog(model, input_size, del_layer_name=l_name[:-1],
-                             mutate_layer_indice=mutate_layer_indice, train_configs=train_configs)
-
-        elif "LS mut_strategy" in line:
-            j = i
-            while "mut_result" not in log[j]:
-                j += 1
-            assert "generation" in log[j + 1]
-            if "generation" in log[j + 1]:
-                generation = int(log[j + 1][:-1].split(" ")[0])
-                if generation not in traces:
-                    continue
-                else:
-                    generation_idx = traces.index(generation)
-                    del traces[generation_idx]
-            elif "no suitable op" in log[j]:
-                continue
-
-            if "suitable" in log[j]:
-                continue
-
-            ms_mut_result = log[j].split(":")[1][:-1] == "True"
-            if ms_mut_result is False:
-                i = j
-                continue
-
-            l_name1 = log[i + 1].split(":")[-1]
-            l_name2 = log[i + 2].split(":")[-1]
-            LS_mut_followlog(model, input_size, l_name1[:-1], l_name2[:-1], train_configs=train_configs)
-
-        elif "Adopt WS mut_strategy" in line or "Adopt NS mut_strategy" in line or "Adopt GF mut_strategy" in line \
-                or "Adopt NAI mut_strategy" in line or "Adopt NEB mut_strategy" in line:
-            mut_type_flag = -1
-            if "WS mut_strategy" in line:
-                mut_type_flag = 0
-            elif "NS mut_strategy" in line:
-                mut_type_flag = 1
-            elif "GF mut_strategy" in line:
-                mut_type_flag = 2
-            elif "NAI mut_strategy" in line:
-                mut_type_flag = 3
-            elif "NEB mut_strategy" in line:
-                mut_type_flag = 4
-
-            j = i
-            while "mut_result" not in log[j]:
-                if "mutation_ratio" in log[j]:
-                    mutation_ratio = float(log[j][:-1].split(":")[1])
-                elif "mutlayers_indice" in log[j]:
-                    mut_layer_indice = (int(log[j][:-1].split(":")[-1]))
-                elif "select layer" in log[j]:
-                    l_name = log[j][:-1].split(":")[-1]
-
-                j += 1
-
-            assert "generation" in log[j + 1]
-            if "generation" in log[j + 1]:
-                generation = int(log[j + 1][:-1].split(" ")[0])
-                if generation not in traces:
-                    continue
-                else:
-                    generation_idx = traces.index(generation)
-                    del traces[generation_idx]
-
-            if "suitable" in log[j]:
-                continue
-
-            ms_mut_result = log[j].split(":")[1][:-1] == "True"
-            if ms_mut_result is False:
-                i = j
-                continue
-
-            if mut_type_flag == 0:
-                WS_mut_followlog(model, input_size, l_name, mutation_ratio, mut_layer_indice,
-                                 train_configs=train_configs)
-            elif mut_type_flag == 1:
-                NS_mut_followlog(model, input_size, l_name, mutation_ratio, mut_layer_indice,
-                                 train_configs=train_configs)
-            elif mut_type_flag == 2:
-                GF_mut_followlog(model, input_size, l_name, mutation_ratio, mut_layer_indice,
-                                 train_configs=train_configs)
-            elif mut_type_flag == 3:
-                NAI_mut_followlog(model, input_size, l_name, mutation_ratio, mut_layer_indice,
-                                  train_configs=train_configs)
-            elif mut_type_flag == 4:
-                NEB_mut_followlog(model, input_size, l_name, mutation_ratio, mut_layer_indice,
-                                  train_configs=train_configs)
-
-        elif "Adopt LA mut_strategy" in line or "Adopt RA mut_strategy" in line or \
-                "Adopt CM mut_strategy" in line or "Adopt LC mut_strategy" in line:
-            mut_type_flag = -1
-            mut_type_name = ""
-            if "LA mut_strategy" in line:
-                mut_type_flag = 0
-            elif "RA mut_strategy" in line:
-                mut_type_flag = 1
-            elif "CM mut_strategy" in line:
-                mut_type_flag = 2
-            elif "LC mut_strategy" in line:
-                mut_type_flag = 3
-
-            j = i
-            activation_name = None
-            add_layer_type = None
-            while not "mut_result" in log[j]:
-                if "select layer: " in log[j]:
-                    end1 = log[j].index(" layer_type:")
-                    mut_layer_name = log[j][len("select layer: "):end1]
-                elif "add Basic layer" in log[j]:
-                    add_layer_type = (log[j][len("add Basic layer : "):-1])
-                elif "mut Basic type:" in log[j]:
-                    mut_layer_isBasic = (log[j][len("mut Basic layer : ") - 2:-1] == "True")
-                elif "mutlayers_indice" in log[j]:
-                    mut_layer_indice = (int(log[j][:-1].split(":")[-1]))
-                elif "select insert layer: " in log[j]:
-                    end2 = log[j].index("<")
-                    insert_layer_info = log[j][len("select insert layer: "):end2]
-                    k = 0
-                    if "dwpw_group" == insert_layer_info:
-                        k = j
-                        while "dwpw_activation" not in log[k]:
-                            k += 1
-                        activation_name = log[k][:-1].split(": ")[1][:-2]
-                j += 1
-
-            assert "generation" in log[j + 1]
-            if "generation" in log[j + 1]:
-                generation = int(log[j + 1][:-1].split(" ")[0])
-                if generation not in traces:
-                    continue
-                else:
-                    generation_idx = traces.index(generation)
-                    del traces[generation_idx]
-
-            if "No suitable ops for" in log[j] or "Create illegal layer" in log[j] or "set layers failure" in log[j]:
-                continue
-
-            ms_mut_result = log[j].split(":")[1][:-1] == "True"
-            if ms_mut_result is False:
-                i = j
-                continue
-
-            if mut_type_flag == 0:
-                LA_mut_followlog(model, input_size, mut_layer_isBasic, mut_layer_name, add_layer_type,
-                                 insert_layer_info, activation_name, mut_layer_indice,
-                                 train_configs=train_configs)
-            elif mut_type_flag == 1:
-                RA_mut_followlog(model, input_size, mut_layer_isBasic, mut_layer_name, add_layer_type,
-                                 insert_layer_info, activation_name, mut_layer_indice,
-                                 train_configs=train_configs)
-            elif mut_type_flag == 2:
-                CM_mut_followlog(model, input_size, mut_layer_isBasic, mut_layer_name, insert_layer_info,
-                                 activation_name, mut_layer_indice, train_configs=train_configs)
-            elif mut_type_flag == 3:
-                LC_mut_followlog(model, input_size, mut_layer_isBasic, mut_layer_name, add_layer_type,
-                                 insert_layer_info, activation_name, train_configs=train_configs)
-
-        elif "Adopt PM mut_strategy" in line:
-            j = i
-            m_value = None
-            while not "mut_result" in log[j]:
-                if "Edit value:" in log[j]:
-                    m_value = log[j][len("Edit value: "):log[j].index(" new_inshape")]
-                    if "(" in m_value and ")" in m_value:
-                        tmp = m_value[1: -1].split(",")
-                        m_value = tuple([int(val) for val in tmp])
-                    elif m_value in "True False":
-                        m_value = bool(m_value)
-                    elif ("." in m_value or "e" in m_value):
-                        m_value = float(m_value)
-                    elif not ("." in m_value or "e" in m_value):
-                        m_value = int(m_value)
-                elif "mutlayers_indice:" in log[j]:
-                    start3 = log[j].index(":")
-                    mutate_layer_indice = int(log[j][(start3 + 1):-1])
-                j += 1
-            assert "generation" in log[j + 1]
-            if "generation" in log[j + 1]:
-                generation = int(log[j + 1][:-1].split(" ")[0])
-                if generation not in traces:
-                    continue
-                else:
-                    generation_idx = traces.index(generation)
-                    del traces[generation_idx]
-
-            if "Parameter Miss" in log[j] or "PM Create illegal layer" in log[j] or "set layers failure" in log[j]:
-                i = j + 1
-                continue
-            ms_mut_result = log[j].split(":")[1][:-1] == "True"
-            if ms_mut_result is False:
-                i = j
-                continue
-
-            assert m_value is not None
-            end1 = log[i + 2].index(" layer_type")
-            end2 = log[i + 2].index(" input_shape:")
-            start2 = log[i + 2].index("selected param:") + len("selected param:")
-            sel_layer_name = log[i + 2][11:end1]
-            mutate_param_selname = log[i + 2][start2:end2]
-
-            PM_mut_followlog(model, input_size, sel_layer_name, mutate_layer_indice, mutate_param_selname,
-                             m_value, train_configs=train_configs)
-
-        elif "Adopt SM mut_strategy" in line:
-            j = i
-            while "mut_result" not in log[j]:
-                if "select layer: " in log[j]:
-                    end1 = log[j].index(" layer_type:")
-                    mut_layer_name = log[j][len("select layer: "):end1]
-                elif "mutlayers_indice" in log[j]:
-                    mut_layer_indice = (int(log[j][:-1].split(":")[-1]))
-                elif "mut Basic type:" in log[j]:
-                    mut_layer_isBasic = (log[j][len("mut Basic layer : ") - 2:-1] == "True")
-                elif "mutate state:" in log[j]:
-                    mutate_state = log[j][len("mutate state: "):-1]
-
-                    if mutate_state == "all":
-                        mutate_input_shape_str = log[j + 1][log[j + 1].index("[") + 1:log[j + 1].index("]")]
-                        mutate_input_shape_str = mutate_input_shape_str.replace(" ", "")
-                        mutate_input_shape_str = mutate_input_shape_str.split(",")
-                        mutate_input_shape = tuple([int(val) for val in mutate_input_shape_str])
-
-                        mutate_output_shape_str = log[j + 2][log[j + 2].index("[") + 1:log[j + 2].index("]")]
-                        mutate_output_shape_str = mutate_output_shape_str.replace(" ", "")
-                        mutate_output_shape_str = mutate_output_shape_str.split(",")
-                        mutate_output_shape = tuple([int(val) for val in mutate_output_shape_str])
-                        mut_state = 2
-                    elif mutate_state == "before":
-                        mutate_input_shape_str = log[j + 1][log[j + 1].index("[") + 1:log[j + 1].index("]")]
-                        mutate_input_shape_str = mutate_input_shape_str.replace(" ", "")
-                        mutate_input_shape_str = mutate_input_shape_str.split(",")
-                        mutate_input_shape = tuple([int(val) for val in mutate_input_shape_str])
-                        mutate_output_shape = None
-                        mut_state = 0
-                    elif mutate_state == "after":
-                        mutate_output_shape_str = log[j + 1][log[j + 1].index("[") + 1:log[j + 1].index("]")]
-                        mutate_output_shape_str = mutate_output_shape_str.replace(" ", "")
-                        mutate_output_shape_str = mutate_output_shape_str.split(",")
-                        mutate_output_shape = tuple([int(val) for val in mutate_output_shape_str])
-                        mutate_input_shape = None
-                        mut_state = 1
-                j += 1
-
-            assert "generation" in log[j + 1]
-            if "generation" in log[j + 1]:
-                generation = int(log[j + 1][:-1].split(" ")[0])
-                if generation not in traces:
-                    continue
-                else:
-                    generation_idx = traces.index(generation)
-                    del traces[generation_idx]
-
-            if "Create illegal layer" in log[j] or "set layers failure" in log[j] or "No suitable ops for" in log[j]:
-                continue
-
-            ms_mut_result = log[j].split(":")[1][:-1] == "True"
-            if ms_mut_result is False:
-                i = j
-                continue
-
-            SM_mut_followlog(model, input_size, mut_layer_isBasic, mut_layer_name, mut_state,
-                             mutate_input_shape, mutate_output_shape, mutate_layer_indice=mut_layer_indice,
-                             train_configs=train_configs)
-
-        elif "Adopt DM mut_strategy" in line:
-            j = i
-            while "mut_result" not in log[j]:
-                if "select layer: " in log[j]:
-                    end1 = log[j].index(" layer_type:")
-                    mut_layer_name = log[j][len("select layer: "):end1]
-                elif "mutlayers_indice" in log[j]:
-                    mut_layer_indice = (int(log[j][:-1].split(":")[-1]))
-                elif "mut Basic type:" in log[j]:
-                    mut_layer_isBasic = (log[j][len("mut Basic layer : ") - 2:-1] == "True")
-                elif "in_dtype:" in log[j]:
-                    dtype_str = str(log[j][:-1]).split(":")[1]
-                    if "float16" in dtype_str.lower():
-                        t_dtype = mindspore.float16
-                    elif "float32" in dtype_str.lower():
-                        t_dtype = mindspore.float32
-                    elif "int32" in dtype_str.lower():
-                        t_dtype = mindspore.int32
-                    elif "int16" in dtype_str.lower():
-                        t_dtype = mindspore.int16
-
-                j += 1
-
-            assert "generation" in log[j + 1]
-            if "generation" in log[j + 1]:
-                generation = int(log[j + 1][:-1].split(" ")[0])
-                if generation not in traces:
-                    continue
-                else:
-                    generation_idx = traces.index(generation)
-                    del traces[generation_idx]
-
-            if "Create illegal layer" in log[j] or "set layers failure" in log[j] or "No suitable ops for" in log[j]:
-                continue
-
-            ms_mut_result = log[j].split(":")[1][:-1] == "True"
-            if ms_mut_result is False:
-                i = j
-                continue
-
-            DM_mut_followlog(model, input_size, mut_layer_isBasic, mut_layer_name, t_dtype,
-                             mut_layer_indice, train_configs=train_configs)
-
-    f.close()
+        apply_record_mindspore(model, record, input_size, train_configs)
+        sync = sync or record["operator"] in structural_operators
+    if sync:
+        get_eligibility(model).sync(model)
+    return model
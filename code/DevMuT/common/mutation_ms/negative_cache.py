@@ -0,0 +1,93 @@
+import os
+import numpy as np
+
+
+class NegativeResultCache:
+    """
+    Per-campaign record of mutation choices that already failed: a layer an operator could not use at all
+    ("No suitable ops", "set layers failure") or a candidate op that could not be inserted at that layer (illegal
+    layer, failed legality check).
+
+    An entry is keyed by (operator, layer name, layer type, in_shape, candidate op) and remembers the layer's
+    neighbourhood (its orders entry and out_shape) at the time of the failure. Once a later mutation changes that
+    neighbourhood the entry is stale and dropped on the next lookup, so the choice can be tried again.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.recorded = 0
+        self.avoided = 0
+        self.invalidated = 0
+
+    def site(self, model, operator, layer_name):
+        """
+        (key, neighbourhood) of `layer_name` in its current state; take it before the model is mutated.
+        """
+        layer = model.get_layers(layer_name)
+        in_shape = getattr(model, "in_shapes", {}).get(layer_name)
+        out_shape = getattr(model, "out_shapes", {}).get(layer_name)
+        if in_shape is None:
+            in_shape = getattr(model, "Cascade_OPs_inshapes", {}).get(layer_name)
+            out_shape = getattr(model, "Cascade_OPs_outshapes", {}).get(layer_name)
+        key = (operator, layer_name, layer.__class__.__name__, None if in_shape is None else tuple(in_shape))
+        neighbourhood = (str(getattr(model, "orders", {}).get(layer_name)),
+                         None if out_shape is None else tuple(out_shape))
+        return key, neighbourhood
+
+    def add(self, site, candidate=None):
+        key, neighbourhood = site
+        self.entries[key + (candidate,)] = neighbourhood
+        self.recorded += 1
+
+    def known(self, site, candidate=None):
+        key, neighbourhood = site
+        entry = self.entries.get(key + (candidate,))
+        if entry is None:
+            return False
+        if not entry == neighbourhood:
+            self.entries.pop(key + (candidate,))
+            self.invalidated += 1
+            return False
+        return True
+
+    def pick_layer(self, model, operator, layer_names):
+        """
+        Uniform random pick among `layer_names`, passing over the layers `operator` is known to fail on (unless
+        it fails on all of them).
+        """
+        layer_names = np.random.permutation(layer_names)
+        for layer_name in layer_names:
+            if not self.known(self.site(model, operator, layer_name)):
+                return layer_name
+            self.avoided += 1
+        return layer_names[0]
+
+    def excluded(self, site, candidates):
+        """
+        Names of the candidate ops (LazyOps) already known to fail at `site`.
+        """
+        names = []
+        for candidate in candidates:
+            name = getattr(candidate, "name", None)
+            if name is not None and self.known(site, name):
+                names.append(name)
+                self.avoided += 1
+        return names
+
+    def summary(self):
+        return "negative cache: {} entries, recorded:{}, avoided:{}, invalidated:{}".format(
+            len(self.entries), self.recorded, self.avoided, self.invalidated)
+
+
+negative_caches = {}
+
+
+def get_negative_cache(text_path):
+    """
+    Cache of the campaign writing the mutation log `text_path`, so runs on other models or campaigns in the same
+    process never share entries.
+    """
+    key = os.path.abspath(text_path)
+    if key not in negative_caches:
+        negative_caches[key] = NegativeResultCache()
+    return negative_caches[key]
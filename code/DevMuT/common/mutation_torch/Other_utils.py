@@ -5,6 +5,8 @@ import yaml
 import torch
 from common.mutation_torch.Layer_utils import *
 from common.mutation_ms.OP_parameter_mutate_utils import get_new_basicop, get_new_cascadeop
+from common.profiler import profiled
+from common.topology import within, find_Cascade_OP, find_Child_leaf_OP
 
 if "CONTEXT_DEVICE_TARGET" in os.environ and os.environ['CONTEXT_DEVICE_TARGET']=='GPU':
     final_device = f'cuda:0'
@@ -28,22 +30,6 @@ def update_params(old_op, new_op):
     return new_op
 
 
-def find_Cascade_OP(layer_names):
-    Cascade_ops = []
-    for i in range(len(layer_names)):
-        if "_del" in layer_names[i] or "empty" in layer_names[i]:
-            continue
-        c1 = layer_names[i].split(".")
-        for j in range(i + 1, len(layer_names)):
-            if "_del" in layer_names[j] or "empty" in layer_names[i]:
-                continue
-            c2 = layer_names[j].split(".")
-            if layer_names[i] in layer_names[j] and len(c1) == len(c2) - 1:
-                Cascade_ops.append(layer_names[i])
-                break
-    return Cascade_ops
-
-
 def check_orderinfo_selfcorrect(model):
     orders = model.orders
     layer_names = list(orders.keys())
@@ -80,13 +66,13 @@ def find_Cascade_OP_shape(model, input_size, del_layer_name, yezi_ops):
         if isinstance(qianqu_info, list):
             for qianqu_info_single in qianqu_info:
                 flag1 = True
-                if not (del_layer_name in qianqu_info_single):
+                if not within(qianqu_info_single, del_layer_name):
                     flag = False
                     flag1 = False
                 if not flag1:
                     last_ops.append(qianqu_info_single)
         else:
-            if del_layer_name not in qianqu_info:
+            if not within(qianqu_info, del_layer_name):
                 flag = False
                 last_ops.append(qianqu_info)
 
@@ -100,7 +86,7 @@ def find_Cascade_OP_shape(model, input_size, del_layer_name, yezi_ops):
         if isinstance(houji_info, list):
             for houji_info_single in houji_info:
                 flag2 = True
-                if not (del_layer_name in houji_info_single):
+                if not within(houji_info_single, del_layer_name):
                     flag = False
                     flag2 = False
 
@@ -108,7 +94,7 @@ def find_Cascade_OP_shape(model, input_size, del_layer_name, yezi_ops):
                     next_ops.append(houji_info_single)
 
         else:
-            if not (del_layer_name in houji_info):
+            if not within(houji_info, del_layer_name):
                 flag = False
                 next_ops.append(houji_info)
 
@@ -131,20 +117,7 @@ def find_Cascade_OP_shape(model, input_size, del_layer_name, yezi_ops):
     return last_ops, next_ops, input_shapes, out_shapes
 
 
-def find_Child_leaf_OP(layer_names, del_layer_name, Basic_op_names, add_Cascade_OP_names):
-    yezi_ops = []
-    for layer_name in layer_names:
-        if "_del" in layer_name or "empty" in layer_name:
-            continue
-
-        flag = (del_layer_name in layer_name) and not (del_layer_name == layer_name) and \
-               (layer_name in Basic_op_names or layer_name in add_Cascade_OP_names)
-        if flag:
-            yezi_ops.append(layer_name)
-
-    return yezi_ops
-
-
+@profiled(cat="legality")
 def judge_legenacy(model, input_size, train_configs):
     batch_size = input_size[0]
     input_sizes = train_configs["input_size"]
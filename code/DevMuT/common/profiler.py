@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import functools
+import threading
+
+_state = {"enabled": False, "max_events": 1000000}
+_events = []
+_stats = {}
+_lock = threading.Lock()
+_origin = time.perf_counter_ns()
+
+
+def enable(flag=True, max_events=1000000):
+    _state["enabled"] = bool(flag)
+    _state["max_events"] = int(max_events)
+
+
+def enabled():
+    return _state["enabled"]
+
+
+def reset():
+    with _lock:
+        del _events[:]
+        _stats.clear()
+
+
+def _now_us():
+    return (time.perf_counter_ns() - _origin) / 1000.0
+
+
+def _record(name, cat, start_us, dur_us):
+    with _lock:
+        stat = _stats.get(name)
+        if stat is None:
+            stat = _stats[name] = [cat, 0, 0.0, 0.0]
+        stat[1] += 1
+        stat[2] += dur_us
+        stat[3] = max(stat[3], dur_us)
+        if len(_events) < _state["max_events"]:
+            _events.append({"name": name, "cat": cat, "ph": "X", "ts": start_us, "dur": dur_us,
+                            "pid": os.getpid(), "tid": threading.get_ident()})
+
+
+class span:
+    """
+    Times the enclosed block as one Chrome-trace "complete" event and adds it to the per-name summary.
+    Costs one flag check when profiling is disabled.
+    """
+    __slots__ = ("name", "cat", "start")
+
+    def __init__(self, name, cat=""):
+        self.name = name
+        self.cat = cat
+        self.start = None
+
+    def __enter__(self):
+        if _state["enabled"]:
+            self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.start is not None:
+            _record(self.name, self.cat, self.start, _now_us() - self.start)
+        return False
+
+
+def profiled(name=None, cat=""):
+    """
+    Decorator form of span; the span name defaults to the function name.
+    """
+
+    def decorator(fn):
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _state["enabled"]:
+                return fn(*args, **kwargs)
+            start = _now_us()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _record(span_name, cat, start, _now_us() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def counter(name, value):
+    if not _state["enabled"]:
+        return
+    with _lock:
+        if len(_events) < _state["max_events"]:
+            _events.append({"name": name, "ph": "C", "ts": _now_us(), "pid": os.getpid(),
+                            "args": {name: value}})
+
+
+def save_trace(path):
+    """
+    Chrome trace / Perfetto JSON of everything recorded so far (load it in chrome://tracing or ui.perfetto.dev).
+    """
+    with _lock:
+        events = list(_events)
+    for tid in sorted(set(val["tid"] for val in events if "tid" in val)):
+        name = "main" if tid == threading.main_thread().ident else "thread-{}".format(tid)
+        events.append({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}})
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return path
+
+
+def summary_table():
+    """
+    Per-span count, total, mean and max time, sorted by total time.
+    """
+    with _lock:
+        rows = sorted(_stats.items(), key=lambda val: -val[1][2])
+    lines = ["{:<40}{:<12}{:>8}{:>12}{:>12}{:>12}".format("span", "category", "count", "total(s)", "mean(ms)",
+                                                         "max(ms)")]
+    for name, (cat, count, total, max_dur) in rows:
+        lines.append("{:<40}{:<12}{:>8}{:>12.2f}{:>12.2f}{:>12.2f}".format(
+            name[:39], cat[:11], count, total / 1e6, total / 1e3 / max(count, 1), max_dur / 1e3))
+    return "\n".join(lines)
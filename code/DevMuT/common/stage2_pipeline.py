@@ -0,0 +1,103 @@
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_DONE = object()
+
+
+class MutantPrefetcher:
+    """
+    Producer side of the stage-2 pipeline: `build_fn(generation)` rebuilds the (MindSpore, PyTorch) mutant pair
+    of each selected generation in a background thread, at most `depth` generations ahead of the consumer, so
+    the reconstruction of generation k+1 overlaps the cross-framework inference of generation k.
+    With depth 0 every pair is built in the consumer thread when it is needed.
+    """
+
+    def __init__(self, build_fn, generations, depth=1):
+        self.build_fn = build_fn
+        self.generations = list(generations)
+        self.depth = depth
+        self.queue = queue.Queue(maxsize=max(depth, 1))
+        self.stopped = threading.Event()
+        self.build_time = 0.0
+        self.wait_time = 0.0
+
+    def build(self, generation):
+        start_time = time.time()
+        models = self.build_fn(generation)
+        self.build_time += time.time() - start_time
+        return models
+
+    def produce(self):
+        for generation in self.generations:
+            if self.stopped.is_set():
+                break
+            try:
+                item = (generation, self.build(generation), None)
+            except Exception as e:
+                item = (generation, None, e)
+            self.queue.put(item)
+            if item[2] is not None:
+                break
+        self.queue.put(_DONE)
+
+    def __iter__(self):
+        if self.depth <= 0:
+            for generation in self.generations:
+                yield generation, self.build(generation)
+            return
+
+        thread = threading.Thread(target=self.produce, daemon=True)
+        thread.start()
+        try:
+            while True:
+                start_time = time.time()
+                item = self.queue.get()
+                self.wait_time += time.time() - start_time
+                if item is _DONE:
+                    break
+                generation, models, error = item
+                if error is not None:
+                    raise error
+                yield generation, models
+        finally:
+            # unblock a producer waiting on a full queue when the consumer stops early
+            self.stopped.set()
+            while thread.is_alive():
+                try:
+                    self.queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+
+class DualForward:
+    """
+    Runs the PyTorch forward of a slice on a helper thread while the calling thread runs the MindSpore forward,
+    each framework on its own device. Both release the GIL inside their kernels.
+    """
+
+    def __init__(self, concurrent=True):
+        self.executor = ThreadPoolExecutor(max_workers=1) if concurrent else None
+        self.forward_time = 0.0
+
+    def __call__(self, ms_fn, torch_fn):
+        start_time = time.time()
+        if self.executor is None:
+            outputs = ms_fn(), torch_fn()
+        else:
+            future = self.executor.submit(torch_fn)
+            output_ms = ms_fn()
+            outputs = output_ms, future.result()
+        self.forward_time += time.time() - start_time
+        return outputs
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+
+def pipeline_summary(prefetcher, dual_forward, wall_time):
+    return "stage2 pipeline: {} generations, rebuild:{:.1f}s, forward:{:.1f}s, waiting for rebuild:{:.1f}s, " \
+           "wall:{:.1f}s".format(len(prefetcher.generations), prefetcher.build_time, dual_forward.forward_time,
+                                 prefetcher.wait_time, wall_time)
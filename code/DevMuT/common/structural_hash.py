@@ -0,0 +1,118 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+
+def iter_leaves(model):
+    """
+    (name, layer) of every leaf cell/module, for MindSpore Cells and PyTorch Modules alike.
+    """
+    if hasattr(model, "cells_and_names"):
+        for name, cell in model.cells_and_names():
+            if name and len(cell.name_cells()) == 0:
+                yield name, cell
+    else:
+        for name, module in model.named_modules():
+            if name and len(module._modules) == 0:
+                yield name, module
+
+
+def _layer_params(layer):
+    if hasattr(layer, "get_parameters"):
+        return [param.asnumpy() for param in layer.get_parameters()]
+    tensors = list(layer.parameters(recurse=False)) + list(layer.buffers(recurse=False))
+    return [tensor.detach().cpu().numpy() for tensor in tensors]
+
+
+def _layer_repr(layer):
+    # hyperparameters as the framework prints them: extend_repr for MindSpore, extra_repr for PyTorch
+    repr_fn = getattr(layer, "extend_repr", None) or getattr(layer, "extra_repr", None)
+    return repr_fn() if repr_fn is not None else ""
+
+
+def layer_digest(layer, weights=True):
+    digest = hashlib.sha1()
+    digest.update(layer.__class__.__name__.encode("utf-8"))
+    digest.update(_layer_repr(layer).encode("utf-8"))
+    for value in _layer_params(layer):
+        digest.update("{}{}".format(value.shape, value.dtype).encode("utf-8"))
+        if weights:
+            digest.update(np.ascontiguousarray(value).tobytes())
+    return digest.hexdigest()
+
+
+def topology_digest(model):
+    orders = getattr(model, "orders", None)
+    if not isinstance(orders, dict):
+        return ""
+    return hashlib.sha1(str(sorted((key, str(val)) for key, val in orders.items())).encode("utf-8")).hexdigest()
+
+
+def _touches(name, changed):
+    return any(name == val or name.startswith(val + ".") or val.startswith(name + ".") for val in changed)
+
+
+class StructuralIndex:
+    """
+    Campaign-wide index of mutant fingerprints: layer types, hyperparameters and parameter shapes/dtypes of
+    every leaf, the `orders` topology and (with `weights`) a digest of the weights.
+
+    The per-layer digests of recent mutants are kept by key (0 for the seed, otherwise the generation), so the
+    fingerprint of a mutant only re-hashes the layers its mutation changed. The caller only passes `changed` when
+    the model is exactly the parent plus that mutation (see common/model_states.py); without it every layer is
+    hashed. A fingerprint seen before maps to the generation that produced it and its score, which duplicates
+    reuse instead of being scored again.
+    """
+
+    def __init__(self, weights=True, capacity=8):
+        self.weights = weights
+        self.capacity = capacity
+        self.layer_digests = OrderedDict()
+        self.scores = {}
+        self.generations = {}
+        self.duplicates = {}
+        self.layers_hashed = 0
+        self.layers_reused = 0
+
+    def fingerprint(self, model, parent_key=None, changed=None, new_key=None):
+        parent = None
+        if parent_key is not None and changed is not None:
+            parent = self.layer_digests.get(parent_key)
+        digests = {}
+        for name, layer in iter_leaves(model):
+            if parent is not None and name in parent and not _touches(name, changed):
+                digests[name] = parent[name]
+                self.layers_reused += 1
+            else:
+                digests[name] = layer_digest(layer, self.weights)
+                self.layers_hashed += 1
+        if new_key is not None and self.capacity > 0:
+            self.layer_digests[new_key] = digests
+            self.layer_digests.move_to_end(new_key)
+            while len(self.layer_digests) > self.capacity + 1:
+                evict = [val for val in self.layer_digests.keys() if not val == 0]
+                if len(evict) == 0:
+                    break
+                self.layer_digests.pop(evict[0])
+        digest = hashlib.sha1(topology_digest(model).encode("utf-8"))
+        for name in sorted(digests.keys()):
+            digest.update("{}:{};".format(name, digests[name]).encode("utf-8"))
+        return digest.hexdigest()
+
+    def lookup(self, fingerprint):
+        """
+        (generation, score) of the first mutant with this fingerprint, or None.
+        """
+        return self.scores.get(fingerprint)
+
+    def add(self, generation, fingerprint, score):
+        self.generations[generation] = fingerprint
+        if fingerprint in self.scores:
+            self.duplicates[generation] = self.scores[fingerprint][0]
+        else:
+            self.scores[fingerprint] = (generation, score)
+
+    def summary(self):
+        total = self.layers_hashed + self.layers_reused
+        return "structural index: {} mutants, {} distinct, {} duplicates skipped, layers hashed:{}/{}".format(
+            len(self.generations), len(self.scores), len(self.duplicates), self.layers_hashed, total)
@@ -0,0 +1,191 @@
+import time
+import numpy as np
+from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor
+from common.mutation_journal import get_journal
+
+
+class MutationSurrogate:
+    """
+    Online surrogate of the stage-1 mutation outcome, so operators that are predicted to fail (or to score low)
+    on the current parent are passed over before any operator code, legality check or rebuild is run.
+
+    Only what is known before the mutation is used as features: the operator, the operator that produced the
+    parent, the depth of the parent's execution trace, the parent's score and its number of layers. Every executed
+    mutation adds a sample labelled from its journal record (and its score, for the successful ones); the
+    gradient-boosted models are refit every `refit` samples once `warmup` samples exist. A fraction `explore` of
+    the rejected proposals is executed anyway, so the surrogate keeps seeing the operators it advises against.
+    """
+
+    def __init__(self, mutation_types, log_path, enabled=False, warmup=30, refit=20, min_prob=0.2,
+                 score_quantile=0.25, explore=0.1):
+        self.mutation_types = list(mutation_types)
+        self.op_ids = {op: idx for idx, op in enumerate(self.mutation_types)}
+        self.log_path = log_path
+        self.enabled = enabled
+        self.warmup = warmup
+        self.refit = refit
+        self.min_prob = min_prob
+        self.score_quantile = score_quantile
+        self.explore = explore
+        self.samples, self.labels = [], []
+        self.score_samples, self.score_labels = [], []
+        self.pending = {}
+        self.expired = 0
+        self.scores = {}
+        self.classifier = None
+        self.regressor = None
+        self.score_threshold = None
+        self.fitted_size = 0
+        self.predictions = 0
+        self.hits = 0
+        self.skipped = 0
+        self.skipped_ops = {}
+        self.fail_time = {}
+        self.fit_time = 0.0
+
+    def context(self, model, parent_traces):
+        """
+        Operator-independent features of the parent: (operator of its last generation, depth, score, layers).
+        """
+        parent_traces = [val for val in parent_traces if not val == "seed"]
+        record = get_journal(self.log_path).get(parent_traces[-1]) if len(parent_traces) > 0 else None
+        parent_score = 0.0
+        for generation in reversed(parent_traces):
+            if generation in self.scores:
+                parent_score = self.scores[generation]
+                break
+        num_layers = len(model.layer_names) if hasattr(model, "layer_names") else 0
+        return None if record is None else record["operator"], len(parent_traces), parent_score, num_layers
+
+    def features(self, operator, context):
+        vec = np.zeros(2 * len(self.mutation_types) + 4, dtype=np.float32)
+        vec[self.op_ids[operator]] = 1
+        if context[0] in self.op_ids:
+            vec[len(self.mutation_types) + self.op_ids[context[0]]] = 1
+        vec[-4] = context[0] is None
+        vec[-3:] = context[1:]
+        return vec
+
+    def predict(self, operator, context):
+        """
+        (probability of success, predicted score), or None before the first fit.
+        """
+        if self.classifier is None:
+            return None
+        vec = self.features(operator, context).reshape(1, -1)
+        if isinstance(self.classifier, float):
+            prob = self.classifier
+        else:
+            prob = float(self.classifier.predict_proba(vec)[0][1])
+        score = None if self.regressor is None else float(self.regressor.predict(vec)[0])
+        return prob, score
+
+    def accepts(self, prediction):
+        if prediction is None:
+            return True
+        prob, score = prediction
+        if prob < self.min_prob:
+            return False
+        return self.score_threshold is None or score is None or score >= self.score_threshold
+
+    def select(self, proposals, context, limit=1):
+        """
+        The first `limit` operators of `proposals` (in the caller's order of preference) the surrogate does not
+        advise against. If every proposal is rejected, the one most likely to succeed is returned.
+        """
+        proposals = list(proposals)
+        if not self.enabled or self.classifier is None:
+            return proposals[:limit]
+        selected, predictions = [], {}
+        for operator in proposals:
+            if len(selected) >= limit:
+                break
+            predictions[operator] = self.predict(operator, context)
+            if self.accepts(predictions[operator]) or np.random.rand() < self.explore:
+                selected.append(operator)
+            else:
+                self.skipped += 1
+                self.skipped_ops[operator] = self.skipped_ops.get(operator, 0) + 1
+        if len(selected) == 0:
+            best = max(predictions.keys(), key=lambda val: predictions[val][0])
+            # the fallback is executed after all, so it is not a saved mutation
+            self.skipped -= 1
+            self.skipped_ops[best] -= 1
+            selected.append(best)
+        return selected
+
+    def begin(self, generation, operator, context):
+        if not self.enabled:
+            return
+        # a mutant is scored right after its mutation, so a pending entry of an earlier generation never will be
+        # (a mutation that succeeded but was not scored); it already counts as a sample and is dropped here
+        self.expired += len(self.pending)
+        self.pending.clear()
+        self.pending[generation] = (operator, context, self.predict(operator, context), time.time())
+
+    def observe(self, generation, mut_result):
+        """
+        Label the mutation of `generation` with its journal record once the operator has returned.
+        """
+        if generation not in self.pending:
+            return
+        operator, context, prediction, start_time = self.pending[generation]
+        cost_time = time.time() - start_time
+        record = get_journal(self.log_path).get(generation)
+        success = record["success"] if record is not None else mut_result == "True" or mut_result is True
+        if prediction is not None:
+            self.predictions += 1
+            self.hits += int((prediction[0] >= self.min_prob) == success)
+        if not success:
+            self.pending.pop(generation)
+            times = self.fail_time.setdefault(operator, [0.0, 0])
+            times[0] += cost_time
+            times[1] += 1
+        self.samples.append(self.features(operator, context))
+        self.labels.append(int(success))
+        if len(self.labels) >= self.warmup and len(self.labels) - self.fitted_size >= self.refit:
+            self.fit()
+
+    def observe_score(self, generation, score):
+        if generation not in self.pending:
+            return
+        operator, context = self.pending.pop(generation)[:2]
+        self.scores[generation] = float(score)
+        self.score_samples.append(self.features(operator, context))
+        self.score_labels.append(float(score))
+
+    def fit(self):
+        start_time = time.time()
+        labels = np.array(self.labels)
+        if labels.min() == labels.max():
+            self.classifier = float(labels[0])
+        else:
+            self.classifier = GradientBoostingClassifier(n_estimators=50, max_depth=3)
+            self.classifier.fit(np.stack(self.samples), labels)
+        if len(self.score_labels) >= self.warmup // 2:
+            self.regressor = GradientBoostingRegressor(n_estimators=50, max_depth=3)
+            self.regressor.fit(np.stack(self.score_samples), np.array(self.score_labels))
+            if self.score_quantile > 0:
+                self.score_threshold = float(np.quantile(self.score_labels, self.score_quantile))
+        self.fitted_size = len(self.labels)
+        self.fit_time += time.time() - start_time
+
+    def saved_time(self):
+        # a skipped mutation is charged the mean time of the failed mutations of its operator (or of all operators)
+        total_time = sum(val[0] for val in self.fail_time.values())
+        total_count = sum(val[1] for val in self.fail_time.values())
+        saved = 0.0
+        for operator, count in self.skipped_ops.items():
+            times = self.fail_time.get(operator)
+            if times is not None and times[1] > 0:
+                saved += count * times[0] / times[1]
+            elif total_count > 0:
+                saved += count * total_time / total_count
+        return saved
+
+    def summary(self):
+        hit_rate = self.hits / self.predictions if self.predictions > 0 else 0.0
+        return "surrogate: {} samples, {} predictions, hit rate:{:.3f}, skipped:{} {}, saved time:{:.1f}s, " \
+               "fit time:{:.1f}s, unscored:{}".format(len(self.labels), self.predictions, hit_rate, self.skipped,
+                                                     self.skipped_ops, self.saved_time(), self.fit_time,
+                                                     self.expired)
@@ -0,0 +1,100 @@
+import numpy as np
+from common.eligibility import EligibilityIndex, layer_categories
+
+
+class Param:
+    def __init__(self, shape):
+        self.shape = shape
+
+
+class Layer:
+    def __init__(self, *shapes):
+        self.params = [Param(shape) for shape in shapes]
+
+    def get_parameters(self):
+        return iter(self.params)
+
+
+class Conv2d(Layer):
+    pass
+
+
+class Dense(Layer):
+    pass
+
+
+class ReLU(Layer):
+    pass
+
+
+class Replace_ms(Layer):
+    pass
+
+
+class SequentialCell(Layer):
+    def __init__(self, cells):
+        super(SequentialCell, self).__init__()
+        self.cells = cells
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __getitem__(self, idx):
+        return self.cells[idx]
+
+
+class Model:
+    def __init__(self):
+        self.layer_names = {"conv1": Conv2d((8, 3, 3, 3)), "relu": ReLU(), "fc": Dense((10, 8), (10,)),
+                            "block": SequentialCell([ReLU(), Replace_ms()]), "conv2": Conv2d((8, 8, 3, 3))}
+        self.Basic_OPS = ["conv1", "relu", "fc"]
+        self.add_Cascade_OPs = ["block"]
+
+    def get_layers(self, layer_name):
+        if layer_name not in self.layer_names:
+            return False
+        return self.layer_names[layer_name]
+
+
+def test_layer_categories():
+    assert layer_categories(Conv2d((8, 3, 3, 3))) == {"weighted", "conv_dense", "weight_change", "insertable"}
+    assert layer_categories(ReLU()) == {"insertable"}
+    assert "insertable" not in layer_categories(SequentialCell([ReLU(), Replace_ms()]))
+    assert "insertable" in layer_categories(SequentialCell([Replace_ms(), ReLU()]))
+
+
+def test_draw_only_returns_candidates_of_the_category():
+    np.random.seed(0)
+    model = Model()
+    index = EligibilityIndex(model, model.layer_names.keys())
+    # conv2 is conv/dense but not a mutation candidate
+    assert sorted(index.members["candidate:conv_dense"]) == ["conv1", "fc"]
+    assert {index.draw("WS") for _ in range(50)} == {"conv1", "fc"}
+    assert {index.draw("NS") for _ in range(50)} == {"conv1", "fc"}
+
+
+def test_sync_and_update_keep_categories_current():
+    np.random.seed(0)
+    model = Model()
+    index = EligibilityIndex(model, model.layer_names.keys())
+    model.Basic_OPS = ["relu", "fc"]
+    model.add_Cascade_OPs = ["block", "conv2"]
+    index.sync(model)
+    assert sorted(index.members["candidate:conv_dense"]) == ["conv2", "fc"]
+    assert sorted(index.members["conv_dense"]) == ["conv1", "conv2", "fc"]
+
+    index.update("fc", ReLU())
+    assert index.members["candidate:conv_dense"] == ["conv2"]
+    assert index.draw("WS") == "conv2"
+
+    model.add_Cascade_OPs = ["block"]
+    index.sync(model)
+    assert index.draw("WS") is None
+
+
+def test_filter_falls_back_to_all_candidates():
+    model = Model()
+    index = EligibilityIndex(model, model.layer_names.keys())
+    assert index.filter("LA", ["relu", "block"]) == ["relu"]
+    assert index.filter("LA", ["block"]) == ["block"]
+    assert index.filter("LS", ["block"]) == ["block"]
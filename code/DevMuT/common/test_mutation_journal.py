@@ -0,0 +1,124 @@
+import os
+import json
+import pytest
+from common.mutation_journal import MutationJournal, JournalRecordError, parse_mutation_block, replayable, \
+    make_record, render_text
+
+
+def block(*lines):
+    return [line + "\n" for line in lines]
+
+
+def write_text(path, blocks):
+    with open(path, "w") as f:
+        for lines in blocks:
+            f.writelines(lines)
+
+
+LD_BLOCK = block("Adopt LD mut_strategy!", "delete layer_name:layer1.0.conv1", "candidate_in_mutlayers_indice:-1",
+                 "mut_result:True", "1 generation!", "")
+LS_BLOCK = block("Adopt LS mut_strategy!", "switch layer1:layer1.0.relu", "switch layer2:layer2.0.relu",
+                 "mut_result:True", "2 generation!", "")
+WS_BLOCK = block("Adopt WS mut_strategy!", "candidate_in_mutlayers_indice:-1", "select layer:conv1",
+                 "layer type:Conv2d", "mutation_ratio:0.3", "mut_result:True", "3 generation!", "")
+LA_BLOCK = block("Adopt LA mut_strategy!",
+                 "select layer: layer1.0 layer_type: <class 'Bottleneck'> in_shape: [1, 64, 56, 56]",
+                 "mut Basic type: False", "add Basic layer : Cascade_op", "candidate_in_mutlayers_indice:2",
+                 "select insert layer: dwpw_group<", "  (depthwise): dwpw_basic<", "    (dwpw_activation): ReLU6<>", ">",
+                 "mut_result:True", "4 generation!", "")
+PM_BLOCK = block("Adopt PM mut_strategy!", "candidate_in_mutlayers_indice:-1",
+                 "select op: conv1 layer_type: Conv2d selected param:kernel_size input_shape:[1, 3] output_shape:[1, 8]",
+                 "Edit value: (5, 5) new_inshape: (1, 3) new_outshape: (1, 8)", "mut_result:True", "5 generation!", "")
+SM_BLOCK = block("Adopt SM mut_strategy!",
+                 "select layer: fc layer_type: <class 'Dense'> in_shape: [1, 2048]", "mut Basic type: True",
+                 "candidate_in_mutlayers_indice:-1", "mutate state: all", "mutate input_shape: [1, 12, 7]",
+                 "mutate output_shape: [1, 9]", "mut_result:True", "6 generation!", "")
+DM_BLOCK = block("Adopt DM mut_strategy!",
+                 "select layer: fc layer_type: <class 'Dense'> in_shape: [1, 2048]", "mut Basic type: True",
+                 "candidate_in_mutlayers_indice:-1", "in_dtype:Float16", "mut_result:True", "7 generation!", "")
+
+
+def test_parse_blocks_per_operator():
+    assert parse_mutation_block(LD_BLOCK)["args"] == {"del_layer_name": "layer1.0.conv1", "mutate_layer_indice": -1}
+    assert parse_mutation_block(LS_BLOCK)["args"] == {"mut_layer_name1": "layer1.0.relu",
+                                                      "mut_layer_name2": "layer2.0.relu"}
+    assert parse_mutation_block(WS_BLOCK)["args"] == {"mut_layer_name": "conv1", "mutation_ratio": 0.3,
+                                                      "mutate_layer_indice": -1}
+    assert parse_mutation_block(LA_BLOCK)["args"] == {"mut_layer_isBasic": False, "mut_layer_name": "layer1.0",
+                                                      "add_layer_type": "Cascade_op", "add_layer_info": "dwpw_group",
+                                                      "activation_name": "ReLU6", "mutate_layer_indice": 2}
+    assert parse_mutation_block(PM_BLOCK)["args"] == {"mutate_layer_name": "conv1", "mutate_layer_indice": -1,
+                                                      "mutate_param_selname": "kernel_size", "mut_value": [5, 5]}
+    assert parse_mutation_block(SM_BLOCK)["args"] == {"mut_layer_isBasic": True, "mut_layer_name": "fc",
+                                                      "mut_state": 2, "input_shape_mut": [1, 12, 7],
+                                                      "output_shape_mut": [1, 9], "mutate_layer_indice": -1}
+    assert parse_mutation_block(DM_BLOCK)["args"] == {"mut_layer_isBasic": True, "mut_layer_name": "fc",
+                                                      "newdtype": "float16", "mutate_layer_indice": -1}
+    record = parse_mutation_block(DM_BLOCK)
+    assert (record["generation"], record["operator"], record["success"], record["skip"]) == (7, "DM", True, False)
+
+
+def test_skip_results_are_not_replayed():
+    record = parse_mutation_block(block("Adopt WS mut_strategy!", "mut_result:No suitable ops for WS mutation!",
+                                        "8 generation!", ""))
+    assert record["skip"] and record["args"] is None
+    assert not replayable(record)
+
+    record = parse_mutation_block(block("Adopt LA mut_strategy!", "mut_result:Create illegal layer!",
+                                        "9 generation!", ""))
+    assert record["skip"] and not record["success"]
+    assert not replayable(record)
+
+
+def test_parse_error_raises_on_replay():
+    # a PM block without its "Edit value" line can not be replayed
+    record = parse_mutation_block(PM_BLOCK[:3] + PM_BLOCK[4:])
+    assert record["args"] is None and "error" in record
+    with pytest.raises(JournalRecordError):
+        replayable(record)
+
+    record = make_record(10, "LD", True, {"del_layer_name": None, "mutate_layer_indice": -1})
+    assert "error" in record
+    with pytest.raises(JournalRecordError):
+        replayable(record)
+
+
+def test_recorder_commit_renders_text(tmp_path):
+    text_path = str(tmp_path / "mutation.txt")
+    journal = MutationJournal(text_path)
+    f = journal.recorder(1, "LS")
+    f.write("Adopt LS mut_strategy!\n")
+    f.record(mut_layer_name1="a", mut_layer_name2="b")
+    record = journal.commit("True")
+    assert record["args"] == {"mut_layer_name1": "a", "mut_layer_name2": "b"} and replayable(record)
+    assert journal.get(1) == record
+    with open(text_path) as f:
+        assert f.read() == "Adopt LS mut_strategy!\nmut_result:True\n1 generation!\n\n"
+    assert render_text(record).endswith("1 generation!\n\n")
+
+
+def test_import_text(tmp_path):
+    text_path = str(tmp_path / "mutation.txt")
+    write_text(text_path, [LD_BLOCK, LS_BLOCK, block("mutation trace: {}"), WS_BLOCK])
+    journal = MutationJournal(text_path)
+    assert len(journal) == 3 and journal.success_count == 3
+    assert [val["generation"] for val in journal.select([3, 1, 42])] == [1, 3]
+    assert os.path.exists(str(tmp_path / "mutation.jsonl"))
+
+
+def test_offsets_after_incremental_sync(tmp_path):
+    text_path = str(tmp_path / "mutation.txt")
+    writer, reader = MutationJournal(text_path), MutationJournal(text_path)
+    writer.append(parse_mutation_block(LD_BLOCK))
+    assert reader.sync() == 1 and reader.get(1)["operator"] == "LD"
+
+    writer.append(parse_mutation_block(LS_BLOCK))
+    writer.append(parse_mutation_block(WS_BLOCK))
+    # a record still being written is not indexed until its line is complete
+    with open(writer.journal_path, "a") as f:
+        f.write(json.dumps(parse_mutation_block(PM_BLOCK))[:20])
+    assert reader.sync() == 2
+    assert reader.get(2)["args"]["mut_layer_name2"] == "layer2.0.relu"
+    assert reader.get(3)["args"]["mut_layer_name"] == "conv1"
+    assert 5 not in reader
+    assert [val["generation"] for val in reader.select([3, 2, 1])] == [1, 2, 3]
@@ -0,0 +1,43 @@
+from common.topology import LayerTree, within, find_Child_leaf_OP, find_Cascade_OP
+
+LAYER_NAMES = ["conv1", "layer1", "layer1.0", "layer1.0.conv1", "layer1.0.relu", "layer1.1", "layer1.1.conv1",
+               "layer1.1.empty", "layer10", "layer10.conv", "head", "head.fc_del", "fc"]
+BASIC_OPS = ["conv1", "layer1.0.conv1", "layer1.0.relu", "layer1.1.empty", "layer10.conv", "fc"]
+ADD_CASCADE_OPS = ["layer1.1"]
+
+
+def test_within_matches_by_path():
+    assert within("layer1.0", "layer1")
+    assert within("layer1", "layer1")
+    assert not within("layer10", "layer1")
+
+
+def test_tree_structure():
+    tree = LayerTree(LAYER_NAMES)
+    assert len(tree) == len(LAYER_NAMES)
+    assert tree.depth[tree.ids["layer1.0.conv1"]] == 3
+    assert tree.parent[tree.ids["layer1.0.conv1"]] == tree.ids["layer1.0"]
+    assert tree.parent[tree.ids["conv1"]] == -1
+    assert tree.children("layer1") == ["layer1.0", "layer1.1"]
+    assert tree.children("missing") == []
+
+
+def test_descendants_are_a_subtree_range():
+    tree = LayerTree(LAYER_NAMES)
+    assert tree.descendants("layer1") == ["layer1.0", "layer1.0.conv1", "layer1.0.relu", "layer1.1",
+                                          "layer1.1.conv1", "layer1.1.empty"]
+    assert tree.descendants("layer10") == ["layer10.conv"]
+    assert tree.descendants("fc") == []
+
+
+def test_cascade_ops_skip_deleted_children():
+    # "head" only has a deleted child, so it is no longer a cascade op
+    assert find_Cascade_OP(LAYER_NAMES) == ["layer1", "layer1.0", "layer1.1", "layer10"]
+
+
+def test_leaf_ops_match_the_scan():
+    tree = LayerTree(LAYER_NAMES)
+    for name in ["layer1", "layer1.0", "layer10", "fc"]:
+        assert find_Child_leaf_OP(LAYER_NAMES, name, BASIC_OPS, ADD_CASCADE_OPS, tree) == \
+               find_Child_leaf_OP(LAYER_NAMES, name, BASIC_OPS, ADD_CASCADE_OPS)
+    assert tree.leaf_ops("layer1", BASIC_OPS, ADD_CASCADE_OPS) == ["layer1.0.conv1", "layer1.0.relu", "layer1.1"]
@@ -0,0 +1,88 @@
+from bisect import bisect_left, bisect_right
+import numpy as np
+
+
+def within(name, ancestor):
+    """
+    True if `name` is `ancestor` or one of the layers nested under it (by path, so "layers.1" does not contain
+    "layers.10").
+    """
+    return name == ancestor or name.startswith(ancestor + ".")
+
+
+def _skipped(name):
+    return "_del" in name or "empty" in name
+
+
+class LayerTree:
+    """
+    Module hierarchy of a model's dotted layer names as a prefix tree with integer node ids.
+
+    Node ids follow the order of `layer_names`; `parent` and `depth` are arrays over the ids. The names are also
+    kept sorted by path, where every subtree is a contiguous range, so the layers under a name are found with
+    two binary searches instead of a scan over every layer name.
+    """
+
+    def __init__(self, layer_names):
+        self.names = list(layer_names)
+        self.ids = {name: idx for idx, name in enumerate(self.names)}
+        paths = [tuple(name.split(".")) for name in self.names]
+        self.depth = np.array([len(path) for path in paths], dtype=np.int32)
+        self.parent = np.array([self.ids.get(".".join(path[:-1]), -1) for path in paths], dtype=np.int32)
+        self.order = sorted(range(len(paths)), key=lambda idx: paths[idx])
+        self.sorted_paths = [paths[idx] for idx in self.order]
+
+    def __len__(self):
+        return len(self.names)
+
+    def descendant_ids(self, name):
+        path = tuple(name.split("."))
+        lo = bisect_right(self.sorted_paths, path)
+        hi = bisect_left(self.sorted_paths, path + ("\U0010ffff",), lo)
+        return sorted(self.order[lo:hi])
+
+    def descendants(self, name):
+        """
+        Layers nested under `name` (excluding itself), in layer_names order.
+        """
+        return [self.names[idx] for idx in self.descendant_ids(name)]
+
+    def children(self, name):
+        idx = self.ids.get(name)
+        if idx is None:
+            return []
+        return [self.names[val] for val in np.flatnonzero(self.parent == idx)]
+
+    def cascade_ops(self):
+        """
+        Layers with at least one direct child, skipping deleted/empty placeholders (what find_Cascade_OP
+        returns), in layer_names order.
+        """
+        has_child = np.zeros(len(self.names), dtype=bool)
+        for idx, name in enumerate(self.names):
+            if self.parent[idx] >= 0 and "_del" not in name:
+                has_child[self.parent[idx]] = True
+        return [name for idx, name in enumerate(self.names) if has_child[idx] and not _skipped(name)]
+
+    def leaf_ops(self, del_layer_name, Basic_op_names, add_Cascade_OP_names):
+        """
+        find_Child_leaf_OP on the tree.
+        """
+        ops = set(Basic_op_names) | set(add_Cascade_OP_names)
+        return [name for name in self.descendants(del_layer_name) if name in ops and not _skipped(name)]
+
+
+def find_Child_leaf_OP(layer_names, del_layer_name, Basic_op_names, add_Cascade_OP_names, tree=None):
+    """
+    Basic ops and added cascade ops nested under `del_layer_name`. With the model's LayerTree the lookup is a
+    subtree range; otherwise one pass over `layer_names` with set membership.
+    """
+    if tree is not None:
+        return tree.leaf_ops(del_layer_name, Basic_op_names, add_Cascade_OP_names)
+    ops = set(Basic_op_names) | set(add_Cascade_OP_names)
+    return [name for name in layer_names if not _skipped(name) and not name == del_layer_name and
+            within(name, del_layer_name) and name in ops]
+
+
+def find_Cascade_OP(layer_names):
+    return LayerTree(layer_names).cascade_ops()
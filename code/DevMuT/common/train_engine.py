@@ -0,0 +1,416 @@
+import os
+import time
+import numpy as np
+import psutil
+import torch
+import mindspore
+import jax
+import jax.numpy as jnp
+import optax
+from common.dataset_utils import get_dataset
+from common.loss_utils import get_loss
+from common.opt_utils import get_optimizer
+from common.analyzelog_util import train_result_analyze
+from common.state_utils import TorchStateShadow, JaxTorchBridge
+from common.profiler import span
+
+jax_optimizers = {'SGD': optax.sgd, 'adam': optax.adam, 'adamweightdecay': optax.adamw}
+
+
+def get_train_device():
+    if "CONTEXT_DEVICE_TARGET" in os.environ and os.environ['CONTEXT_DEVICE_TARGET'] == 'GPU':
+        devices = os.environ['CUDA_VISIBLE_DEVICES'].split(",")
+        return "cuda:" + devices[-2]
+    return 'cpu'
+
+
+def chebyshev_distance(dict1, dict2):
+    return np.max(np.abs(dict1 - dict2))
+
+
+def _ms_tensor(array, dtype):
+    # zero-copy when the dataset already yields the dtype the network expects
+    if array.dtype == mindspore.dtype_to_nptype(dtype) and array.flags['C_CONTIGUOUS']:
+        return mindspore.Tensor.from_numpy(array)
+    return mindspore.Tensor(array, dtype)
+
+
+def _write_log(true_log_path, train_logger, line):
+    if true_log_path is not None:
+        f = open(true_log_path, 'a+')
+        f.write(line + "\n")
+        f.close()
+    train_logger.info(line)
+
+
+class TorchAdapter:
+    """
+    PyTorch side of a lockstep step. Inputs are copied into device buffers allocated on the first batch (and
+    again only when the batch shape changes), the loss is summed on the device.
+    """
+
+    def __init__(self, model, loss_fn, optimizer, device, input_dtype, label_dtype, loss_args=()):
+        self.model = model.to(device)
+        self.loss_fn = loss_fn.to(device)
+        self.optimizer = optimizer
+        self.device = device
+        self.dtypes = (input_dtype, label_dtype)
+        self.loss_args = loss_args
+        self.buffers = [None, None]
+        self.loss_sum = torch.zeros((), dtype=torch.float32, device=device)
+
+    def put(self, *arrays):
+        for idx, (array, dtype) in enumerate(zip(arrays, self.dtypes)):
+            host = torch.from_numpy(array)
+            if self.buffers[idx] is None or not tuple(self.buffers[idx].shape) == tuple(host.shape):
+                self.buffers[idx] = torch.empty(host.shape, dtype=dtype, device=self.device)
+            self.buffers[idx].copy_(host)
+        return self.buffers
+
+    def step(self):
+        data, label = self.buffers
+        output = self.model(data)
+        loss = self.loss_fn(output, label, *self.loss_args)
+        loss.backward()
+        self.optimizer.step()
+        self.optimizer.zero_grad(set_to_none=True)
+        loss = loss.detach()
+        self.loss_sum.add_(loss)
+        return loss
+
+    @torch.no_grad()
+    def forward(self):
+        return self.model(self.buffers[0])
+
+    def reset(self):
+        self.loss_sum.zero_()
+
+
+class MindSporeAdapter:
+    """
+    MindSpore side of a lockstep step. The grad function is built once, the loss is summed on the device and
+    only the gradient of the last parameter is kept for the sampled distances.
+    """
+
+    def __init__(self, model, loss_fn, optimizer, input_dtype, label_dtype, loss_args=()):
+        self.model = model
+        self.dtypes = (input_dtype, label_dtype)
+        self.loss_args = loss_args
+        self.optimizer = optimizer
+
+        def forward_fn(data, label):
+            return loss_fn(model(data), label, *loss_args)
+
+        self.grad_fn = mindspore.ops.value_and_grad(forward_fn, None, optimizer.parameters)
+        self.loss_sum = mindspore.Tensor(0.0, mindspore.float32)
+        self.last_grad = None
+
+    def put(self, data, label):
+        return _ms_tensor(data, self.dtypes[0]), _ms_tensor(label, self.dtypes[1])
+
+    def step(self, data, label):
+        loss, grads = self.grad_fn(data, label)
+        loss = mindspore.ops.depend(loss, self.optimizer(grads))
+        self.loss_sum = self.loss_sum + loss
+        self.last_grad = grads[-1]
+        return loss
+
+    def reset(self):
+        self.loss_sum = mindspore.Tensor(0.0, mindspore.float32)
+
+
+class JaxAdapter:
+    """
+    JAX side of a lockstep step: the JAX params are evaluated through the PyTorch module (parked by the state
+    shadow) and updated with optax. Loss, gradient and update are one jitted call, compiled once per batch shape.
+    """
+
+    def __init__(self, params, loss_fn, optimizer, loss_args=()):
+        self.params = params
+        self.optimizer = optimizer
+        self.opt_state = optimizer.init(params)
+        self.loss_sum = jnp.zeros((), dtype=jnp.float32)
+
+        def step_fn(params, opt_state, loss_sum, output, label):
+            loss, grads = jax.value_and_grad(lambda params_: loss_fn(output, label, *loss_args))(params)
+            updates, opt_state = optimizer.update(grads, opt_state, params)
+            return loss, optax.apply_updates(params, updates), opt_state, loss_sum + loss
+
+        self.step_fn = jax.jit(step_fn)
+
+    def step(self, output, label):
+        loss, self.params, self.opt_state, self.loss_sum = self.step_fn(self.params, self.opt_state, self.loss_sum,
+                                                                        output, label)
+        return loss
+
+    def reset(self):
+        self.loss_sum = jnp.zeros((), dtype=jnp.float32)
+
+
+def classification_jax_loss(output, label, *args):
+    return optax.softmax_cross_entropy(output, jax.nn.one_hot(label, output.shape[-1])).mean()
+
+
+def unet_jax_loss(output, label, *args):
+    # same as CrossEntropyWithLogits: channels last, class index is the argmax of the one-hot mask
+    output = jnp.transpose(output, (0, 2, 3, 1)).reshape(-1, output.shape[1])
+    label = jnp.transpose(label, (0, 2, 3, 1)).reshape(-1, label.shape[1])
+    return optax.softmax_cross_entropy_with_integer_labels(output, jnp.argmax(label, axis=1)).mean()
+
+
+def textcnn_jax_loss(output, label, num_classes):
+    return optax.softmax_cross_entropy(output, jax.nn.one_hot(label, num_classes)).mean()
+
+
+def classification_metric(engine, test_iter):
+    """
+    Accuracy of both models on the test set, counted on the devices and read back once.
+    """
+    family = engine.family
+    correct_torch = torch.zeros((), dtype=torch.int64, device=engine.device)
+    correct_ms = mindspore.Tensor(0, mindspore.int32)
+    test_data_size = 0
+    with torch.no_grad():
+        for item in test_iter:
+            data, label = item[family.data_key], item[family.label_key]
+            test_data_size += data.shape[0]
+            data_torch, label_torch = engine.torch.put(data, label)
+            correct_torch += (engine.torch.model(data_torch).argmax(1) == label_torch).sum()
+            data_ms, label_ms = engine.ms.put(data, label)
+            correct_ms = correct_ms + (engine.ms.model(data_ms).argmax(1) == label_ms).astype(mindspore.int32).sum()
+    test_data_size = max(test_data_size, 1)
+    return float(correct_ms.asnumpy()) / test_data_size, correct_torch.item() / test_data_size
+
+
+class TrainFamily:
+    """
+    Model-family hooks of the training engine: dataset columns, input/label dtypes per framework, the JAX loss,
+    extra loss arguments, optimizer keyword arguments, the test metric (None to skip evaluation) and the
+    host sampling interval.
+    """
+
+    def __init__(self, data_key, label_key, ms_dtypes, torch_dtypes, jax_loss, metric=None, loss_args=(),
+                 ms_opt_kwargs=None, torch_opt_kwargs=None, sample_interval=100, max_train_samples=5000):
+        self.data_key, self.label_key = data_key, label_key
+        self.ms_dtypes, self.torch_dtypes = ms_dtypes, torch_dtypes
+        self.jax_loss = jax_loss
+        self.metric = metric
+        self.loss_args = loss_args
+        self.ms_opt_kwargs = ms_opt_kwargs or {}
+        self.torch_opt_kwargs = torch_opt_kwargs or {}
+        self.sample_interval = sample_interval
+        self.max_train_samples = max_train_samples
+
+
+class DifferentialTrainEngine:
+    """
+    One lockstep MindSpore/PyTorch/JAX training loop for every model family.
+
+    A step does a fixed amount of work: inputs go into pre-allocated buffers, the losses stay on their devices
+    as running sums, and the host only reads values back every `sample_interval` steps (per-step losses and
+    parameter distances for the log) and at the end of an epoch (the exact mean losses).
+    """
+
+    def __init__(self, model_ms, model_torch, train_configs, family, train_logger, true_log_path=None):
+        self.family = family
+        self.train_configs = train_configs
+        self.train_logger = train_logger
+        self.true_log_path = true_log_path
+        self.device = get_train_device()
+        self.epochs = train_configs['epoch']
+        self.batch_size = train_configs['batch_size']
+        self.sample_interval = int(train_configs.get('sample_interval', family.sample_interval))
+        self.max_train_samples = int(train_configs.get('max_train_samples', family.max_train_samples))
+        self.process = psutil.Process()
+        learning_rate = train_configs['learning_rate']
+
+        loss_ms, loss_torch = get_loss(train_configs['loss_name'])
+        optimizer_ms, optimizer_torch = get_optimizer(train_configs['optimizer'])
+
+        trainable_params = model_ms.trainable_params()
+        for idx, param in enumerate(trainable_params):
+            param.name = model_ms.__class__.__name__ + str(idx) + "_" + param.name
+        optimizer_ms = optimizer_ms(params=trainable_params, learning_rate=learning_rate, **family.ms_opt_kwargs)
+        optimizer_torch = optimizer_torch([param for param in model_torch.parameters() if param.requires_grad],
+                                          lr=learning_rate, **family.torch_opt_kwargs)
+
+        self.torch = TorchAdapter(model_torch, loss_torch(), optimizer_torch, self.device, *family.torch_dtypes,
+                                  loss_args=family.loss_args)
+        self.ms = MindSporeAdapter(model_ms, loss_ms(), optimizer_ms, *family.ms_dtypes, loss_args=family.loss_args)
+        self.state_shadow = TorchStateShadow(model_torch)
+        self.bridge = JaxTorchBridge(self.state_shadow.state)
+        self.jax = JaxAdapter(self.bridge.params_from_torch(), family.jax_loss,
+                              jax_optimizers[train_configs['optimizer']](learning_rate), loss_args=family.loss_args)
+        self.last_name = list(self.state_shadow.state.keys())[-1]
+        self.host_syncs = 0
+
+        dataset = get_dataset(train_configs['dataset_name'])
+        self.train_set = dataset(data_dir=train_configs['dataset_path'], batch_size=self.batch_size, is_train=True)
+        self.test_set = dataset(data_dir=train_configs['dataset_path'], batch_size=self.batch_size, is_train=False)
+
+    def rss(self):
+        return self.process.memory_info().rss / 1024 / 1024
+
+    def distances(self):
+        torch_last = self.state_shadow.state[self.last_name].detach().cpu().numpy()
+        ms_last = self.ms.last_grad.asnumpy()
+        jax_last = np.asarray(self.jax.params[self.last_name])[-1]
+        return chebyshev_distance(torch_last, ms_last), chebyshev_distance(ms_last, jax_last), \
+            chebyshev_distance(torch_last, jax_last)
+
+    def train_epoch(self, train_iter, stats):
+        self.torch.model.train()
+        self.ms.model.set_train(True)
+        for adapter in [self.torch, self.ms, self.jax]:
+            adapter.reset()
+        samples = []
+        step = 0
+        for item in train_iter:
+            data, label = item[self.family.data_key], item[self.family.label_key]
+            self.torch.put(data, label)
+            data_ms, label_ms = self.ms.put(data, label)
+
+            memory_start, time_start = self.rss(), time.time()
+            with span("torch_step", "train"):
+                loss_torch = self.torch.step()
+            time_torch = time.time()
+            memory_torch = self.rss()
+            self.state_shadow.snapshot()
+
+            with span("ms_step", "train"):
+                loss_ms = self.ms.step(data_ms, label_ms)
+            time_ms_end = time.time()
+            memory_ms = self.rss()
+
+            time_jax_start = time.time()
+            with span("jax_step", "train"):
+                self.bridge.load_params(self.jax.params)
+                output = self.bridge.to_jax(self.torch.forward())
+                loss_jax = self.jax.step(output, label)
+            time_jax_end = time.time()
+            memory_jax = self.rss()
+
+            stats.add(time_torch - time_start, time_ms_end - time_torch, time_jax_end - time_jax_start,
+                      memory_torch - memory_start, memory_ms - memory_torch, memory_jax - memory_ms)
+
+            if step % self.sample_interval == 0:
+                with span("host_sync", "train"):
+                    distances = self.distances()
+                self.host_syncs += 1
+                samples.append(distances)
+                line = "batch: {}, \n torch_loss: {}, ms_loss: {}, jax_loss: {}, \n " \
+                       "torch_memory: {:.2f}MB, ms_memory: {:.2f}MB, jax_memory: {:.2f}MB, \n " \
+                       "torch_time: {}, ms_time: {}, jax_time: {}, \n torch_mindsore_distance: {}, \n " \
+                       "ms_jax_distance: {}, \n jax_troch_distance: {}".format(
+                        step * self.batch_size, loss_torch.item(), loss_ms.asnumpy(), np.array(loss_jax),
+                        *stats.last(), *distances)
+                _write_log(self.true_log_path, self.train_logger, line)
+            self.state_shadow.restore()
+            step += 1
+            if step * self.batch_size >= self.max_train_samples:
+                break
+
+        steps = max(step, 1)
+        self.host_syncs += 1
+        losses = (self.torch.loss_sum.item() / steps, float(self.ms.loss_sum.asnumpy()) / steps,
+                  float(self.jax.loss_sum) / steps)
+        distances = np.mean(np.array(samples), axis=0) if len(samples) > 0 else [np.nan] * 3
+        return losses, distances
+
+    def run(self):
+        train_iter = self.train_set.create_dict_iterator(output_numpy=True, num_epochs=self.epochs)
+        test_iter = self.test_set.create_dict_iterator(output_numpy=True, num_epochs=self.epochs)
+        losses_torch_avg, losses_ms_avg, losses_jax_avg = [], [], []
+        eval_ms, eval_torch = [], []
+        stats = StepStats(1)
+        for epoch in range(self.epochs):
+            _write_log(self.true_log_path, self.train_logger, '----------------------------')
+            _write_log(self.true_log_path, self.train_logger, f"epoch: {epoch}/{self.epochs}")
+            stats = StepStats(self.train_set.get_dataset_size())
+            losses, distances = self.train_epoch(train_iter, stats)
+            losses_torch_avg.append(losses[0])
+            losses_ms_avg.append(losses[1])
+            losses_jax_avg.append(losses[2])
+            times, memories = stats.mean()
+            _write_log(self.true_log_path, self.train_logger,
+                       "epoch: {}, \n torch_loss_avg: {}, ms_loss_avg: {}, jax_loss_avg: {}, \n "
+                       "torch_memory_avg: {:.2f}MB, ms_memory_avg: {:.2f}MB, jax_memory_avg: {:.2f}MB, \n "
+                       "torch_time_avg: {}, ms_time_avg: {}, jax_time_avg: {}, \n "
+                       "torch_mindsore_distance_avg: {}, \n ms_jax_distance_avg: {}, \n "
+                       "jax_troch_distance_avg: {}".format(epoch, *losses, *memories, *times, *distances))
+            _write_log(self.true_log_path, self.train_logger, self.state_shadow.summary())
+            _write_log(self.true_log_path, self.train_logger, self.bridge.summary())
+            _write_log(self.true_log_path, self.train_logger,
+                       "train engine: {} steps, {} host syncs".format(stats.count, self.host_syncs))
+
+            if self.family.metric is None:
+                continue
+            self.torch.model.eval()
+            self.ms.model.set_train(False)
+            acc_ms, acc_torch = self.family.metric(self, test_iter)
+            _write_log(self.true_log_path, self.train_logger,
+                       f"Mindspore Test Accuracy: {(100 * acc_ms)}%" + " Pytorch Test Accuracy: {}%".format(
+                           100 * acc_torch))
+            eval_ms.append(acc_ms)
+            eval_torch.append(acc_torch)
+
+        if self.family.metric is None:
+            return
+        self.train_logger.generation = self.train_configs['generation']
+        memories_torch, memories_ms = stats.memories()
+        analyze_util = train_result_analyze(model_name=self.train_configs['model_name'], epochs=self.epochs,
+                                            loss_ms=losses_ms_avg, loss_torch=losses_torch_avg, eval_ms=eval_ms,
+                                            eval_torch=eval_torch, memories_ms=memories_ms,
+                                            memories_torch=memories_torch,
+                                            loss_truth=self.train_configs['loss_ground_truth'],
+                                            acc_truth=self.train_configs['eval_ground_truth'],
+                                            memory_truth=self.train_configs['memory_threshold'],
+                                            train_logger=self.train_logger)
+        analyze_util.analyze_main()
+
+
+class StepStats:
+    """
+    Per-step time (s) and memory (MB) of torch, ms and jax in arrays sized for one epoch.
+    """
+
+    def __init__(self, steps):
+        self.values = np.zeros((max(int(steps), 1), 6), dtype=np.float64)
+        self.count = 0
+
+    def add(self, *values):
+        if self.count == len(self.values):
+            self.values = np.concatenate([self.values, np.zeros_like(self.values)])
+        self.values[self.count] = values
+        self.count += 1
+
+    def last(self):
+        row = self.values[max(self.count - 1, 0)]
+        return list(row[3:]) + list(row[:3])
+
+    def mean(self):
+        row = self.values[:max(self.count, 1)].mean(axis=0)
+        return list(row[:3]), list(row[3:])
+
+    def memories(self):
+        return list(self.values[:self.count, 3]), list(self.values[:self.count, 4])
+
+
+imageclassification_family = TrainFamily(
+    'image', 'label', (mindspore.float32, mindspore.int32), (torch.float32, torch.long), classification_jax_loss,
+    metric=classification_metric, ms_opt_kwargs={'momentum': 0.9, 'weight_decay': 0.0001}, sample_interval=100,
+    max_train_samples=5000)
+unet_family = TrainFamily(
+    'image', 'mask', (mindspore.float32, mindspore.float32), (torch.float32, torch.float32), unet_jax_loss,
+    ms_opt_kwargs={'weight_decay': 0.0005}, torch_opt_kwargs={'weight_decay': 0.0005}, sample_interval=100,
+    max_train_samples=2000)
+textcnn_family = TrainFamily(
+    'data', 'label', (mindspore.int32, mindspore.int32), (torch.long, torch.long), textcnn_jax_loss,
+    metric=classification_metric, loss_args=(2,), ms_opt_kwargs={'weight_decay': 3e-5},
+    torch_opt_kwargs={'weight_decay': 3e-5}, sample_interval=10, max_train_samples=5000)
+
+
+def start_train(family, model_ms, model_torch, train_configs, train_logger, true_log_path=None):
+    engine = DifferentialTrainEngine(model_ms, model_torch, train_configs, family, train_logger, true_log_path)
+    engine.run()
+    return engine
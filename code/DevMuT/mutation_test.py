@@ -13,7 +13,7 @@ from common.dataset_utils import get_dataset
 from common.model_utils import get_model
 from common.log_recoder import Logger
 from common.mutation_ms.mutator_selection_logic import Roulette, MCMC, doubleq_state
-from common.mutation_torch.mutation_main_followlog import analyze_log_torch_followtrace,check_ms_failed_trace
+from common.mutation_torch.mutation_main_followlog import analyze_log_torch_followtrace, check_ms_failed_trie
 from common.mutation_ms.model_mutation_operators_followlog import analyze_log_mindspore_followtrace
 from common.mutation_ms.model_mutation_generators import generate_model_by_model_mutation
 from common.help_utils import rename_parameter
@@ -21,7 +21,22 @@ from common.help_utils import ToolUtils
 from common.help_utils import YoloUtil
 from common.help_utils import get_filter_data
 from common.model_train import get_model_train
+from common.mutant_cache import MutantCache, SeedPrototypes, get_lineage
+from common.mutation_journal import get_journal
+from common.activation_cache import ActivationCache, changed_layers
+from common.model_states import ModelStates
+from common.mutation_campaign import run_campaign
+from common.forcal_cache import forcal_key, load_forcal_data
+from common.stage2_pipeline import MutantPrefetcher, DualForward, pipeline_summary
+from common.structural_hash import StructuralIndex
+from common.lockstep import LockstepTwins
+from common.surrogate import MutationSurrogate
+from common.mutation_ms.OP_shape_utils import legality_summary
+from common.mutation_ms.negative_cache import get_negative_cache
+from common import profiler
+from common.profiler import profiled, span
 import time
+import threading
 from utils.util import QNetwork
 from utils.util import check_illegal_mutant
 
@@ -112,9 +127,48 @@ class NetworkGeneralization:
             input_size_list = tuple(input_size_list)
             input_size_lists.append(input_size_list)
         self.input_size = input_size_lists[0]
+        # generation numbers of this run; campaign workers (common/mutation_campaign.py) get disjoint ranges
+        self.first_generation = int(getattr(args, 'first_generation', 1))
+        self.last_generation = self.first_generation + self.mutation_iterations - 1
+        self.forcal_cache_dir = config['mutation_config'].get('forcal_cache_dir', os.getcwd() + '/forcal_cache')
+        self.forcal_data = None
+        self.stage2_pipeline_depth = int(config['mutation_config'].get('stage2_pipeline_depth', 1))
+        self.stage2_concurrent_forward = bool(config['mutation_config'].get('stage2_concurrent_forward', True))
+        self.profile = bool(config['mutation_config'].get('profile', False))
+        self.profile_trace = config['mutation_config'].get('profile_trace', self.log_path + '/trace.json')
+        profiler.enable(self.profile, int(config['mutation_config'].get('profile_max_events', 1000000)))
         self.first_scores = []
         self.second_scores = []
+        self.stage2_diffs = {}
         self.mindspore_pass_rate = 0
+        self.mutant_cache = MutantCache(capacity=int(config['mutation_config'].get('mutant_cache_size', 8)),
+                                        max_bytes=float(config['mutation_config'].get('mutant_cache_mb', 2048))
+                                        * 1024 * 1024)
+        self.lockstep = None
+        if bool(config['mutation_config'].get('lockstep_torch', False)):
+            self.lockstep = LockstepTwins(self.mut_log_path, self.input_size, self.train_config,
+                                          capacity=int(config['mutation_config'].get('lockstep_cache_size', 8)),
+                                          mutate_logger=self.run_log)
+        # lockstep twins start from the PyTorch seed, so every MindSpore seed must carry that seed's weights
+        self.seed_prototypes = SeedPrototypes(
+            enabled=bool(config['mutation_config'].get('seed_prototype_cache', True)) or self.lockstep is not None)
+        self.model_states = ModelStates()
+        self.activation_cache = ActivationCache(
+            capacity=int(config['mutation_config'].get('activation_cache_size', 2)),
+            max_bytes=float(config['mutation_config'].get('activation_cache_mb', 1024)) * 1024 * 1024)
+        self.beam_width = int(config['mutation_config'].get('beam_width', 2))
+        self.beam_children = int(config['mutation_config'].get('beam_children', 4))
+        self.surrogate = MutationSurrogate(
+            self.mutation_type, self.mut_log_path, enabled=bool(config['mutation_config'].get('surrogate', False)),
+            warmup=int(config['mutation_config'].get('surrogate_warmup', 30)),
+            refit=int(config['mutation_config'].get('surrogate_refit', 20)),
+            min_prob=float(config['mutation_config'].get('surrogate_min_prob', 0.2)),
+            score_quantile=float(config['mutation_config'].get('surrogate_score_quantile', 0.25)),
+            explore=float(config['mutation_config'].get('surrogate_explore', 0.1)))
+        self.duplicate_elimination = bool(config['mutation_config'].get('duplicate_elimination', True))
+        self.structural_index = StructuralIndex(
+            weights=bool(config['mutation_config'].get('fingerprint_weights', True)),
+            capacity=int(config['mutation_config'].get('fingerprint_cache_size', 8)))
 
         config['mutation_config'].update({'log_path': self.log_path, 'mutation_strategy': self.mutation_strategy,
                                           'mutation_type': self.mutation_type,
@@ -131,57 +185,134 @@ class NetworkGeneralization:
                           "---------------------------------\n{}\n".format
                           ("\n".join([f"{key}: {value}" for key, value in config.items()])))
 
+    def write_profile(self):
+        """
+        Chrome trace of the run plus the per-span summary table in run.txt, when profiling is enabled.
+        """
+        if not self.profile:
+            return
+        trace_path = profiler.save_trace(self.profile_trace)
+        f = open(self.true_log_path, 'a+')
+        f.write("profile ({}):\n{}\n".format(trace_path, profiler.summary_table()))
+        f.close()
+        self.run_log.info("profile ({}):\n{}".format(trace_path, profiler.summary_table()))
+
     def init_logging(self):
         log = Logger(log_file=self.log_path + '/run.log')
         return log.logger
 
-    def cal_mutation_score(self, model, data_forcal, origin_outputs):
-        if self.mutation_eval_metric == "origin_diff":
-            if not (isinstance(origin_outputs[0], tuple) or isinstance(origin_outputs[0], list)):
-                if isinstance(data_forcal, list):  # mutiply inputs and single outputs
-                    out_diffs = []
-                    for idx in range(0, data_forcal[0].shape[0], self.test_size):
-                        inputs = []
-                        for val in data_forcal:
-                            inputs.append(val[idx: (idx + self.test_size), :])
-                        mutation_output = model(*inputs)
-                        origin_output = mindspore.ops.flatten(origin_outputs[int(idx / self.test_size)])
-                        mutation_output = mindspore.ops.flatten(mutation_output)
-                        out_diff = (origin_output - mutation_output).asnumpy()
-                        out_diffs.append(np.linalg.norm(out_diff))
-
-                else:  # single inputs and single outputs
-                    out_diffs = []
-                    for idx in range(0, data_forcal.shape[0], self.test_size):
-                        imgs_ms = data_forcal[idx:(idx + self.test_size), :]
-                        outputs = model(imgs_ms)
-                        origin_output = mindspore.ops.flatten(origin_outputs[int(idx / self.test_size)])
-                        output = mindspore.ops.flatten(outputs)
-                        out_diff = (origin_output - output).asnumpy()
-                        out_diffs.append(np.linalg.norm(out_diff))
-
-            else:
-                if isinstance(data_forcal, list):  # mutiply inputs and mutiply outputs
-                    mutation_outputs = []
-                    for idx in range(0, data_forcal[0].shape[0], self.test_size):
-                        inputs = []
-                        for val in data_forcal:
-                            inputs.append(val[idx: (idx + self.test_size), :])
-                        mutation_output = model(*inputs)
-                        mutation_outputs.append(mutation_output)
+    def build_seed_model(self):
+        if self.lockstep is None:
+            return get_model(self.model_name, input_size=tuple(self.input_size), only_ms=True)
+        model_ms, model_torch = get_model(self.model_name, input_size=tuple(self.input_size))
+        self.lockstep.set_seed(model_torch)
+        return model_ms
+
+    def get_seed_model(self):
+        return self.seed_prototypes.get(self.model_name, self.input_size, self.build_seed_model)
+
+    def choose_operators(self, proposals, model, parent_traces, limit=1):
+        # the surrogate passes over the proposals it predicts to fail or to score low on this parent
+        if not self.surrogate.enabled:
+            return list(proposals)[:limit]
+        return self.surrogate.select(proposals, self.surrogate.context(model, parent_traces), limit)
+
+    def mutate_model(self, model, mut_type, generation, parent_traces):
+        """
+        Mutate `model` (the mutant with trace `parent_traces`) in place as generation `generation`; in lockstep mode
+        the same mutation is applied to its PyTorch twin right away.
+        """
+        if self.surrogate.enabled:
+            self.surrogate.begin(generation, mut_type, self.surrogate.context(model, parent_traces))
+        self.model_states.mutated(model, generation)
+        mut_result = generate_model_by_model_mutation(model, mut_type, self.input_size, self.mut_log_path, generation,
+                                                      self.run_log, self.train_config)
+        self.surrogate.observe(generation, mut_result)
+        if self.lockstep is not None:
+            self.lockstep.step(generation, parent_traces)
+        return mut_result
+
+    def restore_mutant(self, execution_traces):
+        # rebuild a stage1 mutant from the nearest cached ancestor instead of replaying from the seed
+        return self.mutant_cache.restore(execution_traces, self.get_seed_model, self.mut_log_path, self.input_size,
+                                         self.train_config, self.model_states)
+
+    def forcal_batches(self, data_forcal):
+        batches = []
+        if isinstance(data_forcal, list):
+            for idx in range(0, data_forcal[0].shape[0], self.test_size):
+                batches.append([val[idx: (idx + self.test_size), :] for val in data_forcal])
+        else:
+            for idx in range(0, data_forcal.shape[0], self.test_size):
+                batches.append([data_forcal[idx:(idx + self.test_size), :]])
+        return batches
 
+    def model_key(self, mutant_name):
+        # activation cache key of a seed/mutant name as used by the MCMC and ddqn strategies
+        if mutant_name == self.model_name + "_seed":
+            return 0
+        return int(mutant_name.split("_")[-1])
 
-                else:  # single inputs and mutiply outputs
-                    mutation_outputs = []
-                    for idx in range(0, data_forcal.shape[0], self.test_size):
-                        imgs_ms = data_forcal[idx:idx + self.test_size, :]
+    def mutation_changes(self, generation):
+        return changed_layers(get_journal(self.mut_log_path).get(generation))
 
-                        mutation_output = model(imgs_ms)  # mutation_outputs is a tuple whose element is tensor
-                        mutation_outputs.append(mutation_output)
+    def build_forcal_data(self):
+        test_set = self.dataset(data_dir=self.dataset_path, batch_size=self.data_forcal_size, is_train=True)
+        test_iter = test_set.create_tuple_iterator(output_numpy=True)
+        return get_filter_data(self.model_name, test_iter, self.data_forcal_size, self.train_config['dtypes'])
+
+    def get_forcal_data(self):
+        # stage1 and stage2 (and repeated runs) share one materialized forcal batch instead of a dataset pipeline each
+        if self.forcal_data is None:
+            key, info = forcal_key(self.model_name, self.train_config['dataset_name'], self.dataset_path,
+                                   self.data_forcal_size, self.train_config['dtypes'])
+            self.forcal_data, hit = load_forcal_data(self.forcal_cache_dir, key, info, self.build_forcal_data)
+            f = open(self.true_log_path, 'a+')
+            f.write("forcal data: {} {}\n".format(key, "loaded from cache" if hit else "materialized"))
+            f.close()
+            self.run_log.info("forcal data: {} {}".format(key, "loaded from cache" if hit else "materialized"))
+        return self.forcal_data
+
+    @profiled(cat="score")
+    def cal_mutation_score(self, model, data_forcal, origin_outputs, parent_key=None, generation=None):
+        # only the layers changed by `generation` and their successors are re-run (and re-hashed), the rest comes
+        # from parent_key; that needs `model` to be exactly parent_key plus this mutation
+        changed = None
+        if generation is not None:
+            if self.model_states.derived(model, parent_key, generation):
+                changed = self.mutation_changes(generation)
+            self.model_states.set(model, generation)
+        fingerprint = None
+        if self.duplicate_elimination and generation is not None:
+            fingerprint = self.structural_index.fingerprint(model, parent_key, changed, generation)
+            duplicate = self.structural_index.lookup(fingerprint)
+            if duplicate is not None:
+                self.structural_index.add(generation, fingerprint, duplicate[1])
+                f = open(self.true_log_path, 'a+')
+                f.write("generation {} is a duplicate of generation {}, score reused\n".format(generation,
+                                                                                               duplicate[0]))
+                f.close()
+                self.run_log.info("generation {} is a duplicate of generation {}, score reused".format(
+                    generation, duplicate[0]))
+                self.surrogate.observe_score(generation, duplicate[1])
+                return duplicate[1]
+        model_outputs = self.activation_cache.forward(model, self.forcal_batches(data_forcal), parent_key, changed,
+                                                      generation, id(data_forcal))
+        if self.mutation_eval_metric == "origin_diff":
+            if not (isinstance(origin_outputs[0], tuple) or isinstance(origin_outputs[0], list)):
+                # single outputs
+                out_diffs = []
+                for idx, mutation_output in enumerate(model_outputs):
+                    origin_output = mindspore.ops.flatten(origin_outputs[idx])
+                    mutation_output = mindspore.ops.flatten(mutation_output)
+                    out_diff = (origin_output - mutation_output).asnumpy()
+                    out_diffs.append(np.linalg.norm(out_diff))
 
-                    if 'yolo' in self.model_name or "openpose" in self.model_name:
-                        origin_outputs = YoloUtil.reformat_outputs_first_generation(origin_outputs)
-                        mutation_outputs = YoloUtil.reformat_outputs_first_generation(mutation_outputs)
+            else:
+                mutation_outputs = model_outputs  # mutation_outputs is a tuple whose element is tensor
+                if not isinstance(data_forcal, list) and ('yolo' in self.model_name or "openpose" in self.model_name):
+                    origin_outputs = YoloUtil.reformat_outputs_first_generation(origin_outputs)
+                    mutation_outputs = YoloUtil.reformat_outputs_first_generation(mutation_outputs)
 
                 out_diffs = []
                 for idx in range(len(mutation_outputs)):
@@ -196,30 +327,22 @@ class NetworkGeneralization:
                         out_diffs.append(out_diff)
 
             score = np.mean(out_diffs)
+        profiler.counter("mutation_score", float(score))
+        if fingerprint is not None:
+            self.structural_index.add(generation, fingerprint, score)
+        self.surrogate.observe_score(generation, score)
         return score
 
     def mindspore_mutation(self):
-        origin_model_ms = get_model(self.model_name, input_size=tuple(self.input_size),only_ms=True)
-        test_set = self.dataset(data_dir=self.dataset_path, batch_size=self.data_forcal_size, is_train=True)
-        test_iter = test_set.create_tuple_iterator(output_numpy=True)
-
-        imgs_ms_forcal = get_filter_data(self.model_name, test_iter, self.data_forcal_size, self.train_config['dtypes'])
-
-        origin_outputs = []
-        if isinstance(imgs_ms_forcal, list):  # mulptily model inputs
-            for idx in range(0, self.data_forcal_size, self.test_size):
-                inputs = []
-                for val in imgs_ms_forcal:
-                    inputs.append(val[idx:idx + self.test_size, :])
-                outputs = origin_model_ms(*inputs)
-                origin_outputs.append(outputs)
-
-        else:  # single model inputs
-            for idx in range(0, imgs_ms_forcal.shape[0], self.test_size):
-                imgs_ms = imgs_ms_forcal[idx:idx + self.test_size, :]
-                outputs = origin_model_ms(imgs_ms)
-                origin_outputs.append(outputs)
+        origin_model_ms = self.get_seed_model()
+        imgs_ms_forcal = self.get_forcal_data()
 
+        # the seed forward also fills the activation cache entry (key 0) every mutant is scored against
+        origin_outputs = self.activation_cache.forward(origin_model_ms, self.forcal_batches(imgs_ms_forcal),
+                                                       new_key=0, data_id=id(imgs_ms_forcal))
+        if self.duplicate_elimination:
+            self.structural_index.fingerprint(origin_model_ms, new_key=0)
+        self.model_states.set(origin_model_ms, 0)
 
         if self.mutation_strategy == "random":
             self.random_mutate(origin_model_ms, imgs_ms_forcal, origin_outputs)
@@ -227,24 +350,44 @@ class NetworkGeneralization:
             self.MCMC_mutate(imgs_ms_forcal, origin_outputs)
         elif self.mutation_strategy == "ddqn":
             self.doubleq_mutate(imgs_ms_forcal, origin_outputs)
+        elif self.mutation_strategy == "beam":
+            self.beam_mutate(imgs_ms_forcal, origin_outputs)
 
-        mut_succ = os.popen(f"grep -c mut_result:True {self.mut_log_path}").readlines()[0]
-        muttypes = os.popen(f"grep -aF 'Adopt' {self.mut_log_path}").readlines()
-        mutresults = os.popen(f"grep -aF 'mut_result:' {self.mut_log_path}").readlines()
+        journal = get_journal(self.mut_log_path)
+        mut_succ = journal.success_count
         muttype_count1 = dict(zip(self.mutation_type, [0] * len(self.mutation_type)))
         muttype_count2 = dict(zip(self.mutation_type, [0] * len(self.mutation_type)))
-        for i in range(len(muttypes)):
-            muttype = muttypes[i].split(' ')[1]
-            muttype_count1[muttype] += 1
-            mutresult = mutresults[i].split(':')[1].split('\n')[0]
-            if mutresult == 'True' or mutresult is True:
-                muttype_count2[muttype] += 1
+        for muttype, (total, succ) in journal.op_counts.items():
+            muttype_count1[muttype] = total
+            muttype_count2[muttype] = succ
         f = open(self.true_log_path, 'a+')
         f.write('mutation iteration:{} ({}), mutation success:{} ({})\n'.format(
             self.mutation_iterations, muttype_count1, mut_succ, muttype_count2))
         f.close()
         self.run_log.info('mutation iteration:{} ({}), mutation success:{} ({})\n'.format(
             self.mutation_iterations, muttype_count1, mut_succ, muttype_count2))
+        f = open(self.true_log_path, 'a+')
+        f.write(self.mutant_cache.summary() + "\n")
+        f.write(self.seed_prototypes.summary() + "\n")
+        f.write(legality_summary() + "\n")
+        f.write(get_negative_cache(self.mut_log_path).summary() + "\n")
+        f.write(self.activation_cache.summary() + "\n")
+        f.write(self.structural_index.summary() + "\n")
+        if self.lockstep is not None:
+            f.write(self.lockstep.summary() + "\n")
+        if self.surrogate.enabled:
+            f.write(self.surrogate.summary() + "\n")
+        f.close()
+        self.run_log.info(self.mutant_cache.summary())
+        self.run_log.info(self.seed_prototypes.summary())
+        self.run_log.info(legality_summary())
+        self.run_log.info(get_negative_cache(self.mut_log_path).summary())
+        self.run_log.info(self.activation_cache.summary())
+        self.run_log.info(self.structural_index.summary())
+        if self.lockstep is not None:
+            self.run_log.info(self.lockstep.summary())
+        if self.surrogate.enabled:
+            self.run_log.info(self.surrogate.summary())
 
 
     def doubleq_mutate(self, imgs_ms_forcal, origin_outputs):
@@ -278,7 +421,7 @@ class NetworkGeneralization:
         optimizer2 = torch.optim.Adam(q2.parameters(), lr=1e-4)
         mutation_scores = []
 
-        net_ms_seed = get_model(self.model_name, input_size=tuple(self.input_size), only_ms=True)
+        net_ms_seed = self.get_seed_model()
 
 
         self.mutants_info = {self.model_name + "_seed": doubleq_state(self.model_name + "_seed", 0, 0, {k: 0 for k in self.mutation_type})}
@@ -288,7 +431,7 @@ class NetworkGeneralization:
         self.run_log.info("**** Start DoubleQ Learning ****\n")
         self.loss =[]
 
-        for generation in range(1, self.mutation_iterations + 1):
+        for generation in range(self.first_generation, self.last_generation + 1):
             self.run_log.info("================== start {} generation!({}/{}) ==================".format(generation, generation, self.mutation_iterations))
             self.trace_info[self.model_name+"_"+str(generation)] = current_seed_name
             p = np.random.rand(1)[0]
@@ -302,14 +445,16 @@ class NetworkGeneralization:
                 mut_type = self.mutation_type[np.argmax(q1q2.detach().cpu().numpy())]
 
 
-            mut_result = generate_model_by_model_mutation(net_ms_seed, mut_type, self.input_size, self.mut_log_path, generation, self.run_log, self.train_config)
+            mut_result = self.mutate_model(net_ms_seed, mut_type, generation, get_lineage(
+                self.trace_info, current_seed_name, self.model_name + "_seed"))
 
             self.mutants_info[current_seed_name].selected = self.mutants_info[current_seed_name].selected+1
             self.mutants_info[current_seed_name].mutator_dict[mut_type] = self.mutants_info[current_seed_name].mutator_dict[mut_type] + 1
 
 
             if mut_result == 'True' or mut_result is True:
-                r = self.cal_mutation_score(net_ms_seed, imgs_ms_forcal, origin_outputs)
+                r = self.cal_mutation_score(net_ms_seed, imgs_ms_forcal, origin_outputs,
+                                            self.model_key(current_seed_name), generation)
 
                 check_result = check_illegal_mutant(net_ms_seed, self.mutation_outputs)
                 if not check_result:
@@ -326,25 +471,8 @@ class NetworkGeneralization:
 
                     current_seed_name = self.mutants_info[maxuct_idx].name
 
-                    orignial_model = get_model(self.model_name, input_size=tuple(self.input_size), only_ms=True)
-
-                    father_name = deepcopy(current_seed_name)
-                    if "seed" in current_seed_name:
-                        execution_traces = ["seed"]
-                    else:
-                        execution_traces = [int(father_name.split("_")[1])]
-                    while True:
-                        father_name = self.trace_info[father_name]
-                        if "_seed" in father_name:
-                            break
-                        trace_singledot = int(father_name.split("_")[1])
-                        execution_traces.append(trace_singledot)
-
-                    execution_traces.sort()
-                    assert len(execution_traces) > 0
-                    assert net_ms_seed is not None
-                    if "seed" not in current_seed_name:
-                        net_ms_seed = analyze_log_mindspore_followtrace(execution_traces, orignial_model,self.mut_log_path, self.input_size,self.train_config)
+                    execution_traces = get_lineage(self.trace_info, current_seed_name, self.model_name + "_seed")
+                    net_ms_seed = self.restore_mutant(execution_traces)
                     mutation_scores.append(-100)
 
                 else:
@@ -356,6 +484,9 @@ class NetworkGeneralization:
                     self.mutants_info[self.model_name + "_" + str(generation)] = mutant_info
                     current_seed_name = self.model_name + "_" + str(generation)
                     mutation_scores.append(r)
+                    self.mutant_cache.put(generation, get_lineage(self.trace_info, current_seed_name,
+                                                                  self.model_name + "_seed"),
+                                          net_ms_seed, self.input_size)
 
                     # if generation % 2 == 0:
                     #     try:
@@ -382,25 +513,8 @@ class NetworkGeneralization:
 
                 current_seed_name = self.mutants_info[maxuct_idx].name
 
-                orignial_model = get_model(self.model_name, input_size=tuple(self.input_size), only_ms=True)
-
-                father_name = deepcopy(current_seed_name)
-                if "seed" in current_seed_name:
-                    execution_traces = ["seed"]
-                else:
-                    execution_traces = [int(father_name.split("_")[1])]
-                while True:
-                    father_name = self.trace_info[father_name]
-                    if "_seed" in father_name:
-                        break
-                    trace_singledot = int(father_name.split("_")[1])
-                    execution_traces.append(trace_singledot)
-
-                execution_traces.sort()
-                assert len(execution_traces) > 0
-                assert net_ms_seed is not None
-                if "seed" not in current_seed_name:
-                    net_ms_seed = analyze_log_mindspore_followtrace(execution_traces, orignial_model, self.mut_log_path,self.input_size, self.train_config)
+                execution_traces = get_lineage(self.trace_info, current_seed_name, self.model_name + "_seed")
+                net_ms_seed = self.restore_mutant(execution_traces)
                 mutation_scores.append(-100)
 
             if len(self.mutation_outputs) == 0:
@@ -447,11 +561,11 @@ class NetworkGeneralization:
 
         self.run_log.info("mutation_scores: {}".format(mutation_scores))
         first_select_generations = np.argsort(np.array(mutation_scores))[(len(mutation_scores) - self.selected_model_num):]
-        self.run_log.info("**** stage1 select generations: {} ****\n".format(first_select_generations + 1))
+        self.run_log.info("**** stage1 select generations: {} ****\n".format(first_select_generations + self.first_generation))
 
 
         mut_trace = {}
-        for gen in range(1, self.mutation_iterations + 1):
+        for gen in range(self.first_generation, self.last_generation + 1):
             start_gen = gen
             execution_traces = [start_gen]
             while True:
@@ -470,7 +584,7 @@ class NetworkGeneralization:
         f.write("mutation trace: {}\n".format(mut_trace))
         f.close()
 
-        first_select_generations = list(map(str, first_select_generations + 1))
+        first_select_generations = list(map(str, first_select_generations + self.first_generation))
         self.first_generation_tracedict = {gen: trace for gen, trace in mut_trace.items()
                                            if gen in first_select_generations}
         self.first_scores = mutation_scores
@@ -492,41 +606,46 @@ class NetworkGeneralization:
 
     def random_mutate(self, origin_model_ms, imgs_ms_forcal, origin_outputs):
         mutation_scores = []
-        for generation in range(1, self.mutation_iterations + 1):
+        parent_key = 0
+        for generation in range(self.first_generation, self.last_generation + 1):
             f = open(self.true_log_path, 'a+')
             f.write("================== start {} generation!({}/{}) ==================".format(generation, generation, self.mutation_iterations))
             f.close()
             self.run_log.info("================== start {} generation!({}/{}) ==================".format(generation, generation, self.mutation_iterations))
-            mut_type = np.random.permutation(self.mutation_type)[0]
-            mut_result = generate_model_by_model_mutation(origin_model_ms, mut_type, self.input_size, self.mut_log_path, generation, self.run_log, self.train_config)
+            mut_type = self.choose_operators(np.random.permutation(self.mutation_type), origin_model_ms,
+                                             list(range(self.first_generation, generation)))[0]
+            mut_result = self.mutate_model(origin_model_ms, mut_type, generation,
+                                           list(range(self.first_generation, generation)))
 
             if mut_result == 'True' or mut_result is True:
                 self.mindspore_pass_rate += 1
-                mutate_score = self.cal_mutation_score(origin_model_ms, imgs_ms_forcal, origin_outputs)
+                mutate_score = self.cal_mutation_score(origin_model_ms, imgs_ms_forcal, origin_outputs, parent_key,
+                                                       generation)
+                parent_key = generation
                 mutation_scores.append(mutate_score)
+                self.mutant_cache.put(generation, list(range(self.first_generation, generation + 1)), origin_model_ms,
+                                      self.input_size)
             else:
                 mutation_scores.append(-100)
-                execution_traces = [i for i in range(1, generation)]
-                net_ms_seed = get_model(self.model_name, input_size=tuple(self.input_size),only_ms=True)
-                net_ms = analyze_log_mindspore_followtrace(execution_traces, net_ms_seed, self.mut_log_path,
-                                                           self.input_size, self.train_config)
-                origin_model_ms = net_ms
+                execution_traces = [i for i in range(self.first_generation, generation)]
+                origin_model_ms = self.restore_mutant(execution_traces)
         f = open(self.true_log_path, 'a+')
         f.write("mutation_scores: {}".format(mutation_scores))
         f.close()
         self.run_log.info("mutation_scores: {}".format(mutation_scores))
         first_select_generations = np.argsort(np.array(mutation_scores))[(len(mutation_scores) - self.selected_model_num):]
         f = open(self.true_log_path, 'a+')
-        f.write("**** stage1 select generations: {} ****\n".format(first_select_generations + 1))
+        f.write("**** stage1 select generations: {} ****\n".format(first_select_generations + self.first_generation))
         f.close()
-        self.run_log.info("**** stage1 select generations: {} ****\n".format(first_select_generations + 1))
+        self.run_log.info("**** stage1 select generations: {} ****\n".format(first_select_generations + self.first_generation))
 
-        mut_trace = {str(i): list(range(1, i+1)) for i in range(1, self.mutation_iterations+1)}
+        mut_trace = {str(i): list(range(self.first_generation, i + 1))
+                     for i in range(self.first_generation, self.last_generation + 1)}
         self.total_trace_record = mut_trace
         f = open(self.mut_log_path, 'a+')
         f.write("mutation trace: {}\n".format(mut_trace))
         f.close()
-        first_select_generations = list(map(str, first_select_generations+1))
+        first_select_generations = list(map(str, first_select_generations + self.first_generation))
         self.first_generation_tracedict = {gen: trace for gen, trace in mut_trace.items()
                                            if gen in first_select_generations}
         self.first_scores = mutation_scores
@@ -544,8 +663,8 @@ class NetworkGeneralization:
 
         last_used_mutator = None
         last_inconsistency = 0
-        generation = 1
-        while generation <= self.mutation_iterations:
+        generation = self.first_generation
+        while generation <= self.last_generation:
             f = open(self.true_log_path, 'a+')
             f.write(
                 "================== start {} generation!({}/{}) ==================".format(generation, generation,
@@ -556,44 +675,37 @@ class NetworkGeneralization:
                                                                                            self.mutation_iterations))
             new_seed_name = self.model_name + "_" + str(generation)
 
-            net_ms_seed = get_model(self.model_name, input_size=tuple(self.input_size), only_ms=True)
             picked_seed = ToolUtils.select_mutant(mutant_selector)
             selected_op = ToolUtils.select_mutator(mutator_selector, last_used_mutator=last_used_mutator)
-            mutate_op_history[selected_op] += 1
-            last_used_mutator = selected_op
-            mutator = mutator_selector.mutators[selected_op]
             mutant = mutant_selector.mutants[picked_seed]
 
             # create net_ms(selected the "picked_seed"th mutation model)
+            execution_traces = []
             if picked_seed == self.model_name + "_seed":
-                net_ms = net_ms_seed
+                net_ms = self.get_seed_model()
             else:
-                father_name = picked_seed
-                execution_traces = [int(father_name.split("_")[1])]
-                while True:
-                    father_name = mcmc_help_info[father_name]
-                    if father_name == self.model_name + "_seed":
-                        break
-                    trace_singledot = int(father_name.split("_")[1])
-                    execution_traces.append(trace_singledot)
-
-                execution_traces.sort()
+                execution_traces = get_lineage(mcmc_help_info, picked_seed, self.model_name + "_seed")
                 assert len(execution_traces) > 0
-                assert net_ms_seed is not None
-                net_ms = analyze_log_mindspore_followtrace(execution_traces, net_ms_seed, self.mut_log_path,
-                                                           self.input_size, self.train_config)
+                net_ms = self.restore_mutant(execution_traces)
             # pick_seed is the father of current seed whose name is new_seed_name
             mcmc_help_info[new_seed_name] = picked_seed
             if net_ms is None:
                 raise RuntimeError("seed model is None !")
-            mut_result = generate_model_by_model_mutation(net_ms, selected_op, self.input_size, self.mut_log_path,
-                                                          generation, self.run_log, self.train_config)
+            # the MCMC pick first, then the other operators in random order
+            selected_op = self.choose_operators([selected_op] + [val for val in np.random.permutation(mutate_ops)
+                                                                 if not val == selected_op],
+                                                net_ms, execution_traces)[0]
+            mutate_op_history[selected_op] += 1
+            last_used_mutator = selected_op
+            mutator = mutator_selector.mutators[selected_op]
+            mut_result = self.mutate_model(net_ms, selected_op, generation, execution_traces)
 
             if mut_result == "True" or mut_result is True:
                 mutant.selected += 1
                 mutator.total += 1
 
-                accumulative_inconsistency = self.cal_mutation_score(net_ms, imgs_ms_forcal, origin_outputs)
+                accumulative_inconsistency = self.cal_mutation_score(net_ms, imgs_ms_forcal, origin_outputs,
+                                                                     self.model_key(picked_seed), generation)
                 mutation_scores.append(accumulative_inconsistency)
 
                 delta = accumulative_inconsistency - last_inconsistency
@@ -605,6 +717,8 @@ class NetworkGeneralization:
                     mutant_selector.add_mutant(new_seed_name)
                     last_inconsistency = accumulative_inconsistency
                 self.mindspore_pass_rate += 1
+                self.mutant_cache.put(generation, get_lineage(mcmc_help_info, new_seed_name, self.model_name + "_seed"),
+                                      net_ms, self.input_size)
             else:
                 mutation_scores.append(-100)
             generation += 1
@@ -615,12 +729,12 @@ class NetworkGeneralization:
         first_select_generations = np.argsort(np.array(mutation_scores))[
                                    (len(mutation_scores) - self.selected_model_num):]
         f = open(self.true_log_path, 'a+')
-        f.write("**** stage1 select generations: {} ****\n".format(first_select_generations + 1))
+        f.write("**** stage1 select generations: {} ****\n".format(first_select_generations + self.first_generation))
         f.close()
-        self.run_log.info("**** stage1 select generations: {} ****\n".format(first_select_generations + 1))
+        self.run_log.info("**** stage1 select generations: {} ****\n".format(first_select_generations + self.first_generation))
 
         mut_trace = {}
-        for gen in range(1, self.mutation_iterations+1):
+        for gen in range(self.first_generation, self.last_generation + 1):
             start_gen = gen
             execution_traces = [start_gen]
             while True:
@@ -638,23 +752,218 @@ class NetworkGeneralization:
         f.write("mutation trace: {}\n".format(mut_trace))
         f.close()
 
-        first_select_generations = list(map(str, first_select_generations+1))
+        first_select_generations = list(map(str, first_select_generations + self.first_generation))
         self.first_generation_tracedict = {gen: trace for gen, trace in mut_trace.items()
                                            if gen in first_select_generations}
         self.first_scores = mutation_scores
         return self.first_generation_tracedict
 
+    def beam_mutate(self, imgs_ms_forcal, origin_outputs):
+        """
+        Beam search over mutants: every round each of the `beam_width` parents is forked into up to
+        `beam_children` children, each mutated with a different operator. Illegal children are dropped by the
+        operators' legality check, the survivors are scored grouped by parent (so they all reuse the parent's
+        cached activations) and the best `beam_width` non-duplicate survivors become the next parents.
+        """
+        mutation_scores = []
+        mut_trace = {}
+        beam = [(0, [])]  # (activation cache key, execution trace) of each parent, the seed first
+        generation = self.first_generation
+        while generation <= self.last_generation:
+            f = open(self.true_log_path, 'a+')
+            f.write("================== start beam round at {} generation!({}/{}), parents: {} ==================\n"
+                    .format(generation, generation, self.mutation_iterations, [val[0] for val in beam]))
+            f.close()
+            self.run_log.info("================== start beam round at {} generation!({}/{}), parents: {} "
+                              "==================".format(generation, generation, self.mutation_iterations,
+                                                         [val[0] for val in beam]))
+            survivors = []
+            for parent_key, parent_traces in beam:
+                model = self.restore_mutant(deepcopy(parent_traces))
+                mut_types = self.choose_operators(np.random.permutation(self.mutation_type), model, parent_traces,
+                                                  self.beam_children)
+                for idx, mut_type in enumerate(mut_types):
+                    if generation > self.last_generation:
+                        break
+                    if idx > 0:
+                        model = self.restore_mutant(deepcopy(parent_traces))
+                    mut_result = self.mutate_model(model, mut_type, generation, parent_traces)
+                    mut_trace[str(generation)] = parent_traces + [generation]
+                    if mut_result == "True" or mut_result is True:
+                        self.mindspore_pass_rate += 1
+                        score = self.cal_mutation_score(model, imgs_ms_forcal, origin_outputs, parent_key, generation)
+                        mutation_scores.append(score)
+                        self.mutant_cache.put(generation, mut_trace[str(generation)], model, self.input_size)
+                        if generation not in self.structural_index.duplicates:
+                            survivors.append((score, generation))
+                    else:
+                        mutation_scores.append(-100)
+                    generation += 1
+
+            if len(survivors) > 0:
+                survivors.sort(key=lambda val: -val[0])
+                beam = [(gen, mut_trace[str(gen)]) for _, gen in survivors[:self.beam_width]]
+
+        f = open(self.true_log_path, 'a+')
+        f.write("mutation_scores: {}".format(mutation_scores))
+        f.close()
+        self.run_log.info("mutation_scores: {}".format(mutation_scores))
+        first_select_generations = np.argsort(np.array(mutation_scores))[
+                                   (len(mutation_scores) - self.selected_model_num):]
+        f = open(self.true_log_path, 'a+')
+        f.write("**** stage1 select generations: {} ****\n".format(first_select_generations + self.first_generation))
+        f.close()
+        self.run_log.info("**** stage1 select generations: {} ****\n".format(
+            first_select_generations + self.first_generation))
+
+        self.total_trace_record = mut_trace
+        f = open(self.mut_log_path, 'a+')
+        f.write("mutation trace: {}\n".format(mut_trace))
+        f.close()
+
+        first_select_generations = list(map(str, first_select_generations + self.first_generation))
+        self.first_generation_tracedict = {gen: trace for gen, trace in mut_trace.items()
+                                           if gen in first_select_generations}
+        self.first_scores = mutation_scores
+        return self.first_generation_tracedict
+
+    def stage2_inputs(self, imgs_ms_forcal, final_device):
+        """
+        (mindspore inputs, torch inputs) of every stage2 slice, converted once and shared by all generations.
+        """
+        stage2_inputs = []
+        if isinstance(imgs_ms_forcal, list):  # mulptily inputs
+            for idx in range(0, self.data_forcal_size+1, self.test_size):
+                mindspore_inputs, torch_inputs = [], []
+                for val in imgs_ms_forcal:
+                    val_slice = val[idx:idx + self.test_size, :]
+                    val_array = val_slice.asnumpy()
+                    if "float32" in str(val.dtype).lower():
+                        t_dtype = torch.float32
+                    elif "int32" in str(val.dtype).lower():
+                        t_dtype = torch.int32
+                    elif "int64" in str(val.dtype).lower():
+                        t_dtype = torch.int64
+                    val_torch = torch.tensor(val_array, dtype=t_dtype).to(final_device)
+                    mindspore_inputs.append(val_slice)
+                    torch_inputs.append(val_torch)
+                stage2_inputs.append((mindspore_inputs, torch_inputs))
+
+        else:  # single inputs
+            for idx in range(0, self.data_forcal_size, self.test_size):
+                ms_input = imgs_ms_forcal[idx:idx + self.test_size, :]
+                array_input = ms_input.asnumpy()
+
+                if "float32" in str(ms_input.dtype).lower():
+                    t_dtype = torch.float32
+                elif "int32" in str(ms_input.dtype).lower():
+                    t_dtype = torch.int64
+
+                torch_input = torch.tensor(array_input, dtype=t_dtype).to(final_device)
+                stage2_inputs.append(([ms_input], [torch_input]))
+        return stage2_inputs
+
+    def build_stage2_mutants(self, generation, ms_lock):
+        # MindSpore work is serialized through ms_lock, its PyNative executor is shared by the whole process
+        cur_generation_trace = self.first_generation_tracedict[str(generation)]
+        if self.lockstep is not None and self.lockstep.seed is not None:
+            # both legs start from the stage-1 seed pair; the PyTorch leg is the lockstep twin when it is cached
+            with ms_lock:
+                model_ms_mutation = self.restore_mutant(deepcopy(cur_generation_trace))
+                rename_parameter(model_ms_mutation)
+            return model_ms_mutation, self.lockstep.restore(cur_generation_trace)
+        with ms_lock:
+            model_ms_origin, model_torch_origin = get_model(self.model_name, input_size=tuple(self.input_size))
+            # the stage-1 cache holds mutants of the MindSpore-only seed, whose weights are not the ones transferred
+            # from PyTorch, so the MindSpore leg is replayed on model_ms_origin to share weights with its twin
+            model_ms_mutation = analyze_log_mindspore_followtrace(deepcopy(cur_generation_trace), model_ms_origin,
+                                                                  self.mut_log_path, self.input_size,
+                                                                  self.train_config)
+            rename_parameter(model_ms_mutation)
+        model_torch_mutation = analyze_log_torch_followtrace(deepcopy(cur_generation_trace), model_torch_origin,
+                                                             self.mut_log_path, self.input_size, self.train_config)
+        return model_ms_mutation, model_torch_mutation
+
+    def stage2_forward_ms(self, model, inputs, multi_inputs, ms_lock):
+        with ms_lock:
+            if "rcnn" in self.model_name and multi_inputs:
+                return model.backbone(inputs[0])
+            return model(*inputs)
+
+    def stage2_forward_torch(self, model, inputs, multi_inputs):
+        # no_grad is thread local, so it is entered on the thread that runs the forward
+        with torch.no_grad():
+            if "rcnn" in self.model_name and multi_inputs:
+                return model.backbone(inputs[0])
+            return model(*inputs)
+
+    @staticmethod
+    def stage2_cos_distances(output_ms, output_torch, sequence_types):
+        cos_dims = []
+        if not isinstance(output_ms, sequence_types):
+            output_ms = output_ms.asnumpy()
+            output_ms = torch.tensor(output_ms, dtype=output_torch.dtype)
+
+            output_torch_array = torch.flatten(output_torch).detach().cpu().numpy()
+            # since torch.flatten is different from that of mindspore, we adopt torch.flatten
+            output_ms_array = torch.flatten(output_ms).detach().cpu().numpy()
+
+            cos_dim = 1 - output_torch_array.dot(output_ms_array) / (
+                    np.linalg.norm(output_torch_array) * np.linalg.norm(output_ms_array))
+            cos_dims.append(cos_dim)
+        else:
+            for idx in range(len(output_torch)):
+                output_ms_idx = output_ms[idx].asnumpy()
+                output_torch_idx = output_torch[idx]
+
+                output_ms_fortorch = torch.tensor(output_ms_idx, dtype=output_torch_idx.dtype)
+
+                output_torch_array = torch.flatten(output_torch_idx).detach().cpu().numpy()
+                output_ms_array = torch.flatten(output_ms_fortorch).detach().cpu().numpy()
+
+                cos_dim = 1 - output_torch_array.dot(output_ms_array) / (
+                        np.linalg.norm(output_torch_array) * np.linalg.norm(output_ms_array))
+                cos_dims.append(cos_dim)
+        return cos_dims
+
+    def record_stage2_verdict(self, generation, mean_diff, duplicate_of=None):
+        self.stage2_diffs[generation] = mean_diff
+        self.second_scores.append(mean_diff)
+        if mean_diff > self.threshold or np.isnan(mean_diff):
+            self.second_generation_tracedict[str(generation)] = self.first_generation_tracedict[str(generation)]
+        note = "" if duplicate_of is None else " (duplicate of {})".format(duplicate_of)
+        f = open(self.true_log_path, 'a+')
+        f.write("selected_mutation_model: {}, ms_torch_diff: {}, diff_threshold: {}{}".format(
+            generation, mean_diff, self.threshold, note))
+        f.close()
+        self.run_log.info("selected_mutation_model: {}, ms_torch_diff: {}, diff_threshold: {}{}".format(
+            generation, mean_diff, self.threshold, note))
+
     def diff_calculate(self):
 
-        _, seed_model_torch = get_model(self.model_name, input_size=tuple(self.input_size))
-        self.inconsistency_traces = {}
-        if self.mutation_strategy == "random":
-            self.inconsistency_traces = check_ms_failed_trace(seed_model_torch, self.mut_log_path, self.input_size, self.train_config, deepcopy(self.total_trace_record[str(self.mutation_iterations)]), mutate_logger=self.run_log)
+        # all traces are replayed together through their prefix tree, every generation is checked once
+        trace_list = [deepcopy(traces) for traces in self.total_trace_record.values()]
+        if self.lockstep is not None and self.lockstep.covers(trace_list):
+            # every generation was already checked against its PyTorch twin during stage 1
+            self.inconsistency_traces = dict(self.lockstep.inconsistency_traces)
+            f = open(self.true_log_path, 'a+')
+            f.write("stage2 trace replay: skipped, {} generations checked in lockstep\n".format(
+                len(self.lockstep.generations)))
+            f.close()
+            self.run_log.info("stage2 trace replay: skipped, {} generations checked in lockstep".format(
+                len(self.lockstep.generations)))
         else:
-            for key in list(self.total_trace_record.keys()):
-                traces = self.total_trace_record[key]
-                _, seed_model_torch = get_model(self.model_name, input_size=tuple(self.input_size))
-                self.inconsistency_traces.update(check_ms_failed_trace(seed_model_torch, self.mut_log_path, self.input_size, self.train_config, deepcopy(traces), mutate_logger=self.run_log))
+            self.inconsistency_traces, replay_stats = check_ms_failed_trie(
+                lambda: get_model(self.model_name, input_size=tuple(self.input_size))[1], self.mut_log_path,
+                self.input_size, self.train_config, trace_list, mutate_logger=self.run_log)
+            f = open(self.true_log_path, 'a+')
+            f.write("stage2 trace replay: {} generations replayed for {} trace generations, clones:{}, "
+                    "rebuilds:{}\n".format(replay_stats["generations"], replay_stats["trace_generations"],
+                                           replay_stats["clones"], replay_stats["rebuilds"]))
+            f.close()
+            self.run_log.info("stage2 trace replay: {} generations replayed for {} trace generations, clones:{}, "
+                              "rebuilds:{}".format(replay_stats["generations"], replay_stats["trace_generations"],
+                                                   replay_stats["clones"], replay_stats["rebuilds"]))
 
         del_traces = list(self.inconsistency_traces.keys())
         for trace in del_traces:
@@ -674,9 +983,7 @@ class NetworkGeneralization:
         first_select_generations = [int(val) for val in first_select_generations_str]
         select_generations = np.sort(first_select_generations)
 
-        test_set = self.dataset(data_dir=self.dataset_path, batch_size=self.data_forcal_size, is_train=True)
-        test_iter = test_set.create_tuple_iterator(output_numpy=True)
-        imgs_ms_forcal = get_filter_data(self.model_name, test_iter, self.data_forcal_size, self.train_config['dtypes'])
+        imgs_ms_forcal = self.get_forcal_data()
 
 
         if "CONTEXT_DEVICE_TARGET" in os.environ and os.environ['CONTEXT_DEVICE_TARGET'] == 'GPU':
@@ -686,126 +993,51 @@ class NetworkGeneralization:
         else:
             final_device = 'cpu'
 
-        for generation in select_generations:
-            model_ms_origin, model_torch_origin = get_model(self.model_name, input_size=tuple(self.input_size))
+        ms_lock = threading.Lock()
+        multi_inputs = isinstance(imgs_ms_forcal, list)
+        stage2_inputs = self.stage2_inputs(imgs_ms_forcal, final_device)
+        prefetcher = MutantPrefetcher(lambda gen: self.build_stage2_mutants(gen, ms_lock), select_generations,
+                                      self.stage2_pipeline_depth)
+        dual_forward = DualForward(concurrent=self.stage2_concurrent_forward)
+        verdicts = {}
+        start_time = time.time()
+        for generation, (model_ms_mutation, model_torch_mutation) in prefetcher:
             f = open(self.true_log_path, 'a+')
             f.write('compare mindspore and pytorch with selected mutation model: {}'.format(generation))
             f.close()
             self.run_log.info('compare mindspore and pytorch with selected mutation model: {}'.format(generation))
 
-            cur_generation_trace = self.first_generation_tracedict[str(generation)]
-            model_ms_mutation = analyze_log_mindspore_followtrace(deepcopy(cur_generation_trace), model_ms_origin,
-                                                                  self.mut_log_path, self.input_size, self.train_config)
-            rename_parameter(model_ms_mutation)
-            model_torch_mutation = analyze_log_torch_followtrace(deepcopy(cur_generation_trace), model_torch_origin,
-                                                                 self.mut_log_path, self.input_size, self.train_config)
+            # the verdict depends on both legs, so a mutant pair is a duplicate only if both fingerprints match
+            fingerprint = None
+            if self.duplicate_elimination:
+                with ms_lock:
+                    fingerprint = self.structural_index.fingerprint(model_ms_mutation)
+                fingerprint = (fingerprint, self.structural_index.fingerprint(model_torch_mutation))
+            if fingerprint in verdicts:
+                self.record_stage2_verdict(generation, verdicts[fingerprint][1], verdicts[fingerprint][0])
+                continue
 
             # calculate the output difference with torch model and mindspore model
             mut_out_diff_metric = []
-            if isinstance(imgs_ms_forcal, list):  # mulptily inputs
-                for idx in range(0, self.data_forcal_size+1, self.test_size):
-                    mindspore_inputs, torch_inputs = [], []
-                    for val in imgs_ms_forcal:
-                        val_slice = val[idx:idx + self.test_size, :]
-                        val_array = val_slice.asnumpy()
-                        if "float32" in str(val.dtype).lower():
-                            t_dtype = torch.float32
-                        elif "int32" in str(val.dtype).lower():
-                            t_dtype = torch.int32
-                        elif "int64" in str(val.dtype).lower():
-                            t_dtype = torch.int64
-                        val_torch = torch.tensor(val_array, dtype=t_dtype).to(final_device)
-                        mindspore_inputs.append(val[idx:idx + self.test_size, :])
-                        torch_inputs.append(val_torch)
-                    with torch.no_grad():
-                        if "rcnn" in self.model_name:
-                            output_torch = model_torch_mutation.backbone(torch_inputs[0])
-                            output_ms = model_ms_mutation.backbone(mindspore_inputs[0])
-                        else:
-                            output_torch = model_torch_mutation(*torch_inputs)
-                            output_ms = model_ms_mutation(*mindspore_inputs)
-
-                    if not isinstance(output_ms, tuple):
-                        output_ms = output_ms.asnumpy()
-                        output_ms = torch.tensor(output_ms, dtype=output_torch.dtype)
-
-                        output_torch_array = torch.flatten(output_torch).detach().cpu().numpy()
-                        # since torch.flatten is different from that of mindspore, we adopt torch.flatten
-                        output_ms_array = torch.flatten(output_ms).detach().cpu().numpy()
-
-                        fenzi = output_torch_array.dot(output_ms_array)
-                        fenmu = np.linalg.norm(output_torch_array) * np.linalg.norm(output_ms_array)
-
-                        cos_dim = 1 - (fenzi / fenmu)
-                        mut_out_diff_metric.append(cos_dim)
-                    else:
-                        for idx in range(len(output_torch)):
-                            output_ms_idx = output_ms[idx].asnumpy()
-                            output_torch_idx = output_torch[idx]
-
-                            output_ms_fortorch = torch.tensor(output_ms_idx, dtype=output_torch_idx.dtype)
-
-                            output_torch_array = torch.flatten(output_torch_idx).detach().cpu().numpy()
-                            output_ms_array = torch.flatten(output_ms_fortorch).detach().cpu().numpy()
-
-                            cos_dim = 1 - output_torch_array.dot(output_ms_array) / (
-                                    np.linalg.norm(output_torch_array) * np.linalg.norm(output_ms_array))
-                            mut_out_diff_metric.append(cos_dim)
-
-            else:  # single inputs
-                for idx in range(0, self.data_forcal_size, self.test_size):
-                    ms_input = imgs_ms_forcal[idx:idx + self.test_size, :]
-                    array_input = ms_input.asnumpy()
-
-                    if "float32" in str(ms_input.dtype).lower():
-                        t_dtype = torch.float32
-                    elif "int32" in str(ms_input.dtype).lower():
-                        t_dtype = torch.int64
-
-                    torch_input = torch.tensor(array_input, dtype=t_dtype).to(final_device)
-
-                    with torch.no_grad():
-                        output_torch = model_torch_mutation(torch_input)
-                    output_ms = model_ms_mutation(ms_input)
-
-                    if 'yolo' in self.model_name or 'openpose' in self.model_name:
-                        output_ms = YoloUtil.reformat_outputs_second_generation(output_ms)
-                        output_torch = YoloUtil.reformat_outputs_second_generation(output_torch)
-
-                    if not (isinstance(output_ms, tuple) or isinstance(output_ms, list)):
-                        output_ms = output_ms.asnumpy()
-                        output_ms = torch.tensor(output_ms, dtype=output_torch.dtype)
-
-                        output_torch_array = torch.flatten(output_torch).detach().cpu().numpy()
-                        # since torch.flatten is different from that of mindspore, we adopt torch.flatten
-                        output_ms_array = torch.flatten(output_ms).detach().cpu().numpy()
-
-                        cos_dim = 1 - output_torch_array.dot(output_ms_array) / (
-                                np.linalg.norm(output_torch_array) * np.linalg.norm(output_ms_array))
-                        mut_out_diff_metric.append(cos_dim)
-                    else:
-                        for idx in range(len(output_torch)):
-                            output_ms_idx = output_ms[idx].asnumpy()
-                            output_torch_idx = output_torch[idx]
-
-                            output_ms_fortorch = torch.tensor(output_ms_idx, dtype=output_torch_idx.dtype)
-
-                            output_torch_array = torch.flatten(output_torch_idx).detach().cpu().numpy()
-                            output_ms_array = torch.flatten(output_ms_fortorch).detach().cpu().numpy()
-
-                            cos_dim = 1 - output_torch_array.dot(output_ms_array) / (
-                                    np.linalg.norm(output_torch_array) * np.linalg.norm(output_ms_array))
-                            mut_out_diff_metric.append(cos_dim)
-
-            self.second_scores.append(np.mean(mut_out_diff_metric))
-            if np.mean(mut_out_diff_metric) > self.threshold or np.isnan(np.mean(mut_out_diff_metric)):
-                self.second_generation_tracedict[str(generation)] = self.first_generation_tracedict[str(generation)]
-            f = open(self.true_log_path, 'a+')
-            f.write("selected_mutation_model: {}, ms_torch_diff: {}, diff_threshold: {}".format(
-                generation, np.mean(mut_out_diff_metric), self.threshold))
-            f.close()
-            self.run_log.info("selected_mutation_model: {}, ms_torch_diff: {}, diff_threshold: {}".format(
-                generation, np.mean(mut_out_diff_metric), self.threshold))
+            for mindspore_inputs, torch_inputs in stage2_inputs:
+                output_ms, output_torch = dual_forward(
+                    lambda: self.stage2_forward_ms(model_ms_mutation, mindspore_inputs, multi_inputs, ms_lock),
+                    lambda: self.stage2_forward_torch(model_torch_mutation, torch_inputs, multi_inputs))
+                if not multi_inputs and ('yolo' in self.model_name or 'openpose' in self.model_name):
+                    output_ms = YoloUtil.reformat_outputs_second_generation(output_ms)
+                    output_torch = YoloUtil.reformat_outputs_second_generation(output_torch)
+                # multiple-input models only treat tuple outputs as several outputs
+                sequence_types = tuple if multi_inputs else (tuple, list)
+                mut_out_diff_metric.extend(self.stage2_cos_distances(output_ms, output_torch, sequence_types))
+
+            self.record_stage2_verdict(generation, np.mean(mut_out_diff_metric))
+            if fingerprint is not None:
+                verdicts[fingerprint] = (generation, np.mean(mut_out_diff_metric))
+        dual_forward.shutdown()
+        f = open(self.true_log_path, 'a+')
+        f.write(pipeline_summary(prefetcher, dual_forward, time.time() - start_time) + "\n")
+        f.close()
+        self.run_log.info(pipeline_summary(prefetcher, dual_forward, time.time() - start_time))
 
         if len(self.second_generation_tracedict) == 0:
             f = open(self.true_log_path, 'a+')
@@ -863,7 +1095,8 @@ class NetworkGeneralization:
 
             self.train_config['generation'] = generation
             start_model_train = get_model_train(self.model_name)
-            start_model_train(model_ms_mutation, model_torch_mutation, self.train_config, self.run_log)
+            start_model_train(model_ms_mutation, model_torch_mutation, self.train_config, self.run_log,
+                              self.true_log_path)
 
 
 def get_arg_opt():
@@ -886,12 +1119,14 @@ def get_arg_opt():
                         default=['LD', 'PM', 'LA', 'RA', 'CM', 'SM', 'LS', 'LC'],
                         choices=['LD', 'PM', 'LA', 'RA', 'CM', 'SM', 'LS', 'LC', 'WS', 'NS', 'GF', 'NAI', 'NEB',"SM", "DM"],
                         help='mutation type: one or more')
-    parser.add_argument('--mutation_strategy', type=str, default='random', choices=['random', 'MCMC'],
+    parser.add_argument('--mutation_strategy', type=str, default='random', choices=['random', 'MCMC', 'beam'],
                         help='mutation strategy')
     parser.add_argument('--log_path', type=str, default='./log', help='the path of mutation log')
     parser.add_argument('--time_stamp', type=str, default=None)
     parser.add_argument('--mutation_log', type=str, default=None, help='the path of existing mutation log')
     parser.add_argument('--selected_gen', type=int, nargs='+', default=None, help='specify generation of mutation')
+    parser.add_argument('--num_workers', type=int, default=1, help='number of parallel stage1 mutation chains')
+    parser.add_argument('--campaign_seed', type=int, default=0, help='RNG seed of the first campaign worker')
     return parser.parse_args()
 
 
@@ -925,6 +1160,8 @@ if __name__ == '__main__':
         mutation_strategy="ddqn",
         mutation_log='/data1/czx/net-sv/common/log',
         selected_gen=None,
+        num_workers=1,
+        campaign_seed=0,
     )
 
 
@@ -942,17 +1179,24 @@ if __name__ == '__main__':
     f.write("Stage1: start network mutation!")
     f.close()
     mutate.run_log.info("Stage1: start network mutation!")
-    mutate.mindspore_mutation()
+    with span("stage1", "stage"):
+        if args_opt.num_workers > 1:
+            run_campaign(mutate, args_opt, args_opt.num_workers)
+        else:
+            mutate.mindspore_mutation()
     f = open(mutate.true_log_path, 'a+')
     f.write('Stage2: select mutation models by calculating distance')
     f.close()
     mutate.run_log.info('Stage2: select mutation models by calculating distance')
-    mutate.diff_calculate()
+    with span("stage2", "stage"):
+        mutate.diff_calculate()
     f = open(mutate.true_log_path, 'a+')
     f.write('Stage3: train mutation model with large output variance between MindSpore and Pytorch')
     f.close()
     mutate.run_log.info('Stage3: train mutation model with large output variance between MindSpore and Pytorch')
-    mutate.mutation_model_train()
+    with span("stage3", "stage"):
+        mutate.mutation_model_train()
+    mutate.write_profile()
 
 
 
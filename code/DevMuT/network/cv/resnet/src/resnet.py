@@ -23,6 +23,7 @@ from mindspore.common.tensor import Tensor
 from network.cv.resnet.src.model_utils.config import config
 
 import troubleshooter as ts
+from common.layer_paths import LayerPathMixin
 
 
 def conv_variance_scaling_initializer(in_channel, out_channel, kernel_size):
@@ -340,7 +341,7 @@ class ResidualBlockBase(nn.Cell):
         return out
 
 
-class ResNet(nn.Cell):
+class ResNet(LayerPathMixin, nn.Cell):
     """
     ResNet architecture.
 
@@ -1228,614 +1229,6 @@ class ResNet(nn.Cell):
 
         return out
 
-    def get_layers(self, layer_name):
-        if layer_name not in self.layer_names.keys():
-            return False
-        return self.layer_names[layer_name]
-
-    def set_layers(self, layer_name, new_layer):
-        if 'conv1' == layer_name:
-            self.conv1 = new_layer
-            self.layer_names["conv1"] = new_layer
-            self.origin_layer_names["conv1"] = new_layer
-        elif 'bn1' == layer_name:
-            self.bn1 = new_layer
-            self.layer_names["bn1"] = new_layer
-            self.origin_layer_names["bn1"] = new_layer
-        elif 'relu' == layer_name:
-            self.relu = new_layer
-            self.layer_names["relu"] = new_layer
-            self.origin_layer_names["relu"] = new_layer
-        elif 'maxpool' == layer_name:
-            self.maxpool = new_layer
-            self.layer_names["maxpool"] = new_layer
-            self.origin_layer_names["maxpool"] = new_layer
-        elif 'layer1' == layer_name:
-            self.layer1 = new_layer
-            self.layer_names["layer1"] = new_layer
-            self.origin_layer_names["layer1"] = new_layer
-        elif 'layer1.0' == layer_name:
-            self.layer1[0] = new_layer
-            self.layer_names["layer1.0"] = new_layer
-            self.origin_layer_names["layer1.0"] = new_layer
-        elif 'layer1.0.conv1' == layer_name:
-            self.layer1[0].conv1 = new_layer
-            self.layer_names["layer1.0.conv1"] = new_layer
-            self.origin_layer_names["layer1.0.conv1"] = new_layer
-        elif 'layer1.0.bn1' == layer_name:
-            self.layer1[0].bn1 = new_layer
-            self.layer_names["layer1.0.bn1"] = new_layer
-            self.origin_layer_names["layer1.0.bn1"] = new_layer
-        elif 'layer1.0.conv2' == layer_name:
-            self.layer1[0].conv2 = new_layer
-            self.layer_names["layer1.0.conv2"] = new_layer
-            self.origin_layer_names["layer1.0.conv2"] = new_layer
-        elif 'layer1.0.bn2' == layer_name:
-            self.layer1[0].bn2 = new_layer
-            self.layer_names["layer1.0.bn2"] = new_layer
-            self.origin_layer_names["layer1.0.bn2"] = new_layer
-        elif 'layer1.0.conv3' == layer_name:
-            self.layer1[0].conv3 = new_layer
-            self.layer_names["layer1.0.conv3"] = new_layer
-            self.origin_layer_names["layer1.0.conv3"] = new_layer
-        elif 'layer1.0.bn3' == layer_name:
-            self.layer1[0].bn3 = new_layer
-            self.layer_names["layer1.0.bn3"] = new_layer
-            self.origin_layer_names["layer1.0.bn3"] = new_layer
-        elif 'layer1.0.relu' == layer_name:
-            self.layer1[0].relu = new_layer
-            self.layer_names["layer1.0.relu"] = new_layer
-            self.origin_layer_names["layer1.0.relu"] = new_layer
-        elif 'layer1.0.down_sample_layer' == layer_name:
-            self.layer1[0].down_sample_layer = new_layer
-            self.layer_names["layer1.0.down_sample_layer"] = new_layer
-            self.origin_layer_names["layer1.0.down_sample_layer"] = new_layer
-        elif 'layer1.0.down_sample_layer.0' == layer_name:
-            self.layer1[0].down_sample_layer[0] = new_layer
-            self.layer_names["layer1.0.down_sample_layer.0"] = new_layer
-            self.origin_layer_names["layer1.0.down_sample_layer.0"] = new_layer
-        elif 'layer1.0.down_sample_layer.1' == layer_name:
-            self.layer1[0].down_sample_layer[1] = new_layer
-            self.layer_names["layer1.0.down_sample_layer.1"] = new_layer
-            self.origin_layer_names["layer1.0.down_sample_layer.1"] = new_layer
-        elif 'layer1.1' == layer_name:
-            self.layer1[1] = new_layer
-            self.layer_names["layer1.1"] = new_layer
-            self.origin_layer_names["layer1.1"] = new_layer
-        elif 'layer1.1.conv1' == layer_name:
-            self.layer1[1].conv1 = new_layer
-            self.layer_names["layer1.1.conv1"] = new_layer
-            self.origin_layer_names["layer1.1.conv1"] = new_layer
-        elif 'layer1.1.bn1' == layer_name:
-            self.layer1[1].bn1 = new_layer
-            self.layer_names["layer1.1.bn1"] = new_layer
-            self.origin_layer_names["layer1.1.bn1"] = new_layer
-        elif 'layer1.1.conv2' == layer_name:
-            self.layer1[1].conv2 = new_layer
-            self.layer_names["layer1.1.conv2"] = new_layer
-            self.origin_layer_names["layer1.1.conv2"] = new_layer
-        elif 'layer1.1.bn2' == layer_name:
-            self.layer1[1].bn2 = new_layer
-            self.layer_names["layer1.1.bn2"] = new_layer
-            self.origin_layer_names["layer1.1.bn2"] = new_layer
-        elif 'layer1.1.conv3' == layer_name:
-            self.layer1[1].conv3 = new_layer
-            self.layer_names["layer1.1.conv3"] = new_layer
-            self.origin_layer_names["layer1.1.conv3"] = new_layer
-        elif 'layer1.1.bn3' == layer_name:
-            self.layer1[1].bn3 = new_layer
-            self.layer_names["layer1.1.bn3"] = new_layer
-            self.origin_layer_names["layer1.1.bn3"] = new_layer
-        elif 'layer1.1.relu' == layer_name:
-            self.layer1[1].relu = new_layer
-            self.layer_names["layer1.1.relu"] = new_layer
-            self.origin_layer_names["layer1.1.relu"] = new_layer
-        elif 'layer1.2' == layer_name:
-            self.layer1[2] = new_layer
-            self.layer_names["layer1.2"] = new_layer
-            self.origin_layer_names["layer1.2"] = new_layer
-        elif 'layer1.2.conv1' == layer_name:
-            self.layer1[2].conv1 = new_layer
-            self.layer_names["layer1.2.conv1"] = new_layer
-            self.origin_layer_names["layer1.2.conv1"] = new_layer
-        elif 'layer1.2.bn1' == layer_name:
-            self.layer1[2].bn1 = new_layer
-            self.layer_names["layer1.2.bn1"] = new_layer
-            self.origin_layer_names["layer1.2.bn1"] = new_layer
-        elif 'layer1.2.conv2' == layer_name:
-            self.layer1[2].conv2 = new_layer
-            self.layer_names["layer1.2.conv2"] = new_layer
-            self.origin_layer_names["layer1.2.conv2"] = new_layer
-        elif 'layer1.2.bn2' == layer_name:
-            self.layer1[2].bn2 = new_layer
-            self.layer_names["layer1.2.bn2"] = new_layer
-            self.origin_layer_names["layer1.2.bn2"] = new_layer
-        elif 'layer1.2.conv3' == layer_name:
-            self.layer1[2].conv3 = new_layer
-            self.layer_names["layer1.2.conv3"] = new_layer
-            self.origin_layer_names["layer1.2.conv3"] = new_layer
-        elif 'layer1.2.bn3' == layer_name:
-            self.layer1[2].bn3 = new_layer
-            self.layer_names["layer1.2.bn3"] = new_layer
-            self.origin_layer_names["layer1.2.bn3"] = new_layer
-        elif 'layer1.2.relu' == layer_name:
-            self.layer1[2].relu = new_layer
-            self.layer_names["layer1.2.relu"] = new_layer
-            self.origin_layer_names["layer1.2.relu"] = new_layer
-        elif 'layer2' == layer_name:
-            self.layer2 = new_layer
-            self.layer_names["layer2"] = new_layer
-            self.origin_layer_names["layer2"] = new_layer
-        elif 'layer2.0' == layer_name:
-            self.layer2[0] = new_layer
-            self.layer_names["layer2.0"] = new_layer
-            self.origin_layer_names["layer2.0"] = new_layer
-        elif 'layer2.0.conv1' == layer_name:
-            self.layer2[0].conv1 = new_layer
-            self.layer_names["layer2.0.conv1"] = new_layer
-            self.origin_layer_names["layer2.0.conv1"] = new_layer
-        elif 'layer2.0.bn1' == layer_name:
-            self.layer2[0].bn1 = new_layer
-            self.layer_names["layer2.0.bn1"] = new_layer
-            self.origin_layer_names["layer2.0.bn1"] = new_layer
-        elif 'layer2.0.conv2' == layer_name:
-            self.layer2[0].conv2 = new_layer
-            self.layer_names["layer2.0.conv2"] = new_layer
-            self.origin_layer_names["layer2.0.conv2"] = new_layer
-        elif 'layer2.0.bn2' == layer_name:
-            self.layer2[0].bn2 = new_layer
-            self.layer_names["layer2.0.bn2"] = new_layer
-            self.origin_layer_names["layer2.0.bn2"] = new_layer
-        elif 'layer2.0.conv3' == layer_name:
-            self.layer2[0].conv3 = new_layer
-            self.layer_names["layer2.0.conv3"] = new_layer
-            self.origin_layer_names["layer2.0.conv3"] = new_layer
-        elif 'layer2.0.bn3' == layer_name:
-            self.layer2[0].bn3 = new_layer
-            self.layer_names["layer2.0.bn3"] = new_layer
-            self.origin_layer_names["layer2.0.bn3"] = new_layer
-        elif 'layer2.0.relu' == layer_name:
-            self.layer2[0].relu = new_layer
-            self.layer_names["layer2.0.relu"] = new_layer
-            self.origin_layer_names["layer2.0.relu"] = new_layer
-        elif 'layer2.0.down_sample_layer' == layer_name:
-            self.layer2[0].down_sample_layer = new_layer
-            self.layer_names["layer2.0.down_sample_layer"] = new_layer
-            self.origin_layer_names["layer2.0.down_sample_layer"] = new_layer
-        elif 'layer2.0.down_sample_layer.0' == layer_name:
-            self.layer2[0].down_sample_layer[0] = new_layer
-            self.layer_names["layer2.0.down_sample_layer.0"] = new_layer
-            self.origin_layer_names["layer2.0.down_sample_layer.0"] = new_layer
-        elif 'layer2.0.down_sample_layer.1' == layer_name:
-            self.layer2[0].down_sample_layer[1] = new_layer
-            self.layer_names["layer2.0.down_sample_layer.1"] = new_layer
-            self.origin_layer_names["layer2.0.down_sample_layer.1"] = new_layer
-        elif 'layer2.1' == layer_name:
-            self.layer2[1] = new_layer
-            self.layer_names["layer2.1"] = new_layer
-            self.origin_layer_names["layer2.1"] = new_layer
-        elif 'layer2.1.conv1' == layer_name:
-            self.layer2[1].conv1 = new_layer
-            self.layer_names["layer2.1.conv1"] = new_layer
-            self.origin_layer_names["layer2.1.conv1"] = new_layer
-        elif 'layer2.1.bn1' == layer_name:
-            self.layer2[1].bn1 = new_layer
-            self.layer_names["layer2.1.bn1"] = new_layer
-            self.origin_layer_names["layer2.1.bn1"] = new_layer
-        elif 'layer2.1.conv2' == layer_name:
-            self.layer2[1].conv2 = new_layer
-            self.layer_names["layer2.1.conv2"] = new_layer
-            self.origin_layer_names["layer2.1.conv2"] = new_layer
-        elif 'layer2.1.bn2' == layer_name:
-            self.layer2[1].bn2 = new_layer
-            self.layer_names["layer2.1.bn2"] = new_layer
-            self.origin_layer_names["layer2.1.bn2"] = new_layer
-        elif 'layer2.1.conv3' == layer_name:
-            self.layer2[1].conv3 = new_layer
-            self.layer_names["layer2.1.conv3"] = new_layer
-            self.origin_layer_names["layer2.1.conv3"] = new_layer
-        elif 'layer2.1.bn3' == layer_name:
-            self.layer2[1].bn3 = new_layer
-            self.layer_names["layer2.1.bn3"] = new_layer
-            self.origin_layer_names["layer2.1.bn3"] = new_layer
-        elif 'layer2.1.relu' == layer_name:
-            self.layer2[1].relu = new_layer
-            self.layer_names["layer2.1.relu"] = new_layer
-            self.origin_layer_names["layer2.1.relu"] = new_layer
-        elif 'layer2.2' == layer_name:
-            self.layer2[2] = new_layer
-            self.layer_names["layer2.2"] = new_layer
-            self.origin_layer_names["layer2.2"] = new_layer
-        elif 'layer2.2.conv1' == layer_name:
-            self.layer2[2].conv1 = new_layer
-            self.layer_names["layer2.2.conv1"] = new_layer
-            self.origin_layer_names["layer2.2.conv1"] = new_layer
-        elif 'layer2.2.bn1' == layer_name:
-            self.layer2[2].bn1 = new_layer
-            self.layer_names["layer2.2.bn1"] = new_layer
-            self.origin_layer_names["layer2.2.bn1"] = new_layer
-        elif 'layer2.2.conv2' == layer_name:
-            self.layer2[2].conv2 = new_layer
-            self.layer_names["layer2.2.conv2"] = new_layer
-            self.origin_layer_names["layer2.2.conv2"] = new_layer
-        elif 'layer2.2.bn2' == layer_name:
-            self.layer2[2].bn2 = new_layer
-            self.layer_names["layer2.2.bn2"] = new_layer
-            self.origin_layer_names["layer2.2.bn2"] = new_layer
-        elif 'layer2.2.conv3' == layer_name:
-            self.layer2[2].conv3 = new_layer
-            self.layer_names["layer2.2.conv3"] = new_layer
-            self.origin_layer_names["layer2.2.conv3"] = new_layer
-        elif 'layer2.2.bn3' == layer_name:
-            self.layer2[2].bn3 = new_layer
-            self.layer_names["layer2.2.bn3"] = new_layer
-            self.origin_layer_names["layer2.2.bn3"] = new_layer
-        elif 'layer2.2.relu' == layer_name:
-            self.layer2[2].relu = new_layer
-            self.layer_names["layer2.2.relu"] = new_layer
-            self.origin_layer_names["layer2.2.relu"] = new_layer
-        elif 'layer2.3' == layer_name:
-            self.layer2[3] = new_layer
-            self.layer_names["layer2.3"] = new_layer
-            self.origin_layer_names["layer2.3"] = new_layer
-        elif 'layer2.3.conv1' == layer_name:
-            self.layer2[3].conv1 = new_layer
-            self.layer_names["layer2.3.conv1"] = new_layer
-            self.origin_layer_names["layer2.3.conv1"] = new_layer
-        elif 'layer2.3.bn1' == layer_name:
-            self.layer2[3].bn1 = new_layer
-            self.layer_names["layer2.3.bn1"] = new_layer
-            self.origin_layer_names["layer2.3.bn1"] = new_layer
-        elif 'layer2.3.conv2' == layer_name:
-            self.layer2[3].conv2 = new_layer
-            self.layer_names["layer2.3.conv2"] = new_layer
-            self.origin_layer_names["layer2.3.conv2"] = new_layer
-        elif 'layer2.3.bn2' == layer_name:
-            self.layer2[3].bn2 = new_layer
-            self.layer_names["layer2.3.bn2"] = new_layer
-            self.origin_layer_names["layer2.3.bn2"] = new_layer
-        elif 'layer2.3.conv3' == layer_name:
-            self.layer2[3].conv3 = new_layer
-            self.layer_names["layer2.3.conv3"] = new_layer
-            self.origin_layer_names["layer2.3.conv3"] = new_layer
-        elif 'layer2.3.bn3' == layer_name:
-            self.layer2[3].bn3 = new_layer
-            self.layer_names["layer2.3.bn3"] = new_layer
-            self.origin_layer_names["layer2.3.bn3"] = new_layer
-        elif 'layer2.3.relu' == layer_name:
-            self.layer2[3].relu = new_layer
-            self.layer_names["layer2.3.relu"] = new_layer
-            self.origin_layer_names["layer2.3.relu"] = new_layer
-        elif 'layer3' == layer_name:
-            self.layer3 = new_layer
-            self.layer_names["layer3"] = new_layer
-            self.origin_layer_names["layer3"] = new_layer
-        elif 'layer3.0' == layer_name:
-            self.layer3[0] = new_layer
-            self.layer_names["layer3.0"] = new_layer
-            self.origin_layer_names["layer3.0"] = new_layer
-        elif 'layer3.0.conv1' == layer_name:
-            self.layer3[0].conv1 = new_layer
-            self.layer_names["layer3.0.conv1"] = new_layer
-            self.origin_layer_names["layer3.0.conv1"] = new_layer
-        elif 'layer3.0.bn1' == layer_name:
-            self.layer3[0].bn1 = new_layer
-            self.layer_names["layer3.0.bn1"] = new_layer
-            self.origin_layer_names["layer3.0.bn1"] = new_layer
-        elif 'layer3.0.conv2' == layer_name:
-            self.layer3[0].conv2 = new_layer
-            self.layer_names["layer3.0.conv2"] = new_layer
-            self.origin_layer_names["layer3.0.conv2"] = new_layer
-        elif 'layer3.0.bn2' == layer_name:
-            self.layer3[0].bn2 = new_layer
-            self.layer_names["layer3.0.bn2"] = new_layer
-            self.origin_layer_names["layer3.0.bn2"] = new_layer
-        elif 'layer3.0.conv3' == layer_name:
-            self.layer3[0].conv3 = new_layer
-            self.layer_names["layer3.0.conv3"] = new_layer
-            self.origin_layer_names["layer3.0.conv3"] = new_layer
-        elif 'layer3.0.bn3' == layer_name:
-            self.layer3[0].bn3 = new_layer
-            self.layer_names["layer3.0.bn3"] = new_layer
-            self.origin_layer_names["layer3.0.bn3"] = new_layer
-        elif 'layer3.0.relu' == layer_name:
-            self.layer3[0].relu = new_layer
-            self.layer_names["layer3.0.relu"] = new_layer
-            self.origin_layer_names["layer3.0.relu"] = new_layer
-        elif 'layer3.0.down_sample_layer' == layer_name:
-            self.layer3[0].down_sample_layer = new_layer
-            self.layer_names["layer3.0.down_sample_layer"] = new_layer
-            self.origin_layer_names["layer3.0.down_sample_layer"] = new_layer
-        elif 'layer3.0.down_sample_layer.0' == layer_name:
-            self.layer3[0].down_sample_layer[0] = new_layer
-            self.layer_names["layer3.0.down_sample_layer.0"] = new_layer
-            self.origin_layer_names["layer3.0.down_sample_layer.0"] = new_layer
-        elif 'layer3.0.down_sample_layer.1' == layer_name:
-            self.layer3[0].down_sample_layer[1] = new_layer
-            self.layer_names["layer3.0.down_sample_layer.1"] = new_layer
-            self.origin_layer_names["layer3.0.down_sample_layer.1"] = new_layer
-        elif 'layer3.1' == layer_name:
-            self.layer3[1] = new_layer
-            self.layer_names["layer3.1"] = new_layer
-            self.origin_layer_names["layer3.1"] = new_layer
-        elif 'layer3.1.conv1' == layer_name:
-            self.layer3[1].conv1 = new_layer
-            self.layer_names["layer3.1.conv1"] = new_layer
-            self.origin_layer_names["layer3.1.conv1"] = new_layer
-        elif 'layer3.1.bn1' == layer_name:
-            self.layer3[1].bn1 = new_layer
-            self.layer_names["layer3.1.bn1"] = new_layer
-            self.origin_layer_names["layer3.1.bn1"] = new_layer
-        elif 'layer3.1.conv2' == layer_name:
-            self.layer3[1].conv2 = new_layer
-            self.layer_names["layer3.1.conv2"] = new_layer
-            self.origin_layer_names["layer3.1.conv2"] = new_layer
-        elif 'layer3.1.bn2' == layer_name:
-            self.layer3[1].bn2 = new_layer
-            self.layer_names["layer3.1.bn2"] = new_layer
-            self.origin_layer_names["layer3.1.bn2"] = new_layer
-        elif 'layer3.1.conv3' == layer_name:
-            self.layer3[1].conv3 = new_layer
-            self.layer_names["layer3.1.conv3"] = new_layer
-            self.origin_layer_names["layer3.1.conv3"] = new_layer
-        elif 'layer3.1.bn3' == layer_name:
-            self.layer3[1].bn3 = new_layer
-            self.layer_names["layer3.1.bn3"] = new_layer
-            self.origin_layer_names["layer3.1.bn3"] = new_layer
-        elif 'layer3.1.relu' == layer_name:
-            self.layer3[1].relu = new_layer
-            self.layer_names["layer3.1.relu"] = new_layer
-            self.origin_layer_names["layer3.1.relu"] = new_layer
-        elif 'layer3.2' == layer_name:
-            self.layer3[2] = new_layer
-            self.layer_names["layer3.2"] = new_layer
-            self.origin_layer_names["layer3.2"] = new_layer
-        elif 'layer3.2.conv1' == layer_name:
-            self.layer3[2].conv1 = new_layer
-            self.layer_names["layer3.2.conv1"] = new_layer
-            self.origin_layer_names["layer3.2.conv1"] = new_layer
-        elif 'layer3.2.bn1' == layer_name:
-            self.layer3[2].bn1 = new_layer
-            self.layer_names["layer3.2.bn1"] = new_layer
-            self.origin_layer_names["layer3.2.bn1"] = new_layer
-        elif 'layer3.2.conv2' == layer_name:
-            self.layer3[2].conv2 = new_layer
-            self.layer_names["layer3.2.conv2"] = new_layer
-            self.origin_layer_names["layer3.2.conv2"] = new_layer
-        elif 'layer3.2.bn2' == layer_name:
-            self.layer3[2].bn2 = new_layer
-            self.layer_names["layer3.2.bn2"] = new_layer
-            self.origin_layer_names["layer3.2.bn2"] = new_layer
-        elif 'layer3.2.conv3' == layer_name:
-            self.layer3[2].conv3 = new_layer
-            self.layer_names["layer3.2.conv3"] = new_layer
-            self.origin_layer_names["layer3.2.conv3"] = new_layer
-        elif 'layer3.2.bn3' == layer_name:
-            self.layer3[2].bn3 = new_layer
-            self.layer_names["layer3.2.bn3"] = new_layer
-            self.origin_layer_names["layer3.2.bn3"] = new_layer
-        elif 'layer3.2.relu' == layer_name:
-            self.layer3[2].relu = new_layer
-            self.layer_names["layer3.2.relu"] = new_layer
-            self.origin_layer_names["layer3.2.relu"] = new_layer
-        elif 'layer3.3' == layer_name:
-            self.layer3[3] = new_layer
-            self.layer_names["layer3.3"] = new_layer
-            self.origin_layer_names["layer3.3"] = new_layer
-        elif 'layer3.3.conv1' == layer_name:
-            self.layer3[3].conv1 = new_layer
-            self.layer_names["layer3.3.conv1"] = new_layer
-            self.origin_layer_names["layer3.3.conv1"] = new_layer
-        elif 'layer3.3.bn1' == layer_name:
-            self.layer3[3].bn1 = new_layer
-            self.layer_names["layer3.3.bn1"] = new_layer
-            self.origin_layer_names["layer3.3.bn1"] = new_layer
-        elif 'layer3.3.conv2' == layer_name:
-            self.layer3[3].conv2 = new_layer
-            self.layer_names["layer3.3.conv2"] = new_layer
-            self.origin_layer_names["layer3.3.conv2"] = new_layer
-        elif 'layer3.3.bn2' == layer_name:
-            self.layer3[3].bn2 = new_layer
-            self.layer_names["layer3.3.bn2"] = new_layer
-            self.origin_layer_names["layer3.3.bn2"] = new_layer
-        elif 'layer3.3.conv3' == layer_name:
-            self.layer3[3].conv3 = new_layer
-            self.layer_names["layer3.3.conv3"] = new_layer
-            self.origin_layer_names["layer3.3.conv3"] = new_layer
-        elif 'layer3.3.bn3' == layer_name:
-            self.layer3[3].bn3 = new_layer
-            self.layer_names["layer3.3.bn3"] = new_layer
-            self.origin_layer_names["layer3.3.bn3"] = new_layer
-        elif 'layer3.3.relu' == layer_name:
-            self.layer3[3].relu = new_layer
-            self.layer_names["layer3.3.relu"] = new_layer
-            self.origin_layer_names["layer3.3.relu"] = new_layer
-        elif 'layer3.4' == layer_name:
-            self.layer3[4] = new_layer
-            self.layer_names["layer3.4"] = new_layer
-            self.origin_layer_names["layer3.4"] = new_layer
-        elif 'layer3.4.conv1' == layer_name:
-            self.layer3[4].conv1 = new_layer
-            self.layer_names["layer3.4.conv1"] = new_layer
-            self.origin_layer_names["layer3.4.conv1"] = new_layer
-        elif 'layer3.4.bn1' == layer_name:
-            self.layer3[4].bn1 = new_layer
-            self.layer_names["layer3.4.bn1"] = new_layer
-            self.origin_layer_names["layer3.4.bn1"] = new_layer
-        elif 'layer3.4.conv2' == layer_name:
-            self.layer3[4].conv2 = new_layer
-            self.layer_names["layer3.4.conv2"] = new_layer
-            self.origin_layer_names["layer3.4.conv2"] = new_layer
-        elif 'layer3.4.bn2' == layer_name:
-            self.layer3[4].bn2 = new_layer
-            self.layer_names["layer3.4.bn2"] = new_layer
-            self.origin_layer_names["layer3.4.bn2"] = new_layer
-        elif 'layer3.4.conv3' == layer_name:
-            self.layer3[4].conv3 = new_layer
-            self.layer_names["layer3.4.conv3"] = new_layer
-            self.origin_layer_names["layer3.4.conv3"] = new_layer
-        elif 'layer3.4.bn3' == layer_name:
-            self.layer3[4].bn3 = new_layer
-            self.layer_names["layer3.4.bn3"] = new_layer
-            self.origin_layer_names["layer3.4.bn3"] = new_layer
-        elif 'layer3.4.relu' == layer_name:
-            self.layer3[4].relu = new_layer
-            self.layer_names["layer3.4.relu"] = new_layer
-            self.origin_layer_names["layer3.4.relu"] = new_layer
-        elif 'layer3.5' == layer_name:
-            self.layer3[5] = new_layer
-            self.layer_names["layer3.5"] = new_layer
-            self.origin_layer_names["layer3.5"] = new_layer
-        elif 'layer3.5.conv1' == layer_name:
-            self.layer3[5].conv1 = new_layer
-            self.layer_names["layer3.5.conv1"] = new_layer
-            self.origin_layer_names["layer3.5.conv1"] = new_layer
-        elif 'layer3.5.bn1' == layer_name:
-            self.layer3[5].bn1 = new_layer
-            self.layer_names["layer3.5.bn1"] = new_layer
-            self.origin_layer_names["layer3.5.bn1"] = new_layer
-        elif 'layer3.5.conv2' == layer_name:
-            self.layer3[5].conv2 = new_layer
-            self.layer_names["layer3.5.conv2"] = new_layer
-            self.origin_layer_names["layer3.5.conv2"] = new_layer
-        elif 'layer3.5.bn2' == layer_name:
-            self.layer3[5].bn2 = new_layer
-            self.layer_names["layer3.5.bn2"] = new_layer
-            self.origin_layer_names["layer3.5.bn2"] = new_layer
-        elif 'layer3.5.conv3' == layer_name:
-            self.layer3[5].conv3 = new_layer
-            self.layer_names["layer3.5.conv3"] = new_layer
-            self.origin_layer_names["layer3.5.conv3"] = new_layer
-        elif 'layer3.5.bn3' == layer_name:
-            self.layer3[5].bn3 = new_layer
-            self.layer_names["layer3.5.bn3"] = new_layer
-            self.origin_layer_names["layer3.5.bn3"] = new_layer
-        elif 'layer3.5.relu' == layer_name:
-            self.layer3[5].relu = new_layer
-            self.layer_names["layer3.5.relu"] = new_layer
-            self.origin_layer_names["layer3.5.relu"] = new_layer
-        elif 'layer4' == layer_name:
-            self.layer4 = new_layer
-            self.layer_names["layer4"] = new_layer
-            self.origin_layer_names["layer4"] = new_layer
-        elif 'layer4.0' == layer_name:
-            self.layer4[0] = new_layer
-            self.layer_names["layer4.0"] = new_layer
-            self.origin_layer_names["layer4.0"] = new_layer
-        elif 'layer4.0.conv1' == layer_name:
-            self.layer4[0].conv1 = new_layer
-            self.layer_names["layer4.0.conv1"] = new_layer
-            self.origin_layer_names["layer4.0.conv1"] = new_layer
-        elif 'layer4.0.bn1' == layer_name:
-            self.layer4[0].bn1 = new_layer
-            self.layer_names["layer4.0.bn1"] = new_layer
-            self.origin_layer_names["layer4.0.bn1"] = new_layer
-        elif 'layer4.0.conv2' == layer_name:
-            self.layer4[0].conv2 = new_layer
-            self.layer_names["layer4.0.conv2"] = new_layer
-            self.origin_layer_names["layer4.0.conv2"] = new_layer
-        elif 'layer4.0.bn2' == layer_name:
-            self.layer4[0].bn2 = new_layer
-            self.layer_names["layer4.0.bn2"] = new_layer
-            self.origin_layer_names["layer4.0.bn2"] = new_layer
-        elif 'layer4.0.conv3' == layer_name:
-            self.layer4[0].conv3 = new_layer
-            self.layer_names["layer4.0.conv3"] = new_layer
-            self.origin_layer_names["layer4.0.conv3"] = new_layer
-        elif 'layer4.0.bn3' == layer_name:
-            self.layer4[0].bn3 = new_layer
-            self.layer_names["layer4.0.bn3"] = new_layer
-            self.origin_layer_names["layer4.0.bn3"] = new_layer
-        elif 'layer4.0.relu' == layer_name:
-            self.layer4[0].relu = new_layer
-            self.layer_names["layer4.0.relu"] = new_layer
-            self.origin_layer_names["layer4.0.relu"] = new_layer
-        elif 'layer4.0.down_sample_layer' == layer_name:
-            self.layer4[0].down_sample_layer = new_layer
-            self.layer_names["layer4.0.down_sample_layer"] = new_layer
-            self.origin_layer_names["layer4.0.down_sample_layer"] = new_layer
-        elif 'layer4.0.down_sample_layer.0' == layer_name:
-            self.layer4[0].down_sample_layer[0] = new_layer
-            self.layer_names["layer4.0.down_sample_layer.0"] = new_layer
-            self.origin_layer_names["layer4.0.down_sample_layer.0"] = new_layer
-        elif 'layer4.0.down_sample_layer.1' == layer_name:
-            self.layer4[0].down_sample_layer[1] = new_layer
-            self.layer_names["layer4.0.down_sample_layer.1"] = new_layer
-            self.origin_layer_names["layer4.0.down_sample_layer.1"] = new_layer
-        elif 'layer4.1' == layer_name:
-            self.layer4[1] = new_layer
-            self.layer_names["layer4.1"] = new_layer
-            self.origin_layer_names["layer4.1"] = new_layer
-        elif 'layer4.1.conv1' == layer_name:
-            self.layer4[1].conv1 = new_layer
-            self.layer_names["layer4.1.conv1"] = new_layer
-            self.origin_layer_names["layer4.1.conv1"] = new_layer
-        elif 'layer4.1.bn1' == layer_name:
-            self.layer4[1].bn1 = new_layer
-            self.layer_names["layer4.1.bn1"] = new_layer
-            self.origin_layer_names["layer4.1.bn1"] = new_layer
-        elif 'layer4.1.conv2' == layer_name:
-            self.layer4[1].conv2 = new_layer
-            self.layer_names["layer4.1.conv2"] = new_layer
-            self.origin_layer_names["layer4.1.conv2"] = new_layer
-        elif 'layer4.1.bn2' == layer_name:
-            self.layer4[1].bn2 = new_layer
-            self.layer_names["layer4.1.bn2"] = new_layer
-            self.origin_layer_names["layer4.1.bn2"] = new_layer
-        elif 'layer4.1.conv3' == layer_name:
-            self.layer4[1].conv3 = new_layer
-            self.layer_names["layer4.1.conv3"] = new_layer
-            self.origin_layer_names["layer4.1.conv3"] = new_layer
-        elif 'layer4.1.bn3' == layer_name:
-            self.layer4[1].bn3 = new_layer
-            self.layer_names["layer4.1.bn3"] = new_layer
-            self.origin_layer_names["layer4.1.bn3"] = new_layer
-        elif 'layer4.1.relu' == layer_name:
-            self.layer4[1].relu = new_layer
-            self.layer_names["layer4.1.relu"] = new_layer
-            self.origin_layer_names["layer4.1.relu"] = new_layer
-        elif 'layer4.2' == layer_name:
-            self.layer4[2] = new_layer
-            self.layer_names["layer4.2"] = new_layer
-            self.origin_layer_names["layer4.2"] = new_layer
-        elif 'layer4.2.conv1' == layer_name:
-            self.layer4[2].conv1 = new_layer
-            self.layer_names["layer4.2.conv1"] = new_layer
-            self.origin_layer_names["layer4.2.conv1"] = new_layer
-        elif 'layer4.2.bn1' == layer_name:
-            self.layer4[2].bn1 = new_layer
-            self.layer_names["layer4.2.bn1"] = new_layer
-            self.origin_layer_names["layer4.2.bn1"] = new_layer
-        elif 'layer4.2.conv2' == layer_name:
-            self.layer4[2].conv2 = new_layer
-            self.layer_names["layer4.2.conv2"] = new_layer
-            self.origin_layer_names["layer4.2.conv2"] = new_layer
-        elif 'layer4.2.bn2' == layer_name:
-            self.layer4[2].bn2 = new_layer
-            self.layer_names["layer4.2.bn2"] = new_layer
-            self.origin_layer_names["layer4.2.bn2"] = new_layer
-        elif 'layer4.2.conv3' == layer_name:
-            self.layer4[2].conv3 = new_layer
-            self.layer_names["layer4.2.conv3"] = new_layer
-            self.origin_layer_names["layer4.2.conv3"] = new_layer
-        elif 'layer4.2.bn3' == layer_name:
-            self.layer4[2].bn3 = new_layer
-            self.layer_names["layer4.2.bn3"] = new_layer
-            self.origin_layer_names["layer4.2.bn3"] = new_layer
-        elif 'layer4.2.relu' == layer_name:
-            self.layer4[2].relu = new_layer
-            self.layer_names["layer4.2.relu"] = new_layer
-            self.origin_layer_names["layer4.2.relu"] = new_layer
-        elif 'flatten' == layer_name:
-            self.flatten = new_layer
-            self.layer_names["flatten"] = new_layer
-            self.origin_layer_names["flatten"] = new_layer
-        elif 'end_point' == layer_name:
-            self.end_point = new_layer
-            self.layer_names["end_point"] = new_layer
-            self.origin_layer_names["end_point"] = new_layer
-
-
     def get_order(self, layer_name):
         if layer_name not in self.orders.keys():
             return False
@@ -19,6 +19,7 @@ from mindspore.common.initializer import TruncatedNormal
 from network.cv.unet.Unetconfig import config
 from mindspore import context, ops
 from mindspore.nn import CentralCrop
+from common.layer_paths import LayerPathMixin
 
 
 def preprocess_img_mask(img, mask, num_classes, img_size, augment=False, eval_resize=False):
@@ -406,7 +407,7 @@ class OutConv(nn.Cell):
         return x
 
 
-class UNetMedical(nn.Cell):
+class UNetMedical(LayerPathMixin, nn.Cell):
     def __init__(self, n_channels, n_classes):
         super(UNetMedical, self).__init__()
         self.n_channels = n_channels
@@ -794,349 +795,6 @@ class UNetMedical(nn.Cell):
 
 
 
-    def set_layers(self, layer_name, new_layer):
-        if 'inc' == layer_name:
-            self.inc = new_layer
-            self.layer_names["inc"] = new_layer
-            self.origin_layer_names["inc"] = new_layer
-        elif 'inc.double_conv' == layer_name:
-            self.inc.double_conv = new_layer
-            self.layer_names["inc.double_conv"] = new_layer
-            self.origin_layer_names["inc.double_conv"] = new_layer
-        elif 'inc.double_conv.0' == layer_name:
-            self.inc.double_conv[0] = new_layer
-            self.layer_names["inc.double_conv.0"] = new_layer
-            self.origin_layer_names["inc.double_conv.0"] = new_layer
-        elif 'inc.double_conv.1' == layer_name:
-            self.inc.double_conv[1] = new_layer
-            self.layer_names["inc.double_conv.1"] = new_layer
-            self.origin_layer_names["inc.double_conv.1"] = new_layer
-        elif 'inc.double_conv.2' == layer_name:
-            self.inc.double_conv[2] = new_layer
-            self.layer_names["inc.double_conv.2"] = new_layer
-            self.origin_layer_names["inc.double_conv.2"] = new_layer
-        elif 'inc.double_conv.3' == layer_name:
-            self.inc.double_conv[3] = new_layer
-            self.layer_names["inc.double_conv.3"] = new_layer
-            self.origin_layer_names["inc.double_conv.3"] = new_layer
-        elif 'down1' == layer_name:
-            self.down1 = new_layer
-            self.layer_names["down1"] = new_layer
-            self.origin_layer_names["down1"] = new_layer
-        elif 'down1.maxpool_conv' == layer_name:
-            self.down1.maxpool_conv = new_layer
-            self.layer_names["down1.maxpool_conv"] = new_layer
-            self.origin_layer_names["down1.maxpool_conv"] = new_layer
-        elif 'down1.maxpool_conv.0' == layer_name:
-            self.down1.maxpool_conv[0] = new_layer
-            self.layer_names["down1.maxpool_conv.0"] = new_layer
-            self.origin_layer_names["down1.maxpool_conv.0"] = new_layer
-        elif 'down1.maxpool_conv.1' == layer_name:
-            self.down1.maxpool_conv[1] = new_layer
-            self.layer_names["down1.maxpool_conv.1"] = new_layer
-            self.origin_layer_names["down1.maxpool_conv.1"] = new_layer
-        elif 'down1.maxpool_conv.1.double_conv' == layer_name:
-            self.down1.maxpool_conv[1].double_conv = new_layer
-            self.layer_names["down1.maxpool_conv.1.double_conv"] = new_layer
-            self.origin_layer_names["down1.maxpool_conv.1.double_conv"] = new_layer
-        elif 'down1.maxpool_conv.1.double_conv.0' == layer_name:
-            self.down1.maxpool_conv[1].double_conv[0] = new_layer
-            self.layer_names["down1.maxpool_conv.1.double_conv.0"] = new_layer
-            self.origin_layer_names["down1.maxpool_conv.1.double_conv.0"] = new_layer
-        elif 'down1.maxpool_conv.1.double_conv.1' == layer_name:
-            self.down1.maxpool_conv[1].double_conv[1] = new_layer
-            self.layer_names["down1.maxpool_conv.1.double_conv.1"] = new_layer
-            self.origin_layer_names["down1.maxpool_conv.1.double_conv.1"] = new_layer
-        elif 'down1.maxpool_conv.1.double_conv.2' == layer_name:
-            self.down1.maxpool_conv[1].double_conv[2] = new_layer
-            self.layer_names["down1.maxpool_conv.1.double_conv.2"] = new_layer
-            self.origin_layer_names["down1.maxpool_conv.1.double_conv.2"] = new_layer
-        elif 'down1.maxpool_conv.1.double_conv.3' == layer_name:
-            self.down1.maxpool_conv[1].double_conv[3] = new_layer
-            self.layer_names["down1.maxpool_conv.1.double_conv.3"] = new_layer
-            self.origin_layer_names["down1.maxpool_conv.1.double_conv.3"] = new_layer
-        elif 'down2' == layer_name:
-            self.down2 = new_layer
-            self.layer_names["down2"] = new_layer
-            self.origin_layer_names["down2"] = new_layer
-        elif 'down2.maxpool_conv' == layer_name:
-            self.down2.maxpool_conv = new_layer
-            self.layer_names["down2.maxpool_conv"] = new_layer
-            self.origin_layer_names["down2.maxpool_conv"] = new_layer
-        elif 'down2.maxpool_conv.0' == layer_name:
-            self.down2.maxpool_conv[0] = new_layer
-            self.layer_names["down2.maxpool_conv.0"] = new_layer
-            self.origin_layer_names["down2.maxpool_conv.0"] = new_layer
-        elif 'down2.maxpool_conv.1' == layer_name:
-            self.down2.maxpool_conv[1] = new_layer
-            self.layer_names["down2.maxpool_conv.1"] = new_layer
-            self.origin_layer_names["down2.maxpool_conv.1"] = new_layer
-        elif 'down2.maxpool_conv.1.double_conv' == layer_name:
-            self.down2.maxpool_conv[1].double_conv = new_layer
-            self.layer_names["down2.maxpool_conv.1.double_conv"] = new_layer
-            self.origin_layer_names["down2.maxpool_conv.1.double_conv"] = new_layer
-        elif 'down2.maxpool_conv.1.double_conv.0' == layer_name:
-            self.down2.maxpool_conv[1].double_conv[0] = new_layer
-            self.layer_names["down2.maxpool_conv.1.double_conv.0"] = new_layer
-            self.origin_layer_names["down2.maxpool_conv.1.double_conv.0"] = new_layer
-        elif 'down2.maxpool_conv.1.double_conv.1' == layer_name:
-            self.down2.maxpool_conv[1].double_conv[1] = new_layer
-            self.layer_names["down2.maxpool_conv.1.double_conv.1"] = new_layer
-            self.origin_layer_names["down2.maxpool_conv.1.double_conv.1"] = new_layer
-        elif 'down2.maxpool_conv.1.double_conv.2' == layer_name:
-            self.down2.maxpool_conv[1].double_conv[2] = new_layer
-            self.layer_names["down2.maxpool_conv.1.double_conv.2"] = new_layer
-            self.origin_layer_names["down2.maxpool_conv.1.double_conv.2"] = new_layer
-        elif 'down2.maxpool_conv.1.double_conv.3' == layer_name:
-            self.down2.maxpool_conv[1].double_conv[3] = new_layer
-            self.layer_names["down2.maxpool_conv.1.double_conv.3"] = new_layer
-            self.origin_layer_names["down2.maxpool_conv.1.double_conv.3"] = new_layer
-        elif 'down3' == layer_name:
-            self.down3 = new_layer
-            self.layer_names["down3"] = new_layer
-            self.origin_layer_names["down3"] = new_layer
-        elif 'down3.maxpool_conv' == layer_name:
-            self.down3.maxpool_conv = new_layer
-            self.layer_names["down3.maxpool_conv"] = new_layer
-            self.origin_layer_names["down3.maxpool_conv"] = new_layer
-        elif 'down3.maxpool_conv.0' == layer_name:
-            self.down3.maxpool_conv[0] = new_layer
-            self.layer_names["down3.maxpool_conv.0"] = new_layer
-            self.origin_layer_names["down3.maxpool_conv.0"] = new_layer
-        elif 'down3.maxpool_conv.1' == layer_name:
-            self.down3.maxpool_conv[1] = new_layer
-            self.layer_names["down3.maxpool_conv.1"] = new_layer
-            self.origin_layer_names["down3.maxpool_conv.1"] = new_layer
-        elif 'down3.maxpool_conv.1.double_conv' == layer_name:
-            self.down3.maxpool_conv[1].double_conv = new_layer
-            self.layer_names["down3.maxpool_conv.1.double_conv"] = new_layer
-            self.origin_layer_names["down3.maxpool_conv.1.double_conv"] = new_layer
-        elif 'down3.maxpool_conv.1.double_conv.0' == layer_name:
-            self.down3.maxpool_conv[1].double_conv[0] = new_layer
-            self.layer_names["down3.maxpool_conv.1.double_conv.0"] = new_layer
-            self.origin_layer_names["down3.maxpool_conv.1.double_conv.0"] = new_layer
-        elif 'down3.maxpool_conv.1.double_conv.1' == layer_name:
-            self.down3.maxpool_conv[1].double_conv[1] = new_layer
-            self.layer_names["down3.maxpool_conv.1.double_conv.1"] = new_layer
-            self.origin_layer_names["down3.maxpool_conv.1.double_conv.1"] = new_layer
-        elif 'down3.maxpool_conv.1.double_conv.2' == layer_name:
-            self.down3.maxpool_conv[1].double_conv[2] = new_layer
-            self.layer_names["down3.maxpool_conv.1.double_conv.2"] = new_layer
-            self.origin_layer_names["down3.maxpool_conv.1.double_conv.2"] = new_layer
-        elif 'down3.maxpool_conv.1.double_conv.3' == layer_name:
-            self.down3.maxpool_conv[1].double_conv[3] = new_layer
-            self.layer_names["down3.maxpool_conv.1.double_conv.3"] = new_layer
-            self.origin_layer_names["down3.maxpool_conv.1.double_conv.3"] = new_layer
-        elif 'down4' == layer_name:
-            self.down4 = new_layer
-            self.layer_names["down4"] = new_layer
-            self.origin_layer_names["down4"] = new_layer
-        elif 'down4.maxpool_conv' == layer_name:
-            self.down4.maxpool_conv = new_layer
-            self.layer_names["down4.maxpool_conv"] = new_layer
-            self.origin_layer_names["down4.maxpool_conv"] = new_layer
-        elif 'down4.maxpool_conv.0' == layer_name:
-            self.down4.maxpool_conv[0] = new_layer
-            self.layer_names["down4.maxpool_conv.0"] = new_layer
-            self.origin_layer_names["down4.maxpool_conv.0"] = new_layer
-        elif 'down4.maxpool_conv.1' == layer_name:
-            self.down4.maxpool_conv[1] = new_layer
-            self.layer_names["down4.maxpool_conv.1"] = new_layer
-            self.origin_layer_names["down4.maxpool_conv.1"] = new_layer
-        elif 'down4.maxpool_conv.1.double_conv' == layer_name:
-            self.down4.maxpool_conv[1].double_conv = new_layer
-            self.layer_names["down4.maxpool_conv.1.double_conv"] = new_layer
-            self.origin_layer_names["down4.maxpool_conv.1.double_conv"] = new_layer
-        elif 'down4.maxpool_conv.1.double_conv.0' == layer_name:
-            self.down4.maxpool_conv[1].double_conv[0] = new_layer
-            self.layer_names["down4.maxpool_conv.1.double_conv.0"] = new_layer
-            self.origin_layer_names["down4.maxpool_conv.1.double_conv.0"] = new_layer
-        elif 'down4.maxpool_conv.1.double_conv.1' == layer_name:
-            self.down4.maxpool_conv[1].double_conv[1] = new_layer
-            self.layer_names["down4.maxpool_conv.1.double_conv.1"] = new_layer
-            self.origin_layer_names["down4.maxpool_conv.1.double_conv.1"] = new_layer
-        elif 'down4.maxpool_conv.1.double_conv.2' == layer_name:
-            self.down4.maxpool_conv[1].double_conv[2] = new_layer
-            self.layer_names["down4.maxpool_conv.1.double_conv.2"] = new_layer
-            self.origin_layer_names["down4.maxpool_conv.1.double_conv.2"] = new_layer
-        elif 'down4.maxpool_conv.1.double_conv.3' == layer_name:
-            self.down4.maxpool_conv[1].double_conv[3] = new_layer
-            self.layer_names["down4.maxpool_conv.1.double_conv.3"] = new_layer
-            self.origin_layer_names["down4.maxpool_conv.1.double_conv.3"] = new_layer
-        elif 'up1' == layer_name:
-            self.up1 = new_layer
-            self.layer_names["up1"] = new_layer
-            self.origin_layer_names["up1"] = new_layer
-        elif 'up1.center_crop' == layer_name:
-            self.up1.center_crop = new_layer
-            self.layer_names["up1.center_crop"] = new_layer
-            self.origin_layer_names["up1.center_crop"] = new_layer
-        elif 'up1.conv' == layer_name:
-            self.up1.conv = new_layer
-            self.layer_names["up1.conv"] = new_layer
-            self.origin_layer_names["up1.conv"] = new_layer
-        elif 'up1.conv.double_conv' == layer_name:
-            self.up1.conv.double_conv = new_layer
-            self.layer_names["up1.conv.double_conv"] = new_layer
-            self.origin_layer_names["up1.conv.double_conv"] = new_layer
-        elif 'up1.conv.double_conv.0' == layer_name:
-            self.up1.conv.double_conv[0] = new_layer
-            self.layer_names["up1.conv.double_conv.0"] = new_layer
-            self.origin_layer_names["up1.conv.double_conv.0"] = new_layer
-        elif 'up1.conv.double_conv.1' == layer_name:
-            self.up1.conv.double_conv[1] = new_layer
-            self.layer_names["up1.conv.double_conv.1"] = new_layer
-            self.origin_layer_names["up1.conv.double_conv.1"] = new_layer
-        elif 'up1.conv.double_conv.2' == layer_name:
-            self.up1.conv.double_conv[2] = new_layer
-            self.layer_names["up1.conv.double_conv.2"] = new_layer
-            self.origin_layer_names["up1.conv.double_conv.2"] = new_layer
-        elif 'up1.conv.double_conv.3' == layer_name:
-            self.up1.conv.double_conv[3] = new_layer
-            self.layer_names["up1.conv.double_conv.3"] = new_layer
-            self.origin_layer_names["up1.conv.double_conv.3"] = new_layer
-        elif 'up1.up' == layer_name:
-            self.up1.up = new_layer
-            self.layer_names["up1.up"] = new_layer
-            self.origin_layer_names["up1.up"] = new_layer
-        elif 'up1.relu' == layer_name:
-            self.up1.relu = new_layer
-            self.layer_names["up1.relu"] = new_layer
-            self.origin_layer_names["up1.relu"] = new_layer
-        elif 'up2' == layer_name:
-            self.up2 = new_layer
-            self.layer_names["up2"] = new_layer
-            self.origin_layer_names["up2"] = new_layer
-        elif 'up2.center_crop' == layer_name:
-            self.up2.center_crop = new_layer
-            self.layer_names["up2.center_crop"] = new_layer
-            self.origin_layer_names["up2.center_crop"] = new_layer
-        elif 'up2.conv' == layer_name:
-            self.up2.conv = new_layer
-            self.layer_names["up2.conv"] = new_layer
-            self.origin_layer_names["up2.conv"] = new_layer
-        elif 'up2.conv.double_conv' == layer_name:
-            self.up2.conv.double_conv = new_layer
-            self.layer_names["up2.conv.double_conv"] = new_layer
-            self.origin_layer_names["up2.conv.double_conv"] = new_layer
-        elif 'up2.conv.double_conv.0' == layer_name:
-            self.up2.conv.double_conv[0] = new_layer
-            self.layer_names["up2.conv.double_conv.0"] = new_layer
-            self.origin_layer_names["up2.conv.double_conv.0"] = new_layer
-        elif 'up2.conv.double_conv.1' == layer_name:
-            self.up2.conv.double_conv[1] = new_layer
-            self.layer_names["up2.conv.double_conv.1"] = new_layer
-            self.origin_layer_names["up2.conv.double_conv.1"] = new_layer
-        elif 'up2.conv.double_conv.2' == layer_name:
-            self.up2.conv.double_conv[2] = new_layer
-            self.layer_names["up2.conv.double_conv.2"] = new_layer
-            self.origin_layer_names["up2.conv.double_conv.2"] = new_layer
-        elif 'up2.conv.double_conv.3' == layer_name:
-            self.up2.conv.double_conv[3] = new_layer
-            self.layer_names["up2.conv.double_conv.3"] = new_layer
-            self.origin_layer_names["up2.conv.double_conv.3"] = new_layer
-        elif 'up2.up' == layer_name:
-            self.up2.up = new_layer
-            self.layer_names["up2.up"] = new_layer
-            self.origin_layer_names["up2.up"] = new_layer
-        elif 'up2.relu' == layer_name:
-            self.up2.relu = new_layer
-            self.layer_names["up2.relu"] = new_layer
-            self.origin_layer_names["up2.relu"] = new_layer
-        elif 'up3' == layer_name:
-            self.up3 = new_layer
-            self.layer_names["up3"] = new_layer
-            self.origin_layer_names["up3"] = new_layer
-        elif 'up3.center_crop' == layer_name:
-            self.up3.center_crop = new_layer
-            self.layer_names["up3.center_crop"] = new_layer
-            self.origin_layer_names["up3.center_crop"] = new_layer
-        elif 'up3.conv' == layer_name:
-            self.up3.conv = new_layer
-            self.layer_names["up3.conv"] = new_layer
-            self.origin_layer_names["up3.conv"] = new_layer
-        elif 'up3.conv.double_conv' == layer_name:
-            self.up3.conv.double_conv = new_layer
-            self.layer_names["up3.conv.double_conv"] = new_layer
-            self.origin_layer_names["up3.conv.double_conv"] = new_layer
-        elif 'up3.conv.double_conv.0' == layer_name:
-            self.up3.conv.double_conv[0] = new_layer
-            self.layer_names["up3.conv.double_conv.0"] = new_layer
-            self.origin_layer_names["up3.conv.double_conv.0"] = new_layer
-        elif 'up3.conv.double_conv.1' == layer_name:
-            self.up3.conv.double_conv[1] = new_layer
-            self.layer_names["up3.conv.double_conv.1"] = new_layer
-            self.origin_layer_names["up3.conv.double_conv.1"] = new_layer
-        elif 'up3.conv.double_conv.2' == layer_name:
-            self.up3.conv.double_conv[2] = new_layer
-            self.layer_names["up3.conv.double_conv.2"] = new_layer
-            self.origin_layer_names["up3.conv.double_conv.2"] = new_layer
-        elif 'up3.conv.double_conv.3' == layer_name:
-            self.up3.conv.double_conv[3] = new_layer
-            self.layer_names["up3.conv.double_conv.3"] = new_layer
-            self.origin_layer_names["up3.conv.double_conv.3"] = new_layer
-        elif 'up3.up' == layer_name:
-            self.up3.up = new_layer
-            self.layer_names["up3.up"] = new_layer
-            self.origin_layer_names["up3.up"] = new_layer
-        elif 'up3.relu' == layer_name:
-            self.up3.relu = new_layer
-            self.layer_names["up3.relu"] = new_layer
-            self.origin_layer_names["up3.relu"] = new_layer
-        elif 'up4' == layer_name:
-            self.up4 = new_layer
-            self.layer_names["up4"] = new_layer
-            self.origin_layer_names["up4"] = new_layer
-        elif 'up4.center_crop' == layer_name:
-            self.up4.center_crop = new_layer
-            self.layer_names["up4.center_crop"] = new_layer
-            self.origin_layer_names["up4.center_crop"] = new_layer
-        elif 'up4.conv' == layer_name:
-            self.up4.conv = new_layer
-            self.layer_names["up4.conv"] = new_layer
-            self.origin_layer_names["up4.conv"] = new_layer
-        elif 'up4.conv.double_conv' == layer_name:
-            self.up4.conv.double_conv = new_layer
-            self.layer_names["up4.conv.double_conv"] = new_layer
-            self.origin_layer_names["up4.conv.double_conv"] = new_layer
-        elif 'up4.conv.double_conv.0' == layer_name:
-            self.up4.conv.double_conv[0] = new_layer
-            self.layer_names["up4.conv.double_conv.0"] = new_layer
-            self.origin_layer_names["up4.conv.double_conv.0"] = new_layer
-        elif 'up4.conv.double_conv.1' == layer_name:
-            self.up4.conv.double_conv[1] = new_layer
-            self.layer_names["up4.conv.double_conv.1"] = new_layer
-            self.origin_layer_names["up4.conv.double_conv.1"] = new_layer
-        elif 'up4.conv.double_conv.2' == layer_name:
-            self.up4.conv.double_conv[2] = new_layer
-            self.layer_names["up4.conv.double_conv.2"] = new_layer
-            self.origin_layer_names["up4.conv.double_conv.2"] = new_layer
-        elif 'up4.conv.double_conv.3' == layer_name:
-            self.up4.conv.double_conv[3] = new_layer
-            self.layer_names["up4.conv.double_conv.3"] = new_layer
-            self.origin_layer_names["up4.conv.double_conv.3"] = new_layer
-        elif 'up4.up' == layer_name:
-            self.up4.up = new_layer
-            self.layer_names["up4.up"] = new_layer
-            self.origin_layer_names["up4.up"] = new_layer
-        elif 'up4.relu' == layer_name:
-            self.up4.relu = new_layer
-            self.layer_names["up4.relu"] = new_layer
-            self.origin_layer_names["up4.relu"] = new_layer
-        elif 'outc' == layer_name:
-            self.outc = new_layer
-            self.layer_names["outc"] = new_layer
-            self.origin_layer_names["outc"] = new_layer
-        elif 'outc.conv' == layer_name:
-            self.outc.conv = new_layer
-            self.layer_names["outc.conv"] = new_layer
-            self.origin_layer_names["outc.conv"] = new_layer
-
-    def get_layers(self, layer_name):
-        if layer_name not in self.layer_names.keys():
-            return False
-        return self.layer_names[layer_name]
-
     def get_order(self, layer_name):
         if layer_name not in self.orders.keys():
             return False
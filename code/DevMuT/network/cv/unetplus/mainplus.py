@@ -16,6 +16,7 @@ import mindspore.ops.operations as F
 import mindspore.ops.operations as P
 from network.cv.unetplus.src.model_utils.config import config
 from mindspore import context
+from common.layer_paths import LayerPathMixin
 
 
 def preprocess_img_mask(img, mask, num_classes, img_size, augment=False, eval_resize=False):
@@ -331,7 +332,7 @@ class UnetUp(nn.Cell):
         return self.conv(output)
 
 
-class NestedUNet(nn.Cell):
+class NestedUNet(LayerPathMixin, nn.Cell):
     """
     Nested unet
     """
@@ -994,646 +995,6 @@ class NestedUNet(nn.Cell):
             return final
         return final4
 
-    def set_layers(self, layer_name, new_layer):
-        if 'maxpool1' == layer_name:
-            self.maxpool1 = new_layer
-            self.layer_names["maxpool1"] = new_layer
-            self.origin_layer_names["maxpool1"] = new_layer
-        if 'maxpool2' == layer_name:
-            self.maxpool2 = new_layer
-            self.layer_names["maxpool2"] = new_layer
-            self.origin_layer_names["maxpool2"] = new_layer
-        if 'maxpool3' == layer_name:
-            self.maxpool3 = new_layer
-            self.layer_names["maxpool3"] = new_layer
-            self.origin_layer_names["maxpool3"] = new_layer
-        if 'maxpool0' == layer_name:
-            self.maxpool0 = new_layer
-            self.layer_names["maxpool0"] = new_layer
-            self.origin_layer_names["maxpool0"] = new_layer
-        elif 'conv00' == layer_name:
-            self.conv00 = new_layer
-            self.layer_names["conv00"] = new_layer
-            self.origin_layer_names["conv00"] = new_layer
-        elif 'conv00.convs' == layer_name:
-            self.conv00.convs = new_layer
-            self.layer_names["conv00.convs"] = new_layer
-            self.origin_layer_names["conv00.convs"] = new_layer
-        elif 'conv00.convs.0' == layer_name:
-            self.conv00.convs[0] = new_layer
-            self.layer_names["conv00.convs.0"] = new_layer
-            self.origin_layer_names["conv00.convs.0"] = new_layer
-        elif 'conv00.convs.0.0' == layer_name:
-            self.conv00.convs[0][0] = new_layer
-            self.layer_names["conv00.convs.0.0"] = new_layer
-            self.origin_layer_names["conv00.convs.0.0"] = new_layer
-        elif 'conv00.convs.0.1' == layer_name:
-            self.conv00.convs[0][1] = new_layer
-            self.layer_names["conv00.convs.0.1"] = new_layer
-            self.origin_layer_names["conv00.convs.0.1"] = new_layer
-        elif 'conv00.convs.0.2' == layer_name:
-            self.conv00.convs[0][2] = new_layer
-            self.layer_names["conv00.convs.0.2"] = new_layer
-            self.origin_layer_names["conv00.convs.0.2"] = new_layer
-        elif 'conv00.convs.1' == layer_name:
-            self.conv00.convs[1] = new_layer
-            self.layer_names["conv00.convs.1"] = new_layer
-            self.origin_layer_names["conv00.convs.1"] = new_layer
-        elif 'conv00.convs.1.0' == layer_name:
-            self.conv00.convs[1][0] = new_layer
-            self.layer_names["conv00.convs.1.0"] = new_layer
-            self.origin_layer_names["conv00.convs.1.0"] = new_layer
-        elif 'conv00.convs.1.1' == layer_name:
-            self.conv00.convs[1][1] = new_layer
-            self.layer_names["conv00.convs.1.1"] = new_layer
-            self.origin_layer_names["conv00.convs.1.1"] = new_layer
-        elif 'conv00.convs.1.2' == layer_name:
-            self.conv00.convs[1][2] = new_layer
-            self.layer_names["conv00.convs.1.2"] = new_layer
-            self.origin_layer_names["conv00.convs.1.2"] = new_layer
-        elif 'conv10' == layer_name:
-            self.conv10 = new_layer
-            self.layer_names["conv10"] = new_layer
-            self.origin_layer_names["conv10"] = new_layer
-        elif 'conv10.convs' == layer_name:
-            self.conv10.convs = new_layer
-            self.layer_names["conv10.convs"] = new_layer
-            self.origin_layer_names["conv10.convs"] = new_layer
-        elif 'conv10.convs.0' == layer_name:
-            self.conv10.convs[0] = new_layer
-            self.layer_names["conv10.convs.0"] = new_layer
-            self.origin_layer_names["conv10.convs.0"] = new_layer
-        elif 'conv10.convs.0.0' == layer_name:
-            self.conv10.convs[0][0] = new_layer
-            self.layer_names["conv10.convs.0.0"] = new_layer
-            self.origin_layer_names["conv10.convs.0.0"] = new_layer
-        elif 'conv10.convs.0.1' == layer_name:
-            self.conv10.convs[0][1] = new_layer
-            self.layer_names["conv10.convs.0.1"] = new_layer
-            self.origin_layer_names["conv10.convs.0.1"] = new_layer
-        elif 'conv10.convs.0.2' == layer_name:
-            self.conv10.convs[0][2] = new_layer
-            self.layer_names["conv10.convs.0.2"] = new_layer
-            self.origin_layer_names["conv10.convs.0.2"] = new_layer
-        elif 'conv10.convs.1' == layer_name:
-            self.conv10.convs[1] = new_layer
-            self.layer_names["conv10.convs.1"] = new_layer
-            self.origin_layer_names["conv10.convs.1"] = new_layer
-        elif 'conv10.convs.1.0' == layer_name:
-            self.conv10.convs[1][0] = new_layer
-            self.layer_names["conv10.convs.1.0"] = new_layer
-            self.origin_layer_names["conv10.convs.1.0"] = new_layer
-        elif 'conv10.convs.1.1' == layer_name:
-            self.conv10.convs[1][1] = new_layer
-            self.layer_names["conv10.convs.1.1"] = new_layer
-            self.origin_layer_names["conv10.convs.1.1"] = new_layer
-        elif 'conv10.convs.1.2' == layer_name:
-            self.conv10.convs[1][2] = new_layer
-            self.layer_names["conv10.convs.1.2"] = new_layer
-            self.origin_layer_names["conv10.convs.1.2"] = new_layer
-        elif 'conv20' == layer_name:
-            self.conv20 = new_layer
-            self.layer_names["conv20"] = new_layer
-            self.origin_layer_names["conv20"] = new_layer
-        elif 'conv20.convs' == layer_name:
-            self.conv20.convs = new_layer
-            self.layer_names["conv20.convs"] = new_layer
-            self.origin_layer_names["conv20.convs"] = new_layer
-        elif 'conv20.convs.0' == layer_name:
-            self.conv20.convs[0] = new_layer
-            self.layer_names["conv20.convs.0"] = new_layer
-            self.origin_layer_names["conv20.convs.0"] = new_layer
-        elif 'conv20.convs.0.0' == layer_name:
-            self.conv20.convs[0][0] = new_layer
-            self.layer_names["conv20.convs.0.0"] = new_layer
-            self.origin_layer_names["conv20.convs.0.0"] = new_layer
-        elif 'conv20.convs.0.1' == layer_name:
-            self.conv20.convs[0][1] = new_layer
-            self.layer_names["conv20.convs.0.1"] = new_layer
-            self.origin_layer_names["conv20.convs.0.1"] = new_layer
-        elif 'conv20.convs.0.2' == layer_name:
-            self.conv20.convs[0][2] = new_layer
-            self.layer_names["conv20.convs.0.2"] = new_layer
-            self.origin_layer_names["conv20.convs.0.2"] = new_layer
-        elif 'conv20.convs.1' == layer_name:
-            self.conv20.convs[1] = new_layer
-            self.layer_names["conv20.convs.1"] = new_layer
-            self.origin_layer_names["conv20.convs.1"] = new_layer
-        elif 'conv20.convs.1.0' == layer_name:
-            self.conv20.convs[1][0] = new_layer
-            self.layer_names["conv20.convs.1.0"] = new_layer
-            self.origin_layer_names["conv20.convs.1.0"] = new_layer
-        elif 'conv20.convs.1.1' == layer_name:
-            self.conv20.convs[1][1] = new_layer
-            self.layer_names["conv20.convs.1.1"] = new_layer
-            self.origin_layer_names["conv20.convs.1.1"] = new_layer
-        elif 'conv20.convs.1.2' == layer_name:
-            self.conv20.convs[1][2] = new_layer
-            self.layer_names["conv20.convs.1.2"] = new_layer
-            self.origin_layer_names["conv20.convs.1.2"] = new_layer
-        elif 'conv30' == layer_name:
-            self.conv30 = new_layer
-            self.layer_names["conv30"] = new_layer
-            self.origin_layer_names["conv30"] = new_layer
-        elif 'conv30.convs' == layer_name:
-            self.conv30.convs = new_layer
-            self.layer_names["conv30.convs"] = new_layer
-            self.origin_layer_names["conv30.convs"] = new_layer
-        elif 'conv30.convs.0' == layer_name:
-            self.conv30.convs[0] = new_layer
-            self.layer_names["conv30.convs.0"] = new_layer
-            self.origin_layer_names["conv30.convs.0"] = new_layer
-        elif 'conv30.convs.0.0' == layer_name:
-            self.conv30.convs[0][0] = new_layer
-            self.layer_names["conv30.convs.0.0"] = new_layer
-            self.origin_layer_names["conv30.convs.0.0"] = new_layer
-        elif 'conv30.convs.0.1' == layer_name:
-            self.conv30.convs[0][1] = new_layer
-            self.layer_names["conv30.convs.0.1"] = new_layer
-            self.origin_layer_names["conv30.convs.0.1"] = new_layer
-        elif 'conv30.convs.0.2' == layer_name:
-            self.conv30.convs[0][2] = new_layer
-            self.layer_names["conv30.convs.0.2"] = new_layer
-            self.origin_layer_names["conv30.convs.0.2"] = new_layer
-        elif 'conv30.convs.1' == layer_name:
-            self.conv30.convs[1] = new_layer
-            self.layer_names["conv30.convs.1"] = new_layer
-            self.origin_layer_names["conv30.convs.1"] = new_layer
-        elif 'conv30.convs.1.0' == layer_name:
-            self.conv30.convs[1][0] = new_layer
-            self.layer_names["conv30.convs.1.0"] = new_layer
-            self.origin_layer_names["conv30.convs.1.0"] = new_layer
-        elif 'conv30.convs.1.1' == layer_name:
-            self.conv30.convs[1][1] = new_layer
-            self.layer_names["conv30.convs.1.1"] = new_layer
-            self.origin_layer_names["conv30.convs.1.1"] = new_layer
-        elif 'conv30.convs.1.2' == layer_name:
-            self.conv30.convs[1][2] = new_layer
-            self.layer_names["conv30.convs.1.2"] = new_layer
-            self.origin_layer_names["conv30.convs.1.2"] = new_layer
-        elif 'conv40' == layer_name:
-            self.conv40 = new_layer
-            self.layer_names["conv40"] = new_layer
-            self.origin_layer_names["conv40"] = new_layer
-        elif 'conv40.convs' == layer_name:
-            self.conv40.convs = new_layer
-            self.layer_names["conv40.convs"] = new_layer
-            self.origin_layer_names["conv40.convs"] = new_layer
-        elif 'conv40.convs.0' == layer_name:
-            self.conv40.convs[0] = new_layer
-            self.layer_names["conv40.convs.0"] = new_layer
-            self.origin_layer_names["conv40.convs.0"] = new_layer
-        elif 'conv40.convs.0.0' == layer_name:
-            self.conv40.convs[0][0] = new_layer
-            self.layer_names["conv40.convs.0.0"] = new_layer
-            self.origin_layer_names["conv40.convs.0.0"] = new_layer
-        elif 'conv40.convs.0.1' == layer_name:
-            self.conv40.convs[0][1] = new_layer
-            self.layer_names["conv40.convs.0.1"] = new_layer
-            self.origin_layer_names["conv40.convs.0.1"] = new_layer
-        elif 'conv40.convs.0.2' == layer_name:
-            self.conv40.convs[0][2] = new_layer
-            self.layer_names["conv40.convs.0.2"] = new_layer
-            self.origin_layer_names["conv40.convs.0.2"] = new_layer
-        elif 'conv40.convs.1' == layer_name:
-            self.conv40.convs[1] = new_layer
-            self.layer_names["conv40.convs.1"] = new_layer
-            self.origin_layer_names["conv40.convs.1"] = new_layer
-        elif 'conv40.convs.1.0' == layer_name:
-            self.conv40.convs[1][0] = new_layer
-            self.layer_names["conv40.convs.1.0"] = new_layer
-            self.origin_layer_names["conv40.convs.1.0"] = new_layer
-        elif 'conv40.convs.1.1' == layer_name:
-            self.conv40.convs[1][1] = new_layer
-            self.layer_names["conv40.convs.1.1"] = new_layer
-            self.origin_layer_names["conv40.convs.1.1"] = new_layer
-        elif 'conv40.convs.1.2' == layer_name:
-            self.conv40.convs[1][2] = new_layer
-            self.layer_names["conv40.convs.1.2"] = new_layer
-            self.origin_layer_names["conv40.convs.1.2"] = new_layer
-        elif 'up_concat01' == layer_name:
-            self.up_concat01 = new_layer
-            self.layer_names["up_concat01"] = new_layer
-            self.origin_layer_names["up_concat01"] = new_layer
-        elif 'up_concat01.conv' == layer_name:
-            self.up_concat01.conv = new_layer
-            self.layer_names["up_concat01.conv"] = new_layer
-            self.origin_layer_names["up_concat01.conv"] = new_layer
-        elif 'up_concat01.conv.convs' == layer_name:
-            self.up_concat01.conv.convs = new_layer
-            self.layer_names["up_concat01.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat01.conv.convs"] = new_layer
-        elif 'up_concat01.conv.convs.0' == layer_name:
-            self.up_concat01.conv.convs[0] = new_layer
-            self.layer_names["up_concat01.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat01.conv.convs.0"] = new_layer
-        elif 'up_concat01.conv.convs.0.0' == layer_name:
-            self.up_concat01.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat01.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat01.conv.convs.0.0"] = new_layer
-        elif 'up_concat01.conv.convs.0.1' == layer_name:
-            self.up_concat01.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat01.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat01.conv.convs.0.1"] = new_layer
-        elif 'up_concat01.conv.convs.1' == layer_name:
-            self.up_concat01.conv.convs[1] = new_layer
-            self.layer_names["up_concat01.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat01.conv.convs.1"] = new_layer
-        elif 'up_concat01.conv.convs.1.0' == layer_name:
-            self.up_concat01.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat01.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat01.conv.convs.1.0"] = new_layer
-        elif 'up_concat01.conv.convs.1.1' == layer_name:
-            self.up_concat01.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat01.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat01.conv.convs.1.1"] = new_layer
-        elif 'up_concat01.up_conv' == layer_name:
-            self.up_concat01.up_conv = new_layer
-            self.layer_names["up_concat01.up_conv"] = new_layer
-            self.origin_layer_names["up_concat01.up_conv"] = new_layer
-        elif 'up_concat11' == layer_name:
-            self.up_concat11 = new_layer
-            self.layer_names["up_concat11"] = new_layer
-            self.origin_layer_names["up_concat11"] = new_layer
-        elif 'up_concat11.conv' == layer_name:
-            self.up_concat11.conv = new_layer
-            self.layer_names["up_concat11.conv"] = new_layer
-            self.origin_layer_names["up_concat11.conv"] = new_layer
-        elif 'up_concat11.conv.convs' == layer_name:
-            self.up_concat11.conv.convs = new_layer
-            self.layer_names["up_concat11.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat11.conv.convs"] = new_layer
-        elif 'up_concat11.conv.convs.0' == layer_name:
-            self.up_concat11.conv.convs[0] = new_layer
-            self.layer_names["up_concat11.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat11.conv.convs.0"] = new_layer
-        elif 'up_concat11.conv.convs.0.0' == layer_name:
-            self.up_concat11.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat11.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat11.conv.convs.0.0"] = new_layer
-        elif 'up_concat11.conv.convs.0.1' == layer_name:
-            self.up_concat11.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat11.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat11.conv.convs.0.1"] = new_layer
-        elif 'up_concat11.conv.convs.1' == layer_name:
-            self.up_concat11.conv.convs[1] = new_layer
-            self.layer_names["up_concat11.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat11.conv.convs.1"] = new_layer
-        elif 'up_concat11.conv.convs.1.0' == layer_name:
-            self.up_concat11.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat11.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat11.conv.convs.1.0"] = new_layer
-        elif 'up_concat11.conv.convs.1.1' == layer_name:
-            self.up_concat11.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat11.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat11.conv.convs.1.1"] = new_layer
-        elif 'up_concat11.up_conv' == layer_name:
-            self.up_concat11.up_conv = new_layer
-            self.layer_names["up_concat11.up_conv"] = new_layer
-            self.origin_layer_names["up_concat11.up_conv"] = new_layer
-        elif 'up_concat21' == layer_name:
-            self.up_concat21 = new_layer
-            self.layer_names["up_concat21"] = new_layer
-            self.origin_layer_names["up_concat21"] = new_layer
-        elif 'up_concat21.conv' == layer_name:
-            self.up_concat21.conv = new_layer
-            self.layer_names["up_concat21.conv"] = new_layer
-            self.origin_layer_names["up_concat21.conv"] = new_layer
-        elif 'up_concat21.conv.convs' == layer_name:
-            self.up_concat21.conv.convs = new_layer
-            self.layer_names["up_concat21.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat21.conv.convs"] = new_layer
-        elif 'up_concat21.conv.convs.0' == layer_name:
-            self.up_concat21.conv.convs[0] = new_layer
-            self.layer_names["up_concat21.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat21.conv.convs.0"] = new_layer
-        elif 'up_concat21.conv.convs.0.0' == layer_name:
-            self.up_concat21.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat21.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat21.conv.convs.0.0"] = new_layer
-        elif 'up_concat21.conv.convs.0.1' == layer_name:
-            self.up_concat21.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat21.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat21.conv.convs.0.1"] = new_layer
-        elif 'up_concat21.conv.convs.1' == layer_name:
-            self.up_concat21.conv.convs[1] = new_layer
-            self.layer_names["up_concat21.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat21.conv.convs.1"] = new_layer
-        elif 'up_concat21.conv.convs.1.0' == layer_name:
-            self.up_concat21.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat21.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat21.conv.convs.1.0"] = new_layer
-        elif 'up_concat21.conv.convs.1.1' == layer_name:
-            self.up_concat21.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat21.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat21.conv.convs.1.1"] = new_layer
-        elif 'up_concat21.up_conv' == layer_name:
-            self.up_concat21.up_conv = new_layer
-            self.layer_names["up_concat21.up_conv"] = new_layer
-            self.origin_layer_names["up_concat21.up_conv"] = new_layer
-        elif 'up_concat31' == layer_name:
-            self.up_concat31 = new_layer
-            self.layer_names["up_concat31"] = new_layer
-            self.origin_layer_names["up_concat31"] = new_layer
-        elif 'up_concat31.conv' == layer_name:
-            self.up_concat31.conv = new_layer
-            self.layer_names["up_concat31.conv"] = new_layer
-            self.origin_layer_names["up_concat31.conv"] = new_layer
-        elif 'up_concat31.conv.convs' == layer_name:
-            self.up_concat31.conv.convs = new_layer
-            self.layer_names["up_concat31.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat31.conv.convs"] = new_layer
-        elif 'up_concat31.conv.convs.0' == layer_name:
-            self.up_concat31.conv.convs[0] = new_layer
-            self.layer_names["up_concat31.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat31.conv.convs.0"] = new_layer
-        elif 'up_concat31.conv.convs.0.0' == layer_name:
-            self.up_concat31.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat31.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat31.conv.convs.0.0"] = new_layer
-        elif 'up_concat31.conv.convs.0.1' == layer_name:
-            self.up_concat31.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat31.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat31.conv.convs.0.1"] = new_layer
-        elif 'up_concat31.conv.convs.1' == layer_name:
-            self.up_concat31.conv.convs[1] = new_layer
-            self.layer_names["up_concat31.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat31.conv.convs.1"] = new_layer
-        elif 'up_concat31.conv.convs.1.0' == layer_name:
-            self.up_concat31.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat31.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat31.conv.convs.1.0"] = new_layer
-        elif 'up_concat31.conv.convs.1.1' == layer_name:
-            self.up_concat31.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat31.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat31.conv.convs.1.1"] = new_layer
-        elif 'up_concat31.up_conv' == layer_name:
-            self.up_concat31.up_conv = new_layer
-            self.layer_names["up_concat31.up_conv"] = new_layer
-            self.origin_layer_names["up_concat31.up_conv"] = new_layer
-        elif 'up_concat02' == layer_name:
-            self.up_concat02 = new_layer
-            self.layer_names["up_concat02"] = new_layer
-            self.origin_layer_names["up_concat02"] = new_layer
-        elif 'up_concat02.conv' == layer_name:
-            self.up_concat02.conv = new_layer
-            self.layer_names["up_concat02.conv"] = new_layer
-            self.origin_layer_names["up_concat02.conv"] = new_layer
-        elif 'up_concat02.conv.convs' == layer_name:
-            self.up_concat02.conv.convs = new_layer
-            self.layer_names["up_concat02.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat02.conv.convs"] = new_layer
-        elif 'up_concat02.conv.convs.0' == layer_name:
-            self.up_concat02.conv.convs[0] = new_layer
-            self.layer_names["up_concat02.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat02.conv.convs.0"] = new_layer
-        elif 'up_concat02.conv.convs.0.0' == layer_name:
-            self.up_concat02.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat02.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat02.conv.convs.0.0"] = new_layer
-        elif 'up_concat02.conv.convs.0.1' == layer_name:
-            self.up_concat02.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat02.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat02.conv.convs.0.1"] = new_layer
-        elif 'up_concat02.conv.convs.1' == layer_name:
-            self.up_concat02.conv.convs[1] = new_layer
-            self.layer_names["up_concat02.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat02.conv.convs.1"] = new_layer
-        elif 'up_concat02.conv.convs.1.0' == layer_name:
-            self.up_concat02.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat02.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat02.conv.convs.1.0"] = new_layer
-        elif 'up_concat02.conv.convs.1.1' == layer_name:
-            self.up_concat02.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat02.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat02.conv.convs.1.1"] = new_layer
-        elif 'up_concat02.up_conv' == layer_name:
-            self.up_concat02.up_conv = new_layer
-            self.layer_names["up_concat02.up_conv"] = new_layer
-            self.origin_layer_names["up_concat02.up_conv"] = new_layer
-        elif 'up_concat12' == layer_name:
-            self.up_concat12 = new_layer
-            self.layer_names["up_concat12"] = new_layer
-            self.origin_layer_names["up_concat12"] = new_layer
-        elif 'up_concat12.conv' == layer_name:
-            self.up_concat12.conv = new_layer
-            self.layer_names["up_concat12.conv"] = new_layer
-            self.origin_layer_names["up_concat12.conv"] = new_layer
-        elif 'up_concat12.conv.convs' == layer_name:
-            self.up_concat12.conv.convs = new_layer
-            self.layer_names["up_concat12.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat12.conv.convs"] = new_layer
-        elif 'up_concat12.conv.convs.0' == layer_name:
-            self.up_concat12.conv.convs[0] = new_layer
-            self.layer_names["up_concat12.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat12.conv.convs.0"] = new_layer
-        elif 'up_concat12.conv.convs.0.0' == layer_name:
-            self.up_concat12.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat12.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat12.conv.convs.0.0"] = new_layer
-        elif 'up_concat12.conv.convs.0.1' == layer_name:
-            self.up_concat12.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat12.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat12.conv.convs.0.1"] = new_layer
-        elif 'up_concat12.conv.convs.1' == layer_name:
-            self.up_concat12.conv.convs[1] = new_layer
-            self.layer_names["up_concat12.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat12.conv.convs.1"] = new_layer
-        elif 'up_concat12.conv.convs.1.0' == layer_name:
-            self.up_concat12.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat12.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat12.conv.convs.1.0"] = new_layer
-        elif 'up_concat12.conv.convs.1.1' == layer_name:
-            self.up_concat12.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat12.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat12.conv.convs.1.1"] = new_layer
-        elif 'up_concat12.up_conv' == layer_name:
-            self.up_concat12.up_conv = new_layer
-            self.layer_names["up_concat12.up_conv"] = new_layer
-            self.origin_layer_names["up_concat12.up_conv"] = new_layer
-        elif 'up_concat22' == layer_name:
-            self.up_concat22 = new_layer
-            self.layer_names["up_concat22"] = new_layer
-            self.origin_layer_names["up_concat22"] = new_layer
-        elif 'up_concat22.conv' == layer_name:
-            self.up_concat22.conv = new_layer
-            self.layer_names["up_concat22.conv"] = new_layer
-            self.origin_layer_names["up_concat22.conv"] = new_layer
-        elif 'up_concat22.conv.convs' == layer_name:
-            self.up_concat22.conv.convs = new_layer
-            self.layer_names["up_concat22.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat22.conv.convs"] = new_layer
-        elif 'up_concat22.conv.convs.0' == layer_name:
-            self.up_concat22.conv.convs[0] = new_layer
-            self.layer_names["up_concat22.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat22.conv.convs.0"] = new_layer
-        elif 'up_concat22.conv.convs.0.0' == layer_name:
-            self.up_concat22.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat22.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat22.conv.convs.0.0"] = new_layer
-        elif 'up_concat22.conv.convs.0.1' == layer_name:
-            self.up_concat22.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat22.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat22.conv.convs.0.1"] = new_layer
-        elif 'up_concat22.conv.convs.1' == layer_name:
-            self.up_concat22.conv.convs[1] = new_layer
-            self.layer_names["up_concat22.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat22.conv.convs.1"] = new_layer
-        elif 'up_concat22.conv.convs.1.0' == layer_name:
-            self.up_concat22.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat22.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat22.conv.convs.1.0"] = new_layer
-        elif 'up_concat22.conv.convs.1.1' == layer_name:
-            self.up_concat22.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat22.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat22.conv.convs.1.1"] = new_layer
-        elif 'up_concat22.up_conv' == layer_name:
-            self.up_concat22.up_conv = new_layer
-            self.layer_names["up_concat22.up_conv"] = new_layer
-            self.origin_layer_names["up_concat22.up_conv"] = new_layer
-        elif 'up_concat03' == layer_name:
-            self.up_concat03 = new_layer
-            self.layer_names["up_concat03"] = new_layer
-            self.origin_layer_names["up_concat03"] = new_layer
-        elif 'up_concat03.conv' == layer_name:
-            self.up_concat03.conv = new_layer
-            self.layer_names["up_concat03.conv"] = new_layer
-            self.origin_layer_names["up_concat03.conv"] = new_layer
-        elif 'up_concat03.conv.convs' == layer_name:
-            self.up_concat03.conv.convs = new_layer
-            self.layer_names["up_concat03.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat03.conv.convs"] = new_layer
-        elif 'up_concat03.conv.convs.0' == layer_name:
-            self.up_concat03.conv.convs[0] = new_layer
-            self.layer_names["up_concat03.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat03.conv.convs.0"] = new_layer
-        elif 'up_concat03.conv.convs.0.0' == layer_name:
-            self.up_concat03.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat03.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat03.conv.convs.0.0"] = new_layer
-        elif 'up_concat03.conv.convs.0.1' == layer_name:
-            self.up_concat03.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat03.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat03.conv.convs.0.1"] = new_layer
-        elif 'up_concat03.conv.convs.1' == layer_name:
-            self.up_concat03.conv.convs[1] = new_layer
-            self.layer_names["up_concat03.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat03.conv.convs.1"] = new_layer
-        elif 'up_concat03.conv.convs.1.0' == layer_name:
-            self.up_concat03.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat03.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat03.conv.convs.1.0"] = new_layer
-        elif 'up_concat03.conv.convs.1.1' == layer_name:
-            self.up_concat03.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat03.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat03.conv.convs.1.1"] = new_layer
-        elif 'up_concat03.up_conv' == layer_name:
-            self.up_concat03.up_conv = new_layer
-            self.layer_names["up_concat03.up_conv"] = new_layer
-            self.origin_layer_names["up_concat03.up_conv"] = new_layer
-        elif 'up_concat13' == layer_name:
-            self.up_concat13 = new_layer
-            self.layer_names["up_concat13"] = new_layer
-            self.origin_layer_names["up_concat13"] = new_layer
-        elif 'up_concat13.conv' == layer_name:
-            self.up_concat13.conv = new_layer
-            self.layer_names["up_concat13.conv"] = new_layer
-            self.origin_layer_names["up_concat13.conv"] = new_layer
-        elif 'up_concat13.conv.convs' == layer_name:
-            self.up_concat13.conv.convs = new_layer
-            self.layer_names["up_concat13.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat13.conv.convs"] = new_layer
-        elif 'up_concat13.conv.convs.0' == layer_name:
-            self.up_concat13.conv.convs[0] = new_layer
-            self.layer_names["up_concat13.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat13.conv.convs.0"] = new_layer
-        elif 'up_concat13.conv.convs.0.0' == layer_name:
-            self.up_concat13.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat13.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat13.conv.convs.0.0"] = new_layer
-        elif 'up_concat13.conv.convs.0.1' == layer_name:
-            self.up_concat13.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat13.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat13.conv.convs.0.1"] = new_layer
-        elif 'up_concat13.conv.convs.1' == layer_name:
-            self.up_concat13.conv.convs[1] = new_layer
-            self.layer_names["up_concat13.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat13.conv.convs.1"] = new_layer
-        elif 'up_concat13.conv.convs.1.0' == layer_name:
-            self.up_concat13.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat13.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat13.conv.convs.1.0"] = new_layer
-        elif 'up_concat13.conv.convs.1.1' == layer_name:
-            self.up_concat13.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat13.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat13.conv.convs.1.1"] = new_layer
-        elif 'up_concat13.up_conv' == layer_name:
-            self.up_concat13.up_conv = new_layer
-            self.layer_names["up_concat13.up_conv"] = new_layer
-            self.origin_layer_names["up_concat13.up_conv"] = new_layer
-        elif 'up_concat04' == layer_name:
-            self.up_concat04 = new_layer
-            self.layer_names["up_concat04"] = new_layer
-            self.origin_layer_names["up_concat04"] = new_layer
-        elif 'up_concat04.conv' == layer_name:
-            self.up_concat04.conv = new_layer
-            self.layer_names["up_concat04.conv"] = new_layer
-            self.origin_layer_names["up_concat04.conv"] = new_layer
-        elif 'up_concat04.conv.convs' == layer_name:
-            self.up_concat04.conv.convs = new_layer
-            self.layer_names["up_concat04.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat04.conv.convs"] = new_layer
-        elif 'up_concat04.conv.convs.0' == layer_name:
-            self.up_concat04.conv.convs[0] = new_layer
-            self.layer_names["up_concat04.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat04.conv.convs.0"] = new_layer
-        elif 'up_concat04.conv.convs.0.0' == layer_name:
-            self.up_concat04.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat04.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat04.conv.convs.0.0"] = new_layer
-        elif 'up_concat04.conv.convs.0.1' == layer_name:
-            self.up_concat04.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat04.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat04.conv.convs.0.1"] = new_layer
-        elif 'up_concat04.conv.convs.1' == layer_name:
-            self.up_concat04.conv.convs[1] = new_layer
-            self.layer_names["up_concat04.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat04.conv.convs.1"] = new_layer
-        elif 'up_concat04.conv.convs.1.0' == layer_name:
-            self.up_concat04.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat04.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat04.conv.convs.1.0"] = new_layer
-        elif 'up_concat04.conv.convs.1.1' == layer_name:
-            self.up_concat04.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat04.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat04.conv.convs.1.1"] = new_layer
-        elif 'up_concat04.up_conv' == layer_name:
-            self.up_concat04.up_conv = new_layer
-            self.layer_names["up_concat04.up_conv"] = new_layer
-            self.origin_layer_names["up_concat04.up_conv"] = new_layer
-        elif 'final1' == layer_name:
-            self.final1 = new_layer
-            self.layer_names["final1"] = new_layer
-            self.origin_layer_names["final1"] = new_layer
-        elif 'final2' == layer_name:
-            self.final2 = new_layer
-            self.layer_names["final2"] = new_layer
-            self.origin_layer_names["final2"] = new_layer
-        elif 'final3' == layer_name:
-            self.final3 = new_layer
-            self.layer_names["final3"] = new_layer
-            self.origin_layer_names["final3"] = new_layer
-        elif 'final4' == layer_name:
-            self.final4 = new_layer
-            self.layer_names["final4"] = new_layer
-            self.origin_layer_names["final4"] = new_layer
-
-
-    def get_layers(self, layer_name):
-        if layer_name not in self.layer_names.keys():
-            return False
-        return self.layer_names[layer_name]
-
     def get_order(self, layer_name):
         if layer_name not in self.orders.keys():
             return False
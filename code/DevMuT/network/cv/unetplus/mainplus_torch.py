@@ -3,6 +3,7 @@ import torch.optim as optim
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
+from common.layer_paths import LayerPathMixin
 
 
 def conv_bn_relu(in_channels, out_channels, use_bn=True, kernel_size=3, stride=1, padding=1, activation='relu'):
@@ -55,7 +56,7 @@ class UnetUp(nn.Module):
         return self.conv(output)
 
 
-class NestedUNet(nn.Module):
+class NestedUNet(LayerPathMixin, nn.Module):
     """
     Nested unet
     """
@@ -717,646 +718,6 @@ class NestedUNet(nn.Module):
             return final
         return final4
 
-    def get_layers(self, layer_name):
-        if layer_name not in self.layer_names.keys():
-            return False
-        return self.layer_names[layer_name]
-
-
-    def set_layers(self, layer_name, new_layer):
-        if 'maxpool1' == layer_name:
-            self.maxpool1 = new_layer
-            self.layer_names["maxpool1"] = new_layer
-            self.origin_layer_names["maxpool1"] = new_layer
-        if 'maxpool2' == layer_name:
-            self.maxpool2 = new_layer
-            self.layer_names["maxpool2"] = new_layer
-            self.origin_layer_names["maxpool2"] = new_layer
-        if 'maxpool3' == layer_name:
-            self.maxpool3 = new_layer
-            self.layer_names["maxpool3"] = new_layer
-            self.origin_layer_names["maxpool3"] = new_layer
-        if 'maxpool0' == layer_name:
-            self.maxpool0 = new_layer
-            self.layer_names["maxpool0"] = new_layer
-            self.origin_layer_names["maxpool0"] = new_layer
-        elif 'conv00' == layer_name:
-            self.conv00 = new_layer
-            self.layer_names["conv00"] = new_layer
-            self.origin_layer_names["conv00"] = new_layer
-        elif 'conv00.convs' == layer_name:
-            self.conv00.convs = new_layer
-            self.layer_names["conv00.convs"] = new_layer
-            self.origin_layer_names["conv00.convs"] = new_layer
-        elif 'conv00.convs.0' == layer_name:
-            self.conv00.convs[0] = new_layer
-            self.layer_names["conv00.convs.0"] = new_layer
-            self.origin_layer_names["conv00.convs.0"] = new_layer
-        elif 'conv00.convs.0.0' == layer_name:
-            self.conv00.convs[0][0] = new_layer
-            self.layer_names["conv00.convs.0.0"] = new_layer
-            self.origin_layer_names["conv00.convs.0.0"] = new_layer
-        elif 'conv00.convs.0.1' == layer_name:
-            self.conv00.convs[0][1] = new_layer
-            self.layer_names["conv00.convs.0.1"] = new_layer
-            self.origin_layer_names["conv00.convs.0.1"] = new_layer
-        elif 'conv00.convs.0.2' == layer_name:
-            self.conv00.convs[0][2] = new_layer
-            self.layer_names["conv00.convs.0.2"] = new_layer
-            self.origin_layer_names["conv00.convs.0.2"] = new_layer
-        elif 'conv00.convs.1' == layer_name:
-            self.conv00.convs[1] = new_layer
-            self.layer_names["conv00.convs.1"] = new_layer
-            self.origin_layer_names["conv00.convs.1"] = new_layer
-        elif 'conv00.convs.1.0' == layer_name:
-            self.conv00.convs[1][0] = new_layer
-            self.layer_names["conv00.convs.1.0"] = new_layer
-            self.origin_layer_names["conv00.convs.1.0"] = new_layer
-        elif 'conv00.convs.1.1' == layer_name:
-            self.conv00.convs[1][1] = new_layer
-            self.layer_names["conv00.convs.1.1"] = new_layer
-            self.origin_layer_names["conv00.convs.1.1"] = new_layer
-        elif 'conv00.convs.1.2' == layer_name:
-            self.conv00.convs[1][2] = new_layer
-            self.layer_names["conv00.convs.1.2"] = new_layer
-            self.origin_layer_names["conv00.convs.1.2"] = new_layer
-        elif 'conv10' == layer_name:
-            self.conv10 = new_layer
-            self.layer_names["conv10"] = new_layer
-            self.origin_layer_names["conv10"] = new_layer
-        elif 'conv10.convs' == layer_name:
-            self.conv10.convs = new_layer
-            self.layer_names["conv10.convs"] = new_layer
-            self.origin_layer_names["conv10.convs"] = new_layer
-        elif 'conv10.convs.0' == layer_name:
-            self.conv10.convs[0] = new_layer
-            self.layer_names["conv10.convs.0"] = new_layer
-            self.origin_layer_names["conv10.convs.0"] = new_layer
-        elif 'conv10.convs.0.0' == layer_name:
-            self.conv10.convs[0][0] = new_layer
-            self.layer_names["conv10.convs.0.0"] = new_layer
-            self.origin_layer_names["conv10.convs.0.0"] = new_layer
-        elif 'conv10.convs.0.1' == layer_name:
-            self.conv10.convs[0][1] = new_layer
-            self.layer_names["conv10.convs.0.1"] = new_layer
-            self.origin_layer_names["conv10.convs.0.1"] = new_layer
-        elif 'conv10.convs.0.2' == layer_name:
-            self.conv10.convs[0][2] = new_layer
-            self.layer_names["conv10.convs.0.2"] = new_layer
-            self.origin_layer_names["conv10.convs.0.2"] = new_layer
-        elif 'conv10.convs.1' == layer_name:
-            self.conv10.convs[1] = new_layer
-            self.layer_names["conv10.convs.1"] = new_layer
-            self.origin_layer_names["conv10.convs.1"] = new_layer
-        elif 'conv10.convs.1.0' == layer_name:
-            self.conv10.convs[1][0] = new_layer
-            self.layer_names["conv10.convs.1.0"] = new_layer
-            self.origin_layer_names["conv10.convs.1.0"] = new_layer
-        elif 'conv10.convs.1.1' == layer_name:
-            self.conv10.convs[1][1] = new_layer
-            self.layer_names["conv10.convs.1.1"] = new_layer
-            self.origin_layer_names["conv10.convs.1.1"] = new_layer
-        elif 'conv10.convs.1.2' == layer_name:
-            self.conv10.convs[1][2] = new_layer
-            self.layer_names["conv10.convs.1.2"] = new_layer
-            self.origin_layer_names["conv10.convs.1.2"] = new_layer
-        elif 'conv20' == layer_name:
-            self.conv20 = new_layer
-            self.layer_names["conv20"] = new_layer
-            self.origin_layer_names["conv20"] = new_layer
-        elif 'conv20.convs' == layer_name:
-            self.conv20.convs = new_layer
-            self.layer_names["conv20.convs"] = new_layer
-            self.origin_layer_names["conv20.convs"] = new_layer
-        elif 'conv20.convs.0' == layer_name:
-            self.conv20.convs[0] = new_layer
-            self.layer_names["conv20.convs.0"] = new_layer
-            self.origin_layer_names["conv20.convs.0"] = new_layer
-        elif 'conv20.convs.0.0' == layer_name:
-            self.conv20.convs[0][0] = new_layer
-            self.layer_names["conv20.convs.0.0"] = new_layer
-            self.origin_layer_names["conv20.convs.0.0"] = new_layer
-        elif 'conv20.convs.0.1' == layer_name:
-            self.conv20.convs[0][1] = new_layer
-            self.layer_names["conv20.convs.0.1"] = new_layer
-            self.origin_layer_names["conv20.convs.0.1"] = new_layer
-        elif 'conv20.convs.0.2' == layer_name:
-            self.conv20.convs[0][2] = new_layer
-            self.layer_names["conv20.convs.0.2"] = new_layer
-            self.origin_layer_names["conv20.convs.0.2"] = new_layer
-        elif 'conv20.convs.1' == layer_name:
-            self.conv20.convs[1] = new_layer
-            self.layer_names["conv20.convs.1"] = new_layer
-            self.origin_layer_names["conv20.convs.1"] = new_layer
-        elif 'conv20.convs.1.0' == layer_name:
-            self.conv20.convs[1][0] = new_layer
-            self.layer_names["conv20.convs.1.0"] = new_layer
-            self.origin_layer_names["conv20.convs.1.0"] = new_layer
-        elif 'conv20.convs.1.1' == layer_name:
-            self.conv20.convs[1][1] = new_layer
-            self.layer_names["conv20.convs.1.1"] = new_layer
-            self.origin_layer_names["conv20.convs.1.1"] = new_layer
-        elif 'conv20.convs.1.2' == layer_name:
-            self.conv20.convs[1][2] = new_layer
-            self.layer_names["conv20.convs.1.2"] = new_layer
-            self.origin_layer_names["conv20.convs.1.2"] = new_layer
-        elif 'conv30' == layer_name:
-            self.conv30 = new_layer
-            self.layer_names["conv30"] = new_layer
-            self.origin_layer_names["conv30"] = new_layer
-        elif 'conv30.convs' == layer_name:
-            self.conv30.convs = new_layer
-            self.layer_names["conv30.convs"] = new_layer
-            self.origin_layer_names["conv30.convs"] = new_layer
-        elif 'conv30.convs.0' == layer_name:
-            self.conv30.convs[0] = new_layer
-            self.layer_names["conv30.convs.0"] = new_layer
-            self.origin_layer_names["conv30.convs.0"] = new_layer
-        elif 'conv30.convs.0.0' == layer_name:
-            self.conv30.convs[0][0] = new_layer
-            self.layer_names["conv30.convs.0.0"] = new_layer
-            self.origin_layer_names["conv30.convs.0.0"] = new_layer
-        elif 'conv30.convs.0.1' == layer_name:
-            self.conv30.convs[0][1] = new_layer
-            self.layer_names["conv30.convs.0.1"] = new_layer
-            self.origin_layer_names["conv30.convs.0.1"] = new_layer
-        elif 'conv30.convs.0.2' == layer_name:
-            self.conv30.convs[0][2] = new_layer
-            self.layer_names["conv30.convs.0.2"] = new_layer
-            self.origin_layer_names["conv30.convs.0.2"] = new_layer
-        elif 'conv30.convs.1' == layer_name:
-            self.conv30.convs[1] = new_layer
-            self.layer_names["conv30.convs.1"] = new_layer
-            self.origin_layer_names["conv30.convs.1"] = new_layer
-        elif 'conv30.convs.1.0' == layer_name:
-            self.conv30.convs[1][0] = new_layer
-            self.layer_names["conv30.convs.1.0"] = new_layer
-            self.origin_layer_names["conv30.convs.1.0"] = new_layer
-        elif 'conv30.convs.1.1' == layer_name:
-            self.conv30.convs[1][1] = new_layer
-            self.layer_names["conv30.convs.1.1"] = new_layer
-            self.origin_layer_names["conv30.convs.1.1"] = new_layer
-        elif 'conv30.convs.1.2' == layer_name:
-            self.conv30.convs[1][2] = new_layer
-            self.layer_names["conv30.convs.1.2"] = new_layer
-            self.origin_layer_names["conv30.convs.1.2"] = new_layer
-        elif 'conv40' == layer_name:
-            self.conv40 = new_layer
-            self.layer_names["conv40"] = new_layer
-            self.origin_layer_names["conv40"] = new_layer
-        elif 'conv40.convs' == layer_name:
-            self.conv40.convs = new_layer
-            self.layer_names["conv40.convs"] = new_layer
-            self.origin_layer_names["conv40.convs"] = new_layer
-        elif 'conv40.convs.0' == layer_name:
-            self.conv40.convs[0] = new_layer
-            self.layer_names["conv40.convs.0"] = new_layer
-            self.origin_layer_names["conv40.convs.0"] = new_layer
-        elif 'conv40.convs.0.0' == layer_name:
-            self.conv40.convs[0][0] = new_layer
-            self.layer_names["conv40.convs.0.0"] = new_layer
-            self.origin_layer_names["conv40.convs.0.0"] = new_layer
-        elif 'conv40.convs.0.1' == layer_name:
-            self.conv40.convs[0][1] = new_layer
-            self.layer_names["conv40.convs.0.1"] = new_layer
-            self.origin_layer_names["conv40.convs.0.1"] = new_layer
-        elif 'conv40.convs.0.2' == layer_name:
-            self.conv40.convs[0][2] = new_layer
-            self.layer_names["conv40.convs.0.2"] = new_layer
-            self.origin_layer_names["conv40.convs.0.2"] = new_layer
-        elif 'conv40.convs.1' == layer_name:
-            self.conv40.convs[1] = new_layer
-            self.layer_names["conv40.convs.1"] = new_layer
-            self.origin_layer_names["conv40.convs.1"] = new_layer
-        elif 'conv40.convs.1.0' == layer_name:
-            self.conv40.convs[1][0] = new_layer
-            self.layer_names["conv40.convs.1.0"] = new_layer
-            self.origin_layer_names["conv40.convs.1.0"] = new_layer
-        elif 'conv40.convs.1.1' == layer_name:
-            self.conv40.convs[1][1] = new_layer
-            self.layer_names["conv40.convs.1.1"] = new_layer
-            self.origin_layer_names["conv40.convs.1.1"] = new_layer
-        elif 'conv40.convs.1.2' == layer_name:
-            self.conv40.convs[1][2] = new_layer
-            self.layer_names["conv40.convs.1.2"] = new_layer
-            self.origin_layer_names["conv40.convs.1.2"] = new_layer
-        elif 'up_concat01' == layer_name:
-            self.up_concat01 = new_layer
-            self.layer_names["up_concat01"] = new_layer
-            self.origin_layer_names["up_concat01"] = new_layer
-        elif 'up_concat01.conv' == layer_name:
-            self.up_concat01.conv = new_layer
-            self.layer_names["up_concat01.conv"] = new_layer
-            self.origin_layer_names["up_concat01.conv"] = new_layer
-        elif 'up_concat01.conv.convs' == layer_name:
-            self.up_concat01.conv.convs = new_layer
-            self.layer_names["up_concat01.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat01.conv.convs"] = new_layer
-        elif 'up_concat01.conv.convs.0' == layer_name:
-            self.up_concat01.conv.convs[0] = new_layer
-            self.layer_names["up_concat01.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat01.conv.convs.0"] = new_layer
-        elif 'up_concat01.conv.convs.0.0' == layer_name:
-            self.up_concat01.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat01.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat01.conv.convs.0.0"] = new_layer
-        elif 'up_concat01.conv.convs.0.1' == layer_name:
-            self.up_concat01.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat01.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat01.conv.convs.0.1"] = new_layer
-        elif 'up_concat01.conv.convs.1' == layer_name:
-            self.up_concat01.conv.convs[1] = new_layer
-            self.layer_names["up_concat01.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat01.conv.convs.1"] = new_layer
-        elif 'up_concat01.conv.convs.1.0' == layer_name:
-            self.up_concat01.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat01.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat01.conv.convs.1.0"] = new_layer
-        elif 'up_concat01.conv.convs.1.1' == layer_name:
-            self.up_concat01.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat01.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat01.conv.convs.1.1"] = new_layer
-        elif 'up_concat01.up_conv' == layer_name:
-            self.up_concat01.up_conv = new_layer
-            self.layer_names["up_concat01.up_conv"] = new_layer
-            self.origin_layer_names["up_concat01.up_conv"] = new_layer
-        elif 'up_concat11' == layer_name:
-            self.up_concat11 = new_layer
-            self.layer_names["up_concat11"] = new_layer
-            self.origin_layer_names["up_concat11"] = new_layer
-        elif 'up_concat11.conv' == layer_name:
-            self.up_concat11.conv = new_layer
-            self.layer_names["up_concat11.conv"] = new_layer
-            self.origin_layer_names["up_concat11.conv"] = new_layer
-        elif 'up_concat11.conv.convs' == layer_name:
-            self.up_concat11.conv.convs = new_layer
-            self.layer_names["up_concat11.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat11.conv.convs"] = new_layer
-        elif 'up_concat11.conv.convs.0' == layer_name:
-            self.up_concat11.conv.convs[0] = new_layer
-            self.layer_names["up_concat11.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat11.conv.convs.0"] = new_layer
-        elif 'up_concat11.conv.convs.0.0' == layer_name:
-            self.up_concat11.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat11.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat11.conv.convs.0.0"] = new_layer
-        elif 'up_concat11.conv.convs.0.1' == layer_name:
-            self.up_concat11.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat11.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat11.conv.convs.0.1"] = new_layer
-        elif 'up_concat11.conv.convs.1' == layer_name:
-            self.up_concat11.conv.convs[1] = new_layer
-            self.layer_names["up_concat11.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat11.conv.convs.1"] = new_layer
-        elif 'up_concat11.conv.convs.1.0' == layer_name:
-            self.up_concat11.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat11.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat11.conv.convs.1.0"] = new_layer
-        elif 'up_concat11.conv.convs.1.1' == layer_name:
-            self.up_concat11.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat11.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat11.conv.convs.1.1"] = new_layer
-        elif 'up_concat11.up_conv' == layer_name:
-            self.up_concat11.up_conv = new_layer
-            self.layer_names["up_concat11.up_conv"] = new_layer
-            self.origin_layer_names["up_concat11.up_conv"] = new_layer
-        elif 'up_concat21' == layer_name:
-            self.up_concat21 = new_layer
-            self.layer_names["up_concat21"] = new_layer
-            self.origin_layer_names["up_concat21"] = new_layer
-        elif 'up_concat21.conv' == layer_name:
-            self.up_concat21.conv = new_layer
-            self.layer_names["up_concat21.conv"] = new_layer
-            self.origin_layer_names["up_concat21.conv"] = new_layer
-        elif 'up_concat21.conv.convs' == layer_name:
-            self.up_concat21.conv.convs = new_layer
-            self.layer_names["up_concat21.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat21.conv.convs"] = new_layer
-        elif 'up_concat21.conv.convs.0' == layer_name:
-            self.up_concat21.conv.convs[0] = new_layer
-            self.layer_names["up_concat21.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat21.conv.convs.0"] = new_layer
-        elif 'up_concat21.conv.convs.0.0' == layer_name:
-            self.up_concat21.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat21.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat21.conv.convs.0.0"] = new_layer
-        elif 'up_concat21.conv.convs.0.1' == layer_name:
-            self.up_concat21.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat21.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat21.conv.convs.0.1"] = new_layer
-        elif 'up_concat21.conv.convs.1' == layer_name:
-            self.up_concat21.conv.convs[1] = new_layer
-            self.layer_names["up_concat21.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat21.conv.convs.1"] = new_layer
-        elif 'up_concat21.conv.convs.1.0' == layer_name:
-            self.up_concat21.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat21.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat21.conv.convs.1.0"] = new_layer
-        elif 'up_concat21.conv.convs.1.1' == layer_name:
-            self.up_concat21.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat21.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat21.conv.convs.1.1"] = new_layer
-        elif 'up_concat21.up_conv' == layer_name:
-            self.up_concat21.up_conv = new_layer
-            self.layer_names["up_concat21.up_conv"] = new_layer
-            self.origin_layer_names["up_concat21.up_conv"] = new_layer
-        elif 'up_concat31' == layer_name:
-            self.up_concat31 = new_layer
-            self.layer_names["up_concat31"] = new_layer
-            self.origin_layer_names["up_concat31"] = new_layer
-        elif 'up_concat31.conv' == layer_name:
-            self.up_concat31.conv = new_layer
-            self.layer_names["up_concat31.conv"] = new_layer
-            self.origin_layer_names["up_concat31.conv"] = new_layer
-        elif 'up_concat31.conv.convs' == layer_name:
-            self.up_concat31.conv.convs = new_layer
-            self.layer_names["up_concat31.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat31.conv.convs"] = new_layer
-        elif 'up_concat31.conv.convs.0' == layer_name:
-            self.up_concat31.conv.convs[0] = new_layer
-            self.layer_names["up_concat31.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat31.conv.convs.0"] = new_layer
-        elif 'up_concat31.conv.convs.0.0' == layer_name:
-            self.up_concat31.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat31.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat31.conv.convs.0.0"] = new_layer
-        elif 'up_concat31.conv.convs.0.1' == layer_name:
-            self.up_concat31.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat31.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat31.conv.convs.0.1"] = new_layer
-        elif 'up_concat31.conv.convs.1' == layer_name:
-            self.up_concat31.conv.convs[1] = new_layer
-            self.layer_names["up_concat31.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat31.conv.convs.1"] = new_layer
-        elif 'up_concat31.conv.convs.1.0' == layer_name:
-            self.up_concat31.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat31.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat31.conv.convs.1.0"] = new_layer
-        elif 'up_concat31.conv.convs.1.1' == layer_name:
-            self.up_concat31.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat31.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat31.conv.convs.1.1"] = new_layer
-        elif 'up_concat31.up_conv' == layer_name:
-            self.up_concat31.up_conv = new_layer
-            self.layer_names["up_concat31.up_conv"] = new_layer
-            self.origin_layer_names["up_concat31.up_conv"] = new_layer
-        elif 'up_concat02' == layer_name:
-            self.up_concat02 = new_layer
-            self.layer_names["up_concat02"] = new_layer
-            self.origin_layer_names["up_concat02"] = new_layer
-        elif 'up_concat02.conv' == layer_name:
-            self.up_concat02.conv = new_layer
-            self.layer_names["up_concat02.conv"] = new_layer
-            self.origin_layer_names["up_concat02.conv"] = new_layer
-        elif 'up_concat02.conv.convs' == layer_name:
-            self.up_concat02.conv.convs = new_layer
-            self.layer_names["up_concat02.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat02.conv.convs"] = new_layer
-        elif 'up_concat02.conv.convs.0' == layer_name:
-            self.up_concat02.conv.convs[0] = new_layer
-            self.layer_names["up_concat02.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat02.conv.convs.0"] = new_layer
-        elif 'up_concat02.conv.convs.0.0' == layer_name:
-            self.up_concat02.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat02.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat02.conv.convs.0.0"] = new_layer
-        elif 'up_concat02.conv.convs.0.1' == layer_name:
-            self.up_concat02.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat02.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat02.conv.convs.0.1"] = new_layer
-        elif 'up_concat02.conv.convs.1' == layer_name:
-            self.up_concat02.conv.convs[1] = new_layer
-            self.layer_names["up_concat02.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat02.conv.convs.1"] = new_layer
-        elif 'up_concat02.conv.convs.1.0' == layer_name:
-            self.up_concat02.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat02.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat02.conv.convs.1.0"] = new_layer
-        elif 'up_concat02.conv.convs.1.1' == layer_name:
-            self.up_concat02.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat02.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat02.conv.convs.1.1"] = new_layer
-        elif 'up_concat02.up_conv' == layer_name:
-            self.up_concat02.up_conv = new_layer
-            self.layer_names["up_concat02.up_conv"] = new_layer
-            self.origin_layer_names["up_concat02.up_conv"] = new_layer
-        elif 'up_concat12' == layer_name:
-            self.up_concat12 = new_layer
-            self.layer_names["up_concat12"] = new_layer
-            self.origin_layer_names["up_concat12"] = new_layer
-        elif 'up_concat12.conv' == layer_name:
-            self.up_concat12.conv = new_layer
-            self.layer_names["up_concat12.conv"] = new_layer
-            self.origin_layer_names["up_concat12.conv"] = new_layer
-        elif 'up_concat12.conv.convs' == layer_name:
-            self.up_concat12.conv.convs = new_layer
-            self.layer_names["up_concat12.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat12.conv.convs"] = new_layer
-        elif 'up_concat12.conv.convs.0' == layer_name:
-            self.up_concat12.conv.convs[0] = new_layer
-            self.layer_names["up_concat12.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat12.conv.convs.0"] = new_layer
-        elif 'up_concat12.conv.convs.0.0' == layer_name:
-            self.up_concat12.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat12.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat12.conv.convs.0.0"] = new_layer
-        elif 'up_concat12.conv.convs.0.1' == layer_name:
-            self.up_concat12.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat12.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat12.conv.convs.0.1"] = new_layer
-        elif 'up_concat12.conv.convs.1' == layer_name:
-            self.up_concat12.conv.convs[1] = new_layer
-            self.layer_names["up_concat12.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat12.conv.convs.1"] = new_layer
-        elif 'up_concat12.conv.convs.1.0' == layer_name:
-            self.up_concat12.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat12.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat12.conv.convs.1.0"] = new_layer
-        elif 'up_concat12.conv.convs.1.1' == layer_name:
-            self.up_concat12.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat12.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat12.conv.convs.1.1"] = new_layer
-        elif 'up_concat12.up_conv' == layer_name:
-            self.up_concat12.up_conv = new_layer
-            self.layer_names["up_concat12.up_conv"] = new_layer
-            self.origin_layer_names["up_concat12.up_conv"] = new_layer
-        elif 'up_concat22' == layer_name:
-            self.up_concat22 = new_layer
-            self.layer_names["up_concat22"] = new_layer
-            self.origin_layer_names["up_concat22"] = new_layer
-        elif 'up_concat22.conv' == layer_name:
-            self.up_concat22.conv = new_layer
-            self.layer_names["up_concat22.conv"] = new_layer
-            self.origin_layer_names["up_concat22.conv"] = new_layer
-        elif 'up_concat22.conv.convs' == layer_name:
-            self.up_concat22.conv.convs = new_layer
-            self.layer_names["up_concat22.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat22.conv.convs"] = new_layer
-        elif 'up_concat22.conv.convs.0' == layer_name:
-            self.up_concat22.conv.convs[0] = new_layer
-            self.layer_names["up_concat22.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat22.conv.convs.0"] = new_layer
-        elif 'up_concat22.conv.convs.0.0' == layer_name:
-            self.up_concat22.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat22.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat22.conv.convs.0.0"] = new_layer
-        elif 'up_concat22.conv.convs.0.1' == layer_name:
-            self.up_concat22.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat22.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat22.conv.convs.0.1"] = new_layer
-        elif 'up_concat22.conv.convs.1' == layer_name:
-            self.up_concat22.conv.convs[1] = new_layer
-            self.layer_names["up_concat22.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat22.conv.convs.1"] = new_layer
-        elif 'up_concat22.conv.convs.1.0' == layer_name:
-            self.up_concat22.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat22.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat22.conv.convs.1.0"] = new_layer
-        elif 'up_concat22.conv.convs.1.1' == layer_name:
-            self.up_concat22.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat22.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat22.conv.convs.1.1"] = new_layer
-        elif 'up_concat22.up_conv' == layer_name:
-            self.up_concat22.up_conv = new_layer
-            self.layer_names["up_concat22.up_conv"] = new_layer
-            self.origin_layer_names["up_concat22.up_conv"] = new_layer
-        elif 'up_concat03' == layer_name:
-            self.up_concat03 = new_layer
-            self.layer_names["up_concat03"] = new_layer
-            self.origin_layer_names["up_concat03"] = new_layer
-        elif 'up_concat03.conv' == layer_name:
-            self.up_concat03.conv = new_layer
-            self.layer_names["up_concat03.conv"] = new_layer
-            self.origin_layer_names["up_concat03.conv"] = new_layer
-        elif 'up_concat03.conv.convs' == layer_name:
-            self.up_concat03.conv.convs = new_layer
-            self.layer_names["up_concat03.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat03.conv.convs"] = new_layer
-        elif 'up_concat03.conv.convs.0' == layer_name:
-            self.up_concat03.conv.convs[0] = new_layer
-            self.layer_names["up_concat03.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat03.conv.convs.0"] = new_layer
-        elif 'up_concat03.conv.convs.0.0' == layer_name:
-            self.up_concat03.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat03.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat03.conv.convs.0.0"] = new_layer
-        elif 'up_concat03.conv.convs.0.1' == layer_name:
-            self.up_concat03.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat03.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat03.conv.convs.0.1"] = new_layer
-        elif 'up_concat03.conv.convs.1' == layer_name:
-            self.up_concat03.conv.convs[1] = new_layer
-            self.layer_names["up_concat03.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat03.conv.convs.1"] = new_layer
-        elif 'up_concat03.conv.convs.1.0' == layer_name:
-            self.up_concat03.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat03.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat03.conv.convs.1.0"] = new_layer
-        elif 'up_concat03.conv.convs.1.1' == layer_name:
-            self.up_concat03.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat03.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat03.conv.convs.1.1"] = new_layer
-        elif 'up_concat03.up_conv' == layer_name:
-            self.up_concat03.up_conv = new_layer
-            self.layer_names["up_concat03.up_conv"] = new_layer
-            self.origin_layer_names["up_concat03.up_conv"] = new_layer
-        elif 'up_concat13' == layer_name:
-            self.up_concat13 = new_layer
-            self.layer_names["up_concat13"] = new_layer
-            self.origin_layer_names["up_concat13"] = new_layer
-        elif 'up_concat13.conv' == layer_name:
-            self.up_concat13.conv = new_layer
-            self.layer_names["up_concat13.conv"] = new_layer
-            self.origin_layer_names["up_concat13.conv"] = new_layer
-        elif 'up_concat13.conv.convs' == layer_name:
-            self.up_concat13.conv.convs = new_layer
-            self.layer_names["up_concat13.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat13.conv.convs"] = new_layer
-        elif 'up_concat13.conv.convs.0' == layer_name:
-            self.up_concat13.conv.convs[0] = new_layer
-            self.layer_names["up_concat13.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat13.conv.convs.0"] = new_layer
-        elif 'up_concat13.conv.convs.0.0' == layer_name:
-            self.up_concat13.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat13.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat13.conv.convs.0.0"] = new_layer
-        elif 'up_concat13.conv.convs.0.1' == layer_name:
-            self.up_concat13.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat13.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat13.conv.convs.0.1"] = new_layer
-        elif 'up_concat13.conv.convs.1' == layer_name:
-            self.up_concat13.conv.convs[1] = new_layer
-            self.layer_names["up_concat13.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat13.conv.convs.1"] = new_layer
-        elif 'up_concat13.conv.convs.1.0' == layer_name:
-            self.up_concat13.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat13.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat13.conv.convs.1.0"] = new_layer
-        elif 'up_concat13.conv.convs.1.1' == layer_name:
-            self.up_concat13.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat13.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat13.conv.convs.1.1"] = new_layer
-        elif 'up_concat13.up_conv' == layer_name:
-            self.up_concat13.up_conv = new_layer
-            self.layer_names["up_concat13.up_conv"] = new_layer
-            self.origin_layer_names["up_concat13.up_conv"] = new_layer
-        elif 'up_concat04' == layer_name:
-            self.up_concat04 = new_layer
-            self.layer_names["up_concat04"] = new_layer
-            self.origin_layer_names["up_concat04"] = new_layer
-        elif 'up_concat04.conv' == layer_name:
-            self.up_concat04.conv = new_layer
-            self.layer_names["up_concat04.conv"] = new_layer
-            self.origin_layer_names["up_concat04.conv"] = new_layer
-        elif 'up_concat04.conv.convs' == layer_name:
-            self.up_concat04.conv.convs = new_layer
-            self.layer_names["up_concat04.conv.convs"] = new_layer
-            self.origin_layer_names["up_concat04.conv.convs"] = new_layer
-        elif 'up_concat04.conv.convs.0' == layer_name:
-            self.up_concat04.conv.convs[0] = new_layer
-            self.layer_names["up_concat04.conv.convs.0"] = new_layer
-            self.origin_layer_names["up_concat04.conv.convs.0"] = new_layer
-        elif 'up_concat04.conv.convs.0.0' == layer_name:
-            self.up_concat04.conv.convs[0][0] = new_layer
-            self.layer_names["up_concat04.conv.convs.0.0"] = new_layer
-            self.origin_layer_names["up_concat04.conv.convs.0.0"] = new_layer
-        elif 'up_concat04.conv.convs.0.1' == layer_name:
-            self.up_concat04.conv.convs[0][1] = new_layer
-            self.layer_names["up_concat04.conv.convs.0.1"] = new_layer
-            self.origin_layer_names["up_concat04.conv.convs.0.1"] = new_layer
-        elif 'up_concat04.conv.convs.1' == layer_name:
-            self.up_concat04.conv.convs[1] = new_layer
-            self.layer_names["up_concat04.conv.convs.1"] = new_layer
-            self.origin_layer_names["up_concat04.conv.convs.1"] = new_layer
-        elif 'up_concat04.conv.convs.1.0' == layer_name:
-            self.up_concat04.conv.convs[1][0] = new_layer
-            self.layer_names["up_concat04.conv.convs.1.0"] = new_layer
-            self.origin_layer_names["up_concat04.conv.convs.1.0"] = new_layer
-        elif 'up_concat04.conv.convs.1.1' == layer_name:
-            self.up_concat04.conv.convs[1][1] = new_layer
-            self.layer_names["up_concat04.conv.convs.1.1"] = new_layer
-            self.origin_layer_names["up_concat04.conv.convs.1.1"] = new_layer
-        elif 'up_concat04.up_conv' == layer_name:
-            self.up_concat04.up_conv = new_layer
-            self.layer_names["up_concat04.up_conv"] = new_layer
-            self.origin_layer_names["up_concat04.up_conv"] = new_layer
-        elif 'final1' == layer_name:
-            self.final1 = new_layer
-            self.layer_names["final1"] = new_layer
-            self.origin_layer_names["final1"] = new_layer
-        elif 'final2' == layer_name:
-            self.final2 = new_layer
-            self.layer_names["final2"] = new_layer
-            self.origin_layer_names["final2"] = new_layer
-        elif 'final3' == layer_name:
-            self.final3 = new_layer
-            self.layer_names["final3"] = new_layer
-            self.origin_layer_names["final3"] = new_layer
-        elif 'final4' == layer_name:
-            self.final4 = new_layer
-            self.layer_names["final4"] = new_layer
-            self.origin_layer_names["final4"] = new_layer
-
     def get_order(self, layer_name):
         if layer_name not in self.orders.keys():
             return False
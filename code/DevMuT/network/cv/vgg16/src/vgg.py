@@ -23,6 +23,7 @@ from mindspore.common.initializer import initializer
 from .utils.var_init import default_recurisive_init, KaimingNormal
 import mindspore
 import mindspore.ops as ops
+from common.layer_paths import LayerPathMixin
 
 
 def _make_layer(base, args, batch_norm):
@@ -51,7 +52,7 @@ def _make_layer(base, args, batch_norm):
     return nn.SequentialCell(layers)
 
 
-class Vgg(nn.Cell):
+class Vgg(LayerPathMixin, nn.Cell):
     """
     VGG network definition.
     """
@@ -375,288 +376,6 @@ class Vgg(nn.Cell):
             x = self.classifier(x)
         return x
 
-    def get_layers(self, layer_name):
-        if layer_name not in self.layer_names.keys():
-            return False
-        return self.layer_names[layer_name]
-
-    def set_layers(self, layer_name, new_layer):
-
-        if 'layers' == layer_name:
-            self.layers = new_layer
-            self.layer_names['layers'] = new_layer
-            self.origin_layer_names['layers'] = new_layer
-
-        elif 'layers.0' == layer_name:
-            self.layers[0] = new_layer
-            self.layer_names['layers.0'] = new_layer
-            self.origin_layer_names['layers.0'] = new_layer
-
-        elif 'layers.1' == layer_name:
-            self.layers[1] = new_layer
-            self.layer_names['layers.1'] = new_layer
-            self.origin_layer_names['layers.1'] = new_layer
-
-        elif 'layers.2' == layer_name:
-            self.layers[2] = new_layer
-            self.layer_names['layers.2'] = new_layer
-            self.origin_layer_names['layers.2'] = new_layer
-
-        elif 'layers.3' == layer_name:
-            self.layers[3] = new_layer
-            self.layer_names['layers.3'] = new_layer
-            self.origin_layer_names['layers.3'] = new_layer
-
-        elif 'layers.4' == layer_name:
-            self.layers[4] = new_layer
-            self.layer_names['layers.4'] = new_layer
-            self.origin_layer_names['layers.4'] = new_layer
-
-        elif 'layers.5' == layer_name:
-            self.layers[5] = new_layer
-            self.layer_names['layers.5'] = new_layer
-            self.origin_layer_names['layers.5'] = new_layer
-
-        elif 'layers.6' == layer_name:
-            self.layers[6] = new_layer
-            self.layer_names['layers.6'] = new_layer
-            self.origin_layer_names['layers.6'] = new_layer
-
-        elif 'layers.7' == layer_name:
-            self.layers[7] = new_layer
-            self.layer_names['layers.7'] = new_layer
-            self.origin_layer_names['layers.7'] = new_layer
-
-        elif 'layers.8' == layer_name:
-            self.layers[8] = new_layer
-            self.layer_names['layers.8'] = new_layer
-            self.origin_layer_names['layers.8'] = new_layer
-
-        elif 'layers.9' == layer_name:
-            self.layers[9] = new_layer
-            self.layer_names['layers.9'] = new_layer
-            self.origin_layer_names['layers.9'] = new_layer
-
-        elif 'layers.10' == layer_name:
-            self.layers[10] = new_layer
-            self.layer_names['layers.10'] = new_layer
-            self.origin_layer_names['layers.10'] = new_layer
-
-        elif 'layers.11' == layer_name:
-            self.layers[11] = new_layer
-            self.layer_names['layers.11'] = new_layer
-            self.origin_layer_names['layers.11'] = new_layer
-
-        elif 'layers.12' == layer_name:
-            self.layers[12] = new_layer
-            self.layer_names['layers.12'] = new_layer
-            self.origin_layer_names['layers.12'] = new_layer
-
-        elif 'layers.13' == layer_name:
-            self.layers[13] = new_layer
-            self.layer_names['layers.13'] = new_layer
-            self.origin_layer_names['layers.13'] = new_layer
-
-        elif 'layers.14' == layer_name:
-            self.layers[14] = new_layer
-            self.layer_names['layers.14'] = new_layer
-            self.origin_layer_names['layers.14'] = new_layer
-
-        elif 'layers.15' == layer_name:
-            self.layers[15] = new_layer
-            self.layer_names['layers.15'] = new_layer
-            self.origin_layer_names['layers.15'] = new_layer
-
-        elif 'layers.16' == layer_name:
-            self.layers[16] = new_layer
-            self.layer_names['layers.16'] = new_layer
-            self.origin_layer_names['layers.16'] = new_layer
-
-        elif 'layers.17' == layer_name:
-            self.layers[17] = new_layer
-            self.layer_names['layers.17'] = new_layer
-            self.origin_layer_names['layers.17'] = new_layer
-
-        elif 'layers.18' == layer_name:
-            self.layers[18] = new_layer
-            self.layer_names['layers.18'] = new_layer
-            self.origin_layer_names['layers.18'] = new_layer
-
-        elif 'layers.19' == layer_name:
-            self.layers[19] = new_layer
-            self.layer_names['layers.19'] = new_layer
-            self.origin_layer_names['layers.19'] = new_layer
-
-        elif 'layers.20' == layer_name:
-            self.layers[20] = new_layer
-            self.layer_names['layers.20'] = new_layer
-            self.origin_layer_names['layers.20'] = new_layer
-
-        elif 'layers.21' == layer_name:
-            self.layers[21] = new_layer
-            self.layer_names['layers.21'] = new_layer
-            self.origin_layer_names['layers.21'] = new_layer
-
-        elif 'layers.22' == layer_name:
-            self.layers[22] = new_layer
-            self.layer_names['layers.22'] = new_layer
-            self.origin_layer_names['layers.22'] = new_layer
-
-        elif 'layers.23' == layer_name:
-            self.layers[23] = new_layer
-            self.layer_names['layers.23'] = new_layer
-            self.origin_layer_names['layers.23'] = new_layer
-
-        elif 'layers.24' == layer_name:
-            self.layers[24] = new_layer
-            self.layer_names['layers.24'] = new_layer
-            self.origin_layer_names['layers.24'] = new_layer
-
-        elif 'layers.25' == layer_name:
-            self.layers[25] = new_layer
-            self.layer_names['layers.25'] = new_layer
-            self.origin_layer_names['layers.25'] = new_layer
-
-        elif 'layers.26' == layer_name:
-            self.layers[26] = new_layer
-            self.layer_names['layers.26'] = new_layer
-            self.origin_layer_names['layers.26'] = new_layer
-
-        elif 'layers.27' == layer_name:
-            self.layers[27] = new_layer
-            self.layer_names['layers.27'] = new_layer
-            self.origin_layer_names['layers.27'] = new_layer
-
-        elif 'layers.28' == layer_name:
-            self.layers[28] = new_layer
-            self.layer_names['layers.28'] = new_layer
-            self.origin_layer_names['layers.28'] = new_layer
-
-        elif 'layers.29' == layer_name:
-            self.layers[29] = new_layer
-            self.layer_names['layers.29'] = new_layer
-            self.origin_layer_names['layers.29'] = new_layer
-
-        elif 'layers.30' == layer_name:
-            self.layers[30] = new_layer
-            self.layer_names['layers.30'] = new_layer
-            self.origin_layer_names['layers.30'] = new_layer
-
-        elif 'layers.31' == layer_name:
-            self.layers[31] = new_layer
-            self.layer_names['layers.31'] = new_layer
-            self.origin_layer_names['layers.31'] = new_layer
-
-        elif 'layers.32' == layer_name:
-            self.layers[32] = new_layer
-            self.layer_names['layers.32'] = new_layer
-            self.origin_layer_names['layers.32'] = new_layer
-
-        elif 'layers.33' == layer_name:
-            self.layers[33] = new_layer
-            self.layer_names['layers.33'] = new_layer
-            self.origin_layer_names['layers.33'] = new_layer
-
-        elif 'layers.34' == layer_name:
-            self.layers[34] = new_layer
-            self.layer_names['layers.34'] = new_layer
-            self.origin_layer_names['layers.34'] = new_layer
-
-        elif 'layers.35' == layer_name:
-            self.layers[35] = new_layer
-            self.layer_names['layers.35'] = new_layer
-            self.origin_layer_names['layers.35'] = new_layer
-
-        elif 'layers.36' == layer_name:
-            self.layers[36] = new_layer
-            self.layer_names['layers.36'] = new_layer
-            self.origin_layer_names['layers.36'] = new_layer
-
-        elif 'layers.37' == layer_name:
-            self.layers[37] = new_layer
-            self.layer_names['layers.37'] = new_layer
-            self.origin_layer_names['layers.37'] = new_layer
-
-        elif 'layers.38' == layer_name:
-            self.layers[38] = new_layer
-            self.layer_names['layers.38'] = new_layer
-            self.origin_layer_names['layers.38'] = new_layer
-
-        elif 'layers.39' == layer_name:
-            self.layers[39] = new_layer
-            self.layer_names['layers.39'] = new_layer
-            self.origin_layer_names['layers.39'] = new_layer
-
-        elif 'layers.40' == layer_name:
-            self.layers[40] = new_layer
-            self.layer_names['layers.40'] = new_layer
-            self.origin_layer_names['layers.40'] = new_layer
-
-        elif 'layers.41' == layer_name:
-            self.layers[41] = new_layer
-            self.layer_names['layers.41'] = new_layer
-            self.origin_layer_names['layers.41'] = new_layer
-
-        elif 'layers.42' == layer_name:
-            self.layers[42] = new_layer
-            self.layer_names['layers.42'] = new_layer
-            self.origin_layer_names['layers.42'] = new_layer
-
-        elif 'layers.43' == layer_name:
-            self.layers[43] = new_layer
-            self.layer_names['layers.43'] = new_layer
-            self.origin_layer_names['layers.43'] = new_layer
-
-        elif 'avgpool' == layer_name:
-            self.avgpool = new_layer
-            self.layer_names['avgpool'] = new_layer
-            self.origin_layer_names['avgpool'] = new_layer
-
-        elif 'flatten' == layer_name:
-            self.flatten = new_layer
-            self.layer_names['flatten'] = new_layer
-            self.origin_layer_names['flatten'] = new_layer
-
-        elif 'classifier' == layer_name:
-            self.classifier = new_layer
-            self.layer_names['classifier'] = new_layer
-            self.origin_layer_names['classifier'] = new_layer
-
-        elif 'classifier.0' == layer_name:
-            self.classifier[0] = new_layer
-            self.layer_names['classifier.0'] = new_layer
-            self.origin_layer_names['classifier.0'] = new_layer
-
-        elif 'classifier.1' == layer_name:
-            self.classifier[1] = new_layer
-            self.layer_names['classifier.1'] = new_layer
-            self.origin_layer_names['classifier.1'] = new_layer
-
-        elif 'classifier.2' == layer_name:
-            self.classifier[2] = new_layer
-            self.layer_names['classifier.2'] = new_layer
-            self.origin_layer_names['classifier.2'] = new_layer
-
-        elif 'classifier.3' == layer_name:
-            self.classifier[3] = new_layer
-            self.layer_names['classifier.3'] = new_layer
-            self.origin_layer_names['classifier.3'] = new_layer
-
-        elif 'classifier.4' == layer_name:
-            self.classifier[4] = new_layer
-            self.layer_names['classifier.4'] = new_layer
-            self.origin_layer_names['classifier.4'] = new_layer
-
-        elif 'classifier.5' == layer_name:
-            self.classifier[5] = new_layer
-            self.layer_names['classifier.5'] = new_layer
-            self.origin_layer_names['classifier.5'] = new_layer
-
-        elif 'classifier.6' == layer_name:
-            self.classifier[6] = new_layer
-            self.layer_names['classifier.6'] = new_layer
-            self.origin_layer_names['classifier.6'] = new_layer
-
     def get_order(self, layer_name):
         if layer_name not in self.orders.keys():
             return False
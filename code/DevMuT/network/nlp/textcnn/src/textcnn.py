@@ -22,6 +22,7 @@ from mindspore import Tensor
 from mindspore.nn.cell import Cell
 import mindspore
 from mindspore.train.callback import Callback
+from common.layer_paths import LayerPathMixin
 
 
 class EvalCallback(Callback):
@@ -131,7 +132,7 @@ def make_conv_layer(kernel_size):
                      pad_mode="pad", has_bias=True)
 
 
-class TextCNN(nn.Cell):
+class TextCNN(LayerPathMixin, nn.Cell):
     """
     TextCNN architecture
     """
@@ -285,76 +286,6 @@ class TextCNN(nn.Cell):
 
         return x
 
-    def get_layers(self, layer_name):
-        if layer_name not in self.layer_names.keys():
-            return False
-        return self.layer_names[layer_name]
-
-
-    def set_layers(self,layer_name,new_layer):
-        if 'embedding' == layer_name:
-            self.embedding= new_layer
-            self.layer_names["embedding"]=new_layer
-
-        elif 'layer1' == layer_name:
-            self.layer1= new_layer
-            self.layer_names["layer1"]=new_layer
-
-        elif 'layer1.0' == layer_name:
-            self.layer1[0]= new_layer
-            self.layer_names["layer1.0"]=new_layer
-
-        elif 'layer1.1' == layer_name:
-            self.layer1[1]= new_layer
-            self.layer_names["layer1.1"]=new_layer
-            self.origin_layer_names["layer1.1"]=new_layer
-        elif 'layer1.2' == layer_name:
-            self.layer1[2]= new_layer
-            self.layer_names["layer1.2"]=new_layer
-
-        elif 'layer2' == layer_name:
-            self.layer2= new_layer
-            self.layer_names["layer2"]=new_layer
-
-        elif 'layer2.0' == layer_name:
-            self.layer2[0]= new_layer
-            self.layer_names["layer2.0"]=new_layer
-
-        elif 'layer2.1' == layer_name:
-            self.layer2[1]= new_layer
-            self.layer_names["layer2.1"]=new_layer
-
-        elif 'layer2.2' == layer_name:
-            self.layer2[2]= new_layer
-            self.layer_names["layer2.2"]=new_layer
-
-        elif 'layer3' == layer_name:
-            self.layer3= new_layer
-            self.layer_names["layer3"]=new_layer
-
-        elif 'layer3.0' == layer_name:
-            self.layer3[0]= new_layer
-            self.layer_names["layer3.0"]=new_layer
-
-        elif 'layer3.1' == layer_name:
-            self.layer3[1]= new_layer
-            self.layer_names["layer3.1"]=new_layer
-
-        elif 'layer3.2' == layer_name:
-            self.layer3[2]= new_layer
-            self.layer_names["layer3.2"]=new_layer
-
-        elif 'drop' == layer_name:
-            self.drop= new_layer
-            self.layer_names["drop"]=new_layer
-
-        elif 'fc' == layer_name:
-            self.fc= new_layer
-            self.layer_names["fc"]=new_layer
-
-
-
-
     def get_order(self, layer_name):
         if layer_name not in self.orders.keys():
             return False
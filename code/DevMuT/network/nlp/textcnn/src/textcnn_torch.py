@@ -1,6 +1,7 @@
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
+from common.layer_paths import LayerPathMixin
 
 
 def make_conv_layer(kernel_size):
@@ -8,7 +9,7 @@ def make_conv_layer(kernel_size):
                      padding_mode="zeros", bias=True)
 
 
-class TextCNN(nn.Module):
+class TextCNN(LayerPathMixin, nn.Module):
     def __init__(self, vocab_len, word_len, num_classes, vec_length, embedding_table='uniform'):
         super(TextCNN, self).__init__()
         self.vec_length = vec_length
@@ -149,59 +150,6 @@ class TextCNN(nn.Module):
 
         return x
 
-    def get_layers(self, layer_name):
-        if layer_name not in self.layer_names.keys():
-            return False
-        return self.layer_names[layer_name]
-
-    def set_layers(self, layer_name, new_layer):
-
-        if "embedding" == layer_name:
-            self.embedding = new_layer
-            self.layer_names['layers'] = new_layer
-        elif "layer1" == layer_name:
-            self.layer1 = new_layer = new_layer
-            self.layer_names["layer1"] = new_layer
-        elif "layer1.0" == layer_name:
-            self.layer1[0] = new_layer
-            self.layer_names["layer1.0"] = new_layer
-        elif "layer1.1" == layer_name:
-            self.layer1[1] = new_layer
-            self.layer_names["layer1.1"] = new_layer
-        elif "layer1.2" == layer_name:
-            self.layer1[2] = new_layer
-            self.layer_names["layer1.2"] = new_layer
-        elif "layer2" == layer_name:
-            self.layer2 = new_layer
-            self.layer_names["layer2"] = new_layer
-        elif "layer2.0" == layer_name:
-            self.layer2[0] = new_layer
-            self.layer_names["layer2.0"] = new_layer
-        elif "layer2.1" == layer_name:
-            self.layer2[1] = new_layer
-            self.layer_names["layer2.1"] = new_layer
-        elif "layer2.2" == layer_name:
-            self.layer2[2] = new_layer
-            self.layer_names["layer2.2"] = new_layer
-        elif "layer3" == layer_name:
-            self.layer3 = new_layer
-            self.layer_names["layer3"] = new_layer
-        elif "layer3.0" == layer_name:
-            self.layer3[0] = new_layer
-            self.layer_names["layer3.0"] = new_layer
-        elif "layer3.1" == layer_name:
-            self.layer3[1] = new_layer
-            self.layer_names["layer3.1"] = new_layer
-        elif "layer3.2" == layer_name:
-            self.layer3[2] = new_layer
-            self.layer_names["layer3.2"] = new_layer
-        elif "drop" == layer_name:
-            self.drop = new_layer
-            self.layer_names["drop"] = new_layer
-        elif "fc" == layer_name:
-            self.fc = new_layer
-            self.layer_names["fc"] = new_layer
-
     def get_order(self, layer_name):
         if layer_name not in self.orders.keys():
             return False
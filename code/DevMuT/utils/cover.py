@@ -124,10 +124,140 @@ def calculate_edge_num(model: nn.Cell):
     return len(current_edge_list)
 
 
+def _head_node(stree):
+    if mindspore.__version__ == "2.2.0":
+        return stree._symbol_tree.get_head()
+    return stree._symbol_tree.get_head_node()
+
+
+def _node_type(node):
+    return node.get_name() if node.get_instance() is None else node.get_instance().__class__.__name__
+
+
+class ModelCoverage:
+    """
+    Everything the coverage metrics need from one model: leaf-layer input shapes and dtypes (one hooked
+    forward), layer sequences, op types and edges (one SymbolTree), op count and layer parameter settings.
+    """
+
+    def __init__(self):
+        self.shapes = {}
+        self.dtypes = {}
+        self.sequences = set()
+        self.op_types = set()
+        self.edges = []
+        self.op_num = 0
+        self.params = {}
+        self.layer_types = {}
+
+    def input_items(self):
+        # (layer type, input shape, input dtypes) per leaf layer, the unit of layer input coverage
+        items = set()
+        for name, shape in self.shapes.items():
+            items.add((self.layer_types.get(name, name), str(shape), str(self.dtypes.get(name))))
+        return items
+
+    def param_items(self):
+        return set((op_type, val) for op_type, vals in self.params.items() for val in vals)
+
+    def counts(self):
+        # the six numbers calculate_all_coverage always returned
+        return sum(len(val) for val in self.shapes.values()), sum(len(val) for val in self.dtypes.values()), \
+            len(self.sequences), self.op_num, len(self.op_types), len(self.edges)
+
+
+def collect_coverage(model: nn.Cell, np_data: list, model_dtypes_ms: list):
+    info = ModelCoverage()
+    input_data = mindsporeinfoplus.np_2_tensor(np_data, model_dtypes_ms)
+    res, global_layer_info = mindsporeinfoplus.summary_plus(
+        model=model,
+        input_data=input_data,
+        dtypes=model_dtypes_ms,
+        col_names=['input_size', 'output_size', 'name'],
+        mode="train",
+        verbose=0,
+        depth=10
+    )
+    info.shapes = mindsporeinfoplus.get_input_size(global_layer_info)
+    info.dtypes = mindsporeinfoplus.get_dtypes(global_layer_info)
+
+    for name, cell in model.cells_and_names():
+        info.op_num += 1
+        info.layer_types[name] = cell.__class__.__name__
+        if len(cell._cells) == 0:
+            update_params(cell, info.params)
+
+    stree = SymbolTree.create(model)
+    head_node = _head_node(stree)
+    if head_node is None:
+        print("head_node None, return")
+        return info
+    node: Node = head_node.get_next()
+    prev_layer = None
+    while node is not None:
+        if node.get_instance() is not None:
+            layer_type = node.get_instance().__class__.__name__
+            info.op_types.add(layer_type)
+            if prev_layer is not None:
+                info.sequences.add((prev_layer, layer_type))
+            prev_layer = layer_type
+        node = node.get_next()
+    if mindspore.__version__ == "2.2.0":
+        for in_node in stree.nodes(all_nodes=True):
+            for out_node in in_node.get_users():
+                info.edges.append((_node_type(in_node), _node_type(out_node)))
+    else:
+        for in_node in stree.nodes():
+            for out_node in in_node.get_users():
+                info.edges.append((_node_type(in_node), out_node.get_instance().__class__.__name__))
+    return info
+
+
+class CoverageEngine:
+    """
+    Campaign-level coverage. The union sets of every model added so far are kept, so a new mutant only
+    contributes what it adds: layer input coverage (LIC, shape/dtype per layer type), layer sequence
+    coverage (LSC) and layer parameter coverage (LPC), plus the op types and edges seen.
+    """
+
+    def __init__(self):
+        self.inputs = set()
+        self.sequences = set()
+        self.params = set()
+        self.op_types = set()
+        self.edges = set()
+        self.models = 0
+
+    def add(self, model: nn.Cell, np_data: list, model_dtypes_ms: list):
+        """
+        Collect one model and merge it into the campaign sets. Returns (info, gains), gains being the number
+        of new LIC/LSC/LPC/op type/edge items this model contributed.
+        """
+        info = collect_coverage(model, np_data, model_dtypes_ms)
+        return info, self.merge(info)
+
+    def merge(self, info):
+        gains = {}
+        for key, union, items in [("LIC", self.inputs, info.input_items()), ("LSC", self.sequences, info.sequences),
+                                  ("LPC", self.params, info.param_items()), ("op_type", self.op_types, info.op_types),
+                                  ("edge", self.edges, set(info.edges))]:
+            new_items = items - union
+            union |= new_items
+            gains[key] = len(new_items)
+        self.models += 1
+        return gains
+
+    def totals(self):
+        return {"LIC": len(self.inputs), "LSC": len(self.sequences), "LPC": len(self.params),
+                "op_type": len(self.op_types), "edge": len(self.edges)}
+
+    def summary(self):
+        return "coverage: {} models, ".format(self.models) + ", ".join(
+            "{}:{}".format(key, val) for key, val in self.totals().items())
+
+
 def calculate_all_coverage(model: nn.Cell, np_data: list, model_dtypes_ms: list):
-    return calculate_layer_shape(model, np_data, model_dtypes_ms), calculate_layer_dtype \
-        (model, np_data, model_dtypes_ms), calculate_layer_sequence(model), \
-        calculate_op_num(model), calculate_op_type(model), calculate_edge_num(model)
+    return collect_coverage(model, np_data, model_dtypes_ms).counts()
 
 
 if __name__ == '__main__':
@@ -136,3 +266,5 @@ if __name__ == '__main__':
     np_data = [inpu_np]
     model_dtypes_ms = [mindspore.float32]
     print(calculate_all_coverage(net_ms, np_data, model_dtypes_ms))
+    engine = CoverageEngine()
+    print(engine.add(net_ms, np_data, model_dtypes_ms)[1], engine.summary())
@@ -0,0 +1,103 @@
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.mutation_torch.OP_weight_utils import _shuffle_conv2d, _shuffle_dense, generate_permutation
+
+# (out_channels, in_channels, kernel_h, kernel_w) of the distinct conv layers, (out_dim, in_dim) of the dense layers
+vgg16_shapes = [(64, 3, 3, 3), (64, 64, 3, 3), (128, 64, 3, 3), (128, 128, 3, 3), (256, 128, 3, 3),
+                (256, 256, 3, 3), (512, 256, 3, 3), (512, 512, 3, 3), (4096, 25088), (4096, 4096), (1000, 4096)]
+resnet50_shapes = [(64, 3, 7, 7), (64, 64, 1, 1), (64, 64, 3, 3), (256, 64, 1, 1), (128, 256, 1, 1),
+                   (128, 128, 3, 3), (512, 128, 1, 1), (256, 512, 1, 1), (256, 256, 3, 3), (1024, 256, 1, 1),
+                   (512, 1024, 1, 1), (512, 512, 3, 3), (2048, 512, 1, 1), (2048, 1024, 1, 1), (1000, 2048)]
+
+
+def shuffle(a):
+    shuffled_a = np.empty(a.shape, dtype=a.dtype)
+    permutation = np.random.permutation(len(a))
+    shuffled_a[permutation] = a
+    return shuffled_a
+
+
+def _shuffle_conv2d_loop(weights, mutate_ratio):
+    # per output channel version the vectorized kernel replaced
+    new_weights = []
+    for val in weights:
+        if len(val.shape) > 1:
+            num_of_output_channels, num_of_input_channels, filter_height, filter_width = val.shape
+            mutate_output_channels = generate_permutation(num_of_output_channels, mutate_ratio)
+            for output_channel in mutate_output_channels:
+                copy_list = val.copy()
+                copy_list = np.reshape(copy_list,
+                                       (filter_width * filter_height * num_of_input_channels, num_of_output_channels))
+                copy_list[:, output_channel] = shuffle(copy_list[:, output_channel])
+                val = np.reshape(copy_list,
+                                 (num_of_output_channels, num_of_input_channels, filter_height, filter_width))
+        new_weights.append(val)
+    return new_weights
+
+
+def _shuffle_dense_loop(weights, mutate_ratio):
+    new_weights = []
+    for val in weights:
+        if len(val.shape) > 1:
+            mutate_output_dims = generate_permutation(val.shape[0], mutate_ratio)
+            copy_list = val.copy()
+            for output_dim in mutate_output_dims:
+                copy_list[output_dim, :] = shuffle(copy_list[output_dim, :])
+            val = copy_list
+        new_weights.append(val)
+    return new_weights
+
+
+def check_shuffled(old, new, matrix_shape):
+    # every column is a permutation of the original one, so sorting them must give the same matrix
+    old, new = np.reshape(old, matrix_shape), np.reshape(new, matrix_shape)
+    return np.array_equal(np.sort(old, axis=0), np.sort(new, axis=0))
+
+
+def time_kernel(kernel, weights, mutate_ratio, repeat):
+    costs = []
+    for _ in range(repeat):
+        start_time = time.time()
+        kernel(weights, mutate_ratio)
+        costs.append(time.time() - start_time)
+    return min(costs)
+
+
+def benchmark(model_name, shapes, mutate_ratio=0.4, repeat=3):
+    print("{} (mutation_ratio={})".format(model_name, mutate_ratio))
+    print("{:<24}{:>14}{:>14}{:>10}".format("weight shape", "loop (ms)", "batched (ms)", "speedup"))
+    total_old, total_new = 0.0, 0.0
+    for shape in shapes:
+        weight = np.random.randn(*shape).astype(np.float32)
+        weights = [weight, np.random.randn(shape[0]).astype(np.float32)]
+        if len(shape) == 4:
+            old_kernel, new_kernel = _shuffle_conv2d_loop, _shuffle_conv2d
+        else:
+            old_kernel, new_kernel = _shuffle_dense_loop, _shuffle_dense
+
+        new_weight = new_kernel(weights, mutate_ratio)[0]
+        if len(shape) == 2:
+            # dense rows are shuffled, compare them as columns
+            weight, new_weight = weight.T, new_weight.T
+        if not check_shuffled(weight, new_weight, (-1, shape[0])):
+            raise RuntimeError("batched kernel changed the values of {}".format(shape))
+
+        old_cost = time_kernel(old_kernel, weights, mutate_ratio, repeat)
+        new_cost = time_kernel(new_kernel, weights, mutate_ratio, repeat)
+        total_old, total_new = total_old + old_cost, total_new + new_cost
+        print("{:<24}{:>14.2f}{:>14.2f}{:>9.1f}x".format(str(shape), old_cost * 1000, new_cost * 1000,
+                                                       old_cost / max(new_cost, 1e-9)))
+    print("{:<24}{:>14.2f}{:>14.2f}{:>9.1f}x\n".format("total", total_old * 1000, total_new * 1000,
+                                                     total_old / max(total_new, 1e-9)))
+
+
+if __name__ == '__main__':
+    mutation_ratio = float(sys.argv[1]) if len(sys.argv) > 1 else 0.4
+    if not 0 < mutation_ratio <= 1:
+        raise ValueError("mutation_ratio should be in (0, 1]")
+    benchmark("vgg16", vgg16_shapes, mutation_ratio)
+    benchmark("resnet50", resnet50_shapes, mutation_ratio)